@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Assess the throughput of `LeRobotDataset.__getitem__` when `delta_timestamps` request long windows.
+
+A synthetic, low-dimensional dataset is recorded locally (no network access needed), then loaded with
+ACT/diffusion-like `delta_timestamps`. The vectorized query path of `LeRobotDataset` is compared against the
+previous implementation, which built per-key Python lists and queried hf_dataset once per key. Full items are
+also timed with both the 'hf' and the memory-mapped 'memmap' data backends.
+
+Example:
+    python benchmarks/datasets/run_delta_timestamps_benchmark.py --horizon 100 --num-samples 2000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.utils.constants import ACTION, OBS_STATE
+
+
+def record_synthetic_dataset(root: Path, num_episodes: int, episode_length: int, dim: int, fps: int):
+    features = {
+        OBS_STATE: {"dtype": "float32", "shape": (dim,), "names": None},
+        ACTION: {"dtype": "float32", "shape": (dim,), "names": None},
+    }
+    dataset = LeRobotDataset.create(
+        repo_id="benchmark/delta_timestamps", fps=fps, features=features, root=root, use_videos=False
+    )
+    for _ in range(num_episodes):
+        for _ in range(episode_length):
+            dataset.add_frame(
+                {
+                    OBS_STATE: np.random.randn(dim).astype(np.float32),
+                    ACTION: np.random.randn(dim).astype(np.float32),
+                    "task": "benchmark",
+                }
+            )
+        dataset.save_episode()
+    dataset.finalize()
+
+
+def legacy_query(dataset: LeRobotDataset, idx: int) -> dict:
+    """Reference implementation of the delta timestamps query path before vectorization."""
+    item = dataset.hf_dataset[idx]
+    abs_idx = item["index"].item()
+    ep = dataset.meta.episodes[item["episode_index"].item()]
+    ep_start = ep["dataset_from_index"]
+    ep_end = ep["dataset_to_index"]
+    for key, delta_idx in dataset.delta_indices.items():
+        q_idx = [max(ep_start, min(ep_end - 1, abs_idx + delta)) for delta in delta_idx]
+        item[f"{key}_is_pad"] = torch.BoolTensor(
+            [(abs_idx + delta < ep_start) | (abs_idx + delta >= ep_end) for delta in delta_idx]
+        )
+        item[key] = torch.stack(dataset.hf_dataset[key][q_idx])
+    return item
+
+
+def vectorized_query(dataset: LeRobotDataset, idx: int) -> dict:
+    item = dataset.hf_dataset[idx]
+    query_indices, padding = dataset._get_query_indices(item["index"].item(), item["episode_index"].item())
+    return {**item, **padding, **dataset._query_hf_dataset(query_indices)}
+
+
+def measure(fn, dataset: LeRobotDataset, indices: list[int]) -> float:
+    fn(dataset, indices[0])  # warmup, builds the lazy lookup tables
+    start = time.perf_counter()
+    for idx in indices:
+        fn(dataset, idx)
+    return len(indices) / (time.perf_counter() - start)
+
+
+def main(num_episodes: int, episode_length: int, dim: int, fps: int, horizon: int, num_samples: int):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir) / "dataset"
+        record_synthetic_dataset(root, num_episodes, episode_length, dim, fps)
+
+        delta_timestamps = {
+            OBS_STATE: [-1 / fps, 0.0],
+            ACTION: [i / fps for i in range(horizon)],
+        }
+        dataset = LeRobotDataset("benchmark/delta_timestamps", root=root, delta_timestamps=delta_timestamps)
+        indices = random.choices(range(len(dataset)), k=num_samples)
+
+        for _ in range(2):
+            # Make sure both paths agree before timing them
+            reference, result = legacy_query(dataset, indices[0]), vectorized_query(dataset, indices[0])
+            for key in [OBS_STATE, ACTION, f"{ACTION}_is_pad"]:
+                torch.testing.assert_close(reference[key], result[key])
+
+        legacy_sps = measure(legacy_query, dataset, indices)
+        vectorized_sps = measure(vectorized_query, dataset, indices)
+        getitem_sps = measure(lambda ds, i: ds[i], dataset, indices)
+
+        memmap_dataset = LeRobotDataset(
+            "benchmark/delta_timestamps", root=root, delta_timestamps=delta_timestamps, data_backend="memmap"
+        )
+        memmap_getitem_sps = measure(lambda ds, i: ds[i], memmap_dataset, indices)
+
+    print(f"frames={num_episodes * episode_length} horizon={horizon} dim={dim}")
+    print(f"legacy query:         {legacy_sps:10.1f} samples/s")
+    print(f"vectorized query:     {vectorized_sps:10.1f} samples/s ({vectorized_sps / legacy_sps:.1f}x)")
+    print(f"__getitem__ (hf):     {getitem_sps:10.1f} samples/s")
+    print(f"__getitem__ (memmap): {memmap_getitem_sps:10.1f} samples/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-episodes", type=int, default=20, help="Number of synthetic episodes.")
+    parser.add_argument("--episode-length", type=int, default=200, help="Number of frames per episode.")
+    parser.add_argument("--dim", type=int, default=14, help="Dimension of state and action vectors.")
+    parser.add_argument("--fps", type=int, default=30, help="Frame rate of the synthetic dataset.")
+    parser.add_argument("--horizon", type=int, default=100, help="Number of future action deltas queried.")
+    parser.add_argument("--num-samples", type=int, default=1000, help="Number of random items to time.")
+    args = parser.parse_args()
+    main(**vars(args))
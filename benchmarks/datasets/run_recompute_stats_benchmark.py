@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure the throughput of `recompute_stats` (frames/s) for increasing numbers of worker processes.
+
+A synthetic dataset with cameras and low-dimensional features is recorded locally (no network access needed),
+then its stats are recomputed with each number of workers.
+
+Example:
+    python benchmarks/datasets/run_recompute_stats_benchmark.py --num-episodes 100 --num-workers 0 1 2 4
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from lerobot.datasets.dataset_tools import recompute_stats
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.utils.constants import ACTION, OBS_IMAGES, OBS_STATE
+
+
+def record_synthetic_dataset(
+    root: Path,
+    num_cameras: int,
+    num_episodes: int,
+    episode_length: int,
+    height: int,
+    width: int,
+    use_videos: bool,
+) -> LeRobotDataset:
+    features = {
+        f"{OBS_IMAGES}.cam_{i}": {
+            "dtype": "video" if use_videos else "image",
+            "shape": (height, width, 3),
+            "names": ["height", "width", "channels"],
+        }
+        for i in range(num_cameras)
+    }
+    features[OBS_STATE] = {"dtype": "float32", "shape": (14,), "names": None}
+    features[ACTION] = {"dtype": "float32", "shape": (14,), "names": None}
+    dataset = LeRobotDataset.create(
+        repo_id="benchmark/recompute_stats", fps=30, features=features, root=root, use_videos=use_videos
+    )
+    for _ in range(num_episodes):
+        for _ in range(episode_length):
+            frame = {
+                key: np.random.randint(0, 256, (height, width, 3), dtype=np.uint8)
+                for key, ft in features.items()
+                if ft["dtype"] in ["image", "video"]
+            }
+            frame[OBS_STATE] = np.random.randn(14).astype(np.float32)
+            frame[ACTION] = np.random.randn(14).astype(np.float32)
+            frame["task"] = "benchmark"
+            dataset.add_frame(frame)
+        dataset.save_episode()
+    dataset.finalize()
+    return LeRobotDataset("benchmark/recompute_stats", root=root)
+
+
+def main(
+    num_cameras: int,
+    num_episodes: int,
+    episode_length: int,
+    height: int,
+    width: int,
+    use_videos: bool,
+    num_workers: list[int],
+    frames_per_task: int,
+):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dataset = record_synthetic_dataset(
+            Path(tmp_dir) / "dataset", num_cameras, num_episodes, episode_length, height, width, use_videos
+        )
+        num_frames = dataset.meta.total_frames
+        print(
+            f"{num_episodes} episodes, {num_frames} frames, {num_cameras} cameras of {height}x{width} "
+            f"({'videos' if use_videos else 'images'}), {frames_per_task} frames per task"
+        )
+        for workers in num_workers:
+            start = time.perf_counter()
+            recompute_stats(dataset, num_workers=workers, frames_per_task=frames_per_task)
+            elapsed = time.perf_counter() - start
+            print(f"num_workers={workers:2d} {num_frames / elapsed:10.1f} frames/s ({elapsed:6.2f} s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-cameras", type=int, default=2, help="Number of cameras.")
+    parser.add_argument("--num-episodes", type=int, default=40, help="Number of episodes of the dataset.")
+    parser.add_argument("--episode-length", type=int, default=100, help="Number of frames per episode.")
+    parser.add_argument("--height", type=int, default=96, help="Height of the frames.")
+    parser.add_argument("--width", type=int, default=128, help="Width of the frames.")
+    parser.add_argument(
+        "--use-videos", action="store_true", help="Store cameras as videos instead of images."
+    )
+    parser.add_argument(
+        "--num-workers", type=int, nargs="+", default=[0, 1, 2, 4], help="Numbers of workers to compare."
+    )
+    parser.add_argument(
+        "--frames-per-task", type=int, default=1000, help="Number of frames of the episodes of a task."
+    )
+    args = parser.parse_args()
+    main(**vars(args))
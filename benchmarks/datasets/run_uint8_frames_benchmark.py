@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Assess the DataLoader throughput of multi-camera datasets returning float32 vs uint8 frames.
+
+A synthetic dataset with several cameras is recorded locally (no network access needed). Batches are loaded
+through a `torch.utils.data.DataLoader` with workers, moved to the device and, for uint8 frames, converted to
+float with `ImageToFloatProcessorStep`, like `lerobot_train` does with `dataset.return_uint8_images=true`.
+
+Example:
+    python benchmarks/datasets/run_uint8_frames_benchmark.py --num-cameras 3 --num-workers 4 --device cuda
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.processor import DeviceProcessorStep, ImageToFloatProcessorStep, TransitionKey
+from lerobot.processor.converters import create_transition
+from lerobot.utils.constants import ACTION, OBS_IMAGES
+
+
+def record_synthetic_dataset(
+    root: Path, num_cameras: int, num_frames: int, height: int, width: int, use_videos: bool
+):
+    features = {
+        f"{OBS_IMAGES}.cam_{i}": {
+            "dtype": "video" if use_videos else "image",
+            "shape": (height, width, 3),
+            "names": ["height", "width", "channels"],
+        }
+        for i in range(num_cameras)
+    }
+    features[ACTION] = {"dtype": "float32", "shape": (6,), "names": None}
+    dataset = LeRobotDataset.create(
+        repo_id="benchmark/uint8_frames", fps=30, features=features, root=root, use_videos=use_videos
+    )
+    for _ in range(num_frames):
+        frame = {key: np.random.randint(0, 256, (height, width, 3), dtype=np.uint8) for key in features}
+        frame[ACTION] = np.random.randn(6).astype(np.float32)
+        frame["task"] = "benchmark"
+        dataset.add_frame(frame)
+    dataset.save_episode()
+    dataset.finalize()
+
+
+def measure(dataset: LeRobotDataset, batch_size: int, num_workers: int, device: str, num_batches: int):
+    dataloader = torch.utils.data.DataLoader(
+        dataset,
+        batch_size=batch_size,
+        num_workers=num_workers,
+        shuffle=True,
+        pin_memory=device == "cuda",
+        drop_last=True,
+    )
+    to_device = DeviceProcessorStep(device=device)
+    to_float = ImageToFloatProcessorStep()
+    camera_keys = dataset.meta.camera_keys
+
+    num_loaded, num_bytes, start = 0, 0, None
+    while num_loaded < num_batches:
+        for batch in dataloader:
+            if start is None:
+                # Skip the first batch, which includes the start of the workers
+                start = time.perf_counter()
+                continue
+            num_bytes += sum(batch[key].numel() * batch[key].element_size() for key in camera_keys)
+            observation = {key: batch[key] for key in camera_keys}
+            transition = to_float(to_device(create_transition(observation=observation)))
+            assert transition[TransitionKey.OBSERVATION][camera_keys[0]].dtype == torch.float32
+            num_loaded += 1
+            if num_loaded == num_batches:
+                break
+    if device == "cuda":
+        torch.cuda.synchronize()
+    elapsed = time.perf_counter() - start
+    return num_loaded * batch_size / elapsed, num_bytes / num_loaded
+
+
+def main(
+    num_cameras: int,
+    num_frames: int,
+    height: int,
+    width: int,
+    use_videos: bool,
+    batch_size: int,
+    num_workers: int,
+    num_batches: int,
+    device: str,
+):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir) / "dataset"
+        record_synthetic_dataset(root, num_cameras, num_frames, height, width, use_videos)
+
+        results = {}
+        for return_uint8_images in [False, True]:
+            dataset = LeRobotDataset(
+                "benchmark/uint8_frames", root=root, return_uint8_images=return_uint8_images
+            )
+            results[return_uint8_images] = measure(dataset, batch_size, num_workers, device, num_batches)
+
+    print(f"cameras={num_cameras} frame={height}x{width} batch_size={batch_size} num_workers={num_workers}")
+    for return_uint8_images, (sps, batch_bytes) in results.items():
+        name = "uint8" if return_uint8_images else "float32"
+        print(f"{name:8s} {sps:10.1f} samples/s, {batch_bytes / 2**20:8.1f} MiB of frames per batch")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-cameras", type=int, default=3, help="Number of cameras.")
+    parser.add_argument("--num-frames", type=int, default=500, help="Number of frames of the dataset.")
+    parser.add_argument("--height", type=int, default=96, help="Height of the frames.")
+    parser.add_argument("--width", type=int, default=128, help="Width of the frames.")
+    parser.add_argument(
+        "--use-videos", action="store_true", help="Store cameras as videos instead of images."
+    )
+    parser.add_argument("--batch-size", type=int, default=32, help="Batch size of the DataLoader.")
+    parser.add_argument("--num-workers", type=int, default=2, help="Number of DataLoader workers.")
+    parser.add_argument("--num-batches", type=int, default=50, help="Number of batches to time.")
+    parser.add_argument("--device", type=str, default="cpu", help="Device the frames are moved to.")
+    args = parser.parse_args()
+    main(**vars(args))
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the decoding throughput of PI0Fast with and without KV cache.
+
+The model is instantiated on the meta device, and its PaliGemma is replaced with a randomly initialized tiny one
+(the vocabulary, the image resolution and thus the prefix length are the ones of the real model), so the
+benchmark runs on CPU without downloading any checkpoint. Both decoding paths generate `max_decoding_steps`
+tokens greedily from the same inputs, and the generated tokens are checked to be identical.
+
+Example:
+    python benchmarks/policies/run_pi0_fast_decoding_benchmark.py --max-decoding-steps 128 --device cpu
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+from transformers.models.auto import CONFIG_MAPPING
+from transformers.models.paligemma.modeling_paligemma import PaliGemmaForConditionalGeneration
+
+from lerobot.policies.pi0_fast.configuration_pi0_fast import PI0FastConfig
+from lerobot.policies.pi0_fast.modeling_pi0_fast import PI0FastPytorch
+
+VOCAB_SIZE = 257152
+
+
+def make_tiny_paligemma(width: int, depth: int, vision_width: int, vision_depth: int):
+    config = CONFIG_MAPPING["paligemma"]()
+    config._vocab_size = VOCAB_SIZE  # noqa: SLF001
+    config.image_token_index = VOCAB_SIZE
+    config.text_config.vocab_size = VOCAB_SIZE
+    config.text_config.hidden_size = width
+    config.text_config.intermediate_size = 4 * width
+    config.text_config.num_hidden_layers = depth
+    config.text_config.num_attention_heads = 4
+    config.text_config.num_key_value_heads = 1
+    config.text_config.head_dim = width // 4
+    config.text_config.hidden_activation = "gelu_pytorch_tanh"
+    config.vision_config.hidden_size = vision_width
+    config.vision_config.intermediate_size = 4 * vision_width
+    config.vision_config.num_hidden_layers = vision_depth
+    config.vision_config.num_attention_heads = 4
+    config.vision_config.projection_dim = width
+    # With tied embeddings, a random model keeps generating its last input token
+    config.tie_word_embeddings = config.text_config.tie_word_embeddings = False
+    return PaliGemmaForConditionalGeneration(config=config)
+
+
+def make_model(args) -> PI0FastPytorch:
+    config = PI0FastConfig(dtype="float32", device=args.device)
+    # Placeholder token ids, a random model (almost) never generates the EOS token
+    tokenizer = SimpleNamespace(bos_token_id=2, eos_token_id=1, pad_token_id=0)
+    with torch.device("meta"):
+        model = PI0FastPytorch(config, paligemma_tokenizer=tokenizer)
+    model.paligemma_with_expert.paligemma = make_tiny_paligemma(
+        args.width, args.depth, args.vision_width, args.vision_depth
+    )
+    return model.to(args.device).eval()
+
+
+def make_inputs(args):
+    images = [
+        torch.rand(args.batch_size, 3, 224, 224, device=args.device) * 2 - 1 for _ in range(args.num_cameras)
+    ]
+    img_masks = [torch.ones(args.batch_size, dtype=torch.bool, device=args.device)] * args.num_cameras
+    tokens = torch.randint(3, VOCAB_SIZE, (args.batch_size, args.prompt_length), device=args.device)
+    masks = torch.ones(args.batch_size, args.prompt_length, dtype=torch.bool, device=args.device)
+    return images, img_masks, tokens, masks
+
+
+def measure(sample_fn, inputs, max_decoding_steps: int, num_iterations: int):
+    latencies = []
+    # Warmup
+    sample_fn(*inputs, max_decoding_steps=max_decoding_steps)
+    for _ in range(num_iterations):
+        start = time.perf_counter()
+        action_tokens = sample_fn(*inputs, max_decoding_steps=max_decoding_steps)
+        latencies.append(time.perf_counter() - start)
+    return action_tokens, np.array(latencies)
+
+
+def main(args):
+    torch.manual_seed(0)
+    model = make_model(args)
+    inputs = make_inputs(args)
+    num_tokens = args.batch_size * args.max_decoding_steps
+
+    results = {}
+    for name, sample_fn in [
+        ("no_cache", model.sample_actions_fast_no_cache),
+        ("kv_cache", model.sample_actions_fast),
+    ]:
+        action_tokens, latencies = measure(sample_fn, inputs, args.max_decoding_steps, args.num_iterations)
+        results[name] = action_tokens
+        p50 = np.median(latencies)
+        print(
+            f"{name:10s} p50 {p50 * 1e3:9.1f} ms  max {latencies.max() * 1e3:9.1f} ms  "
+            f"{num_tokens / p50:8.1f} tokens/s"
+        )
+
+    assert torch.equal(results["no_cache"], results["kv_cache"]), "The decoded tokens differ"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="cpu", help="Device to run the model on.")
+    parser.add_argument("--batch-size", type=int, default=1, help="Number of decoded sequences.")
+    parser.add_argument("--num-cameras", type=int, default=2, help="Number of 224x224 images in the prefix.")
+    parser.add_argument("--prompt-length", type=int, default=48, help="Number of language tokens.")
+    parser.add_argument("--max-decoding-steps", type=int, default=64, help="Number of generated tokens.")
+    parser.add_argument("--width", type=int, default=128, help="Width of the tiny language model.")
+    parser.add_argument("--depth", type=int, default=4, help="Number of layers of the tiny language model.")
+    parser.add_argument("--vision-width", type=int, default=64, help="Width of the tiny vision tower.")
+    parser.add_argument(
+        "--vision-depth", type=int, default=2, help="Number of layers of the tiny vision tower."
+    )
+    parser.add_argument("--num-iterations", type=int, default=5, help="Number of timed iterations.")
+    main(parser.parse_args())
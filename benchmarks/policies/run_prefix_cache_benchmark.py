@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the inference latency of SmolVLA with and without the prefix cache (`use_prefix_cache`).
+
+The SmolVLM config and processor of the hub are replaced with a randomly initialized tiny SmolVLM, like in
+`tests/policies/test_prefix_cache.py`, so the benchmark runs on CPU without downloading anything. Three cases are
+timed:
+- `no_cache`: the prefix is computed on every call,
+- `cache_miss`: the prefix cache is enabled, but every call gets new images, as in a rollout, so the prefix is
+  recomputed and the cache only adds its lookup, which is also timed on its own,
+- `cache_hit`: the prefix cache is enabled, and the calls get the same prompt, images and state, so only the
+  denoising steps run.
+The actions sampled from a cached prefix are checked to match the ones sampled without cache. PI0 and PI05 use
+the same `PrefixCache`.
+
+Example:
+    python benchmarks/policies/run_prefix_cache_benchmark.py --num-steps 10 --device cpu
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import torch
+from transformers import SmolVLMConfig
+
+from lerobot.policies.smolvla import smolvlm_with_expert
+from lerobot.policies.smolvla.configuration_smolvla import SmolVLAConfig
+from lerobot.policies.smolvla.modeling_smolvla import VLAFlowMatching
+from lerobot.policies.utils import PrefixCache
+
+VOCAB_SIZE = 1024
+
+
+def make_model(args) -> VLAFlowMatching:
+    vlm_config = SmolVLMConfig(
+        text_config={
+            "model_type": "llama",
+            "vocab_size": VOCAB_SIZE,
+            "hidden_size": args.width,
+            "intermediate_size": 4 * args.width,
+            "num_hidden_layers": args.depth,
+            "num_attention_heads": args.width // args.head_dim,
+            "num_key_value_heads": 1,
+            "head_dim": args.head_dim,
+        },
+        vision_config={
+            "hidden_size": args.vision_width,
+            "intermediate_size": 4 * args.vision_width,
+            "num_hidden_layers": args.vision_depth,
+            "num_attention_heads": 4,
+            "image_size": args.image_size,
+            "patch_size": 16,
+        },
+        scale_factor=4,
+    )
+    tokenizer = SimpleNamespace(fake_image_token_id=VOCAB_SIZE - 2, global_image_token_id=VOCAB_SIZE - 1)
+    config = SmolVLAConfig(
+        device=args.device, num_vlm_layers=args.depth, num_steps=args.num_steps, use_prefix_cache=True
+    )
+    with (
+        patch.object(smolvlm_with_expert.AutoConfig, "from_pretrained", lambda model_id: vlm_config),
+        patch.object(
+            smolvlm_with_expert.AutoProcessor,
+            "from_pretrained",
+            lambda model_id: SimpleNamespace(tokenizer=tokenizer),
+        ),
+    ):
+        model = VLAFlowMatching(config)
+    return model.to(args.device).eval()
+
+
+def make_inputs(args, max_state_dim: int):
+    images = [
+        torch.rand(args.batch_size, 3, args.image_size, args.image_size, device=args.device) * 2 - 1
+        for _ in range(args.num_cameras)
+    ]
+    img_masks = [torch.ones(args.batch_size, dtype=torch.bool, device=args.device)] * args.num_cameras
+    tokens = torch.randint(0, VOCAB_SIZE - 2, (args.batch_size, args.prompt_length), device=args.device)
+    masks = torch.ones(args.batch_size, args.prompt_length, dtype=torch.bool, device=args.device)
+    state = torch.randn(args.batch_size, max_state_dim, device=args.device)
+    return images, img_masks, tokens, masks, state
+
+
+@torch.no_grad()
+def main(args):
+    torch.manual_seed(0)
+    model = make_model(args)
+    num_params = sum(param.numel() for param in model.parameters())
+    print(
+        f"SmolVLA with {num_params / 1e6:.1f}M parameters, {args.num_cameras} cameras, {args.num_steps} steps"
+    )
+
+    # Name -> (prefix cache, new images on every call)
+    cases = {
+        "no_cache": (None, True),
+        "cache_miss": (PrefixCache(), True),
+        "cache_hit": (PrefixCache(), False),
+    }
+    images, *other_inputs = make_inputs(args, model.config.max_state_dim)
+    latencies = {name: [] for name in cases}
+    # The cases are interleaved, so that they are equally affected by the load of the machine
+    for idx in range(args.num_iterations + 1):
+        for name, (prefix_cache, new_images) in cases.items():
+            model.prefix_cache = prefix_cache
+            case_images = [torch.rand_like(image) * 2 - 1 for image in images] if new_images else images
+            start = time.perf_counter()
+            model.sample_actions(case_images, *other_inputs)
+            # The first call is a warmup
+            if idx > 0:
+                latencies[name].append(time.perf_counter() - start)
+
+    p50 = {name: np.median(case_latencies) for name, case_latencies in latencies.items()}
+    for name, case_latencies in latencies.items():
+        print(f"{name:10s} p50 {p50[name] * 1e3:9.1f} ms  max {max(case_latencies) * 1e3:9.1f} ms")
+    print(f"hit speedup {p50['no_cache'] / p50['cache_hit']:.2f}x")
+    print(f"miss overhead {(p50['cache_miss'] / p50['no_cache'] - 1) * 100:+.1f}%")
+
+    # Cost of a miss in the cache itself: the key, the comparison of the inputs and the update of the entry
+    prefix_cache = PrefixCache()
+    img_masks, tokens, masks, state = other_inputs
+    lookup_latencies = []
+    for _ in range(args.num_iterations):
+        new_images = [torch.rand_like(image) * 2 - 1 for image in images]
+        start = time.perf_counter()
+        prefix_cache.get(tokens, [masks, *new_images, *img_masks, state], lambda: None)
+        lookup_latencies.append(time.perf_counter() - start)
+    print(f"miss lookup p50 {np.median(lookup_latencies) * 1e3:.3f} ms")
+
+    inputs = make_inputs(args, model.config.max_state_dim)
+    noise = model.sample_noise(
+        (args.batch_size, model.config.chunk_size, model.config.max_action_dim), args.device
+    )
+    model.prefix_cache = None
+    expected = model.sample_actions(*inputs, noise=noise)
+    model.prefix_cache = PrefixCache()
+    for _ in range(2):
+        torch.testing.assert_close(model.sample_actions(*inputs, noise=noise), expected)
+    assert model.prefix_cache.num_hits == 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="cpu", help="Device to run the model on.")
+    parser.add_argument("--batch-size", type=int, default=1, help="Number of sampled action chunks.")
+    parser.add_argument("--num-cameras", type=int, default=3, help="Number of images in the prefix.")
+    parser.add_argument("--image-size", type=int, default=256, help="Resolution of the images.")
+    parser.add_argument("--prompt-length", type=int, default=48, help="Number of language tokens.")
+    parser.add_argument("--num-steps", type=int, default=10, help="Number of denoising steps.")
+    parser.add_argument("--width", type=int, default=256, help="Width of the tiny language model.")
+    parser.add_argument(
+        "--depth", type=int, default=8, help="Number of layers of the language model and expert."
+    )
+    parser.add_argument("--head-dim", type=int, default=64, help="Dimension of the attention heads.")
+    parser.add_argument("--vision-width", type=int, default=128, help="Width of the tiny vision tower.")
+    parser.add_argument(
+        "--vision-depth", type=int, default=4, help="Number of layers of the tiny vision tower."
+    )
+    parser.add_argument("--num-iterations", type=int, default=10, help="Number of timed iterations.")
+    main(parser.parse_args())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the latency of processor pipelines with and without `DataProcessorPipeline.compile`.
+
+A pre-processor (rename, batch, device, normalizer) and a post-processor (unnormalizer, device) like the ones of
+the policies are built with synthetic stats, and called on a single observation or action chunk, as on the
+control path of a robot. The latency of each step of the uncompiled pipelines is reported, then the total
+latency of the uncompiled and compiled pipelines.
+
+Example:
+    python benchmarks/processor/run_compiled_pipeline_benchmark.py --num-cameras 2 --device cuda
+"""
+
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+import torch
+
+from lerobot.configs.types import FeatureType, NormalizationMode, PolicyFeature
+from lerobot.processor import (
+    AddBatchDimensionProcessorStep,
+    DeviceProcessorStep,
+    NormalizerProcessorStep,
+    PolicyProcessorPipeline,
+    RenameObservationsProcessorStep,
+    UnnormalizerProcessorStep,
+)
+from lerobot.processor.converters import policy_action_to_transition, transition_to_policy_action
+from lerobot.utils.constants import ACTION, OBS_IMAGES, OBS_STATE
+
+
+def make_features_and_stats(num_cameras: int, height: int, width: int, state_dim: int, action_dim: int):
+    features = {
+        f"{OBS_IMAGES}.cam_{i}": PolicyFeature(type=FeatureType.VISUAL, shape=(3, height, width))
+        for i in range(num_cameras)
+    }
+    features[OBS_STATE] = PolicyFeature(type=FeatureType.STATE, shape=(state_dim,))
+    features[ACTION] = PolicyFeature(type=FeatureType.ACTION, shape=(action_dim,))
+    stats = {
+        key: {"mean": torch.rand(3, 1, 1), "std": torch.rand(3, 1, 1) + 0.1}
+        for key, feature in features.items()
+        if feature.type == FeatureType.VISUAL
+    }
+    stats[OBS_STATE] = {"min": -torch.rand(state_dim), "max": torch.rand(state_dim)}
+    stats[ACTION] = {"mean": torch.randn(action_dim), "std": torch.rand(action_dim) + 0.1}
+    norm_map = {
+        FeatureType.VISUAL: NormalizationMode.MEAN_STD,
+        FeatureType.STATE: NormalizationMode.MIN_MAX,
+        FeatureType.ACTION: NormalizationMode.MEAN_STD,
+    }
+    return features, stats, norm_map
+
+
+def make_pipelines(features, stats, norm_map, device: str):
+    preprocessor = PolicyProcessorPipeline(
+        steps=[
+            RenameObservationsProcessorStep(rename_map={}),
+            AddBatchDimensionProcessorStep(),
+            DeviceProcessorStep(device=device),
+            NormalizerProcessorStep(features=features, norm_map=norm_map, stats=stats, device=device),
+        ],
+        name="policy_preprocessor",
+    )
+    postprocessor = PolicyProcessorPipeline(
+        steps=[
+            UnnormalizerProcessorStep(features=features, norm_map=norm_map, stats=stats, device=device),
+            DeviceProcessorStep(device="cpu"),
+        ],
+        name="policy_postprocessor",
+        to_transition=policy_action_to_transition,
+        to_output=transition_to_policy_action,
+    )
+    return preprocessor, postprocessor
+
+
+def synchronize(device: str):
+    if device == "cuda":
+        torch.cuda.synchronize()
+
+
+def measure_steps(pipeline: PolicyProcessorPipeline, data, device: str, num_iterations: int):
+    """Latency of each step, measured with step hooks."""
+    latencies = defaultdict(list)
+    starts = {}
+
+    def before_step(idx, _transition):
+        synchronize(device)
+        starts[idx] = time.perf_counter()
+
+    def after_step(idx, _transition):
+        synchronize(device)
+        latencies[idx].append(time.perf_counter() - starts[idx])
+
+    pipeline.register_before_step_hook(before_step)
+    pipeline.register_after_step_hook(after_step)
+    for _ in range(num_iterations):
+        pipeline(data)
+    pipeline.unregister_before_step_hook(before_step)
+    pipeline.unregister_after_step_hook(after_step)
+    return {type(pipeline.steps[idx]).__name__: values for idx, values in latencies.items()}
+
+
+def measure(pipeline: PolicyProcessorPipeline, data, device: str, num_iterations: int) -> list[float]:
+    latencies = []
+    for _ in range(num_iterations):
+        start = time.perf_counter()
+        pipeline(data)
+        synchronize(device)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def format_latencies(latencies: list[float]) -> str:
+    p50, p99 = np.percentile(np.array(latencies) * 1e6, [50, 99])
+    return f"p50 {p50:9.1f} us  p99 {p99:9.1f} us"
+
+
+def main(
+    num_cameras: int,
+    height: int,
+    width: int,
+    state_dim: int,
+    action_dim: int,
+    chunk_size: int,
+    device: str,
+    num_iterations: int,
+    torch_compile: bool,
+):
+    features, stats, norm_map = make_features_and_stats(num_cameras, height, width, state_dim, action_dim)
+    observation = {key: torch.rand(*feature.shape) for key, feature in features.items() if key != ACTION}
+    inputs = {
+        "preprocessor": observation,
+        "postprocessor": torch.randn(1, chunk_size, action_dim, device=device),
+    }
+
+    pipelines = dict(zip(inputs, make_pipelines(features, stats, norm_map, device), strict=True))
+    compiled_pipelines = dict(zip(inputs, make_pipelines(features, stats, norm_map, device), strict=True))
+    for pipeline in compiled_pipelines.values():
+        pipeline.compile(use_torch_compile=torch_compile)
+
+    for name, data in inputs.items():
+        pipeline, compiled_pipeline = pipelines[name], compiled_pipelines[name]
+        # Warmup, which also builds the fused plan of the compiled pipeline
+        measure(pipeline, data, device, 10)
+        measure(compiled_pipeline, data, device, 10)
+
+        print(f"{name}:")
+        for step_name, latencies in measure_steps(pipeline, data, device, num_iterations).items():
+            print(f"  {step_name:34s} {format_latencies(latencies)}")
+        print(f"  {'total':34s} {format_latencies(measure(pipeline, data, device, num_iterations))}")
+        compiled_latencies = measure(compiled_pipeline, data, device, num_iterations)
+        print(f"  {'total (compiled)':34s} {format_latencies(compiled_latencies)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-cameras", type=int, default=2, help="Number of cameras of the observation.")
+    parser.add_argument("--height", type=int, default=224, help="Height of the camera frames.")
+    parser.add_argument("--width", type=int, default=224, help="Width of the camera frames.")
+    parser.add_argument("--state-dim", type=int, default=14, help="Dimension of the state.")
+    parser.add_argument("--action-dim", type=int, default=14, help="Dimension of the actions.")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Number of actions of the action chunk.")
+    parser.add_argument("--device", type=str, default="cpu", help="Device the pipelines run on.")
+    parser.add_argument("--num-iterations", type=int, default=500, help="Number of timed calls.")
+    parser.add_argument(
+        "--torch-compile", action="store_true", help="Also `torch.compile` the fused tensor math."
+    )
+    args = parser.parse_args()
+    main(**vars(args))
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare `torch.save`/pickle with the tensor format of `lerobot.transport.utils` for gRPC payloads.
+
+Two synthetic payloads are measured, without any network:
+- the parameters pushed by the learner to the actors (a SAC-like state dict of several MB),
+- an observation sent by the robot client to the policy server (camera frames and a joint state).
+
+For each payload, the serialize latency, and the latency of the full path (serialize, split into gRPC messages,
+reassemble and deserialize) are reported.
+
+Example:
+    python benchmarks/transport/run_serialization_benchmark.py --num-cameras 2 --hidden-dim 1024
+"""
+
+import argparse
+import io
+import pickle  # nosec
+import time
+from multiprocessing import Event
+
+import numpy as np
+import torch
+
+from lerobot.async_inference.helpers import TimedObservation
+from lerobot.transport import services_pb2
+from lerobot.transport.utils import (
+    bytes_to_tensors,
+    receive_bytes_in_chunks,
+    send_bytes_in_chunks,
+    tensors_to_buffers,
+)
+
+
+def make_state_dict(hidden_dim: int, num_layers: int, num_critics: int) -> dict[str, torch.Tensor]:
+    state_dict = {}
+    for critic in range(num_critics):
+        for layer in range(num_layers):
+            state_dict[f"critics.{critic}.net.{layer}.weight"] = torch.randn(hidden_dim, hidden_dim)
+            state_dict[f"critics.{critic}.net.{layer}.bias"] = torch.randn(hidden_dim)
+    for layer in range(num_layers):
+        state_dict[f"actor.net.{layer}.weight"] = torch.randn(hidden_dim, hidden_dim)
+        state_dict[f"actor.net.{layer}.bias"] = torch.randn(hidden_dim)
+    return state_dict
+
+
+def make_observation(num_cameras: int, height: int, width: int) -> TimedObservation:
+    observation = {
+        f"camera_{i}": np.random.randint(0, 256, (height, width, 3), dtype=np.uint8)
+        for i in range(num_cameras)
+    }
+    observation.update({f"joint_{i}.pos": float(i) for i in range(6)})
+    observation["task"] = "benchmark"
+    return TimedObservation(timestamp=time.time(), timestep=0, observation=observation)
+
+
+def torch_save_to_bytes(obj) -> bytes:
+    buffer = io.BytesIO()
+    torch.save(obj, buffer)
+    return buffer.getvalue()
+
+
+def torch_load_from_bytes(data) -> object:
+    return torch.load(io.BytesIO(data), weights_only=False)
+
+
+def transfer(serialized) -> bytearray:
+    messages = send_bytes_in_chunks(serialized, services_pb2.InteractionMessage)
+    return receive_bytes_in_chunks(messages, None, Event())
+
+
+def percentiles(latencies: list[float]) -> tuple[float, float]:
+    p50, p99 = np.percentile(np.array(latencies) * 1e3, [50, 99])
+    return p50, p99
+
+
+def measure(obj, serialize, deserialize, num_iterations: int) -> dict[str, float]:
+    serialize_latencies, total_latencies = [], []
+    num_bytes = 0
+    for _ in range(num_iterations):
+        start = time.perf_counter()
+        serialized = serialize(obj)
+        serialize_latencies.append(time.perf_counter() - start)
+        deserialize(transfer(serialized))
+        total_latencies.append(time.perf_counter() - start)
+        num_bytes = sum(
+            len(memoryview(b).cast("B"))
+            for b in (serialized if isinstance(serialized, list) else [serialized])
+        )
+    serialize_p50, serialize_p99 = percentiles(serialize_latencies)
+    total_p50, total_p99 = percentiles(total_latencies)
+    return {
+        "num_bytes": num_bytes,
+        "serialize_p50": serialize_p50,
+        "serialize_p99": serialize_p99,
+        "total_p50": total_p50,
+        "total_p99": total_p99,
+        "throughput": num_bytes / np.median(total_latencies),
+    }
+
+
+def main(
+    hidden_dim: int,
+    num_layers: int,
+    num_critics: int,
+    num_cameras: int,
+    height: int,
+    width: int,
+    num_iterations: int,
+):
+    payloads = {
+        "parameters": (
+            make_state_dict(hidden_dim, num_layers, num_critics),
+            (torch_save_to_bytes, torch_load_from_bytes),
+        ),
+        "observation": (make_observation(num_cameras, height, width), (pickle.dumps, pickle.loads)),
+    }
+    for payload_name, (obj, baseline) in payloads.items():
+        methods = {
+            "baseline": baseline,
+            "tensor_format": (
+                tensors_to_buffers,
+                lambda data: bytes_to_tensors(data, dataclass_types=[TimedObservation]),
+            ),
+        }
+        for method_name, (serialize, deserialize) in methods.items():
+            results = measure(obj, serialize, deserialize, num_iterations)
+            print(
+                f"{payload_name:12s} {method_name:14s} {results['num_bytes'] / 2**20:7.1f} MiB  "
+                f"serialize p50 {results['serialize_p50']:7.2f} ms p99 {results['serialize_p99']:7.2f} ms  "
+                f"total p50 {results['total_p50']:7.2f} ms p99 {results['total_p99']:7.2f} ms  "
+                f"{results['throughput'] / 2**20:8.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--hidden-dim", type=int, default=512, help="Hidden dimension of the synthetic networks."
+    )
+    parser.add_argument("--num-layers", type=int, default=3, help="Number of layers of each network.")
+    parser.add_argument("--num-critics", type=int, default=2, help="Number of critic networks.")
+    parser.add_argument("--num-cameras", type=int, default=2, help="Number of cameras of the observation.")
+    parser.add_argument("--height", type=int, default=480, help="Height of the camera frames.")
+    parser.add_argument("--width", type=int, default=640, help="Width of the camera frames.")
+    parser.add_argument("--num-iterations", type=int, default=50, help="Number of timed iterations.")
+    args = parser.parse_args()
+    main(**vars(args))
@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Assess the video decoding throughput of `LeRobotDataset` under the access patterns of training.
+
+Unlike `run_video_benchmark.py`, which decodes a few frames of a single video file, this benchmark loads batches
+of a real `LeRobotDataset` through a `torch.utils.data.DataLoader`, for each combination of:
+- the video backend (`pyav`, `torchcodec`),
+- the sampler: uniform shuffling, or `EpisodeAwareSampler` grouping several windows of the same episode per batch,
+- the number of DataLoader workers.
+
+Cameras are loaded with a window of `--window-size` frames per sample through `delta_timestamps`, like
+policies with an observation horizon do. The dataset is recorded locally from synthetic frames, so that the
+benchmark runs offline. It is kept in `--fixture-dir` when given, to compare runs on the same videos.
+
+Reported metrics, per scenario:
+- `samples_per_s`: samples loaded per second, once the workers are started.
+- `p50_item_latency_ms`, `p99_item_latency_ms`: time spent by `LeRobotDataset.__getitems__` per sample. Samples
+  of a batch are decoded together, so this is the latency of a batch divided by its size.
+- `decoded_frames_per_returned_frame`: frames decoded per frame returned (`pyav` only, see
+  `lerobot.datasets.video_utils.get_pyav_decode_stats`).
+- `peak_rss_mb_per_worker`: peak resident memory of the processes loading samples (the main process when
+  `num_workers=0`), averaged over the workers.
+
+Results are saved as json with `--output-path`. Given `--baseline-path` (the output of a previous run),
+the benchmark exits with an error if the throughput of a scenario dropped by more than `--max-slowdown`.
+
+Example:
+    python benchmarks/video/run_dataset_decode_benchmark.py \
+        --backends pyav torchcodec \
+        --num-workers 0 4 \
+        --fixture-dir outputs/video_benchmark_fixture \
+        --output-path outputs/dataset_decode_benchmark.json
+"""
+
+import argparse
+import importlib.util
+import itertools
+import json
+import logging
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.sampler import EpisodeAwareSampler
+from lerobot.datasets.video_utils import get_pyav_decode_stats
+from lerobot.utils.constants import ACTION, OBS_IMAGES
+
+REPO_ID = "benchmark/dataset_decode"
+SAMPLERS = ["shuffle", "episode_aware"]
+# Keys added to each item by `InstrumentedDataset`
+LOAD_TIME_KEY = "benchmark.load_time_s"
+DECODED_FRAMES_KEY = "benchmark.decoded_frames"
+RETURNED_FRAMES_KEY = "benchmark.returned_frames"
+RSS_KEY = "benchmark.peak_rss_bytes"
+WORKER_KEY = "benchmark.worker_id"
+
+
+def get_peak_rss_bytes() -> int:
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+class InstrumentedDataset(torch.utils.data.Dataset):
+    """Wraps a LeRobotDataset to report, within each item, the metrics of the process which loaded it."""
+
+    def __init__(self, dataset: LeRobotDataset):
+        self.dataset = dataset
+
+    def __len__(self) -> int:
+        return len(self.dataset)
+
+    def __getitem__(self, idx: int) -> dict:
+        return self.__getitems__([idx])[0]
+
+    def __getitems__(self, indices: list[int]) -> list[dict]:
+        stats_before = get_pyav_decode_stats()
+        start = time.perf_counter()
+        items = self.dataset.__getitems__(indices)
+        load_time_s = (time.perf_counter() - start) / len(indices)
+        stats_after = get_pyav_decode_stats()
+
+        worker_info = torch.utils.data.get_worker_info()
+        worker_id = worker_info.id if worker_info is not None else -1
+        decoded = stats_after["decoded_frames"] - stats_before["decoded_frames"]
+        returned = stats_after["returned_frames"] - stats_before["returned_frames"]
+        peak_rss = get_peak_rss_bytes()
+        for item in items:
+            # Counters are spread evenly over the items, so that they sum up to the counters of the batch
+            item[LOAD_TIME_KEY] = load_time_s
+            item[DECODED_FRAMES_KEY] = decoded / len(indices)
+            item[RETURNED_FRAMES_KEY] = returned / len(indices)
+            item[RSS_KEY] = peak_rss
+            item[WORKER_KEY] = worker_id
+        return items
+
+
+def record_synthetic_dataset(
+    root: Path,
+    num_episodes: int,
+    episode_length: int,
+    num_cameras: int,
+    height: int,
+    width: int,
+    fps: int,
+    seed: int,
+):
+    features = {
+        f"{OBS_IMAGES}.cam_{i}": {
+            "dtype": "video",
+            "shape": (height, width, 3),
+            "names": ["height", "width", "channels"],
+        }
+        for i in range(num_cameras)
+    }
+    features[ACTION] = {"dtype": "float32", "shape": (6,), "names": None}
+    dataset = LeRobotDataset.create(repo_id=REPO_ID, fps=fps, features=features, root=root, use_videos=True)
+
+    rng = np.random.default_rng(seed)
+    ys, xs = np.mgrid[0:height, 0:width]
+    for _ in range(num_episodes):
+        # Moving gradients with a bit of noise, to get realistic inter frame compression
+        offsets = rng.integers(0, 256, size=num_cameras)
+        for frame_idx in range(episode_length):
+            frame = {}
+            for cam_idx in range(num_cameras):
+                base = (xs + ys + 2 * frame_idx + offsets[cam_idx]) % 256
+                noise = rng.integers(0, 16, size=(height, width))
+                image = np.stack([base, (base + 85) % 256, (base + 170) % 256], axis=-1) + noise[..., None]
+                frame[f"{OBS_IMAGES}.cam_{cam_idx}"] = image.clip(0, 255).astype(np.uint8)
+            frame[ACTION] = rng.standard_normal(6).astype(np.float32)
+            frame["task"] = "benchmark"
+            dataset.add_frame(frame)
+        dataset.save_episode()
+    dataset.finalize()
+
+
+def make_dataloader(
+    dataset: LeRobotDataset, sampler_name: str, batch_size: int, num_workers: int, episode_group_size: int
+) -> torch.utils.data.DataLoader:
+    if sampler_name == "shuffle":
+        sampler, shuffle = None, True
+    elif sampler_name == "episode_aware":
+        sampler = EpisodeAwareSampler(
+            dataset.meta.episodes["dataset_from_index"],
+            dataset.meta.episodes["dataset_to_index"],
+            shuffle=True,
+            episode_group_size=episode_group_size,
+        )
+        shuffle = False
+    else:
+        raise ValueError(f"Unknown sampler: {sampler_name}. Available samplers: {SAMPLERS}")
+
+    return torch.utils.data.DataLoader(
+        InstrumentedDataset(dataset),
+        batch_size=batch_size,
+        shuffle=shuffle,
+        sampler=sampler,
+        num_workers=num_workers,
+        drop_last=True,
+    )
+
+
+def run_scenario(
+    root: Path,
+    backend: str,
+    sampler_name: str,
+    num_workers: int,
+    window_size: int,
+    batch_size: int,
+    num_batches: int,
+    episode_group_size: int,
+) -> dict:
+    meta_dataset = LeRobotDataset(REPO_ID, root=root, video_backend=backend)
+    fps = meta_dataset.fps
+    delta_timestamps = {
+        key: [(i - window_size + 1) / fps for i in range(window_size)]
+        for key in meta_dataset.meta.camera_keys
+    }
+    dataset = LeRobotDataset(REPO_ID, root=root, delta_timestamps=delta_timestamps, video_backend=backend)
+    dataloader = make_dataloader(dataset, sampler_name, batch_size, num_workers, episode_group_size)
+
+    load_times_s, decoded, returned = [], 0.0, 0.0
+    peak_rss_per_worker: dict[int, int] = {}
+    num_loaded, start = 0, None
+    while num_loaded < num_batches:
+        for batch in dataloader:
+            if start is None:
+                # Skip the first batch, which includes the start of the workers
+                start = time.perf_counter()
+                continue
+            load_times_s.extend(batch[LOAD_TIME_KEY].tolist())
+            decoded += batch[DECODED_FRAMES_KEY].sum().item()
+            returned += batch[RETURNED_FRAMES_KEY].sum().item()
+            for worker_id, peak_rss in zip(batch[WORKER_KEY].tolist(), batch[RSS_KEY].tolist(), strict=True):
+                peak_rss_per_worker[worker_id] = max(peak_rss_per_worker.get(worker_id, 0), peak_rss)
+            num_loaded += 1
+            if num_loaded == num_batches:
+                break
+    elapsed_s = time.perf_counter() - start
+
+    load_times_ms = np.array(load_times_s) * 1000
+    return {
+        "backend": backend,
+        "sampler": sampler_name,
+        "num_workers": num_workers,
+        "window_size": window_size,
+        "num_cameras": len(dataset.meta.camera_keys),
+        "batch_size": batch_size,
+        "samples_per_s": num_loaded * batch_size / elapsed_s,
+        "p50_item_latency_ms": float(np.percentile(load_times_ms, 50)),
+        "p99_item_latency_ms": float(np.percentile(load_times_ms, 99)),
+        "decoded_frames_per_returned_frame": decoded / returned if returned > 0 else float("nan"),
+        "peak_rss_mb_per_worker": float(np.mean(list(peak_rss_per_worker.values()))) / 2**20,
+    }
+
+
+def get_scenario_name(result: dict) -> str:
+    return f"{result['backend']}/{result['sampler']}/workers={result['num_workers']}"
+
+
+def find_regressions(results: list[dict], baseline: list[dict], max_slowdown: float) -> list[str]:
+    """Scenarios whose throughput dropped by more than `max_slowdown` (e.g. 0.2 for 20%) from `baseline`."""
+    baseline_by_name = {get_scenario_name(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        name = get_scenario_name(result)
+        if name not in baseline_by_name:
+            continue
+        reference = baseline_by_name[name]["samples_per_s"]
+        if result["samples_per_s"] < (1 - max_slowdown) * reference:
+            regressions.append(f"{name}: {result['samples_per_s']:.1f} samples/s (baseline: {reference:.1f})")
+    return regressions
+
+
+def print_results(results: list[dict]):
+    header = (
+        f"{'scenario':40s} {'samples/s':>10s} {'p50 ms':>8s} {'p99 ms':>8s} {'dec/ret':>8s} {'RSS MiB':>8s}"
+    )
+    print(header)
+    for result in results:
+        print(
+            f"{get_scenario_name(result):40s} "
+            f"{result['samples_per_s']:10.1f} "
+            f"{result['p50_item_latency_ms']:8.2f} "
+            f"{result['p99_item_latency_ms']:8.2f} "
+            f"{result['decoded_frames_per_returned_frame']:8.2f} "
+            f"{result['peak_rss_mb_per_worker']:8.1f}"
+        )
+
+
+def main(
+    backends: list[str],
+    samplers: list[str],
+    num_workers: list[int],
+    num_episodes: int,
+    episode_length: int,
+    num_cameras: int,
+    height: int,
+    width: int,
+    fps: int,
+    window_size: int,
+    batch_size: int,
+    num_batches: int,
+    episode_group_size: int,
+    fixture_dir: Path | None,
+    output_path: Path | None,
+    baseline_path: Path | None,
+    max_slowdown: float,
+    seed: int,
+):
+    available_backends = []
+    for backend in backends:
+        if backend == "torchcodec" and importlib.util.find_spec("torchcodec") is None:
+            logging.warning("Skipping the 'torchcodec' backend, which is not installed.")
+            continue
+        available_backends.append(backend)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(fixture_dir) if fixture_dir is not None else Path(tmp_dir) / "dataset"
+        if not (root / "meta" / "info.json").is_file():
+            record_synthetic_dataset(
+                root, num_episodes, episode_length, num_cameras, height, width, fps, seed
+            )
+
+        results = []
+        for backend, sampler_name, workers in itertools.product(available_backends, samplers, num_workers):
+            torch.manual_seed(seed)
+            results.append(
+                run_scenario(
+                    root,
+                    backend,
+                    sampler_name,
+                    workers,
+                    window_size,
+                    batch_size,
+                    num_batches,
+                    episode_group_size,
+                )
+            )
+
+    print_results(results)
+    if output_path is not None:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w") as f:
+            json.dump(results, f, indent=4)
+
+    if baseline_path is not None:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, max_slowdown)
+        if regressions:
+            print("Throughput regressions:\n" + "\n".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--backends",
+        type=str,
+        nargs="*",
+        default=["pyav", "torchcodec"],
+        help="Video decoding backends to be tested. Unavailable backends are skipped.",
+    )
+    parser.add_argument(
+        "--samplers", type=str, nargs="*", default=SAMPLERS, help=f"Samplers to be tested, among {SAMPLERS}."
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        nargs="*",
+        default=[0, 2],
+        help="Numbers of DataLoader workers to be tested.",
+    )
+    parser.add_argument("--num-episodes", type=int, default=10, help="Number of episodes of the dataset.")
+    parser.add_argument("--episode-length", type=int, default=100, help="Number of frames per episode.")
+    parser.add_argument("--num-cameras", type=int, default=2, help="Number of cameras.")
+    parser.add_argument("--height", type=int, default=96, help="Height of the frames.")
+    parser.add_argument("--width", type=int, default=128, help="Width of the frames.")
+    parser.add_argument("--fps", type=int, default=30, help="Frame rate of the dataset.")
+    parser.add_argument("--window-size", type=int, default=2, help="Number of frames per camera and sample.")
+    parser.add_argument("--batch-size", type=int, default=16, help="Batch size of the DataLoader.")
+    parser.add_argument("--num-batches", type=int, default=30, help="Number of batches to time per scenario.")
+    parser.add_argument(
+        "--episode-group-size",
+        type=int,
+        default=4,
+        help="Consecutive samples drawn from the same episode with the 'episode_aware' sampler.",
+    )
+    parser.add_argument(
+        "--fixture-dir",
+        type=Path,
+        default=None,
+        help="Directory where the synthetic dataset is recorded, or reused if it already exists. "
+        "Defaults to a temporary directory.",
+    )
+    parser.add_argument("--output-path", type=Path, default=None, help="Json file where results are saved.")
+    parser.add_argument(
+        "--baseline-path",
+        type=Path,
+        default=None,
+        help="Results of a previous run, to check for throughput regressions.",
+    )
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=0.2,
+        help="Maximum throughput drop of a scenario relative to the baseline (e.g. 0.2 for 20%%).",
+    )
+    parser.add_argument("--seed", type=int, default=1337, help="Seed of the synthetic frames and samplers.")
+    args = parser.parse_args()
+    main(**vars(args))
@@ -40,6 +40,7 @@ from tqdm import tqdm
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
 from lerobot.datasets.video_utils import (
     decode_video_frames,
+    decode_video_frames_pyav,
     encode_video_frames,
 )
 from lerobot.utils.constants import OBS_IMAGE
@@ -172,9 +173,19 @@ def benchmark_decoding(
             "mse_values": [],
         }
 
+        decode_stats = {}
         with time_benchmark, lock:
-            frames = decode_video_frames(video_path, timestamps=timestamps, tolerance_s=5e-1, backend=backend)
+            if backend == "pyav":
+                frames = decode_video_frames_pyav(
+                    video_path, timestamps=timestamps, tolerance_s=5e-1, stats=decode_stats
+                )
+            else:
+                frames = decode_video_frames(
+                    video_path, timestamps=timestamps, tolerance_s=5e-1, backend=backend
+                )
         result["load_time_video_ms"] = (time_benchmark.last * 1000) / num_frames
+        result["decoded_frames"] = decode_stats.get("decoded_frames", 0)
+        result["returned_frames"] = decode_stats.get("returned_frames", 0)
 
         with time_benchmark:
             original_frames = load_original_frames(imgs_dir, timestamps, fps)
@@ -201,6 +212,8 @@ def benchmark_decoding(
     mse_values = []
     psnr_values = []
     ssim_values = []
+    decoded_frames = 0
+    returned_frames = 0
 
     # A sample is a single set of decoded frames specified by timestamps_mode (e.g. a single frame, 2 frames, etc.).
     # For each sample, we record metrics (loading time and quality metrics) which are then averaged over all samples.
@@ -216,10 +229,16 @@ def benchmark_decoding(
             psnr_values.extend(result["psnr_values"])
             ssim_values.extend(result["ssim_values"])
             mse_values.extend(result["mse_values"])
+            decoded_frames += result["decoded_frames"]
+            returned_frames += result["returned_frames"]
 
     avg_load_time_video_ms = float(np.array(load_times_video_ms).mean())
     avg_load_time_images_ms = float(np.array(load_times_images_ms).mean())
     video_images_load_time_ratio = avg_load_time_video_ms / avg_load_time_images_ms
+    # Only reported by decoders that count the frames they decode
+    decoded_frames_per_returned_frame = (
+        decoded_frames / returned_frames if returned_frames > 0 else float("nan")
+    )
 
     return {
         "avg_load_time_video_ms": avg_load_time_video_ms,
@@ -228,6 +247,7 @@ def benchmark_decoding(
         "avg_mse": float(np.mean(mse_values)),
         "avg_psnr": float(np.mean(psnr_values)),
         "avg_ssim": float(np.mean(ssim_values)),
+        "decoded_frames_per_returned_frame": decoded_frames_per_returned_frame,
     }
 
 
@@ -340,6 +360,7 @@ def main(
         "avg_mse",
         "avg_psnr",
         "avg_ssim",
+        "decoded_frames_per_returned_frame",
     ]
     file_paths = []
     for video_codec in tqdm(vcodec, desc="encodings (vcodec)"):
@@ -20,9 +20,14 @@ import torch
 from lerobot.robots.config import RobotConfig
 
 from .constants import (
+    DEFAULT_BATCH_TIMEOUT,
+    DEFAULT_CLIENT_TIMEOUT,
     DEFAULT_FPS,
     DEFAULT_INFERENCE_LATENCY,
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_RECONNECT_DELAY,
     DEFAULT_OBS_QUEUE_TIMEOUT,
+    DEFAULT_RECONNECT_DELAY,
 )
 
 # Aggregate function registry for CLI usage
@@ -64,6 +69,20 @@ class PolicyServerConfig:
         default=DEFAULT_OBS_QUEUE_TIMEOUT, metadata={"help": "Timeout for observation queue in seconds"}
     )
 
+    # Batching configuration, for servers with several clients
+    max_batch_size: int = field(
+        default=DEFAULT_MAX_BATCH_SIZE,
+        metadata={"help": "Maximum number of observations of different clients run in a single forward pass"},
+    )
+    batch_timeout: float = field(
+        default=DEFAULT_BATCH_TIMEOUT,
+        metadata={"help": "Maximum time in seconds an observation waits for others to be batched with"},
+    )
+    client_timeout: float = field(
+        default=DEFAULT_CLIENT_TIMEOUT,
+        metadata={"help": "Time in seconds after which a silent client isn't waited for when batching"},
+    )
+
     def __post_init__(self):
         """Validate configuration after initialization."""
         if self.port < 1 or self.port > 65535:
@@ -78,6 +97,15 @@ class PolicyServerConfig:
         if self.obs_queue_timeout < 0:
             raise ValueError(f"obs_queue_timeout must be non-negative, got {self.obs_queue_timeout}")
 
+        if self.max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {self.max_batch_size}")
+
+        if self.batch_timeout < 0:
+            raise ValueError(f"batch_timeout must be non-negative, got {self.batch_timeout}")
+
+        if self.client_timeout <= 0:
+            raise ValueError(f"client_timeout must be positive, got {self.client_timeout}")
+
     @classmethod
     def from_dict(cls, config_dict: dict) -> "PolicyServerConfig":
         """Create a PolicyServerConfig from a dictionary."""
@@ -96,6 +124,9 @@ class PolicyServerConfig:
             "fps": self.fps,
             "environment_dt": self.environment_dt,
             "inference_latency": self.inference_latency,
+            "max_batch_size": self.max_batch_size,
+            "batch_timeout": self.batch_timeout,
+            "client_timeout": self.client_timeout,
         }
 
 
@@ -123,6 +154,15 @@ class RobotClientConfig:
 
     # Network configuration
     server_address: str = field(default="localhost:8080", metadata={"help": "Server address to connect to"})
+    reconnect_delay: float = field(
+        default=DEFAULT_RECONNECT_DELAY,
+        metadata={
+            "help": "Delay before reconnecting the action stream, doubled after each consecutive failure"
+        },
+    )
+    max_reconnect_delay: float = field(
+        default=DEFAULT_MAX_RECONNECT_DELAY, metadata={"help": "Maximum delay before reconnecting"}
+    )
 
     # Device configuration
     policy_device: str = field(default="cpu", metadata={"help": "Device for policy inference"})
@@ -179,6 +219,15 @@ class RobotClientConfig:
         if self.actions_per_chunk <= 0:
             raise ValueError(f"actions_per_chunk must be positive, got {self.actions_per_chunk}")
 
+        if self.reconnect_delay <= 0:
+            raise ValueError(f"reconnect_delay must be positive, got {self.reconnect_delay}")
+
+        if self.max_reconnect_delay < self.reconnect_delay:
+            raise ValueError(
+                f"max_reconnect_delay must be at least reconnect_delay ({self.reconnect_delay}), "
+                f"got {self.max_reconnect_delay}"
+            )
+
         self.aggregate_fn = get_aggregate_function(self.aggregate_fn_name)
 
     @classmethod
@@ -190,6 +239,8 @@ class RobotClientConfig:
         """Convert the configuration to a dictionary."""
         return {
             "server_address": self.server_address,
+            "reconnect_delay": self.reconnect_delay,
+            "max_reconnect_delay": self.max_reconnect_delay,
             "policy_type": self.policy_type,
             "pretrained_name_or_path": self.pretrained_name_or_path,
             "policy_device": self.policy_device,
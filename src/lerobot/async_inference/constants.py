@@ -22,6 +22,24 @@ DEFAULT_INFERENCE_LATENCY = 1 / DEFAULT_FPS
 """Server side: Timeout for observation queue in seconds"""
 DEFAULT_OBS_QUEUE_TIMEOUT = 2
 
+"""Server side: Maximum number of observations, from different clients, run in a single forward pass"""
+DEFAULT_MAX_BATCH_SIZE = 8
+
+"""Server side: Maximum time in seconds an observation waits for others to be batched with"""
+DEFAULT_BATCH_TIMEOUT = 0.005
+
+"""Server side: Time in seconds after which a silent client isn't waited for when batching observations"""
+DEFAULT_CLIENT_TIMEOUT = 5
+
+"""Client side: Delay in seconds before reconnecting the action stream, doubled after each consecutive failure"""
+DEFAULT_RECONNECT_DELAY = 0.1
+
+"""Client side: Maximum delay in seconds before reconnecting the action stream"""
+DEFAULT_MAX_RECONNECT_DELAY = 5
+
+"""Client and server side: gRPC metadata key of the id identifying a robot client across its calls and reconnections"""
+CLIENT_ID_METADATA_KEY = "lerobot-client-id"
+
 # All action chunking policies
 SUPPORTED_POLICIES = ["act", "smolvla", "diffusion", "tdmpc", "vqbet", "pi0", "pi05", "groot"]
 
@@ -15,9 +15,12 @@
 import logging
 import logging.handlers
 import os
+import threading
 import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from pathlib import Path
+from queue import Empty
 from typing import Any
 
 import torch
@@ -234,6 +237,121 @@ class TimedObservation(TimedData):
         return self.observation
 
 
+class TimedActionQueue:
+    """Thread-safe queue of the actions to perform, with consecutive timesteps.
+
+    The actions are stored in a ring buffer, a preallocated `(capacity, action_dim)` tensor where the action of
+    timestep `t` is at row `t % capacity`. Merging an incoming chunk with the queued actions is then a single
+    vectorized `aggregate_fn` call on the overlapping timesteps, and popping an action only reads a row, so the
+    lock is never held for long by either the action receiver or the control loop.
+
+    Args:
+        capacity: Initial number of rows of the ring buffer, grown if a larger chunk is merged.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.actions: torch.Tensor | None = None
+        self.timestamps: torch.Tensor | None = None
+        # The queue holds the actions of timesteps [start, end)
+        self.start = 0
+        self.end = 0
+        self.lock = threading.Lock()
+
+    def qsize(self) -> int:
+        return self.end - self.start
+
+    def empty(self) -> bool:
+        return self.end <= self.start
+
+    def timesteps(self) -> list[int]:
+        """Timesteps of the queued actions, in order."""
+        with self.lock:
+            return list(range(self.start, self.end))
+
+    def get_nowait(self) -> TimedAction:
+        """Pop the action of the earliest timestep. Raises `queue.Empty` if there are no actions."""
+        with self.lock:
+            if self.end <= self.start:
+                raise Empty
+            timestep = self.start
+            row = timestep % self.capacity
+            action = self.actions[row].clone()
+            timestamp = self.timestamps[row].item()
+            self.start += 1
+        return TimedAction(timestamp=timestamp, timestep=timestep, action=action)
+
+    def merge(
+        self,
+        incoming_actions: list[TimedAction],
+        latest_action: int,
+        aggregate_fn: Callable[[torch.Tensor, torch.Tensor], torch.Tensor],
+    ):
+        """Replace the queue with the incoming actions more recent than `latest_action`.
+
+        On the timesteps already in the queue, the actions are `aggregate_fn(queued, incoming)`, computed for all
+        the overlapping timesteps at once, so `aggregate_fn` must broadcast over a leading timestep dimension.
+        """
+        if incoming_actions:
+            first_timestep = incoming_actions[0].get_timestep()
+            timesteps = [action.get_timestep() for action in incoming_actions]
+            if timesteps != list(range(first_timestep, first_timestep + len(timesteps))):
+                raise ValueError(f"Action chunks must have consecutive timesteps, got {timesteps}")
+        else:
+            first_timestep = latest_action + 1
+
+        # Actions older than the latest performed action are skipped
+        num_skipped = max(0, latest_action + 1 - first_timestep)
+        incoming_actions = incoming_actions[num_skipped:]
+        start = first_timestep + num_skipped
+        end = start + len(incoming_actions)
+        if not incoming_actions:
+            with self.lock:
+                self.start = self.end = end
+            return
+
+        actions = torch.stack([action.get_action() for action in incoming_actions])
+        timestamps = torch.tensor(
+            [action.get_timestamp() for action in incoming_actions], dtype=torch.float64
+        )
+
+        with self.lock:
+            self._reserve(actions)
+            rows = torch.arange(start, end) % self.capacity
+
+            overlap_start, overlap_end = max(start, self.start), min(end, self.end)
+            if overlap_start < overlap_end:
+                overlap = slice(overlap_start - start, overlap_end - start)
+                actions[overlap] = aggregate_fn(self.actions[rows[overlap]], actions[overlap])
+
+            self.actions[rows] = actions
+            self.timestamps[rows] = timestamps
+            self.start, self.end = start, end
+
+    def _reserve(self, actions: torch.Tensor):
+        """(Re)allocate the ring buffer if `actions` don't fit in it, keeping the queued actions."""
+        if (
+            self.actions is not None
+            and len(actions) <= self.capacity
+            and self.actions.shape[1:] == actions.shape[1:]
+            and self.actions.dtype == actions.dtype
+            and self.actions.device == actions.device
+        ):
+            return
+
+        capacity = max(self.capacity, len(actions))
+        buffer = actions.new_zeros((capacity, *actions.shape[1:]))
+        timestamps = torch.zeros(capacity, dtype=torch.float64)
+        if self.actions is not None and self.actions.shape[1:] == actions.shape[1:]:
+            queued = torch.arange(self.start, self.end)
+            buffer[queued % capacity] = self.actions[queued % self.capacity].to(buffer)
+            timestamps[queued % capacity] = self.timestamps[queued % self.capacity]
+        else:
+            self.start = self.end = 0
+
+        self.capacity, self.actions, self.timestamps = capacity, buffer, timestamps
+
+
 @dataclass
 class FPSTracker:
     """Utility class to track FPS metrics over time."""
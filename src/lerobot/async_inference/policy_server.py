@@ -20,8 +20,13 @@ python -m lerobot.async_inference.policy_server \
      --port=8080 \
      --fps=30 \
      --inference_latency=0.033 \
-     --obs_queue_timeout=1
+     --obs_queue_timeout=1 \
+     --max_batch_size=8 \
+     --batch_timeout=0.005
 ```
+
+Several robot clients can connect to the same server: they share the policy, and their observations are run
+through it in batches of up to `max_batch_size` observations.
 """
 
 import logging
@@ -29,7 +34,7 @@ import pickle  # nosec
 import threading
 import time
 from concurrent import futures
-from dataclasses import asdict
+from dataclasses import asdict, dataclass, field
 from pprint import pformat
 from queue import Empty, Queue
 from typing import Any
@@ -47,10 +52,10 @@ from lerobot.transport import (
     services_pb2,  # type: ignore
     services_pb2_grpc,  # type: ignore
 )
-from lerobot.transport.utils import receive_bytes_in_chunks
+from lerobot.transport.utils import bytes_to_tensors, receive_bytes_in_chunks, tensors_to_bytes
 
 from .configs import PolicyServerConfig
-from .constants import SUPPORTED_POLICIES
+from .constants import CLIENT_ID_METADATA_KEY, SUPPORTED_POLICIES
 from .helpers import (
     FPSTracker,
     Observation,
@@ -63,6 +68,51 @@ from .helpers import (
 )
 
 
+@dataclass
+class ClientState:
+    """State of one robot client, identified by the id it sends in the metadata of its calls."""
+
+    fps_tracker: FPSTracker
+    # Only running inference on the latest observation received from the client
+    observation_queue: Queue = field(default_factory=lambda: Queue(maxsize=1))
+    predicted_timesteps: set[int] = field(default_factory=set)
+    predicted_timesteps_lock: threading.Lock = field(default_factory=threading.Lock)
+    last_processed_obs: TimedObservation | None = None
+    # Last time the client called the server, clients silent for `client_timeout` aren't waited for by batches
+    last_seen: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class InferenceRequest:
+    """An observation waiting to be batched with the observations of other clients."""
+
+    client_id: str
+    observation: TimedObservation
+    future: futures.Future = field(default_factory=futures.Future)
+    enqueue_time: float = field(default_factory=time.perf_counter)
+
+
+def stack_observations(observations: list[Observation]) -> Observation:
+    """Concatenate preprocessed observations along their batch dimension.
+
+    Raises a ValueError if the observations can't be stacked, e.g. because of images of different sizes.
+    """
+    batch = {}
+    for key, value in observations[0].items():
+        values = [observation[key] for observation in observations]
+        if isinstance(value, torch.Tensor):
+            if value.ndim == 0 or any(v.shape[1:] != value.shape[1:] for v in values):
+                raise ValueError(f"Can't stack '{key}' of shapes {[tuple(v.shape) for v in values]}.")
+            batch[key] = torch.cat(values, dim=0)
+        elif isinstance(value, list):
+            batch[key] = [item for v in values for item in v]
+        elif all(v == value for v in values):
+            batch[key] = value
+        else:
+            raise ValueError(f"Can't stack '{key}' with different values {values}.")
+    return batch
+
+
 class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
     prefix = "policy_server"
     logger = get_logger(prefix)
@@ -71,19 +121,21 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         self.config = config
         self.shutdown_event = threading.Event()
 
-        # FPS measurement
-        self.fps_tracker = FPSTracker(target_fps=config.fps)
-
-        self.observation_queue = Queue(maxsize=1)
-
-        self._predicted_timesteps_lock = threading.Lock()
-        self._predicted_timesteps = set()
-
-        self.last_processed_obs = None
+        # Per client observations and predictions, observations of several clients are batched together
+        self.clients: dict[str, ClientState] = {}
+        # Number of open action streams per client, a reconnecting client can briefly have two
+        self._num_streams: dict[str, int] = {}
+        self._clients_lock = threading.Lock()
+        self._inference_requests: Queue[InferenceRequest] = Queue()
+        self._batching_thread: threading.Thread | None = None
+        self._batching_thread_lock = threading.Lock()
+        self._batching_stats_lock = threading.Lock()
+        self.reset_batching_stats()
 
         # Attributes will be set by SendPolicyInstructions
         self.device = None
         self.policy_type = None
+        self.policy_specs = None
         self.lerobot_features = None
         self.actions_per_chunk = None
         self.policy = None
@@ -98,19 +150,54 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
     def policy_image_features(self):
         return self.policy.config.image_features
 
+    @staticmethod
+    def _get_client_id(context) -> str:
+        """Id sent by the client with its calls, falling back to its gRPC peer for clients not sending one."""
+        return dict(context.invocation_metadata()).get(CLIENT_ID_METADATA_KEY) or context.peer()
+
+    def _get_client(self, client_id: str) -> ClientState:
+        with self._clients_lock:
+            if client_id not in self.clients:
+                self.clients[client_id] = ClientState(fps_tracker=FPSTracker(target_fps=self.config.fps))
+            client = self.clients[client_id]
+            client.last_seen = time.perf_counter()
+            return client
+
+    def _open_stream(self, client_id: str) -> None:
+        with self._clients_lock:
+            self._num_streams[client_id] = self._num_streams.get(client_id, 0) + 1
+
+    def _drop_client(self, client_id: str) -> None:
+        """Forgets a client when its last action stream closes, unless it opened a new one in the meantime."""
+        with self._clients_lock:
+            num_streams = self._num_streams.pop(client_id, 1) - 1
+            if num_streams > 0:
+                self._num_streams[client_id] = num_streams
+            else:
+                self.clients.pop(client_id, None)
+
+    def _num_active_clients(self) -> int:
+        """Number of clients which called the server in the last `client_timeout` seconds. The state of a
+        polling client which stopped polling isn't counted once it times out."""
+        min_last_seen = time.perf_counter() - self.config.client_timeout
+        with self._clients_lock:
+            return sum(client.last_seen >= min_last_seen for client in self.clients.values())
+
+    def _reset_client(self, client_id: str) -> None:
+        """Flushes the state of a client when it (re)connects, without affecting the other clients."""
+        with self._clients_lock:
+            self.clients[client_id] = ClientState(fps_tracker=FPSTracker(target_fps=self.config.fps))
+
     def _reset_server(self) -> None:
-        """Flushes server state when new client connects."""
-        # only running inference on the latest observation received by the server
+        """Flushes server state, for all the clients."""
         self.shutdown_event.set()
-        self.observation_queue = Queue(maxsize=1)
-
-        with self._predicted_timesteps_lock:
-            self._predicted_timesteps = set()
+        with self._clients_lock:
+            self.clients = {}
 
     def Ready(self, request, context):  # noqa: N802
-        client_id = context.peer()
+        client_id = self._get_client_id(context)
         self.logger.info(f"Client {client_id} connected and ready")
-        self._reset_server()
+        self._reset_client(client_id)
         self.shutdown_event.clear()
 
         return services_pb2.Empty()
@@ -122,7 +209,7 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             self.logger.warning("Server is not running. Ignoring policy instructions.")
             return services_pb2.Empty()
 
-        client_id = context.peer()
+        client_id = self._get_client_id(context)
 
         policy_specs = pickle.loads(request.data)  # nosec
 
@@ -143,6 +230,16 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             f"Device: {policy_specs.device}"
         )
 
+        # The policy is shared by all the clients, so that their observations can be batched together
+        if self.policy is not None and policy_specs == self.policy_specs:
+            self.logger.info(f"Policy already loaded, client {client_id} shares it with the other clients")
+            return services_pb2.Empty()
+        if self.policy is not None and len(self.clients) > 1:
+            self.logger.warning(
+                f"Client {client_id} requested a different policy, which replaces the policy of the other clients"
+            )
+
+        self.policy_specs = policy_specs
         self.device = policy_specs.device
         self.policy_type = policy_specs.policy_type  # act, pi0, etc.
         self.lerobot_features = policy_specs.lerobot_features
@@ -174,7 +271,7 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
 
     def SendObservations(self, request_iterator, context):  # noqa: N802
         """Receive observations from the robot client"""
-        client_id = context.peer()
+        client_id = self._get_client_id(context)
         self.logger.debug(f"Receiving observations from {client_id}")
 
         receive_time = time.time()  # comparing timestamps so need time.time()
@@ -182,16 +279,17 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         received_bytes = receive_bytes_in_chunks(
             request_iterator, None, self.shutdown_event, self.logger
         )  # blocking call while looping over request_iterator
-        timed_observation = pickle.loads(received_bytes)  # nosec
+        timed_observation = bytes_to_tensors(received_bytes, dataclass_types=[TimedObservation])
         deserialize_time = time.perf_counter() - start_deserialize
 
         self.logger.debug(f"Received observation #{timed_observation.get_timestep()}")
 
         obs_timestep = timed_observation.get_timestep()
         obs_timestamp = timed_observation.get_timestamp()
+        client = self._get_client(client_id)
 
         # Calculate FPS metrics
-        fps_metrics = self.fps_tracker.calculate_fps_metrics(obs_timestamp)
+        fps_metrics = client.fps_tracker.calculate_fps_metrics(obs_timestamp)
 
         self.logger.debug(
             f"Received observation #{obs_timestep} | "
@@ -207,7 +305,8 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         )
 
         if not self._enqueue_observation(
-            timed_observation  # wrapping a RawObservation
+            timed_observation,  # wrapping a RawObservation
+            client,
         ):
             self.logger.debug(f"Observation #{obs_timestep} has been filtered out")
 
@@ -216,61 +315,92 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
     def GetActions(self, request, context):  # noqa: N802
         """Returns actions to the robot client. Actions are sent as a single
         chunk, containing multiple actions."""
-        client_id = context.peer()
-        self.logger.debug(f"Client {client_id} connected for action streaming")
+        client_id = self._get_client_id(context)
+        self.logger.debug(f"Client {client_id} connected for action polling")
+        client = self._get_client(client_id)
 
-        # Generate action based on the most recent observation and its timestep
         try:
-            getactions_starts = time.perf_counter()
-            obs = self.observation_queue.get(timeout=self.config.obs_queue_timeout)
-            self.logger.info(
-                f"Running inference for observation #{obs.get_timestep()} (must_go: {obs.must_go})"
-            )
-
-            with self._predicted_timesteps_lock:
-                self._predicted_timesteps.add(obs.get_timestep())
-
-            start_time = time.perf_counter()
-            action_chunk = self._predict_action_chunk(obs)
-            inference_time = time.perf_counter() - start_time
+            return self._next_action_chunk(client_id, client)
 
-            start_time = time.perf_counter()
-            actions_bytes = pickle.dumps(action_chunk)  # nosec
-            serialize_time = time.perf_counter() - start_time
+        except Empty:  # no observation added to queue in obs_queue_timeout
+            return services_pb2.Empty()
 
-            # Create and return the action chunk
-            actions = services_pb2.Actions(data=actions_bytes)
+        except Exception as e:
+            self.logger.error(f"Error in GetActions: {e}")
 
-            self.logger.info(
-                f"Action chunk #{obs.get_timestep()} generated | "
-                f"Total time: {(inference_time + serialize_time) * 1000:.2f}ms"
-            )
+            return services_pb2.Empty()
 
-            self.logger.debug(
-                f"Action chunk #{obs.get_timestep()} generated | "
-                f"Inference time: {inference_time:.2f}s |"
-                f"Serialize time: {serialize_time:.2f}s |"
-                f"Total time: {inference_time + serialize_time:.2f}s"
-            )
+    def StreamActions(self, request, context):  # noqa: N802
+        """Streams actions to the robot client, pushing each action chunk as soon as it is
+        predicted instead of waiting for the client to poll for it."""
+        client_id = self._get_client_id(context)
+        self.logger.info(f"Client {client_id} connected for action streaming")
+        self._open_stream(client_id)
 
-            time.sleep(
-                max(0, self.config.inference_latency - max(0, time.perf_counter() - getactions_starts))
-            )  # sleep controls inference latency
+        try:
+            while self.running and context.is_active():
+                # The client is connected as long as its stream is open. Its state is fetched again on every
+                # iteration, in case the client called `Ready` again and reset it
+                client = self._get_client(client_id)
+                try:
+                    yield self._next_action_chunk(client_id, client)
+
+                except Empty:  # no observation added to queue in obs_queue_timeout, keep waiting
+                    continue
+
+                except Exception as e:
+                    self.logger.error(f"Error in StreamActions: {e}")
+        finally:
+            # Also run when the client cancels the stream, so that the batches stop waiting for it
+            self._drop_client(client_id)
+            self.logger.info(f"Action stream of client {client_id} closed")
+
+    def _next_action_chunk(self, client_id: str, client: ClientState) -> services_pb2.Actions:
+        """Run inference on the next observation queued by the client and return the action chunk.
+        Raises `queue.Empty` if no observation is queued within `obs_queue_timeout`."""
+        getactions_starts = time.perf_counter()
+        obs = client.observation_queue.get(timeout=self.config.obs_queue_timeout)
+        self.logger.info(f"Running inference for observation #{obs.get_timestep()} (must_go: {obs.must_go})")
+
+        with client.predicted_timesteps_lock:
+            client.predicted_timesteps.add(obs.get_timestep())
+        client.last_processed_obs = obs
+
+        start_time = time.perf_counter()
+        action_chunk = self._submit_inference(client_id, obs).result()
+        inference_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        actions_bytes = tensors_to_bytes(action_chunk)
+        serialize_time = time.perf_counter() - start_time
+
+        # Create and return the action chunk
+        actions = services_pb2.Actions(data=actions_bytes)
 
-            return actions
+        self.logger.info(
+            f"Action chunk #{obs.get_timestep()} generated | "
+            f"Total time: {(inference_time + serialize_time) * 1000:.2f}ms"
+        )
 
-        except Empty:  # no observation added to queue in obs_queue_timeout
-            return services_pb2.Empty()
+        self.logger.debug(
+            f"Action chunk #{obs.get_timestep()} generated | "
+            f"Inference time: {inference_time:.2f}s |"
+            f"Serialize time: {serialize_time:.2f}s |"
+            f"Total time: {inference_time + serialize_time:.2f}s"
+        )
 
-        except Exception as e:
-            self.logger.error(f"Error in StreamActions: {e}")
+        time.sleep(
+            max(0, self.config.inference_latency - max(0, time.perf_counter() - getactions_starts))
+        )  # sleep controls inference latency
 
-            return services_pb2.Empty()
+        return actions
 
-    def _obs_sanity_checks(self, obs: TimedObservation, previous_obs: TimedObservation) -> bool:
+    def _obs_sanity_checks(
+        self, obs: TimedObservation, previous_obs: TimedObservation, client: ClientState
+    ) -> bool:
         """Check if the observation is valid to be processed by the policy"""
-        with self._predicted_timesteps_lock:
-            predicted_timesteps = self._predicted_timesteps
+        with client.predicted_timesteps_lock:
+            predicted_timesteps = client.predicted_timesteps
 
         if obs.get_timestep() in predicted_timesteps:
             self.logger.debug(f"Skipping observation #{obs.get_timestep()} - Timestep predicted already!")
@@ -285,32 +415,123 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         else:
             return True
 
-    def _enqueue_observation(self, obs: TimedObservation) -> bool:
-        """Enqueue an observation if it must go through processing, otherwise skip it.
+    def _enqueue_observation(self, obs: TimedObservation, client: ClientState) -> bool:
+        """Enqueue an observation of a client if it must go through processing, otherwise skip it.
         Observations not in queue are never run through the policy network"""
 
         if (
             obs.must_go
-            or self.last_processed_obs is None
-            or self._obs_sanity_checks(obs, self.last_processed_obs)
+            or client.last_processed_obs is None
+            or self._obs_sanity_checks(obs, client.last_processed_obs, client)
         ):
-            last_obs = self.last_processed_obs.get_timestep() if self.last_processed_obs else "None"
+            last_obs = client.last_processed_obs.get_timestep() if client.last_processed_obs else "None"
             self.logger.debug(
                 f"Enqueuing observation. Must go: {obs.must_go} | Last processed obs: {last_obs}"
             )
 
             # If queue is full, get the old observation to make room
-            if self.observation_queue.full():
+            if client.observation_queue.full():
                 # pops from queue
-                _ = self.observation_queue.get_nowait()
+                _ = client.observation_queue.get_nowait()
                 self.logger.debug("Observation queue was full, removed oldest observation")
 
             # Now put the new observation (never blocks as queue is non-full here)
-            self.observation_queue.put(obs)
+            client.observation_queue.put(obs)
             return True
 
         return False
 
+    def _submit_inference(self, client_id: str, obs: TimedObservation) -> futures.Future:
+        """Queue an observation for the batching thread, returning a future of its action chunk."""
+        if not self.running:
+            raise RuntimeError("The policy server is stopped.")
+        with self._batching_thread_lock:
+            if self._batching_thread is None or not self._batching_thread.is_alive():
+                self._batching_thread = threading.Thread(
+                    target=self._batching_loop, name="policy_server_batching", daemon=True
+                )
+                self._batching_thread.start()
+        request = InferenceRequest(client_id=client_id, observation=obs)
+        self._inference_requests.put(request)
+        return request.future
+
+    def _batching_loop(self) -> None:
+        """Run the queued observations through the policy, in batches.
+
+        A batch is closed when it holds `max_batch_size` observations or one observation of every active client
+        (see `_num_active_clients`), or `batch_timeout` seconds after its first observation was queued.
+        """
+        while self.running:
+            try:
+                requests = [self._inference_requests.get(timeout=0.1)]
+            except Empty:
+                continue
+
+            deadline = requests[0].enqueue_time + self.config.batch_timeout
+            while len(requests) < min(self.config.max_batch_size, max(1, self._num_active_clients())):
+                try:
+                    requests.append(
+                        self._inference_requests.get(timeout=max(0, deadline - time.perf_counter()))
+                    )
+                except Empty:
+                    break
+
+            self._run_batch(requests)
+
+        # Don't leave the clients waiting for observations which won't be run
+        while True:
+            try:
+                request = self._inference_requests.get_nowait()
+            except Empty:
+                break
+            request.future.set_exception(RuntimeError("The policy server is stopped."))
+
+    def _run_batch(self, requests: list[InferenceRequest]) -> None:
+        start = time.perf_counter()
+        try:
+            action_chunks = self._predict_action_chunks([request.observation for request in requests])
+        except Exception as e:
+            for request in requests:
+                request.future.set_exception(e)
+            return
+
+        for request, action_chunk in zip(requests, action_chunks, strict=True):
+            request.future.set_result(action_chunk)
+
+        queue_delays = [start - request.enqueue_time for request in requests]
+        with self._batching_stats_lock:
+            self._num_batches += 1
+            self._num_batched_observations += len(requests)
+            self._max_batch_size = max(self._max_batch_size, len(requests))
+            self._total_queue_delay += sum(queue_delays)
+            self._max_queue_delay = max(self._max_queue_delay, *queue_delays)
+        self.logger.debug(
+            f"Batch of {len(requests)} observations from {[request.client_id for request in requests]} | "
+            f"Max added latency: {1000 * max(queue_delays):.2f}ms | "
+            f"Inference time: {1000 * (time.perf_counter() - start):.2f}ms"
+        )
+
+    def get_batching_stats(self) -> dict[str, float]:
+        """Return the batch sizes and the latency added by batching, since the start or `reset_batching_stats`."""
+        with self._batching_stats_lock:
+            num_batches = max(1, self._num_batches)
+            num_observations = max(1, self._num_batched_observations)
+            return {
+                "num_batches": self._num_batches,
+                "avg_batch_size": self._num_batched_observations / num_batches,
+                "max_batch_size": self._max_batch_size,
+                "avg_queue_delay_ms": 1000 * self._total_queue_delay / num_observations,
+                "max_queue_delay_ms": 1000 * self._max_queue_delay,
+            }
+
+    def reset_batching_stats(self) -> None:
+        with self._batching_stats_lock:
+            self._num_batches = 0
+            self._num_batched_observations = 0
+            self._max_batch_size = 0
+            self._total_queue_delay = 0.0
+            self._max_queue_delay = 0.0
+
     def _time_action_chunk(self, t_0: float, action_chunk: list[torch.Tensor], i_0: int) -> list[TimedAction]:
         """Turn a chunk of actions into a list of TimedAction instances,
         with the first action corresponding to t_0 and the rest corresponding to
@@ -329,82 +550,98 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
 
         return chunk[:, : self.actions_per_chunk, :]
 
+    def _postprocess_action_chunk(self, action_tensor: torch.Tensor) -> torch.Tensor:
+        """Run the postprocessor once on an action chunk of shape (B, chunk_size, action_dim).
+
+        Postprocessor steps work on batches of single actions of shape (N, action_dim), e.g. unnormalization
+        broadcasts its stats over the last dimension. The chunk is flattened to (B * chunk_size, action_dim)
+        rather than postprocessing each timestep separately.
+        """
+        batch_size, chunk_size, _ = action_tensor.shape
+        actions = self.postprocessor(action_tensor.reshape(batch_size * chunk_size, -1))
+        return actions.reshape(batch_size, chunk_size, -1)
+
     def _predict_action_chunk(self, observation_t: TimedObservation) -> list[TimedAction]:
-        """Predict an action chunk based on an observation.
+        """Predict an action chunk based on a single observation, see `_predict_action_chunks`."""
+        return self._predict_action_chunks([observation_t])[0]
+
+    def _predict_action_chunks(self, observations_t: list[TimedObservation]) -> list[list[TimedAction]]:
+        """Predict the action chunks of observations of (possibly) different clients, in a single forward pass.
 
         Pipeline:
-        1. Convert raw observation to LeRobot format
-        2. Apply preprocessor (tokenization, normalization, batching, device placement)
-        3. Run policy inference to get action chunk
+        1. Convert raw observations to LeRobot format
+        2. Apply preprocessor (tokenization, normalization, batching, device placement) to each observation
+        3. Stack the observations and run policy inference to get the action chunks
         4. Apply postprocessor (unnormalization, device movement)
-        5. Convert to TimedAction list
+        5. Split the action chunks and convert them to TimedAction lists
         """
-        """1. Prepare observation"""
+        """1. Prepare observations"""
         start_prepare = time.perf_counter()
-        observation: Observation = raw_observation_to_observation(
-            observation_t.get_observation(),
-            self.lerobot_features,
-            self.policy_image_features,
-        )
+        observations: list[Observation] = [
+            raw_observation_to_observation(
+                observation_t.get_observation(),
+                self.lerobot_features,
+                self.policy_image_features,
+            )
+            for observation_t in observations_t
+        ]
         prepare_time = time.perf_counter() - start_prepare
 
         """2. Apply preprocessor"""
         start_preprocess = time.perf_counter()
-        observation = self.preprocessor(observation)
-        self.last_processed_obs: TimedObservation = observation_t
+        observations = [self.preprocessor(observation) for observation in observations]
         preprocessing_time = time.perf_counter() - start_preprocess
 
-        """3. Get action chunk"""
+        """3. Get action chunks"""
         start_inference = time.perf_counter()
-        action_tensor = self._get_action_chunk(observation)
+        try:
+            batch = stack_observations(observations) if len(observations) > 1 else observations[0]
+        except ValueError as e:
+            self.logger.warning(f"Running {len(observations)} observations one by one: {e}")
+            action_tensor = torch.cat([self._get_action_chunk(observation) for observation in observations])
+        else:
+            action_tensor = self._get_action_chunk(batch)
         inference_time = time.perf_counter() - start_inference
         self.logger.info(
             f"Preprocessing and inference took {inference_time:.4f}s, action shape: {action_tensor.shape}"
         )
 
         """4. Apply postprocessor"""
-        # Apply postprocessor (handles unnormalization and device movement)
-        # Postprocessor expects (B, action_dim) per action, but we have (B, chunk_size, action_dim)
-        # So we process each action in the chunk individually
+        # Apply postprocessor (handles unnormalization and device movement), once for the whole chunk
         start_postprocess = time.perf_counter()
-        _, chunk_size, _ = action_tensor.shape
-
-        # Process each action in the chunk
-        processed_actions = []
-        for i in range(chunk_size):
-            # Extract action at timestep i: (B, action_dim)
-            single_action = action_tensor[:, i, :]
-            processed_action = self.postprocessor(single_action)
-            processed_actions.append(processed_action)
-
-        # Stack back to (B, chunk_size, action_dim), then remove batch dim
-        action_tensor = torch.stack(processed_actions, dim=1).squeeze(0)
+        action_tensor = self._postprocess_action_chunk(action_tensor)
         self.logger.debug(f"Postprocessed action shape: {action_tensor.shape}")
 
         action_tensor = action_tensor.detach().cpu()
+        postprocessing_time = time.perf_counter() - start_postprocess
 
-        """5. Convert to TimedAction list"""
-        action_chunk = self._time_action_chunk(
-            observation_t.get_timestamp(), list(action_tensor), observation_t.get_timestep()
-        )
+        """5. Convert to TimedAction lists"""
+        start_conversion = time.perf_counter()
+        action_chunks = [
+            self._time_action_chunk(
+                observation_t.get_timestamp(), list(client_actions), observation_t.get_timestep()
+            )
+            for observation_t, client_actions in zip(observations_t, action_tensor, strict=True)
+        ]
         postprocess_stops = time.perf_counter()
-        postprocessing_time = postprocess_stops - start_postprocess
+        conversion_time = postprocess_stops - start_conversion
 
+        timesteps = [observation_t.get_timestep() for observation_t in observations_t]
         self.logger.info(
-            f"Observation {observation_t.get_timestep()} | "
-            f"Total time: {1000 * (postprocess_stops - start_prepare):.2f}ms"
+            f"Observations {timesteps} | Total time: {1000 * (postprocess_stops - start_prepare):.2f}ms"
         )
 
         self.logger.debug(
-            f"Observation {observation_t.get_timestep()} | "
+            f"Observations {timesteps} | "
             f"Prepare time: {1000 * prepare_time:.2f}ms | "
             f"Preprocessing time: {1000 * preprocessing_time:.2f}ms | "
             f"Inference time: {1000 * inference_time:.2f}ms | "
             f"Postprocessing time: {1000 * postprocessing_time:.2f}ms | "
+            f"Conversion time: {1000 * conversion_time:.2f}ms | "
             f"Total time: {1000 * (postprocess_stops - start_prepare):.2f}ms"
         )
 
-        return action_chunk
+        return action_chunks
 
     def stop(self):
         """Stop the server"""
@@ -425,7 +662,8 @@ def serve(cfg: PolicyServerConfig):
     policy_server = PolicyServer(cfg)
 
     # Setup and start gRPC server
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    # Each client has up to two concurrent calls: GetActions (waiting for its batch) and SendObservations
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max(4, 2 * cfg.max_batch_size)))
     services_pb2_grpc.add_AsyncInferenceServicer_to_server(policy_server, server)
     server.add_insecure_port(f"{cfg.host}:{cfg.port}")
 
@@ -37,10 +37,10 @@ import logging
 import pickle  # nosec
 import threading
 import time
+import uuid
 from collections.abc import Callable
 from dataclasses import asdict
 from pprint import pformat
-from queue import Queue
 from typing import Any
 
 import draccus
@@ -62,10 +62,15 @@ from lerobot.transport import (
     services_pb2,  # type: ignore
     services_pb2_grpc,  # type: ignore
 )
-from lerobot.transport.utils import grpc_channel_options, send_bytes_in_chunks
+from lerobot.transport.utils import (
+    bytes_to_tensors,
+    grpc_channel_options,
+    send_bytes_in_chunks,
+    tensors_to_buffers,
+)
 
 from .configs import RobotClientConfig
-from .constants import SUPPORTED_ROBOTS
+from .constants import CLIENT_ID_METADATA_KEY, SUPPORTED_ROBOTS
 from .helpers import (
     Action,
     FPSTracker,
@@ -73,6 +78,7 @@ from .helpers import (
     RawObservation,
     RemotePolicyConfig,
     TimedAction,
+    TimedActionQueue,
     TimedObservation,
     get_logger,
     map_robot_keys_to_lerobot_features,
@@ -111,7 +117,12 @@ class RobotClient:
             self.server_address, grpc_channel_options(initial_backoff=f"{config.environment_dt:.4f}s")
         )
         self.stub = services_pb2_grpc.AsyncInferenceStub(self.channel)
-        self.logger.info(f"Initializing client to connect to server at {self.server_address}")
+        # Sent with every call, so that the server keeps the state of this client across its reconnections
+        self.client_id = uuid.uuid4().hex
+        self.metadata = ((CLIENT_ID_METADATA_KEY, self.client_id),)
+        self.logger.info(
+            f"Initializing client {self.client_id} to connect to server at {self.server_address}"
+        )
 
         self.shutdown_event = threading.Event()
 
@@ -122,8 +133,7 @@ class RobotClient:
 
         self._chunk_size_threshold = config.chunk_size_threshold
 
-        self.action_queue = Queue()
-        self.action_queue_lock = threading.Lock()  # Protect queue operations
+        self.action_queue = TimedActionQueue(capacity=config.actions_per_chunk)
         self.action_queue_size = []
         self.start_barrier = threading.Barrier(2)  # 2 threads: action receiver, control loop
 
@@ -145,7 +155,7 @@ class RobotClient:
         try:
             # client-server handshake
             start_time = time.perf_counter()
-            self.stub.Ready(services_pb2.Empty())
+            self.stub.Ready(services_pb2.Empty(), metadata=self.metadata)
             end_time = time.perf_counter()
             self.logger.debug(f"Connected to policy server in {end_time - start_time:.4f}s")
 
@@ -160,7 +170,7 @@ class RobotClient:
                 f"Device: {self.policy_config.device}"
             )
 
-            self.stub.SendPolicyInstructions(policy_setup)
+            self.stub.SendPolicyInstructions(policy_setup, metadata=self.metadata)
 
             self.shutdown_event.clear()
 
@@ -193,18 +203,18 @@ class RobotClient:
             raise ValueError("Input observation needs to be a TimedObservation!")
 
         start_time = time.perf_counter()
-        observation_bytes = pickle.dumps(obs)
+        observation_buffers = tensors_to_buffers(obs)
         serialize_time = time.perf_counter() - start_time
         self.logger.debug(f"Observation serialization time: {serialize_time:.6f}s")
 
         try:
             observation_iterator = send_bytes_in_chunks(
-                observation_bytes,
+                observation_buffers,
                 services_pb2.Observation,
                 log_prefix="[CLIENT] Observation",
                 silent=True,
             )
-            _ = self.stub.SendObservations(observation_iterator)
+            _ = self.stub.SendObservations(observation_iterator, metadata=self.metadata)
             obs_timestep = obs.get_timestep()
             self.logger.debug(f"Sent observation #{obs_timestep} | ")
 
@@ -215,9 +225,8 @@ class RobotClient:
             return False
 
     def _inspect_action_queue(self):
-        with self.action_queue_lock:
-            queue_size = self.action_queue.qsize()
-            timestamps = sorted([action.get_timestep() for action in self.action_queue.queue])
+        timestamps = self.action_queue.timesteps()
+        queue_size = len(timestamps)
         self.logger.debug(f"Queue size: {queue_size}, Queue contents: {timestamps}")
         return queue_size, timestamps
 
@@ -232,39 +241,10 @@ class RobotClient:
             def aggregate_fn(x1, x2):
                 return x2
 
-        future_action_queue = Queue()
-        with self.action_queue_lock:
-            internal_queue = self.action_queue.queue
-
-        current_action_queue = {action.get_timestep(): action.get_action() for action in internal_queue}
-
-        for new_action in incoming_actions:
-            with self.latest_action_lock:
-                latest_action = self.latest_action
-
-            # New action is older than the latest action in the queue, skip it
-            if new_action.get_timestep() <= latest_action:
-                continue
-
-            # If the new action's timestep is not in the current action queue, add it directly
-            elif new_action.get_timestep() not in current_action_queue:
-                future_action_queue.put(new_action)
-                continue
-
-            # If the new action's timestep is in the current action queue, aggregate it
-            # TODO: There is probably a way to do this with broadcasting of the two action tensors
-            future_action_queue.put(
-                TimedAction(
-                    timestamp=new_action.get_timestamp(),
-                    timestep=new_action.get_timestep(),
-                    action=aggregate_fn(
-                        current_action_queue[new_action.get_timestep()], new_action.get_action()
-                    ),
-                )
-            )
+        with self.latest_action_lock:
+            latest_action = self.latest_action
 
-        with self.action_queue_lock:
-            self.action_queue = future_action_queue
+        self.action_queue.merge(incoming_actions, latest_action, aggregate_fn)
 
     def receive_actions(self, verbose: bool = False):
         """Receive actions from the policy server"""
@@ -272,96 +252,125 @@ class RobotClient:
         self.start_barrier.wait()
         self.logger.info("Action receiving thread starting")
 
+        # Action chunks are pushed by the server as soon as they are predicted. Servers that don't implement
+        # StreamActions are polled with GetActions instead.
+        stream_actions = True
+        reconnect_delay = self.config.reconnect_delay
         while self.running:
             try:
-                # Use StreamActions to get a stream of actions from the server
-                actions_chunk = self.stub.GetActions(services_pb2.Empty())
-                if len(actions_chunk.data) == 0:
-                    continue  # received `Empty` from server, wait for next call
-
-                receive_time = time.time()
-
-                # Deserialize bytes back into list[TimedAction]
-                deserialize_start = time.perf_counter()
-                timed_actions = pickle.loads(actions_chunk.data)  # nosec
-                deserialize_time = time.perf_counter() - deserialize_start
-
-                # Log device type of received actions
-                if len(timed_actions) > 0:
-                    received_device = timed_actions[0].get_action().device.type
-                    self.logger.debug(f"Received actions on device: {received_device}")
-
-                # Move actions to client_device (e.g., for downstream planners that need GPU)
-                client_device = self.config.client_device
-                if client_device != "cpu":
-                    for timed_action in timed_actions:
-                        if timed_action.get_action().device.type != client_device:
-                            timed_action.action = timed_action.get_action().to(client_device)
-                    self.logger.debug(f"Converted actions to device: {client_device}")
+                if stream_actions:
+                    for actions_chunk in self.stub.StreamActions(
+                        services_pb2.Empty(), metadata=self.metadata
+                    ):
+                        reconnect_delay = self.config.reconnect_delay
+                        self._process_action_chunk(actions_chunk, verbose)
                 else:
-                    self.logger.debug(f"Actions kept on device: {client_device}")
-
-                self.action_chunk_size = max(self.action_chunk_size, len(timed_actions))
-
-                # Calculate network latency if we have matching observations
-                if len(timed_actions) > 0 and verbose:
-                    with self.latest_action_lock:
-                        latest_action = self.latest_action
-
-                    self.logger.debug(f"Current latest action: {latest_action}")
-
-                    # Get queue state before changes
-                    old_size, old_timesteps = self._inspect_action_queue()
-                    if not old_timesteps:
-                        old_timesteps = [latest_action]  # queue was empty
-
-                    # Log incoming actions
-                    incoming_timesteps = [a.get_timestep() for a in timed_actions]
-
-                    first_action_timestep = timed_actions[0].get_timestep()
-                    server_to_client_latency = (receive_time - timed_actions[0].get_timestamp()) * 1000
-
-                    self.logger.info(
-                        f"Received action chunk for step #{first_action_timestep} | "
-                        f"Latest action: #{latest_action} | "
-                        f"Incoming actions: {incoming_timesteps[0]}:{incoming_timesteps[-1]} | "
-                        f"Network latency (server->client): {server_to_client_latency:.2f}ms | "
-                        f"Deserialization time: {deserialize_time * 1000:.2f}ms"
-                    )
-
-                # Update action queue
-                start_time = time.perf_counter()
-                self._aggregate_action_queues(timed_actions, self.config.aggregate_fn)
-                queue_update_time = time.perf_counter() - start_time
-
-                self.must_go.set()  # after receiving actions, next empty queue triggers must-go processing!
-
-                if verbose:
-                    # Get queue state after changes
-                    new_size, new_timesteps = self._inspect_action_queue()
-
-                    with self.latest_action_lock:
-                        latest_action = self.latest_action
-
-                    self.logger.info(
-                        f"Latest action: {latest_action} | "
-                        f"Old action steps: {old_timesteps[0]}:{old_timesteps[-1]} | "
-                        f"Incoming action steps: {incoming_timesteps[0]}:{incoming_timesteps[-1]} | "
-                        f"Updated action steps: {new_timesteps[0]}:{new_timesteps[-1]}"
-                    )
-                    self.logger.debug(
-                        f"Queue update complete ({queue_update_time:.6f}s) | "
-                        f"Before: {old_size} items | "
-                        f"After: {new_size} items | "
-                    )
+                    actions_chunk = self.stub.GetActions(services_pb2.Empty(), metadata=self.metadata)
+                    reconnect_delay = self.config.reconnect_delay
+                    # An empty chunk is received when no actions are ready, wait for the next call
+                    if len(actions_chunk.data) > 0:
+                        self._process_action_chunk(actions_chunk, verbose)
+                    continue
 
             except grpc.RpcError as e:
-                self.logger.error(f"Error receiving actions: {e}")
+                if stream_actions and e.code() == grpc.StatusCode.UNIMPLEMENTED:
+                    self.logger.warning("Server does not support StreamActions, polling GetActions instead")
+                    stream_actions = False
+                    continue
+                if self.running:
+                    self.logger.error(f"Error receiving actions: {e}")
+
+            # The action stream ended or the call failed, back off before reconnecting. The wait is interrupted
+            # when the client stops.
+            self.shutdown_event.wait(reconnect_delay)
+            reconnect_delay = min(2 * reconnect_delay, self.config.max_reconnect_delay)
+
+    def _process_action_chunk(self, actions_chunk: services_pb2.Actions, verbose: bool = False):
+        """Deserialize an action chunk received from the server and aggregate it into the action queue"""
+        receive_time = time.time()
+
+        # Deserialize bytes back into list[TimedAction]
+        deserialize_start = time.perf_counter()
+        timed_actions = bytes_to_tensors(actions_chunk.data, dataclass_types=[TimedAction])
+        deserialize_time = time.perf_counter() - deserialize_start
+
+        # Log device type of received actions
+        if len(timed_actions) > 0:
+            received_device = timed_actions[0].get_action().device.type
+            self.logger.debug(f"Received actions on device: {received_device}")
+
+        # Move actions to client_device (e.g., for downstream planners that need GPU)
+        client_device = self.config.client_device
+        if client_device != "cpu":
+            for timed_action in timed_actions:
+                if timed_action.get_action().device.type != client_device:
+                    timed_action.action = timed_action.get_action().to(client_device)
+            self.logger.debug(f"Converted actions to device: {client_device}")
+        else:
+            self.logger.debug(f"Actions kept on device: {client_device}")
+
+        self.action_chunk_size = max(self.action_chunk_size, len(timed_actions))
+
+        # Calculate network latency if we have matching observations
+        if len(timed_actions) > 0 and verbose:
+            with self.latest_action_lock:
+                latest_action = self.latest_action
+
+            self.logger.debug(f"Current latest action: {latest_action}")
+
+            # Get queue state before changes
+            old_size, old_timesteps = self._inspect_action_queue()
+            if not old_timesteps:
+                old_timesteps = [latest_action]  # queue was empty
+
+            # Log incoming actions
+            incoming_timesteps = [a.get_timestep() for a in timed_actions]
+
+            first_action_timestep = timed_actions[0].get_timestep()
+            server_to_client_latency = (receive_time - timed_actions[0].get_timestamp()) * 1000
+
+            self.logger.info(
+                f"Received action chunk for step #{first_action_timestep} | "
+                f"Latest action: #{latest_action} | "
+                f"Incoming actions: {incoming_timesteps[0]}:{incoming_timesteps[-1]} | "
+                f"Network latency (server->client): {server_to_client_latency:.2f}ms | "
+                f"Deserialization time: {deserialize_time * 1000:.2f}ms"
+            )
+
+        # Update action queue
+        start_time = time.perf_counter()
+        try:
+            self._aggregate_action_queues(timed_actions, self.config.aggregate_fn)
+        except ValueError as e:
+            # A malformed chunk must not stop the action receiving thread, the queue is left untouched
+            self.logger.error(f"Dropping action chunk: {e}")
+            return
+        queue_update_time = time.perf_counter() - start_time
+
+        self.must_go.set()  # after receiving actions, next empty queue triggers must-go processing!
+
+        if verbose:
+            # Get queue state after changes
+            new_size, new_timesteps = self._inspect_action_queue()
+
+            with self.latest_action_lock:
+                latest_action = self.latest_action
+
+            self.logger.info(
+                f"Latest action: {latest_action} | "
+                f"Old action steps: {old_timesteps[0]}:{old_timesteps[-1]} | "
+                f"Incoming action steps: {incoming_timesteps[0]}:{incoming_timesteps[-1]} | "
+                f"Updated action steps: {new_timesteps[0]}:{new_timesteps[-1]}"
+            )
+            self.logger.debug(
+                f"Queue update complete ({queue_update_time:.6f}s) | "
+                f"Before: {old_size} items | "
+                f"After: {new_size} items | "
+            )
 
     def actions_available(self):
         """Check if there are actions available in the queue"""
-        with self.action_queue_lock:
-            return not self.action_queue.empty()
+        return not self.action_queue.empty()
 
     def _action_tensor_to_action_dict(self, action_tensor: torch.Tensor) -> dict[str, float]:
         action = {key: action_tensor[i].item() for i, key in enumerate(self.robot.action_features)}
@@ -370,12 +379,10 @@ class RobotClient:
     def control_loop_action(self, verbose: bool = False) -> dict[str, Any]:
         """Reading and performing actions in local queue"""
 
-        # Lock only for queue operations
         get_start = time.perf_counter()
-        with self.action_queue_lock:
-            self.action_queue_size.append(self.action_queue.qsize())
-            # Get action from queue
-            timed_action = self.action_queue.get_nowait()
+        self.action_queue_size.append(self.action_queue.qsize())
+        # Get action from queue
+        timed_action = self.action_queue.get_nowait()
         get_end = time.perf_counter() - get_start
 
         _performed_action = self.robot.send_action(
@@ -385,8 +392,7 @@ class RobotClient:
             self.latest_action = timed_action.get_timestep()
 
         if verbose:
-            with self.action_queue_lock:
-                current_queue_size = self.action_queue.qsize()
+            current_queue_size = self.action_queue.qsize()
 
             self.logger.debug(
                 f"Ts={timed_action.get_timestamp()} | "
@@ -402,8 +408,7 @@ class RobotClient:
 
     def _ready_to_send_observation(self):
         """Flags when the client is ready to send an observation"""
-        with self.action_queue_lock:
-            return self.action_queue.qsize() / self.action_chunk_size <= self._chunk_size_threshold
+        return self.action_queue.qsize() / self.action_chunk_size <= self._chunk_size_threshold
 
     def control_loop_observation(self, task: str, verbose: bool = False) -> RawObservation:
         try:
@@ -425,9 +430,8 @@ class RobotClient:
             obs_capture_time = time.perf_counter() - start_time
 
             # If there are no actions left in the queue, the observation must go through processing!
-            with self.action_queue_lock:
-                observation.must_go = self.must_go.is_set() and self.action_queue.empty()
-                current_queue_size = self.action_queue.qsize()
+            current_queue_size = self.action_queue.qsize()
+            observation.must_go = self.must_go.is_set() and current_queue_size == 0
 
             _ = self.send_observation(observation)
 
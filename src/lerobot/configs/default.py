@@ -35,6 +35,15 @@ class DatasetConfig:
     use_imagenet_stats: bool = True
     video_backend: str = field(default_factory=get_safe_default_codec)
     streaming: bool = False
+    # When > 1, training batches are sampled in runs of `episode_group_size` frames from the same episode, so that
+    # video frames of a batch are decoded together from fewer files (see `EpisodeAwareSampler`).
+    episode_group_size: int = 1
+    # Cache of decoded video frames: in-memory budget in MiB per dataloader worker, and optional directory of
+    # on-disk shards shared by all workers (see `LeRobotDataset`).
+    frame_cache_mb: int = 0
+    frame_cache_dir: str | None = None
+    # Load camera frames as uint8 and convert them to float on the training device (see `LeRobotDataset`).
+    return_uint8_images: bool = False
 
 
 @dataclass
@@ -56,6 +56,9 @@ class TrainPipelineConfig(HubMixin):
     steps: int = 100_000
     eval_freq: int = 20_000
     log_freq: int = 200
+    # Record per-step statistics of the processor pipelines (wall time, host to device bytes, allocations),
+    # logged every `log_freq` steps for the preprocessor and at each evaluation for the postprocessor.
+    profile_processors: bool = False
     tolerance_s: float = 1e-4
     save_checkpoint: bool = True
     # Checkpoint is saved every `save_freq` training iterations and after the last training step.
@@ -19,6 +19,117 @@ from lerobot.datasets.utils import load_image_as_numpy
 
 DEFAULT_QUANTILES = [0.01, 0.10, 0.50, 0.90, 0.99]
 
+# Number of centroids of the quantile sketches
+QUANTILE_SKETCH_SIZE = 100
+# Key of the quantile sketch in the stats of a feature, a dict with the "means" and "weights" of the centroids
+QUANTILE_SKETCH_KEY = "quantile_sketch"
+
+
+def strip_quantile_sketches(stats: dict[str, dict]) -> dict[str, dict]:
+    """Return the stats without their quantile sketches, which are only used to aggregate stats."""
+    return {
+        key: {k: v for k, v in sub.items() if k != QUANTILE_SKETCH_KEY} if isinstance(sub, dict) else sub
+        for key, sub in stats.items()
+    }
+
+
+def _sketch_buckets(ranks: np.ndarray, sketch_size: int) -> np.ndarray:
+    """Map normalized ranks in [0, 1] to centroid indices.
+
+    The arcsine scale function of the t-digest makes the centroids smaller near the tails, so that extreme
+    quantiles (e.g. q01 and q99) stay accurate with a small number of centroids.
+    """
+    buckets = np.floor(sketch_size * (np.arcsin(2 * ranks - 1) / np.pi + 0.5)).astype(np.int64)
+    return np.clip(buckets, 0, sketch_size - 1)
+
+
+def _sketch_from_samples(batch: np.ndarray, sketch_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Build the quantile sketch of a batch of vectors of shape (num_samples, dim).
+
+    Returns:
+        The means and weights of the centroids, both of shape (dim, sketch_size). Empty centroids have a zero
+        weight.
+    """
+    sorted_batch = np.sort(batch.T.astype(np.float64), axis=1)
+    num_samples = sorted_batch.shape[1]
+    # All the dimensions have the same ranks, so they share the same centroids boundaries
+    buckets = _sketch_buckets((np.arange(num_samples) + 0.5) / num_samples, sketch_size)
+    starts = np.flatnonzero(np.diff(buckets, prepend=-1))
+    counts = np.diff(np.append(starts, num_samples))
+
+    means = np.zeros((sorted_batch.shape[0], sketch_size))
+    weights = np.zeros((sorted_batch.shape[0], sketch_size))
+    means[:, buckets[starts]] = np.add.reduceat(sorted_batch, starts, axis=1) / counts
+    weights[:, buckets[starts]] = counts
+    return means, weights
+
+
+def _compress_sketch(
+    means: np.ndarray, weights: np.ndarray, sketch_size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Merge centroids of shape (dim, num_centroids) into a sketch of `sketch_size` centroids per dimension."""
+    dim = means.shape[0]
+    order = np.argsort(means, axis=1, kind="stable")
+    means = np.take_along_axis(means, order, axis=1)
+    weights = np.take_along_axis(weights, order, axis=1)
+
+    cum_weights = np.cumsum(weights, axis=1)
+    ranks = (cum_weights - weights / 2) / cum_weights[:, -1:]
+    # Offset the centroids indices of each dimension, to merge all the dimensions with a single bincount
+    buckets = (_sketch_buckets(ranks, sketch_size) + sketch_size * np.arange(dim)[:, None]).ravel()
+
+    new_weights = np.bincount(buckets, weights=weights.ravel(), minlength=dim * sketch_size)
+    new_sums = np.bincount(buckets, weights=(means * weights).ravel(), minlength=dim * sketch_size)
+    new_means = np.divide(new_sums, new_weights, out=np.zeros_like(new_sums), where=new_weights > 0)
+    return new_means.reshape(dim, sketch_size), new_weights.reshape(dim, sketch_size)
+
+
+def _sketch_quantiles(
+    means: np.ndarray,
+    weights: np.ndarray,
+    min_values: np.ndarray,
+    max_values: np.ndarray,
+    quantile_list: list[float],
+) -> np.ndarray:
+    """Estimate quantiles from a sketch of shape (dim, sketch_size), bounded by the min and max of each dimension.
+
+    Returns:
+        An array of shape (len(quantile_list), dim).
+    """
+    dim, sketch_size = means.shape
+    cum_weights = np.cumsum(weights, axis=1)
+    total = cum_weights[:, -1:]
+
+    # Each centroid is a point at the middle of its rank range, the min and max are at the ends
+    ranks = np.concatenate([np.zeros((dim, 1)), cum_weights - weights / 2, total], axis=1)
+    values = np.concatenate([min_values.reshape(dim, 1), means, max_values.reshape(dim, 1)], axis=1)
+    # Empty centroids are replaced by the previous point, so that they don't change the interpolation
+    valid = np.pad(weights > 0, ((0, 0), (1, 1)), constant_values=True)
+    fill_idx = np.maximum.accumulate(np.where(valid, np.arange(sketch_size + 2), 0), axis=1)
+    ranks = np.take_along_axis(ranks, fill_idx, axis=1)
+    values = np.take_along_axis(values, fill_idx, axis=1)
+
+    targets = np.asarray(quantile_list)[None, :] * total
+    right = np.clip((ranks[:, None, :] < targets[:, :, None]).sum(axis=-1), 1, sketch_size + 1)
+    left = right - 1
+    left_ranks, right_ranks = (
+        np.take_along_axis(ranks, left, axis=1),
+        np.take_along_axis(ranks, right, axis=1),
+    )
+    left_values = np.take_along_axis(values, left, axis=1)
+    right_values = np.take_along_axis(values, right, axis=1)
+
+    span = right_ranks - left_ranks
+    fraction = np.divide(targets - left_ranks, span, out=np.zeros_like(targets), where=span > 0)
+    return (left_values + fraction * (right_values - left_values)).T
+
+
+def _as_float_array(value: np.ndarray) -> np.ndarray:
+    """Cast stats to float arrays, including the nested object arrays read back from the episodes parquet."""
+    if isinstance(value, np.ndarray) and value.dtype == object:
+        return np.stack([_as_float_array(item) for item in value])
+    return np.asarray(value, dtype=np.float64)
+
 
 class RunningQuantileStats:
     """
@@ -26,19 +137,22 @@ class RunningQuantileStats:
     standard deviation, min, max, and approximate quantiles.
 
     Statistics are computed per feature dimension and updated incrementally
-    as new batches are observed. Quantiles are estimated using histograms,
-    which adapt dynamically if the observed data range expands.
+    as new batches are observed. Quantiles are estimated with a t-digest-like
+    sketch of `sketch_size` centroids for all dimensions at once. The sketch is
+    returned with the statistics, so that the stats of several episodes or
+    datasets can be merged into accurate quantiles of their union, see
+    `aggregate_feature_stats`.
     """
 
-    def __init__(self, quantile_list: list[float] | None = None, num_quantile_bins: int = 5000):
+    def __init__(self, quantile_list: list[float] | None = None, sketch_size: int = QUANTILE_SKETCH_SIZE):
         self._count = 0
         self._mean = None
         self._mean_of_squares = None
         self._min = None
         self._max = None
-        self._histograms = None
-        self._bin_edges = None
-        self._num_quantile_bins = num_quantile_bins
+        self._sketch_means = None
+        self._sketch_weights = None
+        self._sketch_size = sketch_size
 
         self._quantile_list = quantile_list
         if self._quantile_list is None:
@@ -59,24 +173,12 @@ class RunningQuantileStats:
             self._mean_of_squares = np.mean(batch**2, axis=0)
             self._min = np.min(batch, axis=0)
             self._max = np.max(batch, axis=0)
-            self._histograms = [np.zeros(self._num_quantile_bins) for _ in range(vector_length)]
-            self._bin_edges = [
-                np.linspace(self._min[i] - 1e-10, self._max[i] + 1e-10, self._num_quantile_bins + 1)
-                for i in range(vector_length)
-            ]
         else:
             if vector_length != self._mean.size:
                 raise ValueError("The length of new vectors does not match the initialized vector length.")
 
-            new_max = np.max(batch, axis=0)
-            new_min = np.min(batch, axis=0)
-            max_changed = np.any(new_max > self._max)
-            min_changed = np.any(new_min < self._min)
-            self._max = np.maximum(self._max, new_max)
-            self._min = np.minimum(self._min, new_min)
-
-            if max_changed or min_changed:
-                self._adjust_histograms()
+            self._max = np.maximum(self._max, np.max(batch, axis=0))
+            self._min = np.minimum(self._min, np.min(batch, axis=0))
 
         self._count += num_elements
 
@@ -89,16 +191,14 @@ class RunningQuantileStats:
             num_elements / self._count
         )
 
-        self._update_histograms(batch)
+        self._update_sketch(batch)
 
     def get_statistics(self) -> dict[str, np.ndarray]:
         """Compute and return the statistics of the vectors processed so far.
 
-        Args:
-            quantiles: List of quantiles to compute (e.g., [0.01, 0.10, 0.50, 0.90, 0.99]). If None, no quantiles computed.
-
         Returns:
-            Dictionary containing the computed statistics.
+            Dictionary containing the computed statistics, the quantiles and the quantile sketch (centroids
+            means and weights, of shape (vector_length, sketch_size)) under `QUANTILE_SKETCH_KEY`.
         """
         if self._count < 2:
             raise ValueError("Cannot compute statistics for less than 2 vectors.")
@@ -115,80 +215,28 @@ class RunningQuantileStats:
             "count": np.array([self._count]),
         }
 
-        quantile_results = self._compute_quantiles()
+        quantile_results = _sketch_quantiles(
+            self._sketch_means, self._sketch_weights, self._min, self._max, self._quantile_list
+        )
         for i, q in enumerate(self._quantile_keys):
             stats[q] = quantile_results[i]
 
+        stats[QUANTILE_SKETCH_KEY] = {
+            "means": self._sketch_means.copy(),
+            "weights": self._sketch_weights.copy(),
+        }
         return stats
 
-    def _adjust_histograms(self):
-        """Adjust histograms when min or max changes."""
-        for i in range(len(self._histograms)):
-            old_edges = self._bin_edges[i]
-            old_hist = self._histograms[i]
-
-            # Create new edges with small padding to ensure range coverage
-            padding = (self._max[i] - self._min[i]) * 1e-10
-            new_edges = np.linspace(
-                self._min[i] - padding, self._max[i] + padding, self._num_quantile_bins + 1
+    def _update_sketch(self, batch: np.ndarray) -> None:
+        """Merge the sketch of new vectors into the running sketch."""
+        means, weights = _sketch_from_samples(batch, self._sketch_size)
+        if self._sketch_means is not None:
+            means, weights = _compress_sketch(
+                np.concatenate([self._sketch_means, means], axis=1),
+                np.concatenate([self._sketch_weights, weights], axis=1),
+                self._sketch_size,
             )
-
-            # Redistribute existing histogram counts to new bins
-            # We need to map each old bin center to the new bins
-            old_centers = (old_edges[:-1] + old_edges[1:]) / 2
-            new_hist = np.zeros(self._num_quantile_bins)
-
-            for old_center, count in zip(old_centers, old_hist, strict=False):
-                if count > 0:
-                    # Find which new bin this old center belongs to
-                    bin_idx = np.searchsorted(new_edges, old_center) - 1
-                    bin_idx = max(0, min(bin_idx, self._num_quantile_bins - 1))
-                    new_hist[bin_idx] += count
-
-            self._histograms[i] = new_hist
-            self._bin_edges[i] = new_edges
-
-    def _update_histograms(self, batch: np.ndarray) -> None:
-        """Update histograms with new vectors."""
-        for i in range(batch.shape[1]):
-            hist, _ = np.histogram(batch[:, i], bins=self._bin_edges[i])
-            self._histograms[i] += hist
-
-    def _compute_quantiles(self) -> list[np.ndarray]:
-        """Compute quantiles based on histograms."""
-        results = []
-        for q in self._quantile_list:
-            target_count = q * self._count
-            q_values = []
-
-            for hist, edges in zip(self._histograms, self._bin_edges, strict=True):
-                q_value = self._compute_single_quantile(hist, edges, target_count)
-                q_values.append(q_value)
-
-            results.append(np.array(q_values))
-        return results
-
-    def _compute_single_quantile(self, hist: np.ndarray, edges: np.ndarray, target_count: float) -> float:
-        """Compute a single quantile value from histogram and bin edges."""
-        cumsum = np.cumsum(hist)
-        idx = np.searchsorted(cumsum, target_count)
-
-        if idx == 0:
-            return edges[0]
-        if idx >= len(cumsum):
-            return edges[-1]
-
-        # If not edge case, interpolate within the bin
-        count_before = cumsum[idx - 1]
-        count_in_bin = cumsum[idx] - count_before
-
-        # If no samples in this bin, use the bin edge
-        if count_in_bin == 0:
-            return edges[idx]
-
-        # Linear interpolation within the bin
-        fraction = (target_count - count_before) / count_in_bin
-        return edges[idx] + fraction * (edges[idx + 1] - edges[idx])
+        self._sketch_means, self._sketch_weights = means, weights
 
 
 def estimate_num_samples(
@@ -268,7 +316,8 @@ def _reshape_stats_by_axis(
 
     Note:
         The 'count' statistic is never reshaped as it represents metadata
-        rather than per-feature statistics.
+        rather than per-feature statistics. The quantile sketch keeps its
+        centroids in a trailing dimension, after the shape of the other statistics.
     """
     if axis == (1,) and not keepdims:
         return stats
@@ -277,6 +326,8 @@ def _reshape_stats_by_axis(
     for key, value in stats.items():
         if key == "count":
             result[key] = value
+        elif key == QUANTILE_SKETCH_KEY:
+            result[key] = {k: v.reshape(*np.shape(result["mean"]), v.shape[-1]) for k, v in value.items()}
         else:
             result[key] = _reshape_single_stat(value, axis, keepdims, original_shape)
 
@@ -402,7 +453,7 @@ def _compute_basic_stats(
         sample_count: Number of samples represented in the data
 
     Returns:
-        Dictionary with basic statistics and quantiles set to mean values
+        Dictionary with basic statistics, quantiles set to mean values and the quantile sketch
     """
     if quantile_list is None:
         quantile_list = DEFAULT_QUANTILES
@@ -419,6 +470,8 @@ def _compute_basic_stats(
     for q in quantile_list_keys:
         stats[q] = stats["mean"].copy()
 
+    means, weights = _sketch_from_samples(array.reshape(len(array), -1), QUANTILE_SKETCH_SIZE)
+    stats[QUANTILE_SKETCH_KEY] = {"means": means, "weights": weights}
     return stats
 
 
@@ -454,6 +507,9 @@ def get_feature_stats(
             - 'std': Standard deviation
             - 'count': Number of samples (always shape (1,))
             - 'q01', 'q10', 'q50', 'q90', 'q99': Quantile values
+            - 'quantile_sketch': Dict with the 'means' and 'weights' of the centroids of the quantile sketch,
+              in a trailing dimension. The weights sum to 'count', so that sketches can be merged by
+              `aggregate_feature_stats`.
 
     """
     if quantile_list is None:
@@ -465,11 +521,15 @@ def get_feature_stats(
     if reshaped.shape[0] < 2:
         stats = _compute_basic_stats(reshaped, sample_count, quantile_list)
     else:
-        running_stats = RunningQuantileStats()
+        running_stats = RunningQuantileStats(quantile_list)
         running_stats.update(reshaped)
         stats = running_stats.get_statistics()
         stats["count"] = np.array([sample_count])
 
+    # Each image sample contributes many pixels to the sketch, weight it as a single sample like the mean
+    sketch_weights = stats[QUANTILE_SKETCH_KEY]["weights"]
+    sketch_weights *= sample_count / sketch_weights.sum(axis=-1, keepdims=True)
+
     stats = _reshape_stats_by_axis(stats, axis, keepdims, original_shape)
     return stats
 
@@ -488,7 +548,7 @@ def compute_episode_stats(
 
     Args:
         episode_data: Dictionary mapping feature names to data
-            - For images/videos: list of file paths
+            - For images/videos: list of file paths, or already sampled uint8 frames of shape (N, C, H, W)
             - For numerical data: numpy arrays
         features: Dictionary describing each feature's dtype and shape
 
@@ -509,7 +569,7 @@ def compute_episode_stats(
             continue
 
         if features[key]["dtype"] in ["image", "video"]:
-            ep_ft_array = sample_images(data)
+            ep_ft_array = sample_images(data) if isinstance(data, list) else data
             axes_to_reduce = (0, 2, 3)
             keepdims = True
         else:
@@ -522,9 +582,14 @@ def compute_episode_stats(
         )
 
         if features[key]["dtype"] in ["image", "video"]:
+            sketch = ep_stats[key].pop(QUANTILE_SKETCH_KEY)
             ep_stats[key] = {
                 k: v if k == "count" else np.squeeze(v / 255.0, axis=0) for k, v in ep_stats[key].items()
             }
+            ep_stats[key][QUANTILE_SKETCH_KEY] = {
+                "means": np.squeeze(sketch["means"] / 255.0, axis=0),
+                "weights": np.squeeze(sketch["weights"], axis=0),
+            }
 
     return ep_stats
 
@@ -543,8 +608,10 @@ def _validate_stat_value(value: np.ndarray, key: str, feature_key: str) -> None:
     if key == "count" and value.shape != (1,):
         raise ValueError(f"Shape of 'count' must be (1), but is {value.shape} instead.")
 
-    if "image" in feature_key and key != "count" and value.shape != (3, 1, 1):
-        raise ValueError(f"Shape of quantile '{key}' must be (3,1,1), but is {value.shape} instead.")
+    # The quantile sketch has an additional trailing dimension for its centroids
+    shape = _as_float_array(value).shape[:-1] if key == QUANTILE_SKETCH_KEY else value.shape
+    if "image" in feature_key and key != "count" and shape != (3, 1, 1):
+        raise ValueError(f"Shape of quantile '{key}' must be (3,1,1), but is {shape} instead.")
 
 
 def _assert_type_and_shape(stats_list: list[dict[str, dict]]):
@@ -559,11 +626,51 @@ def _assert_type_and_shape(stats_list: list[dict[str, dict]]):
     for stats in stats_list:
         for feature_key, feature_stats in stats.items():
             for stat_key, stat_value in feature_stats.items():
-                _validate_stat_value(stat_value, stat_key, feature_key)
+                if stat_key == QUANTILE_SKETCH_KEY:
+                    for sketch_value in stat_value.values():
+                        _validate_stat_value(sketch_value, stat_key, feature_key)
+                else:
+                    _validate_stat_value(stat_value, stat_key, feature_key)
+
+
+def _aggregate_quantile_sketches(
+    stats_ft_list: list[dict[str, np.ndarray]], aggregated: dict[str, np.ndarray], quantile_keys: list[str]
+) -> None:
+    """Merge the quantile sketches of `stats_ft_list`, and estimate the quantiles of their union."""
+    sketch_means = [_as_float_array(s[QUANTILE_SKETCH_KEY]["means"]) for s in stats_ft_list]
+    sketch_weights = [_as_float_array(s[QUANTILE_SKETCH_KEY]["weights"]) for s in stats_ft_list]
+    stat_shape = sketch_means[0].shape[:-1]
+    sketch_size = max(means.shape[-1] for means in sketch_means)
+
+    # Merge the centroids of all the sketches at once, with one row per dimension
+    means, weights = _compress_sketch(
+        np.concatenate([m.reshape(-1, m.shape[-1]) for m in sketch_means], axis=1),
+        np.concatenate([w.reshape(-1, w.shape[-1]) for w in sketch_weights], axis=1),
+        sketch_size,
+    )
+    quantiles = _sketch_quantiles(
+        means,
+        weights,
+        np.ravel(aggregated["min"]),
+        np.ravel(aggregated["max"]),
+        [int(q_key[1:]) / 100 for q_key in quantile_keys],
+    )
+
+    for q_key, values in zip(quantile_keys, quantiles, strict=True):
+        aggregated[q_key] = values.reshape(stat_shape)
+    aggregated[QUANTILE_SKETCH_KEY] = {
+        "means": means.reshape(*stat_shape, sketch_size),
+        "weights": weights.reshape(*stat_shape, sketch_size),
+    }
 
 
 def aggregate_feature_stats(stats_ft_list: list[dict[str, dict]]) -> dict[str, dict[str, np.ndarray]]:
-    """Aggregates stats for a single feature."""
+    """Aggregates stats for a single feature.
+
+    When all the stats have a quantile sketch, the sketches are merged and the quantiles are estimated from the
+    merged sketch, which approximates the quantiles of the union of the data. Otherwise, the quantiles are
+    averaged, weighted by the counts.
+    """
     means = np.stack([s["mean"] for s in stats_ft_list])
     variances = np.stack([s["std"] ** 2 for s in stats_ft_list])
     counts = np.stack([s["count"] for s in stats_ft_list])
@@ -593,6 +700,11 @@ def aggregate_feature_stats(stats_ft_list: list[dict[str, dict]]) -> dict[str, d
     if stats_ft_list:
         quantile_keys = [k for k in stats_ft_list[0] if k.startswith("q") and k[1:].isdigit()]
 
+        if all(QUANTILE_SKETCH_KEY in s for s in stats_ft_list):
+            quantile_keys = [q_key for q_key in quantile_keys if all(q_key in s for s in stats_ft_list)]
+            _aggregate_quantile_sketches(stats_ft_list, aggregated, quantile_keys)
+            return aggregated
+
         for q_key in quantile_keys:
             if all(q_key in s for s in stats_ft_list):
                 quantile_values = np.stack([s[q_key] for s in stats_ft_list])
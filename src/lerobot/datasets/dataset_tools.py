@@ -22,26 +22,37 @@ This module provides utilities for:
 - Adding/removing features from datasets
 - Merging datasets (wrapper around aggregate functionality)
 - Shuffling episode order in datasets
+- Recomputing the statistics of datasets
 """
 
+import io
 import logging
 import random
 import shutil
+import time
 from collections import Counter
-from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from fractions import Fraction
 from pathlib import Path
 
 import datasets
 import numpy as np
 import pandas as pd
+import PIL.Image
+import pyarrow as pa
 import pyarrow.parquet as pq
 import torch
 from tqdm import tqdm
 
 from lerobot.datasets.aggregate import aggregate_datasets
-from lerobot.datasets.compute_stats import aggregate_stats
+from lerobot.datasets.compute_stats import (
+    QUANTILE_SKETCH_KEY,
+    aggregate_stats,
+    auto_downsample_height_width,
+    compute_episode_stats,
+    sample_indices,
+)
 from lerobot.datasets.lerobot_dataset import LeRobotDataset, LeRobotDatasetMetadata
 from lerobot.datasets.utils import (
     DATA_DIR,
@@ -49,14 +60,16 @@ from lerobot.datasets.utils import (
     DEFAULT_DATA_FILE_SIZE_IN_MB,
     DEFAULT_DATA_PATH,
     DEFAULT_EPISODES_PATH,
+    flatten_dict,
     get_parquet_file_size_in_mb,
     load_episodes,
+    load_image_as_numpy,
     update_chunk_file_indices,
     write_info,
     write_stats,
     write_tasks,
 )
-from lerobot.datasets.video_utils import encode_video_frames, get_video_info
+from lerobot.datasets.video_utils import decode_video_frames, encode_video_frames, get_video_info
 from lerobot.utils.constants import HF_LEROBOT_HOME, OBS_IMAGE
 
 
@@ -1573,8 +1586,9 @@ def _copy_and_reindex_episodes_metadata(
             if key.startswith("stats/"):
                 stat_key = key.replace("stats/", "")
                 parts = stat_key.split("/")
-                if len(parts) == 2:
-                    feature_name, stat_name = parts
+                # The quantile sketch is stored in "<feature>/quantile_sketch/<means|weights>" columns
+                if len(parts) == 2 or (len(parts) == 3 and parts[1] == QUANTILE_SKETCH_KEY):
+                    feature_name, stat_name = parts[:2]
                     if feature_name not in episode_stats:
                         episode_stats[feature_name] = {}
 
@@ -1582,7 +1596,10 @@ def _copy_and_reindex_episodes_metadata(
 
                     if feature_name in src_dataset.meta.features:
                         feature_dtype = src_dataset.meta.features[feature_name]["dtype"]
-                        if feature_dtype in ["image", "video"] and stat_name != "count":
+                        if feature_dtype in ["image", "video"] and stat_name not in [
+                            "count",
+                            QUANTILE_SKETCH_KEY,
+                        ]:
                             if isinstance(value, np.ndarray) and value.dtype == object:
                                 flat_values = []
                                 for item in value:
@@ -1593,7 +1610,10 @@ def _copy_and_reindex_episodes_metadata(
                             elif isinstance(value, np.ndarray) and value.shape == (3,):
                                 value = value.reshape(3, 1, 1)
 
-                    episode_stats[feature_name][stat_name] = value
+                    if stat_name == QUANTILE_SKETCH_KEY:
+                        episode_stats[feature_name].setdefault(stat_name, {})[parts[2]] = value
+                    else:
+                        episode_stats[feature_name][stat_name] = value
 
         all_stats.append(episode_stats)
 
@@ -1707,8 +1727,9 @@ def _copy_and_reindex_episodes_metadata_aligned(
                 if key.startswith("stats/"):
                     stat_key = key.replace("stats/", "")
                     parts = stat_key.split("/")
-                    if len(parts) == 2:
-                        feature_name, stat_name = parts
+                    # The quantile sketch is stored in "<feature>/quantile_sketch/<means|weights>" columns
+                    if len(parts) == 2 or (len(parts) == 3 and parts[1] == QUANTILE_SKETCH_KEY):
+                        feature_name, stat_name = parts[:2]
                         if feature_name not in episode_stats:
                             episode_stats[feature_name] = {}
 
@@ -1716,7 +1737,10 @@ def _copy_and_reindex_episodes_metadata_aligned(
 
                         if feature_name in src_dataset.meta.features:
                             feature_dtype = src_dataset.meta.features[feature_name]["dtype"]
-                            if feature_dtype in ["image", "video"] and stat_name != "count":
+                            if feature_dtype in ["image", "video"] and stat_name not in [
+                                "count",
+                                QUANTILE_SKETCH_KEY,
+                            ]:
                                 if isinstance(value, np.ndarray) and value.dtype == object:
                                     flat_values = []
                                     for item in value:
@@ -1727,7 +1751,10 @@ def _copy_and_reindex_episodes_metadata_aligned(
                                 elif isinstance(value, np.ndarray) and value.shape == (3,):
                                     value = value.reshape(3, 1, 1)
 
-                        episode_stats[feature_name][stat_name] = value
+                        if stat_name == QUANTILE_SKETCH_KEY:
+                            episode_stats[feature_name].setdefault(stat_name, {})[parts[2]] = value
+                        else:
+                            episode_stats[feature_name][stat_name] = value
 
             all_stats.append(episode_stats)
 
@@ -2517,3 +2544,293 @@ def convert_image_to_video_dataset(
 
     # Return new dataset
     return LeRobotDataset(repo_id=repo_id, root=output_dir)
+
+
+def _column_to_numpy(column: pa.Array, shape: tuple[int, ...]) -> np.ndarray:
+    """Convert a column of numbers, or of (nested) lists of numbers, to an array of shape (num_rows, *shape)."""
+    values = column
+    while pa.types.is_list(values.type) or pa.types.is_fixed_size_list(values.type):
+        values = values.flatten()
+    array = values.to_numpy(zero_copy_only=False)
+    # Scalar columns are kept 1D, like the episode buffers of `LeRobotDataset.save_episode`
+    return array if values is column else array.reshape(len(column), *shape)
+
+
+def _decode_image(value: dict, root: Path) -> np.ndarray:
+    """Decode an image cell of a data file to a (C, H, W) uint8 array, downsampled like `sample_images`."""
+    if value.get("bytes"):
+        image = np.array(PIL.Image.open(io.BytesIO(value["bytes"])).convert("RGB")).transpose(2, 0, 1)
+    else:
+        image = load_image_as_numpy(root / value["path"], dtype=np.uint8, channel_first=True)
+    return auto_downsample_height_width(image)
+
+
+def _iter_episode_rows(
+    parquet_file: pq.ParquetFile, columns: list[str], batch_size: int, row_groups: list[int] | None = None
+) -> Iterator[tuple[int, pa.RecordBatch]]:
+    """Stream the record batches of a data file, split so that each slice of rows belongs to a single episode."""
+    for batch in parquet_file.iter_batches(batch_size=batch_size, row_groups=row_groups, columns=columns):
+        ep_indices = batch.column("episode_index").to_numpy()
+        boundaries = [0, *(np.flatnonzero(np.diff(ep_indices)) + 1), len(ep_indices)]
+        for start, end in zip(boundaries[:-1], boundaries[1:], strict=True):
+            yield int(ep_indices[start]), batch.slice(start, end - start)
+
+
+def _compute_data_file_stats(
+    root: Path,
+    data_path: Path,
+    episodes: dict[int, tuple[int, int]],
+    features: dict,
+    quantile_list: list[float] | None,
+    batch_size: int,
+    row_groups: list[int] | None = None,
+) -> dict[int, dict[str, dict]]:
+    """Compute the stats of the features stored in a data file, for some of its episodes.
+
+    Only the sampled frames of the image features are decoded, see `sample_images`, and the rows are streamed by
+    batches of `batch_size`, so that at most one episode is kept in memory.
+
+    Args:
+        root: Root of the dataset.
+        data_path: Path of the data file, relative to `root`.
+        episodes: Maps the index of each episode to compute to its first frame index and length.
+        features: Features of the dataset.
+        quantile_list: Quantiles to compute, see `compute_episode_stats`.
+        batch_size: Number of rows read at once.
+        row_groups: Row groups of the file holding the episodes. Defaults to all of them.
+    """
+    parquet_file = pq.ParquetFile(root / data_path)
+    columns = [key for key in parquet_file.schema_arrow.names if key in features]
+    stats_features = {key: features[key] for key in columns if features[key]["dtype"] != "string"}
+    image_keys = [key for key, ft in stats_features.items() if ft["dtype"] == "image"]
+
+    ep_stats = {}
+    episode_data: dict[int, dict[str, list]] = {}
+    for ep_idx, rows in _iter_episode_rows(parquet_file, columns, batch_size, row_groups):
+        if ep_idx not in episodes:
+            # Episode of another task, sharing a row group with these episodes
+            continue
+        if ep_idx not in episode_data:
+            # Rows of an episode are contiguous, so the previous episode is complete
+            for done_idx in list(episode_data):
+                ep_stats[done_idx] = _compute_buffered_episode_stats(
+                    episode_data.pop(done_idx), stats_features, quantile_list
+                )
+            episode_data[ep_idx] = {key: [] for key in stats_features}
+
+        buffer = episode_data[ep_idx]
+        from_index, length = episodes[ep_idx]
+        sampled = np.isin(rows.column("index").to_numpy() - from_index, sample_indices(length))
+        for key, ft in stats_features.items():
+            if key in image_keys:
+                cells = rows.column(key).filter(pa.array(sampled)).to_pylist()
+                buffer[key].extend(_decode_image(cell, root) for cell in cells)
+            else:
+                buffer[key].append(_column_to_numpy(rows.column(key), ft["shape"]))
+
+    for ep_idx, buffer in episode_data.items():
+        ep_stats[ep_idx] = _compute_buffered_episode_stats(buffer, stats_features, quantile_list)
+    return ep_stats
+
+
+def _compute_buffered_episode_stats(
+    buffer: dict[str, list], features: dict, quantile_list: list[float] | None
+) -> dict[str, dict]:
+    episode_data = {
+        key: np.stack(values) if features[key]["dtype"] == "image" else np.concatenate(values)
+        for key, values in buffer.items()
+    }
+    return compute_episode_stats(episode_data, features, quantile_list)
+
+
+def _compute_video_file_stats(
+    root: Path,
+    video_path: Path,
+    video_key: str,
+    episodes: dict[int, tuple[float, int]],
+    fps: int,
+    tolerance_s: float,
+    video_backend: str | None,
+    quantile_list: list[float] | None,
+    decode_batch_size: int = 32,
+) -> dict[int, dict[str, dict]]:
+    """Compute the stats of a video feature for each episode of a video file, from its sampled frames.
+
+    Args:
+        root: Root of the dataset.
+        video_path: Path of the video file, relative to `root`.
+        video_key: Video feature stored in the file.
+        episodes: Maps the index of each episode of the file to its first timestamp in the file and its length.
+        fps: Frame rate of the dataset.
+        tolerance_s: Tolerance of the video decoder.
+        video_backend: Video decoding backend, see `decode_video_frames`.
+        quantile_list: Quantiles to compute, see `compute_episode_stats`.
+        decode_batch_size: Number of frames decoded at once, before being downsampled.
+    """
+    ep_stats = {}
+    for ep_idx, (from_timestamp, length) in episodes.items():
+        timestamps = [from_timestamp + idx / fps for idx in sample_indices(length)]
+        frames = []
+        for start in range(0, len(timestamps), decode_batch_size):
+            decoded = decode_video_frames(
+                root / video_path,
+                timestamps[start : start + decode_batch_size],
+                tolerance_s,
+                video_backend,
+                return_uint8=True,
+            )
+            frames.extend(auto_downsample_height_width(frame) for frame in decoded.numpy())
+        ep_stats[ep_idx] = compute_episode_stats(
+            {video_key: np.stack(frames)}, {video_key: {"dtype": "video"}}, quantile_list
+        )
+    return ep_stats
+
+
+def _write_episodes_stats(path: Path, episodes_stats: dict[int, dict[str, dict]]) -> None:
+    """Replace the stats columns of an episodes metadata file by `episodes_stats`."""
+    table = pq.read_table(path)
+    table = table.drop_columns([name for name in table.column_names if name.startswith("stats/")])
+
+    stats_columns: dict[str, list] = {}
+    for ep_idx in table.column("episode_index").to_pylist():
+        for key, value in flatten_dict({"stats": episodes_stats[ep_idx]}).items():
+            stats_columns.setdefault(key, []).append(value.tolist())
+    for key, values in stats_columns.items():
+        table = table.append_column(key, pa.array(values))
+
+    pq.write_table(table, path, compression="snappy", use_dictionary=True)
+
+
+def _group_episodes(episodes: pd.DataFrame, frames_per_task: int) -> Iterator[pd.DataFrame]:
+    """Split consecutive episodes in groups of about `frames_per_task` frames, without splitting an episode."""
+    first_frames = episodes["length"].cumsum() - episodes["length"]
+    for _, group in episodes.groupby(first_frames.to_numpy() // frames_per_task):
+        yield group
+
+
+def _plan_stats_tasks(
+    dataset: LeRobotDataset,
+    episodes: pd.DataFrame,
+    data_file_starts: dict[tuple[int, int], int],
+    quantile_list: list[float] | None,
+    batch_size: int,
+    frames_per_task: int,
+) -> list[tuple[Callable, tuple]]:
+    """Split the stats computation of `episodes` in tasks of about `frames_per_task` frames of a single file.
+
+    The tasks of a data file only read the row groups holding their episodes.
+    """
+    meta = dataset.meta
+    tasks = []
+    for (chunk_idx, file_idx), file_episodes in episodes.groupby(["data/chunk_index", "data/file_index"]):
+        data_path = meta.data_path.format(chunk_index=chunk_idx, file_index=file_idx)
+        metadata = pq.ParquetFile(meta.root / data_path).metadata
+        num_rows = np.array([metadata.row_group(idx).num_rows for idx in range(metadata.num_row_groups)])
+        row_group_ends = np.cumsum(num_rows)
+        file_start = data_file_starts[(chunk_idx, file_idx)]
+        for group in _group_episodes(file_episodes, frames_per_task):
+            # Rows of the episodes in the file
+            first_row = group["dataset_from_index"].min() - file_start
+            end_row = group["dataset_to_index"].max() - file_start
+            row_groups = np.flatnonzero((row_group_ends - num_rows < end_row) & (row_group_ends > first_row))
+            ep_info = {
+                int(ep["episode_index"]): (int(ep["dataset_from_index"]), int(ep["length"]))
+                for _, ep in group.iterrows()
+            }
+            args = (meta.root, data_path, ep_info, meta.features, quantile_list, batch_size)
+            tasks.append((_compute_data_file_stats, (*args, row_groups.tolist())))
+
+    for video_key in meta.video_keys:
+        file_columns = [f"videos/{video_key}/chunk_index", f"videos/{video_key}/file_index"]
+        for (chunk_idx, file_idx), file_episodes in episodes.groupby(file_columns):
+            video_path = meta.video_path.format(
+                video_key=video_key, chunk_index=chunk_idx, file_index=file_idx
+            )
+            for group in _group_episodes(file_episodes, frames_per_task):
+                from_timestamps = group[f"videos/{video_key}/from_timestamp"]
+                ep_info = {
+                    int(ep_idx): (float(from_timestamp), int(length))
+                    for ep_idx, from_timestamp, length in zip(
+                        group["episode_index"], from_timestamps, group["length"], strict=True
+                    )
+                }
+                args = (meta.root, video_path, video_key, ep_info, meta.fps, dataset.tolerance_s)
+                tasks.append((_compute_video_file_stats, (*args, dataset.video_backend, quantile_list)))
+    return tasks
+
+
+def recompute_stats(
+    dataset: LeRobotDataset,
+    quantile_list: list[float] | None = None,
+    num_workers: int = 4,
+    batch_size: int = 1000,
+    frames_per_task: int = 10_000,
+) -> dict[str, dict[str, np.ndarray]]:
+    """Recompute the stats of the episodes and of the whole dataset from its data and video files, in place.
+
+    The episodes of each data file and each video file are split in tasks of about `frames_per_task` frames,
+    run by a process pool: the tasks of a data file stream the row groups holding their episodes by batches, and
+    only the frames sampled for the image and video stats are decoded. The stats of each task are merged into the
+    stats of the dataset with `aggregate_stats` as soon as it completes. The episodes metadata files are processed
+    one after the other, and only the stats of the episodes of the current one are kept until they are written,
+    so the memory stays bounded regardless of the size of the dataset.
+
+    Args:
+        dataset: The dataset, e.g. after editing its features.
+        quantile_list: Quantiles to compute. Defaults to `DEFAULT_QUANTILES`.
+        num_workers: Number of worker processes. With 0, the tasks are run in the main process.
+        batch_size: Number of rows of the data files read at once.
+        frames_per_task: Number of frames of the episodes of a task. An episode is never split.
+
+    Returns:
+        The new stats of the dataset, also written to `meta/stats.json` and to the episodes metadata.
+    """
+    meta = dataset.meta
+    start_time = time.perf_counter()
+    episodes = load_episodes(meta.root).to_pandas().sort_values("episode_index")
+    data_file_starts = (
+        episodes.groupby(["data/chunk_index", "data/file_index"])["dataset_from_index"].min().to_dict()
+    )
+    meta_file_columns = ["meta/episodes/chunk_index", "meta/episodes/file_index"]
+    plans = [
+        (
+            meta.root / DEFAULT_EPISODES_PATH.format(chunk_index=chunk_idx, file_index=file_idx),
+            meta_file_episodes["episode_index"].tolist(),
+            _plan_stats_tasks(
+                dataset, meta_file_episodes, data_file_starts, quantile_list, batch_size, frames_per_task
+            ),
+        )
+        for (chunk_idx, file_idx), meta_file_episodes in episodes.groupby(meta_file_columns)
+    ]
+
+    stats: dict[str, dict[str, np.ndarray]] = {}
+    executor = ProcessPoolExecutor(max_workers=num_workers) if num_workers > 0 else None
+    try:
+        with tqdm(total=sum(len(tasks) for _, _, tasks in plans), desc="Computing episodes stats") as pbar:
+            for episodes_path, episode_indices, tasks in plans:
+                if executor is not None:
+                    futures = [executor.submit(fn, *args) for fn, args in tasks]
+                    results = (future.result() for future in as_completed(futures))
+                else:
+                    results = (fn(*args) for fn, args in tasks)
+
+                episodes_stats: dict[int, dict[str, dict]] = {int(ep_idx): {} for ep_idx in episode_indices}
+                for task_stats in results:
+                    for ep_idx, ep_stats in task_stats.items():
+                        episodes_stats[ep_idx].update(ep_stats)
+                    stats = aggregate_stats([stats, *task_stats.values()])
+                    pbar.update(1)
+                _write_episodes_stats(episodes_path, episodes_stats)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    meta.stats = stats
+    write_stats(stats, meta.root)
+
+    elapsed = time.perf_counter() - start_time
+    logging.info(
+        f"Recomputed the stats of {meta.total_frames} frames in {elapsed:.1f}s "
+        f"({meta.total_frames / elapsed:.0f} frames/s)"
+    )
+    return stats
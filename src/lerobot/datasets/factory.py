@@ -99,6 +99,9 @@ def make_dataset(cfg: TrainPipelineConfig) -> LeRobotDataset | MultiLeRobotDatas
                 revision=cfg.dataset.revision,
                 video_backend=cfg.dataset.video_backend,
                 tolerance_s=cfg.tolerance_s,
+                frame_cache_mb=cfg.dataset.frame_cache_mb,
+                frame_cache_dir=cfg.dataset.frame_cache_dir,
+                return_uint8_images=cfg.dataset.return_uint8_images,
             )
         else:
             dataset = StreamingLeRobotDataset(
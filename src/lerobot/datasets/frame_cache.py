@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cache of decoded video frames, keyed by (video file, frame index).
+
+Frames are stored as uint8, which is lossless for decoded frames, in two tiers:
+- an in-memory LRU bounded by a budget in bytes, private to each process (e.g. each DataLoader worker),
+- optionally, one memory-mapped `.npy` shard per video file on disk. Shards are shared by all processes through
+  the page cache and persist across epochs and runs, so that frames are decoded only once.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+import torch
+
+
+def get_frame_shard_path(cache_dir: Path, video_path: str | Path) -> Path:
+    """Path of the on-disk shard of `video_path`. It changes whenever the video file is modified."""
+    stat = os.stat(video_path)
+    key = f"{Path(video_path).resolve()}-{stat.st_size}-{stat.st_mtime_ns}"
+    return cache_dir / f"{Path(video_path).stem}-{hashlib.sha1(key.encode()).hexdigest()[:16]}.npy"
+
+
+class FrameShard:
+    """Memory-mapped array of the decoded frames of one video file.
+
+    Rows are records of a "filled" flag and a uint8 frame, so that a frame and its flag always live in the same file
+    (even if several processes create the shard concurrently) and the frame shape is stored in the `.npy` header.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._array = np.load(self.path, mmap_mode="r+")
+
+    @classmethod
+    def create(cls, path: Path, num_frames: int, frame_shape: tuple[int, ...]) -> "FrameShard":
+        path = Path(path)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".shard-", suffix=".npy")
+            os.close(fd)
+            dtype = np.dtype([("filled", np.uint8), ("frame", np.uint8, tuple(frame_shape))])
+            array = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=(num_frames,))
+            array.flush()
+            del array
+            os.replace(tmp_path, path)
+        return cls(path)
+
+    def get(self, frame_index: int) -> torch.Tensor | None:
+        if frame_index >= len(self._array) or not self._array["filled"][frame_index]:
+            return None
+        return torch.from_numpy(np.array(self._array["frame"][frame_index]))
+
+    def put(self, frame_index: int, frame: torch.Tensor):
+        if frame_index >= len(self._array):
+            return
+        self._array["frame"][frame_index] = frame.numpy()
+        self._array["filled"][frame_index] = 1
+
+
+class DecodedFrameCache:
+    """Two-tier cache of decoded uint8 video frames, see the module docstring.
+
+    The shard path of a video file is computed the first time a process looks it up, so a video file modified
+    afterwards only gets a new shard in new processes (e.g. the DataLoader workers of the next epoch).
+
+    Args:
+        max_bytes: Budget in bytes of the in-memory tier. 0 disables it.
+        cache_dir: Directory of the on-disk shards. None disables the on-disk tier.
+    """
+
+    def __init__(self, max_bytes: int = 0, cache_dir: str | Path | None = None):
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must be >= 0, got {max_bytes}.")
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._frames: OrderedDict[tuple[str, int], torch.Tensor] = OrderedDict()
+        self._num_bytes = 0
+        self._shards: dict[str, FrameShard] = {}
+        self._shard_paths: dict[str, Path] = {}
+        self._lock = Lock()
+        self.reset_stats()
+
+    def get(self, video_path: str | Path, frame_indices: list[int]) -> list[torch.Tensor | None]:
+        """Return the cached frames of `video_path`, or None for frames which are not cached."""
+        video_path = str(video_path)
+        frames = []
+        with self._lock:
+            shard = self._get_shard(video_path)
+            for frame_index in frame_indices:
+                key = (video_path, frame_index)
+                frame = self._frames.get(key)
+                if frame is not None:
+                    self._frames.move_to_end(key)
+                    self._memory_hits += 1
+                elif shard is not None and (frame := shard.get(frame_index)) is not None:
+                    self._disk_hits += 1
+                    self._put_in_memory(key, frame)
+                else:
+                    self._misses += 1
+                frames.append(frame)
+        return frames
+
+    def put(self, video_path: str | Path, frame_indices: list[int], frames: torch.Tensor, num_frames: int):
+        """Cache `frames` (uint8, shape (len(frame_indices), C, H, W)) of a video file holding `num_frames`."""
+        video_path = str(video_path)
+        with self._lock:
+            if self.cache_dir is not None:
+                shard = self._get_shard(video_path)
+                if shard is None:
+                    shard = FrameShard.create(
+                        self._get_shard_path(video_path), num_frames, tuple(frames.shape[1:])
+                    )
+                    self._shards[video_path] = shard
+                for frame_index, frame in zip(frame_indices, frames, strict=True):
+                    shard.put(frame_index, frame)
+            for frame_index, frame in zip(frame_indices, frames, strict=True):
+                self._put_in_memory((video_path, frame_index), frame.clone())
+
+    def _get_shard(self, video_path: str) -> FrameShard | None:
+        """Open the shard of `video_path` if it exists, e.g. created by another process or a previous run."""
+        if self.cache_dir is None:
+            return None
+        if video_path not in self._shards:
+            shard_path = self._get_shard_path(video_path)
+            if not shard_path.exists():
+                return None
+            self._shards[video_path] = FrameShard(shard_path)
+        return self._shards[video_path]
+
+    def _get_shard_path(self, video_path: str) -> Path:
+        """Memoized `get_frame_shard_path`, which stats the video file on every call."""
+        if video_path not in self._shard_paths:
+            self._shard_paths[video_path] = get_frame_shard_path(self.cache_dir, video_path)
+        return self._shard_paths[video_path]
+
+    def _put_in_memory(self, key: tuple[str, int], frame: torch.Tensor):
+        if self.max_bytes == 0 or key in self._frames:
+            return
+        num_bytes = frame.numel() * frame.element_size()
+        if num_bytes > self.max_bytes:
+            return
+        self._frames[key] = frame
+        self._num_bytes += num_bytes
+        while self._num_bytes > self.max_bytes:
+            _, evicted = self._frames.popitem(last=False)
+            self._num_bytes -= evicted.numel() * evicted.element_size()
+
+    def get_stats(self) -> dict[str, float]:
+        """Return the lookup counters since the creation of the cache or the last call to `reset_stats`."""
+        with self._lock:
+            num_lookups = self._memory_hits + self._disk_hits + self._misses
+            return {
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": (self._memory_hits + self._disk_hits) / num_lookups if num_lookups > 0 else 0.0,
+                "num_frames_in_memory": len(self._frames),
+                "num_bytes_in_memory": self._num_bytes,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._memory_hits = 0
+            self._disk_hits = 0
+            self._misses = 0
+
+    def __getstate__(self) -> dict:
+        # Each process (e.g. DataLoader worker) starts with an empty memory tier and re-opens the shards
+        state = self.__dict__.copy()
+        state["_frames"] = OrderedDict()
+        state["_num_bytes"] = 0
+        state["_shards"] = {}
+        state["_shard_paths"] = {}
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = Lock()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Memory-mapped columnar store for the low-dimensional features of a LeRobotDataset.
+
+Each numeric column of the parquet data files (state, action, reward, timestamps, indices, ...) is materialized
+once into a contiguous `.npy` file under `data/memmap/`, with one row per absolute dataset index. Columns are then
+memory-mapped, so that items can be served with `torch.from_numpy` over slices of the mapping and pages are shared
+through the page cache between DataLoader workers.
+"""
+
+import json
+import logging
+import shutil
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from lerobot.datasets.utils import DATA_DIR
+
+MEMMAP_DIR = DATA_DIR + "/memmap"
+MEMMAP_MANIFEST = "manifest.json"
+MEMMAP_VERSION = 1
+
+
+def arrow_to_numpy(column: pa.Array | pa.ChunkedArray) -> np.ndarray | None:
+    """Convert a column of scalars or (nested) fixed size lists to a numpy array of shape (num_rows, *shape).
+
+    Floats are returned as float32 and integers as int64, which matches the tensors produced by
+    `hf_transform_to_torch`. Returns None for columns that can't be represented as a single dense numeric array
+    (variable length lists, extension types, strings, null values, etc.).
+    """
+    values = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    if values.null_count > 0:
+        return None
+    shape = [len(values)]
+    while pa.types.is_fixed_size_list(values.type) or pa.types.is_list(values.type):
+        if pa.types.is_fixed_size_list(values.type):
+            size = values.type.list_size
+        else:
+            # Variable size lists (e.g. parquet files read without the dataset features) need a uniform length
+            lengths = pc.list_value_length(values).to_numpy(zero_copy_only=False)
+            size = int(lengths[0]) if len(lengths) > 0 else 0
+            if (lengths != size).any():
+                return None
+        shape.append(size)
+        values = values.flatten()
+        if values.null_count > 0:
+            return None
+
+    if pa.types.is_floating(values.type):
+        dtype = np.float32
+    elif pa.types.is_integer(values.type):
+        dtype = np.int64
+    elif pa.types.is_boolean(values.type):
+        dtype = np.bool_
+    else:
+        return None
+    return values.to_numpy(zero_copy_only=False).astype(dtype, copy=False).reshape(shape)
+
+
+def get_memmap_keys(features: dict[str, dict]) -> list[str]:
+    """Keys of the features that can be stored in a `MemmapFrameStore` (i.e. all but visual and string ones)."""
+    return [key for key, ft in features.items() if ft["dtype"] not in ["image", "video", "string"]]
+
+
+def _get_parquet_files(root: Path) -> list[Path]:
+    return sorted((root / DATA_DIR).glob("*/*.parquet"))
+
+
+def _get_source_signature(root: Path) -> list[dict]:
+    """Identify the parquet files a store was built from, so that a stale store can be detected."""
+    signature = []
+    for path in _get_parquet_files(root):
+        stat = path.stat()
+        signature.append(
+            {"path": str(path.relative_to(root)), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        )
+    return signature
+
+
+class MemmapFrameStore:
+    """Read-only, memory-mapped columns of a LeRobotDataset, indexed by absolute dataset index.
+
+    Use `MemmapFrameStore.load_or_build(root, features)` to get a store: it is built from the parquet files on
+    first use (reading one row group at a time, so that memory stays bounded) and re-built whenever these files
+    change. Columns are mapped copy-on-write, so that tensors created with `torch.from_numpy` are writable without
+    ever modifying the files on disk.
+    """
+
+    def __init__(self, directory: Path, keys: list[str]):
+        self.directory = Path(directory)
+        self._keys = list(keys)
+        self._columns: dict[str, np.ndarray] | None = None
+
+    @classmethod
+    def load_or_build(cls, root: str | Path, features: dict[str, dict]) -> "MemmapFrameStore":
+        root = Path(root)
+        directory = root / MEMMAP_DIR
+        keys = get_memmap_keys(features)
+        signature = _get_source_signature(root)
+
+        manifest_path = directory / MEMMAP_MANIFEST
+        if manifest_path.is_file():
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if (
+                manifest.get("version") == MEMMAP_VERSION
+                and manifest.get("source") == signature
+                and set(keys).issubset(manifest.get("keys", []))
+            ):
+                return cls(directory, keys)
+
+        build_memmap_frame_store(root, keys, signature)
+        return cls(directory, keys)
+
+    @property
+    def columns(self) -> dict[str, np.ndarray]:
+        # Mappings are opened lazily so that they are re-created in each process after unpickling
+        if self._columns is None:
+            self._columns = {
+                key: np.load(self.directory / f"{key}.npy", mmap_mode="c", allow_pickle=False)
+                for key in self._keys
+            }
+        return self._columns
+
+    def keys(self) -> list[str]:
+        return list(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.columns[key]
+
+    def __len__(self) -> int:
+        return len(self.columns[self._keys[0]]) if self._keys else 0
+
+    def __getstate__(self) -> dict:
+        # Don't pickle the mapped arrays (e.g. when spawning DataLoader workers), as numpy would copy them
+        state = self.__dict__.copy()
+        state["_columns"] = None
+        return state
+
+
+def build_memmap_frame_store(root: str | Path, keys: list[str], signature: list[dict] | None = None) -> Path:
+    """Materialize `keys` of the parquet data files of the dataset at `root` into `.npy` files.
+
+    Rows are placed at their absolute dataset index (the "index" column). The store is written in a temporary
+    directory and moved into place once complete, so that a partially written store is never loaded.
+    """
+    root = Path(root)
+    directory = root / MEMMAP_DIR
+    paths = _get_parquet_files(root)
+    if len(paths) == 0:
+        raise FileNotFoundError(f"Provided directory does not contain any parquet file: {root / DATA_DIR}")
+    if signature is None:
+        signature = _get_source_signature(root)
+
+    num_frames = sum(pq.read_metadata(path).num_rows for path in paths)
+    logging.info(f"Building memory-mapped frame store for {num_frames} frames in {directory}")
+
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=directory.parent, prefix=".memmap-"))
+    try:
+        columns: dict[str, np.ndarray] = {}
+        read_columns = list(dict.fromkeys([*keys, "index"]))
+        for path in paths:
+            parquet_file = pq.ParquetFile(path)
+            for row_group in range(parquet_file.num_row_groups):
+                table = parquet_file.read_row_group(row_group, columns=read_columns)
+                indices = table.column("index").to_numpy()
+                if len(indices) > 0 and (indices.min() < 0 or indices.max() >= num_frames):
+                    raise ValueError(f"Column 'index' of {path} is not within [0, {num_frames}).")
+                for key in keys:
+                    values = arrow_to_numpy(table.column(key))
+                    if values is None:
+                        raise ValueError(f"Feature '{key}' can't be stored as a dense numeric array.")
+                    if key not in columns:
+                        columns[key] = np.lib.format.open_memmap(
+                            tmp_dir / f"{key}.npy",
+                            mode="w+",
+                            dtype=values.dtype,
+                            shape=(num_frames, *values.shape[1:]),
+                        )
+                    columns[key][indices] = values
+
+        for column in columns.values():
+            column.flush()
+        del columns
+
+        with open(tmp_dir / MEMMAP_MANIFEST, "w") as f:
+            json.dump({"version": MEMMAP_VERSION, "keys": keys, "source": signature}, f, indent=4)
+
+        if directory.exists():
+            shutil.rmtree(directory)
+        tmp_dir.rename(directory)
+    finally:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+
+    return directory
@@ -13,9 +13,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import contextlib
 import multiprocessing
 import queue
+import sys
 import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
 
 import numpy as np
@@ -104,26 +110,115 @@ def write_image(image: np.ndarray | PIL.Image.Image, fpath: Path, compress_level
         print(f"Error writing image {fpath}: {e}")
 
 
-def worker_thread_loop(queue: queue.Queue):
+@dataclass(frozen=True)
+class SharedFrame:
+    """Reference to a frame stored in a slot of a `SharedFrameRing`, sent to the worker processes instead of the
+    frame itself."""
+
+    shm_name: str
+    slot: int
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class SharedFrameRing:
+    """Fixed number of slots in shared memory, each holding one frame of a given shape and dtype.
+
+    It is created by the process saving the frames. Worker processes attach to it by name to read frames without
+    copying them, and hand the slots back once the frames are written.
+    """
+
+    def __init__(self, shape: tuple[int, ...], dtype: np.dtype, num_slots: int):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.num_slots = num_slots
+        self.slot_nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=max(self.slot_nbytes * num_slots, 1))
+        self.free_slots = deque(range(num_slots))
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, slot: int, image: np.ndarray) -> SharedFrame:
+        get_shared_frame_array(self.shm, slot, self.shape, self.dtype)[...] = image
+        return SharedFrame(self.name, slot, self.shape, self.dtype.str)
+
+    def close(self):
+        self.shm.close()
+        # Already unlinked if the resource tracker of an exited worker cleaned it up
+        with contextlib.suppress(FileNotFoundError):
+            self.shm.unlink()
+
+
+def get_shared_frame_array(
+    shm: shared_memory.SharedMemory, slot: int, shape: tuple[int, ...], dtype: np.dtype
+) -> np.ndarray:
+    dtype = np.dtype(dtype)
+    offset = slot * int(np.prod(shape)) * dtype.itemsize
+    return np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+
+
+class SharedFrameReader:
+    """Reads the frames of the shared memory rings from a worker process, attaching to each ring once."""
+
+    def __init__(self):
+        self._shms: dict[str, shared_memory.SharedMemory] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _attach(name: str) -> shared_memory.SharedMemory:
+        if sys.version_info >= (3, 13):
+            return shared_memory.SharedMemory(name=name, track=False)
+        # Before Python 3.13, attaching registers the segment with the resource tracker again. The worker shares
+        # the tracker of the process that created the ring (see `AsyncImageWriter`), so the ring stays registered
+        # once, until that process unlinks it.
+        return shared_memory.SharedMemory(name=name)
+
+    def read(self, frame: SharedFrame) -> np.ndarray:
+        with self._lock:
+            if frame.shm_name not in self._shms:
+                self._shms[frame.shm_name] = self._attach(frame.shm_name)
+            shm = self._shms[frame.shm_name]
+        return get_shared_frame_array(shm, frame.slot, frame.shape, frame.dtype)
+
+    def close(self):
+        for shm in self._shms.values():
+            shm.close()
+        self._shms = {}
+
+
+def worker_thread_loop(
+    queue: queue.Queue,
+    released_slots: queue.Queue | None = None,
+    shared_frame_reader: SharedFrameReader | None = None,
+):
     while True:
         item = queue.get()
         if item is None:
             queue.task_done()
             break
         image_array, fpath, compress_level = item
-        write_image(image_array, fpath, compress_level)
+        if isinstance(image_array, SharedFrame):
+            write_image(shared_frame_reader.read(image_array), fpath, compress_level)
+            # The slot can be reused by the next frames
+            released_slots.put((image_array.shm_name, image_array.slot))
+        else:
+            write_image(image_array, fpath, compress_level)
         queue.task_done()
 
 
-def worker_process(queue: queue.Queue, num_threads: int):
+def worker_process(queue: queue.Queue, num_threads: int, released_slots: queue.Queue | None = None):
+    shared_frame_reader = SharedFrameReader()
     threads = []
     for _ in range(num_threads):
-        t = threading.Thread(target=worker_thread_loop, args=(queue,))
+        t = threading.Thread(target=worker_thread_loop, args=(queue, released_slots, shared_frame_reader))
         t.daemon = True
         t.start()
         threads.append(t)
     for t in threads:
         t.join()
+    shared_frame_reader.close()
 
 
 class AsyncImageWriter:
@@ -139,15 +234,25 @@ class AsyncImageWriter:
     The optimal number of processes and threads depends on your computer capabilities.
     We advise to use 4 threads per camera with 0 processes. If the fps is not stable, try to increase or lower
     the number of threads. If it is still not stable, try to use 1 subprocess, or more.
+
+    With subprocesses, array frames are copied once into a shared memory ring of `num_shared_slots` slots per
+    frame shape (i.e. per camera resolution), and only slot indices go through the queue, instead of pickling the
+    frames. When all the slots of a ring are waiting to be written, `save_image` blocks until a worker releases
+    one: frames are never dropped, since each of them is a file of the episode. `get_stats` reports these
+    blocked frames and the depth of the queue. Set `num_shared_slots=0` to pickle frames through the queue.
     """
 
-    def __init__(self, num_processes: int = 0, num_threads: int = 1):
+    def __init__(self, num_processes: int = 0, num_threads: int = 1, num_shared_slots: int = 32):
         self.num_processes = num_processes
         self.num_threads = num_threads
+        self.num_shared_slots = num_shared_slots
         self.queue = None
         self.threads = []
         self.processes = []
+        self.rings: dict[tuple, SharedFrameRing] = {}
+        self.released_slots = None
         self._stopped = False
+        self.reset_stats()
 
         if num_threads <= 0 and num_processes <= 0:
             raise ValueError("Number of threads and processes must be greater than zero.")
@@ -163,8 +268,15 @@ class AsyncImageWriter:
         else:
             # Use multiprocessing
             self.queue = multiprocessing.JoinableQueue()
+            if self.num_shared_slots > 0:
+                self.released_slots = multiprocessing.Queue()
+                # Started before the workers so that they share it. A tracker started by a worker would unlink the
+                # rings it attached to when the worker exits.
+                resource_tracker.ensure_running()
             for _ in range(self.num_processes):
-                p = multiprocessing.Process(target=worker_process, args=(self.queue, self.num_threads))
+                p = multiprocessing.Process(
+                    target=worker_process, args=(self.queue, self.num_threads, self.released_slots)
+                )
                 p.daemon = True
                 p.start()
                 self.processes.append(p)
@@ -175,7 +287,59 @@ class AsyncImageWriter:
         if isinstance(image, torch.Tensor):
             # Convert tensor to numpy array to minimize main process time
             image = image.cpu().numpy()
+        if self.released_slots is not None and isinstance(image, np.ndarray):
+            image = self._write_shared_frame(image)
         self.queue.put((image, fpath, compress_level))
+        self._num_frames += 1
+
+    def _write_shared_frame(self, image: np.ndarray) -> SharedFrame:
+        key = (image.shape, image.dtype.str)
+        if key not in self.rings:
+            self.rings[key] = SharedFrameRing(image.shape, image.dtype, self.num_shared_slots)
+        ring = self.rings[key]
+
+        self._collect_released_slots(block=False)
+        if not ring.free_slots:
+            # Backpressure: wait for the workers to write a frame of the same shape
+            self._num_blocked_frames += 1
+            start = time.perf_counter()
+            while not ring.free_slots:
+                self._collect_released_slots(block=True)
+            self._blocked_time_s += time.perf_counter() - start
+        self._num_shared_frames += 1
+        return ring.write(ring.free_slots.popleft(), image)
+
+    def _collect_released_slots(self, block: bool):
+        rings_by_name = {ring.name: ring for ring in self.rings.values()}
+        while True:
+            try:
+                shm_name, slot = self.released_slots.get(block=block)
+            except queue.Empty:
+                return
+            rings_by_name[shm_name].free_slots.append(slot)
+            block = False
+
+    def get_stats(self) -> dict[str, float]:
+        """Return the number of frames saved, sent through shared memory and blocked for lack of free slots
+        since the creation of the writer or the last call to `reset_stats`, and the current depth of the queue."""
+        try:
+            queue_depth = self.queue.qsize()
+        except NotImplementedError:
+            # `multiprocessing.Queue.qsize` isn't implemented on macOS
+            queue_depth = -1
+        return {
+            "num_frames": self._num_frames,
+            "num_shared_frames": self._num_shared_frames,
+            "num_blocked_frames": self._num_blocked_frames,
+            "blocked_time_s": self._blocked_time_s,
+            "queue_depth": queue_depth,
+        }
+
+    def reset_stats(self):
+        self._num_frames = 0
+        self._num_shared_frames = 0
+        self._num_blocked_frames = 0
+        self._blocked_time_s = 0.0
 
     def wait_until_done(self):
         self.queue.join()
@@ -199,5 +363,11 @@ class AsyncImageWriter:
                     p.terminate()
             self.queue.close()
             self.queue.join_thread()
+            if self.released_slots is not None:
+                self.released_slots.close()
+                self.released_slots.join_thread()
+            for ring in self.rings.values():
+                ring.close()
+            self.rings = {}
 
         self._stopped = True
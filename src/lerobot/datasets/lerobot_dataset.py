@@ -19,6 +19,7 @@ import logging
 import shutil
 import tempfile
 from collections.abc import Callable
+from functools import partial
 from pathlib import Path
 
 import datasets
@@ -34,6 +35,8 @@ from huggingface_hub import HfApi, snapshot_download
 from huggingface_hub.errors import RevisionNotFoundError
 
 from lerobot.datasets.compute_stats import aggregate_stats, compute_episode_stats
+from lerobot.datasets.frame_cache import DecodedFrameCache
+from lerobot.datasets.frame_store import MEMMAP_DIR, MemmapFrameStore, arrow_to_numpy
 from lerobot.datasets.image_writer import AsyncImageWriter, write_image
 from lerobot.datasets.utils import (
     DEFAULT_EPISODES_PATH,
@@ -67,9 +70,12 @@ from lerobot.datasets.utils import (
     write_tasks,
 )
 from lerobot.datasets.video_utils import (
+    VIDEO_INDEX_DIR,
+    StreamingVideoEncoder,
     VideoFrame,
     concatenate_video_files,
     decode_video_frames,
+    decode_video_frames_batch,
     encode_video_frames,
     get_safe_default_codec,
     get_video_duration_in_s,
@@ -79,6 +85,7 @@ from lerobot.utils.constants import HF_LEROBOT_HOME
 
 CODEBASE_VERSION = "v3.0"
 VALID_VIDEO_CODECS = {"h264", "hevc", "libsvtav1"}
+VALID_DATA_BACKENDS = {"hf", "memmap"}
 
 
 class LeRobotDatasetMetadata:
@@ -541,6 +548,14 @@ class LeRobotDatasetMetadata:
         return obj
 
 
+def _check_streaming_encoding(streaming_encoding: bool, batch_encoding_size: int) -> None:
+    if streaming_encoding and batch_encoding_size > 1:
+        raise ValueError(
+            "streaming_encoding encodes the videos while recording, it can't be used with "
+            f"batch_encoding_size > 1 (got {batch_encoding_size})."
+        )
+
+
 def _encode_video_worker(
     video_key: str, episode_index: int, root: Path, fps: int, vcodec: str = "libsvtav1"
 ) -> Path:
@@ -567,6 +582,11 @@ class LeRobotDataset(torch.utils.data.Dataset):
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
         vcodec: str = "libsvtav1",
+        data_backend: str = "hf",
+        frame_cache_mb: int = 0,
+        frame_cache_dir: str | Path | None = None,
+        return_uint8_images: bool = False,
+        streaming_encoding: bool = False,
     ):
         """
         2 modes are available for instantiating this class, depending on 2 different use cases:
@@ -682,10 +702,34 @@ class LeRobotDataset(torch.utils.data.Dataset):
             vcodec (str, optional): Video codec for encoding videos during recording. Options: 'h264', 'hevc',
                 'libsvtav1'. Defaults to 'libsvtav1'. Use 'h264' for faster encoding on systems where AV1
                 encoding is CPU-heavy.
+            data_backend (str, optional): Backend used to read non-visual features. 'hf' reads everything
+                from the Hugging Face dataset. 'memmap' materializes numeric features (state, action, reward,
+                timestamps, indices...) once into memory-mapped `.npy` files under 'data/memmap/' and serves
+                them as zero-copy tensors, which reduces per-item overhead and shares memory between DataLoader
+                workers. Images are still read from the Hugging Face dataset. Defaults to 'hf'.
+            frame_cache_mb (int, optional): Budget in MiB of an in-memory cache of decoded video frames, kept
+                as uint8 by each process (e.g. each DataLoader worker). Frames read again in later epochs are
+                then served without decoding. Defaults to 0 (no in-memory cache).
+            frame_cache_dir (str | Path | None, optional): Directory where decoded video frames are also
+                cached as uint8 memory-mapped shards, one per video file. Shards are shared by DataLoader
+                workers and reused across runs. Defaults to None (no on-disk cache).
+            return_uint8_images (bool, optional): Return camera frames (decoded from videos or read from
+                images) as uint8 tensors in [0, 255] instead of float32 tensors in [0, 1]. This divides by 4 the
+                bytes sent through DataLoader workers, pinned memory and host to device copies. Frames must then
+                be converted on the device, e.g. with `ImageToFloatProcessorStep`. Defaults to False.
+            streaming_encoding (bool, optional): When recording, encode the frames of video features into the
+                episode's video while they are added with `add_frame`, in a background thread per camera,
+                instead of writing them as PNG files which are encoded by `save_episode`. Not compatible with
+                `batch_encoding_size` > 1. Defaults to False.
         """
         super().__init__()
         if vcodec not in VALID_VIDEO_CODECS:
             raise ValueError(f"Invalid vcodec '{vcodec}'. Must be one of: {sorted(VALID_VIDEO_CODECS)}")
+        _check_streaming_encoding(streaming_encoding, batch_encoding_size)
+        if data_backend not in VALID_DATA_BACKENDS:
+            raise ValueError(
+                f"Invalid data_backend '{data_backend}'. Must be one of: {sorted(VALID_DATA_BACKENDS)}"
+            )
         self.repo_id = repo_id
         self.root = Path(root) if root else HF_LEROBOT_HOME / repo_id
         self.image_transforms = image_transforms
@@ -698,9 +742,17 @@ class LeRobotDataset(torch.utils.data.Dataset):
         self.batch_encoding_size = batch_encoding_size
         self.episodes_since_last_encoding = 0
         self.vcodec = vcodec
+        self.data_backend = data_backend
+        self.frame_store = None
+        self.return_uint8_images = return_uint8_images
+        self.streaming_encoding = streaming_encoding
+        self.frame_cache = None
+        if frame_cache_mb > 0 or frame_cache_dir is not None:
+            self.frame_cache = DecodedFrameCache(frame_cache_mb * 2**20, frame_cache_dir)
 
         # Unused attributes
         self.image_writer = None
+        self.video_encoders = {}
         self.episode_buffer = None
         self.writer = None
         self.latest_episode = None
@@ -746,6 +798,12 @@ class LeRobotDataset(torch.utils.data.Dataset):
             check_delta_timestamps(self.delta_timestamps, self.fps, self.tolerance_s)
             self.delta_indices = get_delta_indices(self.delta_timestamps, self.fps)
 
+        # Lookup tables for the vectorized delta timestamps query path, built lazily on first access
+        self._reset_query_tables()
+
+        if self.data_backend == "memmap":
+            self.frame_store = MemmapFrameStore.load_or_build(self.root, self.features)
+
     def _close_writer(self) -> None:
         """Close and cleanup the parquet writer if it exists."""
         writer = getattr(self, "writer", None)
@@ -771,7 +829,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         upload_large_folder: bool = False,
         **card_kwargs,
     ) -> None:
-        ignore_patterns = ["images/"]
+        ignore_patterns = ["images/", f"{MEMMAP_DIR}/", f"{VIDEO_INDEX_DIR}/"]
         if not push_videos:
             ignore_patterns.append("videos/")
 
@@ -860,7 +918,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         """hf_dataset contains all the observations, states, actions, rewards, etc."""
         features = get_hf_features_from_features(self.features)
         hf_dataset = load_nested_dataset(self.root / "data", features=features, episodes=self.episodes)
-        hf_dataset.set_transform(hf_transform_to_torch)
+        hf_dataset.set_transform(partial(hf_transform_to_torch, uint8_images=self.return_uint8_images))
         return hf_dataset
 
     def _check_cached_episodes_sufficient(self) -> bool:
@@ -935,9 +993,110 @@ class LeRobotDataset(torch.utils.data.Dataset):
         else:
             return get_hf_features_from_features(self.features)
 
+    def _reset_query_tables(self) -> None:
+        """Drop the lookup tables used by the vectorized query path, so that they get rebuilt on next access."""
+        self._episode_table = None
+        self._episode_table_source = None
+        self._column_cache: dict[str, np.ndarray | None] = {}
+        self._column_cache_source = None
+        self._abs_to_rel_table = None
+        self._video_num_frames = None
+
+    def _get_episode_table(self) -> dict[str, np.ndarray]:
+        """Per-episode lookup table, indexed by episode_index.
+
+        Holds the absolute dataset range of each episode ("dataset_from_index", "dataset_to_index") and, for
+        video datasets, the mp4 file of each episode ("videos/{key}/chunk_index", "videos/{key}/file_index") and
+        its time range in that file ("videos/{key}/from_timestamp", "videos/{key}/to_timestamp"). Reading these
+        values from `self.meta.episodes` row by row is slow, as each access formats a full row.
+        """
+        if self._episode_table is None or self._episode_table_source is not self.meta.episodes:
+            columns = ["episode_index", "dataset_from_index", "dataset_to_index"]
+            for vid_key in self.meta.video_keys:
+                columns += [
+                    f"videos/{vid_key}/chunk_index",
+                    f"videos/{vid_key}/file_index",
+                    f"videos/{vid_key}/from_timestamp",
+                    f"videos/{vid_key}/to_timestamp",
+                ]
+            episodes = self.meta.episodes.with_format("arrow", columns=columns)[:]
+            ep_indices = episodes["episode_index"].to_numpy().astype(np.int64)
+            size = int(ep_indices.max()) + 1 if len(ep_indices) > 0 else 0
+
+            table = {}
+            for key in columns[1:]:
+                dtype = np.float64 if key.endswith("_timestamp") else np.int64
+                values = np.zeros(size, dtype=dtype)
+                values[ep_indices] = episodes[key].to_numpy()
+                table[key] = values
+
+            self._episode_table = table
+            self._episode_table_source = self.meta.episodes
+            self._video_num_frames = None
+        return self._episode_table
+
+    def _get_numpy_column(self, key: str) -> np.ndarray | None:
+        """Return a column of hf_dataset as a contiguous numpy array, or None if it can't be represented as one.
+
+        Columns are materialized once per loaded hf_dataset, so that delta windows can be gathered with a
+        single fancy-indexing operation instead of one row lookup per index. Only numeric features are cached
+        (images, videos and strings are not). Dtypes are aligned with `hf_transform_to_torch`, i.e. floats are
+        returned as float32 and integers as int64.
+        """
+        if self._column_cache_source is not self.hf_dataset:
+            self._column_cache = {}
+            self._column_cache_source = self.hf_dataset
+            self._abs_to_rel_table = None
+
+        if key not in self._column_cache:
+            column = None
+            if key in self.hf_dataset.column_names and self.features[key]["dtype"] not in [
+                "image",
+                "video",
+                "string",
+            ]:
+                column = arrow_to_numpy(self.hf_dataset.with_format("arrow", columns=[key])[:][key])
+            self._column_cache[key] = column
+        return self._column_cache[key]
+
+    def _to_relative_indices(self, abs_indices: np.ndarray) -> np.ndarray:
+        """Map absolute dataset indices to positions in hf_dataset (which differ when `episodes` is set)."""
+        if self._absolute_to_relative_idx is None:
+            return abs_indices
+
+        # Calling _get_numpy_column first ensures the table gets reset whenever hf_dataset is reloaded
+        index_column = self._get_numpy_column("index")
+        if self._abs_to_rel_table is None:
+            table = np.full(int(index_column.max()) + 1, -1, dtype=np.int64)
+            table[index_column] = np.arange(len(index_column), dtype=np.int64)
+            self._abs_to_rel_table = table
+        return self._abs_to_rel_table[abs_indices]
+
+    def _gather_column(self, key: str, abs_indices: np.ndarray) -> np.ndarray | None:
+        """Gather rows of a numeric column at absolute dataset indices, or return None if `key` isn't numeric."""
+        if self.frame_store is not None and key in self.frame_store:
+            return self.frame_store[key][abs_indices]
+        column = self._get_numpy_column(key)
+        if column is None:
+            return None
+        return column[self._to_relative_indices(abs_indices)]
+
+    def _get_frame_store_item(self, idx: int) -> dict:
+        """Read a single frame from the memory-mapped frame store, and the remaining columns from hf_dataset."""
+        abs_idx = idx if self._absolute_to_relative_idx is None else int(self._get_numpy_column("index")[idx])
+        # Slicing (rather than indexing) keeps a view on the mapping, also for scalar features
+        item = {
+            key: torch.from_numpy(self.frame_store[key][abs_idx : abs_idx + 1]).squeeze(0)
+            for key in self.frame_store
+        }
+        other_columns = [key for key in self.hf_dataset.column_names if key not in self.frame_store]
+        if len(other_columns) > 0:
+            item.update(self.hf_dataset.select_columns(other_columns)[idx])
+        return item
+
     def _get_query_indices(
         self, abs_idx: int, ep_idx: int
-    ) -> tuple[dict[str, list[int]], dict[str, torch.Tensor]]:
+    ) -> tuple[dict[str, np.ndarray], dict[str, torch.Tensor]]:
         """Compute query indices for delta timestamps.
 
         Args:
@@ -946,51 +1105,44 @@ class LeRobotDataset(torch.utils.data.Dataset):
 
         Returns:
             A tuple of (query_indices, padding) where:
-            - query_indices: Dict mapping keys to lists of absolute indices to query
+            - query_indices: Dict mapping keys to arrays of absolute indices to query
             - padding: Dict mapping "{key}_is_pad" to boolean tensors indicating padded positions
         """
-        ep = self.meta.episodes[ep_idx]
-        ep_start = ep["dataset_from_index"]
-        ep_end = ep["dataset_to_index"]
-        query_indices = {
-            key: [max(ep_start, min(ep_end - 1, abs_idx + delta)) for delta in delta_idx]
-            for key, delta_idx in self.delta_indices.items()
-        }
-        padding = {  # Pad values outside of current episode range
-            f"{key}_is_pad": torch.BoolTensor(
-                [(abs_idx + delta < ep_start) | (abs_idx + delta >= ep_end) for delta in delta_idx]
-            )
-            for key, delta_idx in self.delta_indices.items()
-        }
+        episode_table = self._get_episode_table()
+        ep_start = episode_table["dataset_from_index"][ep_idx]
+        ep_end = episode_table["dataset_to_index"][ep_idx]
+        query_indices = {}
+        padding = {}
+        for key, delta_idx in self.delta_indices.items():
+            indices = abs_idx + np.asarray(delta_idx, dtype=np.int64)
+            query_indices[key] = np.clip(indices, ep_start, ep_end - 1)
+            # Pad values outside of current episode range
+            padding[f"{key}_is_pad"] = torch.from_numpy((indices < ep_start) | (indices >= ep_end))
         return query_indices, padding
 
     def _get_query_timestamps(
         self,
         current_ts: float,
-        query_indices: dict[str, list[int]] | None = None,
+        query_indices: dict[str, np.ndarray] | None = None,
     ) -> dict[str, list[float]]:
         query_timestamps = {}
         for key in self.meta.video_keys:
             if query_indices is not None and key in query_indices:
-                if self._absolute_to_relative_idx is not None:
-                    relative_indices = [self._absolute_to_relative_idx[idx] for idx in query_indices[key]]
-                    timestamps = self.hf_dataset[relative_indices]["timestamp"]
-                else:
-                    timestamps = self.hf_dataset[query_indices[key]]["timestamp"]
-                query_timestamps[key] = torch.stack(timestamps).tolist()
+                query_timestamps[key] = self._gather_column("timestamp", query_indices[key]).tolist()
             else:
                 query_timestamps[key] = [current_ts]
 
         return query_timestamps
 
-    def _query_hf_dataset(self, query_indices: dict[str, list[int]]) -> dict:
+    def _query_hf_dataset(self, query_indices: dict[str, np.ndarray]) -> dict:
         """
         Query dataset for indices across keys, skipping video keys.
 
-        Tries column-first [key][indices] for speed, falls back to row-first.
+        Numeric columns are gathered in one vectorized operation from the memory-mapped frame store or their
+        cached numpy representation, other columns (e.g. images) fall back to hf_dataset lookups.
 
         Args:
-            query_indices: Dict mapping keys to index lists to retrieve
+            query_indices: Dict mapping keys to index arrays to retrieve
 
         Returns:
             Dict with stacked tensors of queried data (video keys excluded)
@@ -999,39 +1151,141 @@ class LeRobotDataset(torch.utils.data.Dataset):
         for key, q_idx in query_indices.items():
             if key in self.meta.video_keys:
                 continue
+            values = self._gather_column(key, q_idx)
+            if values is not None:
+                result[key] = torch.from_numpy(values)
+                continue
+
             # Map absolute indices to relative indices if needed
-            relative_indices = (
-                q_idx
-                if self._absolute_to_relative_idx is None
-                else [self._absolute_to_relative_idx[idx] for idx in q_idx]
-            )
+            relative_indices = self._to_relative_indices(q_idx).tolist()
             try:
                 result[key] = torch.stack(self.hf_dataset[key][relative_indices])
             except (KeyError, TypeError, IndexError):
                 result[key] = torch.stack(self.hf_dataset[relative_indices][key])
         return result
 
+    def _get_video_queries(
+        self, query_timestamps: dict[str, list[float]], ep_idx: int
+    ) -> dict[str, tuple[Path, list[float]]]:
+        """Resolve, for each camera, the mp4 file of the episode and the timestamps to decode within that file."""
+        episode_table = self._get_episode_table()
+        video_queries = {}
+        for vid_key, query_ts in query_timestamps.items():
+            # Episodes are stored sequentially on a single mp4 to reduce the number of files.
+            # Thus we load the start timestamp of the episode on this mp4 and,
+            # shift the query timestamp accordingly.
+            from_timestamp = float(episode_table[f"videos/{vid_key}/from_timestamp"][ep_idx])
+            shifted_query_ts = [from_timestamp + ts for ts in query_ts]
+
+            fpath = self.meta.video_path.format(
+                video_key=vid_key,
+                chunk_index=int(episode_table[f"videos/{vid_key}/chunk_index"][ep_idx]),
+                file_index=int(episode_table[f"videos/{vid_key}/file_index"][ep_idx]),
+            )
+            video_queries[vid_key] = (self.root / fpath, shifted_query_ts)
+        return video_queries
+
+    def _get_video_num_frames(self, video_path: Path) -> int:
+        """Upper bound of the number of frames of a video file, from the time range of the episodes it holds."""
+        if self._video_num_frames is None:
+            episode_table = self._get_episode_table()
+            self._video_num_frames = {}
+            for vid_key in self.meta.video_keys:
+                for chunk_idx, file_idx, to_timestamp in zip(
+                    episode_table[f"videos/{vid_key}/chunk_index"],
+                    episode_table[f"videos/{vid_key}/file_index"],
+                    episode_table[f"videos/{vid_key}/to_timestamp"],
+                    strict=True,
+                ):
+                    fpath = self.root / self.meta.video_path.format(
+                        video_key=vid_key, chunk_index=int(chunk_idx), file_index=int(file_idx)
+                    )
+                    num_frames = round(float(to_timestamp) * self.fps) + 1
+                    self._video_num_frames[fpath] = max(self._video_num_frames.get(fpath, 0), num_frames)
+        return self._video_num_frames[Path(video_path)]
+
+    def _decode_video_frames(
+        self, video_path: Path, timestamps: list[float], batched: bool = False
+    ) -> torch.Tensor:
+        """Decode frames at `timestamps` of a video file, going through `self.frame_cache` when enabled."""
+        decode_fn = decode_video_frames_batch if batched else decode_video_frames
+        if self.frame_cache is None:
+            return decode_fn(
+                video_path,
+                timestamps,
+                self.tolerance_s,
+                self.video_backend,
+                return_uint8=self.return_uint8_images,
+            )
+
+        frame_indices = [round(ts * self.fps) for ts in timestamps]
+        frames = self.frame_cache.get(video_path, frame_indices)
+        missing = [i for i, frame in enumerate(frames) if frame is None]
+        if len(missing) > 0:
+            decoded = decode_fn(
+                video_path,
+                [timestamps[i] for i in missing],
+                self.tolerance_s,
+                self.video_backend,
+                return_uint8=True,
+            )
+            self.frame_cache.put(
+                video_path,
+                [frame_indices[i] for i in missing],
+                decoded,
+                self._get_video_num_frames(video_path),
+            )
+            for i, frame in zip(missing, decoded, strict=True):
+                frames[i] = frame
+        frames = torch.stack(frames)
+        return frames if self.return_uint8_images else frames.to(torch.float32) / 255
+
     def _query_videos(self, query_timestamps: dict[str, list[float]], ep_idx: int) -> dict[str, torch.Tensor]:
         """Note: When using data workers (e.g. DataLoader with num_workers>0), do not call this function
         in the main process (e.g. by using a second Dataloader with num_workers=0). It will result in a
         Segmentation Fault. This probably happens because a memory reference to the video loader is created in
         the main process and a subprocess fails to access it.
         """
-        ep = self.meta.episodes[ep_idx]
         item = {}
-        for vid_key, query_ts in query_timestamps.items():
-            # Episodes are stored sequentially on a single mp4 to reduce the number of files.
-            # Thus we load the start timestamp of the episode on this mp4 and,
-            # shift the query timestamp accordingly.
-            from_timestamp = ep[f"videos/{vid_key}/from_timestamp"]
-            shifted_query_ts = [from_timestamp + ts for ts in query_ts]
-
-            video_path = self.root / self.meta.get_video_file_path(ep_idx, vid_key)
-            frames = decode_video_frames(video_path, shifted_query_ts, self.tolerance_s, self.video_backend)
+        for vid_key, (video_path, shifted_query_ts) in self._get_video_queries(
+            query_timestamps, ep_idx
+        ).items():
+            frames = self._decode_video_frames(video_path, shifted_query_ts)
             item[vid_key] = frames.squeeze(0)
 
         return item
 
+    def _query_videos_batch(
+        self, queries: list[tuple[dict[str, list[float]], int]]
+    ) -> list[dict[str, torch.Tensor]]:
+        """Batched version of `_query_videos`, taking a list of (query_timestamps, ep_idx) pairs.
+
+        Requests of all samples are grouped by video file, so that each file is decoded once for the whole batch
+        with `decode_video_frames_batch`, and frames are then scattered back to their sample.
+        """
+        requests = {}
+        for sample_idx, (query_timestamps, ep_idx) in enumerate(queries):
+            for vid_key, (video_path, shifted_query_ts) in self._get_video_queries(
+                query_timestamps, ep_idx
+            ).items():
+                requests.setdefault(video_path, []).append((sample_idx, vid_key, shifted_query_ts))
+
+        items = [{} for _ in queries]
+        for video_path, video_requests in requests.items():
+            timestamps = [ts for _, _, shifted_query_ts in video_requests for ts in shifted_query_ts]
+            frames = self._decode_video_frames(video_path, timestamps, batched=True)
+            split_sizes = [len(shifted_query_ts) for _, _, shifted_query_ts in video_requests]
+            for (sample_idx, vid_key, _), vid_frames in zip(
+                video_requests, torch.split(frames, split_sizes), strict=True
+            ):
+                items[sample_idx][vid_key] = vid_frames.squeeze(0)
+
+        # Keep the same key order as `_query_videos`
+        return [
+            {vid_key: item[vid_key] for vid_key in query_timestamps}
+            for item, (query_timestamps, _) in zip(items, queries, strict=True)
+        ]
+
     def _ensure_hf_dataset_loaded(self):
         """Lazy load the HF dataset only when needed for reading."""
         if self._lazy_loading or self.hf_dataset is None:
@@ -1041,14 +1295,22 @@ class LeRobotDataset(torch.utils.data.Dataset):
                 self._writer_closed_for_reading = True
             self.hf_dataset = self.load_hf_dataset()
             self._lazy_loading = False
+            if self.frame_store is not None:
+                # New episodes were written, the store gets rebuilt if its parquet sources changed
+                self.frame_store = MemmapFrameStore.load_or_build(self.root, self.features)
 
     def __len__(self):
         return self.num_frames
 
-    def __getitem__(self, idx) -> dict:
+    def _get_item_without_videos(self, idx: int) -> tuple[dict, dict[str, list[float]] | None]:
+        """Read all the non-video data of a sample, and the timestamps to decode from each of its videos.
+
+        Returns:
+            A tuple of (item, query_timestamps) where query_timestamps is None for datasets without videos.
+        """
         # Ensure dataset is loaded when we actually need to read from it
         self._ensure_hf_dataset_loaded()
-        item = self.hf_dataset[idx]
+        item = self.hf_dataset[idx] if self.frame_store is None else self._get_frame_store_item(idx)
         ep_idx = item["episode_index"].item()
         # Use the absolute index from the dataset for delta timestamp calculations
         abs_idx = item["index"].item()
@@ -1061,12 +1323,14 @@ class LeRobotDataset(torch.utils.data.Dataset):
             for key, val in query_result.items():
                 item[key] = val
 
+        query_timestamps = None
         if len(self.meta.video_keys) > 0:
             current_ts = item["timestamp"].item()
             query_timestamps = self._get_query_timestamps(current_ts, query_indices)
-            video_frames = self._query_videos(query_timestamps, ep_idx)
-            item = {**video_frames, **item}
 
+        return item, query_timestamps
+
+    def _finalize_item(self, item: dict) -> dict:
         if self.image_transforms is not None:
             image_keys = self.meta.camera_keys
             for cam in image_keys:
@@ -1077,6 +1341,29 @@ class LeRobotDataset(torch.utils.data.Dataset):
         item["task"] = self.meta.tasks.iloc[task_idx].name
         return item
 
+    def __getitem__(self, idx) -> dict:
+        item, query_timestamps = self._get_item_without_videos(idx)
+        if query_timestamps is not None:
+            video_frames = self._query_videos(query_timestamps, item["episode_index"].item())
+            item = {**video_frames, **item}
+        return self._finalize_item(item)
+
+    def __getitems__(self, indices: list[int]) -> list[dict]:
+        """Fetch a list of samples at once. `torch.utils.data.DataLoader` uses it to load a whole batch.
+
+        Samples are identical to the ones returned by `__getitem__`, but the video frames requested by all samples
+        are decoded with one call per video file, instead of one call per sample and camera. Combine it with
+        `EpisodeAwareSampler(episode_group_size=...)` so that batches hold several samples of the same episodes.
+        """
+        samples = [self._get_item_without_videos(idx) for idx in indices]
+        if len(self.meta.video_keys) > 0:
+            queries = [(query_timestamps, item["episode_index"].item()) for item, query_timestamps in samples]
+            video_frames = self._query_videos_batch(queries)
+            items = [{**frames, **item} for (item, _), frames in zip(samples, video_frames, strict=True)]
+        else:
+            items = [item for item, _ in samples]
+        return [self._finalize_item(item) for item in items]
+
     def __repr__(self):
         feature_keys = list(self.features)
         return (
@@ -1129,8 +1416,8 @@ class LeRobotDataset(torch.utils.data.Dataset):
     def add_frame(self, frame: dict) -> None:
         """
         This function only adds the frame to the episode_buffer. Apart from images — which are written in a
-        temporary directory — nothing is written to disk. To save those frames, the 'save_episode()' method
-        then needs to be called.
+        temporary directory, or encoded into a temporary video with `streaming_encoding` — nothing is written to
+        disk. To save those frames, the 'save_episode()' method then needs to be called.
         """
         # Convert torch to numpy if needed
         for name in frame:
@@ -1156,7 +1443,11 @@ class LeRobotDataset(torch.utils.data.Dataset):
                     f"An element of the frame is not in the features. '{key}' not in '{self.features.keys()}'."
                 )
 
-            if self.features[key]["dtype"] in ["image", "video"]:
+            if self.features[key]["dtype"] == "video" and self.streaming_encoding:
+                if key not in self.video_encoders:
+                    self._start_video_encoder(key, self.episode_buffer["episode_index"])
+                self.video_encoders[key].add_frame(frame[key])
+            elif self.features[key]["dtype"] in ["image", "video"]:
                 img_path = self._get_image_file_path(
                     episode_index=self.episode_buffer["episode_index"], image_key=key, frame_index=frame_index
                 )
@@ -1217,13 +1508,26 @@ class LeRobotDataset(torch.utils.data.Dataset):
 
         # Wait for image writer to end, so that episode stats over images can be computed
         self._wait_image_writer()
+        # Finish the videos encoded while recording, their stats are computed from frames kept by the encoders
+        streamed_video_paths = {}
+        for video_key, encoder in self.video_encoders.items():
+            streamed_video_paths[video_key] = encoder.finish()
+            episode_buffer[video_key] = encoder.get_stats_frames()
+        self.video_encoders = {}
         ep_stats = compute_episode_stats(episode_buffer, self.features)
 
         ep_metadata = self._save_episode_data(episode_buffer)
         has_video_keys = len(self.meta.video_keys) > 0
         use_batched_encoding = self.batch_encoding_size > 1
 
-        if has_video_keys and not use_batched_encoding:
+        if streamed_video_paths:
+            for video_key in self.meta.video_keys:
+                ep_metadata.update(
+                    self._save_episode_video(
+                        video_key, episode_index, temp_path=streamed_video_paths[video_key]
+                    )
+                )
+        elif has_video_keys and not use_batched_encoding:
             num_cameras = len(self.meta.video_keys)
             if parallel_encoding and num_cameras > 1:
                 # TODO(Steven): Ideally we would like to control the number of threads per encoding such that:
@@ -1505,6 +1809,12 @@ class LeRobotDataset(torch.utils.data.Dataset):
         return metadata
 
     def clear_episode_buffer(self, delete_images: bool = True) -> None:
+        # Discard the videos being encoded for the current episode buffer
+        for encoder in self.video_encoders.values():
+            encoder.cancel()
+            shutil.rmtree(encoder.video_path.parent, ignore_errors=True)
+        self.video_encoders = {}
+
         # Clean up image files for the current episode buffer
         if delete_images:
             # Wait for the async image writer to finish
@@ -1546,6 +1856,11 @@ class LeRobotDataset(torch.utils.data.Dataset):
         if self.image_writer is not None:
             self.image_writer.wait_until_done()
 
+    def _start_video_encoder(self, video_key: str, episode_index: int) -> None:
+        """Start encoding the frames of `video_key` into a temporary video, moved in the dataset by `save_episode`."""
+        temp_path = Path(tempfile.mkdtemp(dir=self.root)) / f"{video_key}_{episode_index:03d}.mp4"
+        self.video_encoders[video_key] = StreamingVideoEncoder(temp_path, self.fps, vcodec=self.vcodec)
+
     def _encode_temporary_episode_video(self, video_key: str, episode_index: int) -> Path:
         """
         Use ffmpeg to convert frames stored as png into mp4 videos.
@@ -1569,10 +1884,12 @@ class LeRobotDataset(torch.utils.data.Dataset):
         video_backend: str | None = None,
         batch_encoding_size: int = 1,
         vcodec: str = "libsvtav1",
+        streaming_encoding: bool = False,
     ) -> "LeRobotDataset":
         """Create a LeRobot Dataset from scratch in order to record data."""
         if vcodec not in VALID_VIDEO_CODECS:
             raise ValueError(f"Invalid vcodec '{vcodec}'. Must be one of: {sorted(VALID_VIDEO_CODECS)}")
+        _check_streaming_encoding(streaming_encoding, batch_encoding_size)
         obj = cls.__new__(cls)
         obj.meta = LeRobotDatasetMetadata.create(
             repo_id=repo_id,
@@ -1587,9 +1904,15 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj.revision = None
         obj.tolerance_s = tolerance_s
         obj.image_writer = None
+        obj.video_encoders = {}
+        obj.streaming_encoding = streaming_encoding
         obj.batch_encoding_size = batch_encoding_size
         obj.episodes_since_last_encoding = 0
         obj.vcodec = vcodec
+        obj.data_backend = "hf"
+        obj.frame_store = None
+        obj.frame_cache = None
+        obj.return_uint8_images = False
 
         if image_writer_processes or image_writer_threads:
             obj.start_image_writer(image_writer_processes, image_writer_threads)
@@ -1603,6 +1926,7 @@ class LeRobotDataset(torch.utils.data.Dataset):
         obj.delta_timestamps = None
         obj.delta_indices = None
         obj._absolute_to_relative_idx = None
+        obj._reset_query_tables()
         obj.video_backend = video_backend if video_backend is not None else get_safe_default_codec()
         obj.writer = None
         obj.latest_episode = None
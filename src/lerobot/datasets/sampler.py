@@ -27,6 +27,7 @@ class EpisodeAwareSampler:
         drop_n_first_frames: int = 0,
         drop_n_last_frames: int = 0,
         shuffle: bool = False,
+        episode_group_size: int = 1,
     ):
         """Sampler that optionally incorporates episode boundary information.
 
@@ -38,19 +39,43 @@ class EpisodeAwareSampler:
             drop_n_first_frames: Number of frames to drop from the start of each episode.
             drop_n_last_frames: Number of frames to drop from the end of each episode.
             shuffle: Whether to shuffle the indices.
+            episode_group_size: When shuffling, yield indices in runs of `episode_group_size` frames from the
+                same episode (frames are shuffled within each episode, then runs are shuffled across
+                episodes). Batches then hold several windows from the same video file, which
+                `LeRobotDataset.__getitems__` decodes together. Defaults to 1, i.e. uniform shuffling.
         """
+        if episode_group_size < 1:
+            raise ValueError(f"episode_group_size must be >= 1, got {episode_group_size}.")
+
         indices = []
+        episode_ranges = []
         for episode_idx, (start_index, end_index) in enumerate(
             zip(dataset_from_indices, dataset_to_indices, strict=True)
         ):
             if episode_indices_to_use is None or episode_idx in episode_indices_to_use:
+                episode_start = len(indices)
                 indices.extend(range(start_index + drop_n_first_frames, end_index - drop_n_last_frames))
+                if len(indices) > episode_start:
+                    episode_ranges.append((episode_start, len(indices)))
 
         self.indices = indices
         self.shuffle = shuffle
+        self.episode_group_size = episode_group_size
+        self._episode_ranges = episode_ranges
+
+    def _iter_episode_groups(self) -> Iterator[int]:
+        groups = []
+        for start, end in self._episode_ranges:
+            positions = start + torch.randperm(end - start)
+            groups.extend(torch.split(positions, self.episode_group_size))
+        for i in torch.randperm(len(groups)):
+            for j in groups[i]:
+                yield self.indices[j]
 
     def __iter__(self) -> Iterator[int]:
-        if self.shuffle:
+        if self.shuffle and self.episode_group_size > 1:
+            yield from self._iter_episode_groups()
+        elif self.shuffle:
             for i in torch.randperm(len(self.indices)):
                 yield self.indices[i]
         else:
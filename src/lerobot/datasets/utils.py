@@ -408,7 +408,9 @@ def load_image_as_numpy(
     return img_array
 
 
-def hf_transform_to_torch(items_dict: dict[str, list[Any]]) -> dict[str, list[torch.Tensor | str]]:
+def hf_transform_to_torch(
+    items_dict: dict[str, list[Any]], uint8_images: bool = False
+) -> dict[str, list[torch.Tensor | str]]:
     """Convert a batch from a Hugging Face dataset to torch tensors.
 
     This transform function converts items from Hugging Face dataset format (pyarrow)
@@ -419,6 +421,8 @@ def hf_transform_to_torch(items_dict: dict[str, list[Any]]) -> dict[str, list[to
     Args:
         items_dict (dict): A dictionary representing a batch of data from a
             Hugging Face dataset.
+        uint8_images (bool): Convert images to (C, H, W, uint8) tensors in the range [0, 255]
+            instead.
 
     Returns:
         dict: The batch with items converted to torch tensors.
@@ -426,7 +430,7 @@ def hf_transform_to_torch(items_dict: dict[str, list[Any]]) -> dict[str, list[to
     for key in items_dict:
         first_item = items_dict[key][0]
         if isinstance(first_item, PILImage.Image):
-            to_tensor = transforms.ToTensor()
+            to_tensor = transforms.PILToTensor() if uint8_images else transforms.ToTensor()
             items_dict[key] = [to_tensor(img) for img in items_dict[key]]
         elif first_item is None:
             pass
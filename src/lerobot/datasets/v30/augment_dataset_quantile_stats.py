@@ -44,7 +44,12 @@ from huggingface_hub import HfApi
 from requests import HTTPError
 from tqdm import tqdm
 
-from lerobot.datasets.compute_stats import DEFAULT_QUANTILES, aggregate_stats, get_feature_stats
+from lerobot.datasets.compute_stats import (
+    DEFAULT_QUANTILES,
+    QUANTILE_SKETCH_KEY,
+    aggregate_stats,
+    get_feature_stats,
+)
 from lerobot.datasets.lerobot_dataset import CODEBASE_VERSION, LeRobotDataset
 from lerobot.datasets.utils import write_stats
 from lerobot.utils.utils import init_logging
@@ -119,9 +124,11 @@ def process_single_episode(dataset: LeRobotDataset, episode_idx: int) -> dict:
         )
 
         if dataset.features[key]["dtype"] in ["image", "video"]:
-            ep_stats[key] = {
-                k: v if k == "count" else np.squeeze(v, axis=0) for k, v in ep_stats[key].items()
-            }
+            for k, v in ep_stats[key].items():
+                if k == QUANTILE_SKETCH_KEY:
+                    ep_stats[key][k] = {name: np.squeeze(s, axis=0) for name, s in v.items()}
+                elif k != "count":
+                    ep_stats[key][k] = np.squeeze(v, axis=0)
 
     return ep_stats
 
@@ -16,22 +16,34 @@
 import glob
 import importlib
 import logging
+import multiprocessing
+import os
+import queue
 import shutil
 import tempfile
+import time
 import warnings
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from fractions import Fraction
 from pathlib import Path
-from threading import Lock
+from threading import Lock, Thread
 from typing import Any, ClassVar
 
 import av
 import fsspec
+import numpy as np
 import pyarrow as pa
 import torch
 import torchvision
 from datasets.features.features import register_feature
 from PIL import Image
 
+from lerobot.datasets.compute_stats import auto_downsample_height_width
+from lerobot.datasets.utils import VIDEO_DIR
+
 
 def get_safe_default_codec():
     if importlib.util.find_spec("torchcodec"):
@@ -48,6 +60,7 @@ def decode_video_frames(
     timestamps: list[float],
     tolerance_s: float,
     backend: str | None = None,
+    return_uint8: bool = False,
 ) -> torch.Tensor:
     """
     Decodes video frames using the specified backend.
@@ -57,31 +70,88 @@ def decode_video_frames(
         timestamps (list[float]): List of timestamps to extract frames.
         tolerance_s (float): Allowed deviation in seconds for frame retrieval.
         backend (str, optional): Backend to use for decoding. Defaults to "torchcodec" when available in the platform; otherwise, defaults to "pyav"..
+        return_uint8 (bool, optional): Return uint8 frames in [0, 255] instead of float32 frames in [0, 1], e.g.
+            to defer the conversion to the device the model runs on. Defaults to False.
 
     Returns:
         torch.Tensor: Decoded frames.
 
-    Currently supports torchcodec on cpu and pyav.
+    Currently supports torchcodec on cpu, pyav (see `decode_video_frames_pyav`) and torchvision's video_reader.
     """
     if backend is None:
         backend = get_safe_default_codec()
     if backend == "torchcodec":
-        return decode_video_frames_torchcodec(video_path, timestamps, tolerance_s)
-    elif backend in ["pyav", "video_reader"]:
-        return decode_video_frames_torchvision(video_path, timestamps, tolerance_s, backend)
+        return decode_video_frames_torchcodec(video_path, timestamps, tolerance_s, return_uint8=return_uint8)
+    elif backend == "pyav":
+        return decode_video_frames_pyav(video_path, timestamps, tolerance_s, return_uint8=return_uint8)
+    elif backend == "video_reader":
+        return decode_video_frames_torchvision(
+            video_path, timestamps, tolerance_s, backend, return_uint8=return_uint8
+        )
     else:
         raise ValueError(f"Unsupported video backend: {backend}")
 
 
+def decode_video_frames_batch(
+    video_path: Path | str,
+    timestamps: list[float],
+    tolerance_s: float,
+    backend: str | None = None,
+    max_gap_s: float = 1.0,
+    return_uint8: bool = False,
+) -> torch.Tensor:
+    """Decodes the frames requested by several samples from the same video file with as few seeks as possible.
+
+    Timestamps may be unsorted and contain duplicates (e.g. overlapping `delta_timestamps` windows of
+    neighboring samples). They are deduplicated and sorted, then decoded with one call per cluster of close
+    timestamps, and frames are scattered back to the order of `timestamps`.
+
+    Args:
+        video_path (Path): Path to the video file.
+        timestamps (list[float]): List of timestamps to extract frames.
+        tolerance_s (float): Allowed deviation in seconds for frame retrieval.
+        backend (str, optional): Backend to use for decoding. Defaults to "torchcodec" when available in the platform; otherwise, defaults to "pyav".
+        max_gap_s (float, optional): The "video_reader" decoder decodes every frame between the first and last
+            requested timestamp of a call. Sorted timestamps further apart than this are decoded in separate
+            calls, each starting from its own key frame. torchcodec seeks to each frame independently and pyav
+            plans its seeks from the key frame index of the video, so all timestamps are decoded in a single call
+            with these backends. Defaults to 1.0.
+        return_uint8 (bool, optional): Return uint8 frames instead of float32 frames in [0, 1]. Defaults to False.
+
+    Returns:
+        torch.Tensor: Decoded frames, in the order of `timestamps`.
+    """
+    if backend is None:
+        backend = get_safe_default_codec()
+
+    unique_ts, inverse = torch.unique(torch.tensor(timestamps, dtype=torch.float64), return_inverse=True)
+    if backend in ["torchcodec", "pyav"]:
+        clusters = [unique_ts]
+    else:
+        split_points = torch.nonzero(torch.diff(unique_ts) > max_gap_s).flatten() + 1
+        clusters = torch.tensor_split(unique_ts, split_points)
+
+    frames = torch.cat(
+        [
+            decode_video_frames(video_path, cluster.tolist(), tolerance_s, backend, return_uint8=return_uint8)
+            for cluster in clusters
+        ]
+    )
+    return frames[inverse]
+
+
 def decode_video_frames_torchvision(
     video_path: Path | str,
     timestamps: list[float],
     tolerance_s: float,
     backend: str = "pyav",
     log_loaded_timestamps: bool = False,
+    return_uint8: bool = False,
 ) -> torch.Tensor:
     """Loads frames associated to the requested timestamps of a video
 
+    Frames are returned channel first, as float32 in [0, 1], or as uint8 when `return_uint8` is True.
+
     The backend can be either "pyav" (default) or "video_reader".
     "video_reader" requires installing torchvision from source, see:
     https://github.com/pytorch/vision/blob/main/torchvision/csrc/io/decoder/gpu/README.rst
@@ -165,48 +235,176 @@ def decode_video_frames_torchvision(
         logging.info(f"{closest_ts=}")
 
     # convert to the pytorch format which is float32 in [0,1] range (and channel first)
-    closest_frames = closest_frames.type(torch.float32) / 255
+    if not return_uint8:
+        closest_frames = closest_frames.type(torch.float32) / 255
 
     assert len(timestamps) == len(closest_frames)
     return closest_frames
 
 
+@dataclass
+class _CachedDecoder:
+    decoder: Any
+    file_handle: Any
+    num_bytes: int
+    # Number of callers decoding with it, see `VideoDecoderCache.use_decoder`
+    num_users: int = 0
+    evicted: bool = False
+
+    def close_if_unused(self):
+        if self.evicted and self.num_users == 0:
+            self.file_handle.close()
+
+
 class VideoDecoderCache:
-    """Thread-safe cache for video decoders to avoid expensive re-initialization."""
+    """Thread-safe LRU cache for video decoders to avoid expensive re-initialization.
 
-    def __init__(self):
-        self._cache: dict[str, tuple[Any, Any]] = {}
+    Each cached decoder keeps a file handle open. The cache is bounded by a maximum number of decoders and,
+    optionally, by the total size in bytes of the cached video files: least recently used decoders are evicted
+    once a limit is exceeded. The file handle of an evicted decoder is closed as soon as no caller of
+    `use_decoder` is decoding with it. As every DataLoader worker holds its own copy of the cache, limits apply
+    per worker.
+
+    Hits, misses, evictions and the time spent opening decoders are counted, see `get_stats`. The counters of the
+    caches of DataLoader workers can be read from the main process with `DecoderCacheWorkerStats`.
+
+    Args:
+        max_decoders: Maximum number of cached decoders. None for no limit.
+        max_bytes: Maximum total size in bytes of the video files of the cached decoders. None for no limit. A
+            single file larger than this limit is still cached, on its own.
+    """
+
+    # Counters reset by `reset_stats`, followed by the current size of the cache
+    STATS_KEYS = ("hits", "misses", "evictions", "open_time_s", "num_decoders", "num_bytes")
+    _HITS, _MISSES, _EVICTIONS, _OPEN_TIME_S, _NUM_DECODERS, _NUM_BYTES = range(len(STATS_KEYS))
+
+    def __init__(self, max_decoders: int | None = None, max_bytes: int | None = None):
+        if max_decoders is not None and max_decoders < 1:
+            raise ValueError(f"max_decoders must be >= 1 or None, got {max_decoders}.")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be >= 1 or None, got {max_bytes}.")
+        self.max_decoders = max_decoders
+        self.max_bytes = max_bytes
+        # Ordered from least to most recently used
+        self._cache: OrderedDict[str, _CachedDecoder] = OrderedDict()
+        self._num_bytes = 0
         self._lock = Lock()
+        # Indexed by `STATS_KEYS`, see `share_stats`
+        self._stats = np.zeros(len(self.STATS_KEYS))
 
-    def get_decoder(self, video_path: str):
-        """Get a cached decoder or create a new one."""
+    def _open_decoder(self, file_handle):
         if importlib.util.find_spec("torchcodec"):
             from torchcodec.decoders import VideoDecoder
         else:
             raise ImportError("torchcodec is required but not available.")
+        return VideoDecoder(file_handle, seek_mode="approximate")
 
-        video_path = str(video_path)
+    def get_decoder(self, video_path: str):
+        """Get a cached decoder or create a new one.
 
+        The decoder is closed if it gets evicted, e.g. by another thread, use `use_decoder` to decode with it.
+        """
         with self._lock:
-            if video_path not in self._cache:
-                file_handle = fsspec.open(video_path).__enter__()
-                decoder = VideoDecoder(file_handle, seek_mode="approximate")
-                self._cache[video_path] = (decoder, file_handle)
+            return self._get_entry(str(video_path)).decoder
 
-            return self._cache[video_path][0]
+    @contextmanager
+    def use_decoder(self, video_path: str) -> Iterator[Any]:
+        """Get a cached decoder or create a new one, which isn't closed before the end of the context even if it
+        gets evicted in the meantime."""
+        with self._lock:
+            entry = self._get_entry(str(video_path))
+            entry.num_users += 1
+        try:
+            yield entry.decoder
+        finally:
+            with self._lock:
+                entry.num_users -= 1
+                entry.close_if_unused()
+
+    def _get_entry(self, video_path: str) -> _CachedDecoder:
+        """Expects the lock to be held."""
+        if video_path in self._cache:
+            self._stats[self._HITS] += 1
+            self._cache.move_to_end(video_path)
+            return self._cache[video_path]
+
+        self._stats[self._MISSES] += 1
+        start = time.perf_counter()
+        open_file = fsspec.open(video_path)
+        num_bytes = open_file.fs.size(open_file.path) if self.max_bytes is not None else 0
+        file_handle = open_file.__enter__()
+        try:
+            decoder = self._open_decoder(file_handle)
+        except Exception:
+            file_handle.close()
+            raise
+        self._stats[self._OPEN_TIME_S] += time.perf_counter() - start
+
+        entry = _CachedDecoder(decoder, file_handle, num_bytes)
+        self._cache[video_path] = entry
+        self._num_bytes += num_bytes
+        self._evict()
+        return entry
+
+    def _evict(self):
+        """Evict least recently used decoders until the cache is within its limits. Expects the lock to be held."""
+        while len(self._cache) > 1 and (
+            (self.max_decoders is not None and len(self._cache) > self.max_decoders)
+            or (self.max_bytes is not None and self._num_bytes > self.max_bytes)
+        ):
+            _, entry = self._cache.popitem(last=False)
+            entry.evicted = True
+            entry.close_if_unused()
+            self._num_bytes -= entry.num_bytes
+            self._stats[self._EVICTIONS] += 1
+        self._update_size_stats()
+
+    def _update_size_stats(self):
+        self._stats[self._NUM_DECODERS] = len(self._cache)
+        self._stats[self._NUM_BYTES] = self._num_bytes
 
     def clear(self):
-        """Clear the cache and close file handles."""
+        """Clear the cache and close the file handles of the decoders not in use."""
         with self._lock:
-            for _, file_handle in self._cache.values():
-                file_handle.close()
+            for entry in self._cache.values():
+                entry.evicted = True
+                entry.close_if_unused()
             self._cache.clear()
+            self._num_bytes = 0
+            self._update_size_stats()
 
     def size(self) -> int:
         """Return the number of cached decoders."""
         with self._lock:
             return len(self._cache)
 
+    def get_stats(self) -> dict[str, float]:
+        """Return the counters of the cache since its creation or the last call to `reset_stats`."""
+        with self._lock:
+            return _decoder_cache_stats_dict(self._stats)
+
+    def reset_stats(self):
+        """Reset the hits, misses, evictions and open time counters."""
+        with self._lock:
+            self._stats[: self._NUM_DECODERS] = 0
+
+    def share_stats(self, stats: np.ndarray):
+        """Count in `stats` from now on, an array of `len(STATS_KEYS)` floats, e.g. in shared memory. The counters
+        already in `stats` are kept, e.g. those of the previous DataLoader worker counting in it."""
+        with self._lock:
+            self._stats = stats
+            self._update_size_stats()
+
+
+def _decoder_cache_stats_dict(stats: np.ndarray) -> dict[str, float]:
+    stats = {
+        key: value if key == "open_time_s" else int(value)
+        for key, value in zip(VideoDecoderCache.STATS_KEYS, stats.tolist(), strict=True)
+    }
+    num_lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / num_lookups if num_lookups > 0 else 0.0
+    return stats
+
 
 class FrameTimestampError(ValueError):
     """Helper error to indicate the retrieved timestamps exceed the queried ones"""
@@ -214,7 +412,341 @@ class FrameTimestampError(ValueError):
     pass
 
 
-_default_decoder_cache = VideoDecoderCache()
+VIDEO_INDEX_DIR = "meta/video_index"
+VIDEO_INDEX_VERSION = 1
+
+
+@dataclass
+class VideoIndex:
+    """Presentation timestamps (pts) of all the frames of a video stream, and which frames are key frames.
+
+    It is built by demuxing the packets of the video, without decoding any frame, see `build_video_index`.
+    """
+
+    # pts of all frames, in stream time base units, sorted in presentation order
+    pts: np.ndarray
+    # whether each frame of `pts` is a key frame
+    is_keyframe: np.ndarray
+    time_base: Fraction
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamps of all frames in seconds."""
+        return self.pts * float(self.time_base)
+
+
+@dataclass
+class DecodeSegment:
+    """A contiguous run of frames to decode: seek to the key frame `seek_pts`, then decode until the last target."""
+
+    seek_pts: int
+    # pts of the frames to return, sorted
+    target_pts: list[int]
+    # number of frames decoded, from the key frame to the last target included
+    num_decoded: int
+
+
+def build_video_index(video_path: Path | str) -> VideoIndex:
+    with av.open(str(video_path)) as container:
+        stream = container.streams.video[0]
+        pts, is_keyframe = [], []
+        for packet in container.demux(stream):
+            # Skip the empty packets flushing the demuxer
+            if packet.pts is None:
+                continue
+            pts.append(packet.pts)
+            is_keyframe.append(packet.is_keyframe)
+        time_base = stream.time_base
+
+    # Packets are stored in decoding order, which differs from presentation order with B-frames
+    order = np.argsort(pts, kind="stable")
+    return VideoIndex(
+        pts=np.asarray(pts, dtype=np.int64)[order],
+        is_keyframe=np.asarray(is_keyframe, dtype=bool)[order],
+        time_base=Fraction(time_base.numerator, time_base.denominator),
+    )
+
+
+def get_video_index_path(video_path: Path | str) -> Path | None:
+    """Path where the index of a video of a LeRobotDataset is persisted, alongside the dataset `meta/` directory.
+
+    e.g. `root/videos/{video_key}/chunk-000/file-000.mp4` is indexed in
+    `root/meta/video_index/{video_key}/chunk-000/file-000.npz`. Returns None for videos which are not laid out this
+    way, whose index is then only kept in memory.
+    """
+    video_path = Path(video_path)
+    parts = video_path.parts
+    if VIDEO_DIR not in parts[:-1]:
+        return None
+    videos_idx = len(parts) - 1 - parts[::-1].index(VIDEO_DIR)
+    root = Path(*parts[:videos_idx]) if videos_idx > 0 else Path(".")
+    if not (root / "meta").is_dir():
+        return None
+    return (root / VIDEO_INDEX_DIR / Path(*parts[videos_idx + 1 :])).with_suffix(".npz")
+
+
+class VideoIndexCache:
+    """Thread-safe cache of video indexes, persisted on disk for the videos of a LeRobotDataset.
+
+    Indexes are built on first use (see `build_video_index`). An index is rebuilt whenever the size or the
+    modification time of its video changes.
+    """
+
+    def __init__(self):
+        self._cache: dict[str, tuple[tuple[int, int], VideoIndex]] = {}
+        self._lock = Lock()
+
+    def get_index(self, video_path: Path | str) -> VideoIndex:
+        video_path = str(video_path)
+        stat = os.stat(video_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._cache.get(video_path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+        index_path = get_video_index_path(video_path)
+        index = self._load(index_path, signature) if index_path is not None else None
+        if index is None:
+            index = build_video_index(video_path)
+            if index_path is not None:
+                self._save(index_path, signature, index)
+
+        with self._lock:
+            self._cache[video_path] = (signature, index)
+        return index
+
+    @staticmethod
+    def _load(index_path: Path, signature: tuple[int, int]) -> VideoIndex | None:
+        if not index_path.is_file():
+            return None
+        with np.load(index_path) as data:
+            if int(data["version"]) != VIDEO_INDEX_VERSION or tuple(data["signature"].tolist()) != signature:
+                return None
+            return VideoIndex(
+                pts=data["pts"],
+                is_keyframe=data["is_keyframe"],
+                time_base=Fraction(int(data["time_base"][0]), int(data["time_base"][1])),
+            )
+
+    @staticmethod
+    def _save(index_path: Path, signature: tuple[int, int], index: VideoIndex):
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, as several DataLoader workers may index the same video at the same time
+        fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, prefix=".index-", suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                version=VIDEO_INDEX_VERSION,
+                signature=np.asarray(signature, dtype=np.int64),
+                pts=index.pts,
+                is_keyframe=index.is_keyframe,
+                time_base=np.asarray([index.time_base.numerator, index.time_base.denominator]),
+            )
+        os.replace(tmp_path, index_path)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_default_video_index_cache = VideoIndexCache()
+
+# Counters of all the calls to `decode_video_frames_pyav` in this process
+_pyav_decode_stats = {"seeks": 0, "decoded_frames": 0, "returned_frames": 0}
+
+
+def get_pyav_decode_stats() -> dict[str, float]:
+    """Return the counters of `decode_video_frames_pyav` in this process (e.g. a DataLoader worker).
+
+    `decoded_frames_per_returned_frame` measures the decoding overhead of the requested frames: it is 1 when only
+    the requested frames are decoded, and grows with the distance between the requested frames and the key frames
+    they are decoded from.
+    """
+    stats = dict(_pyav_decode_stats)
+    returned_frames = stats["returned_frames"]
+    stats["decoded_frames_per_returned_frame"] = (
+        stats["decoded_frames"] / returned_frames if returned_frames > 0 else 0.0
+    )
+    return stats
+
+
+def reset_pyav_decode_stats():
+    for key in _pyav_decode_stats:
+        _pyav_decode_stats[key] = 0
+
+
+def plan_video_decode(
+    index: VideoIndex, timestamps: list[float], tolerance_s: float
+) -> tuple[list[DecodeSegment], list[int]]:
+    """Plan the seeks and decodes needed to get the frames closest to `timestamps`.
+
+    Each requested frame is decoded from its preceding key frame. Requested frames sharing a key frame, or whose key
+    frame is reached anyway while decoding the previous requested frames, are decoded in a single segment. Decoding
+    stops at the last requested frame of each segment.
+
+    Returns:
+        The segments to decode, and the pts of the frame returned for each timestamp.
+    """
+    frame_ts = index.timestamps
+    query_ts = np.asarray(timestamps, dtype=np.float64)
+    # Closest frame to each query timestamp
+    right = np.searchsorted(frame_ts, query_ts).clip(1, len(frame_ts) - 1)
+    left = right - 1
+    closest = np.where(np.abs(frame_ts[left] - query_ts) <= np.abs(frame_ts[right] - query_ts), left, right)
+    if len(frame_ts) == 1:
+        closest = np.zeros_like(closest)
+
+    dist = np.abs(frame_ts[closest] - query_ts)
+    is_within_tol = dist < tolerance_s
+    if not is_within_tol.all():
+        raise FrameTimestampError(
+            f"One or several query timestamps unexpectedly violate the tolerance ({dist[~is_within_tol]} > {tolerance_s=})."
+            "It means that the closest frame that can be loaded from the video is too far away in time."
+            "This might be due to synchronization issues with timestamps during data collection."
+            "To be safe, we advise to ignore this item during training."
+            f"\nqueried timestamps: {query_ts}"
+            f"\nloaded timestamps: {frame_ts[closest]}"
+        )
+
+    keyframes = np.flatnonzero(index.is_keyframe)
+    segments: list[DecodeSegment] = []
+    seek_frame = last_frame = -1
+    for frame in np.unique(closest):
+        keyframe_pos = np.searchsorted(keyframes, frame, side="right") - 1
+        # The first frames of a stream are always decodable from the start of the stream
+        keyframe = int(keyframes[keyframe_pos]) if keyframe_pos >= 0 else 0
+        if segments and keyframe <= last_frame:
+            # The key frame was already decoded while reaching the previous frame: keep decoding from there
+            segments[-1].target_pts.append(int(index.pts[frame]))
+        else:
+            seek_frame = keyframe
+            segments.append(
+                DecodeSegment(
+                    seek_pts=int(index.pts[keyframe]), target_pts=[int(index.pts[frame])], num_decoded=0
+                )
+            )
+        last_frame = int(frame)
+        segments[-1].num_decoded = last_frame - seek_frame + 1
+
+    return segments, index.pts[closest].tolist()
+
+
+def decode_video_frames_pyav(
+    video_path: Path | str,
+    timestamps: list[float],
+    tolerance_s: float,
+    log_loaded_timestamps: bool = False,
+    return_uint8: bool = False,
+    index_cache: VideoIndexCache | None = None,
+    stats: dict[str, int] | None = None,
+) -> torch.Tensor:
+    """Loads frames associated to the requested timestamps of a video with pyav, following a decode plan.
+
+    Unlike `decode_video_frames_torchvision`, which decodes every frame from the key frame preceding the first
+    timestamp up to the last one, the key frame and presentation timestamps of the video are indexed (see
+    `VideoIndexCache`) so that decoding seeks to the closest key frame of each cluster of requested frames and
+    stops as soon as all of them are decoded (see `plan_video_decode`).
+
+    Args:
+        video_path: Path to the video file.
+        timestamps: List of timestamps to extract frames.
+        tolerance_s: Allowed deviation in seconds for frame retrieval.
+        log_loaded_timestamps: Whether to log loaded timestamps.
+        return_uint8: Return uint8 frames instead of float32 frames in [0, 1].
+        index_cache: Optional video index cache instance. Uses default if None.
+        stats: Optional dictionary in which the number of "seeks", "decoded_frames" and "returned_frames" are
+            accumulated. They are also accumulated in the counters of the process, see `get_pyav_decode_stats`.
+
+    Returns:
+        torch.Tensor: Decoded frames (channel first), in the order of `timestamps`.
+    """
+    if index_cache is None:
+        index_cache = _default_video_index_cache
+    index = index_cache.get_index(video_path)
+    segments, closest_pts = plan_video_decode(index, timestamps, tolerance_s)
+
+    loaded_frames: dict[int, torch.Tensor] = {}
+    num_decoded = 0
+    with av.open(str(video_path)) as container:
+        stream = container.streams.video[0]
+        for segment in segments:
+            container.seek(segment.seek_pts, stream=stream, backward=True, any_frame=False)
+            targets = set(segment.target_pts)
+            for frame in container.decode(stream):
+                num_decoded += 1
+                if frame.pts in targets:
+                    loaded_frames[frame.pts] = torch.from_numpy(frame.to_ndarray(format="rgb24")).permute(
+                        2, 0, 1
+                    )
+                    targets.discard(frame.pts)
+                    if log_loaded_timestamps:
+                        logging.info(f"frame loaded at timestamp={float(frame.pts * index.time_base):.4f}")
+                if not targets or frame.pts > segment.target_pts[-1]:
+                    break
+
+    missing = set(closest_pts) - set(loaded_frames)
+    if missing:
+        raise FrameTimestampError(
+            f"Frames at pts {sorted(missing)} of {video_path} could not be decoded (time base {index.time_base})."
+        )
+
+    for counters in [_pyav_decode_stats] if stats is None else [_pyav_decode_stats, stats]:
+        counters["seeks"] = counters.get("seeks", 0) + len(segments)
+        counters["decoded_frames"] = counters.get("decoded_frames", 0) + num_decoded
+        counters["returned_frames"] = counters.get("returned_frames", 0) + len(timestamps)
+
+    closest_frames = torch.stack([loaded_frames[pts] for pts in closest_pts])
+    if not return_uint8:
+        closest_frames = closest_frames.type(torch.float32) / 255
+    return closest_frames
+
+
+# Maximum number of decoders, and thus of open video files, kept by each process (e.g. each DataLoader worker)
+DEFAULT_MAX_CACHED_DECODERS = 32
+
+_default_decoder_cache = VideoDecoderCache(max_decoders=DEFAULT_MAX_CACHED_DECODERS)
+
+
+def get_default_decoder_cache() -> VideoDecoderCache:
+    """Return the decoder cache used by `decode_video_frames_torchcodec` when none is provided."""
+    return _default_decoder_cache
+
+
+class DecoderCacheWorkerStats:
+    """Stats of the default decoder caches of DataLoader workers, which each hold their own cache.
+
+    The counters of the cache of each worker are kept in shared memory, so that the main process can read them.
+    Create it before the DataLoader and pass it `worker_init_fn`. `get_stats` sums the counters of the workers, and
+    adds the hit rate of each of them.
+
+    Args:
+        num_workers: Number of DataLoader workers.
+    """
+
+    def __init__(self, num_workers: int):
+        self.num_workers = num_workers
+        self._shared_stats = multiprocessing.RawArray("d", num_workers * len(VideoDecoderCache.STATS_KEYS))
+        # Counters of the workers at the last call to `reset_stats`, since a worker keeps counting in its slot
+        self._stats_at_reset = np.zeros((num_workers, len(VideoDecoderCache.STATS_KEYS)))
+
+    def _worker_stats(self) -> np.ndarray:
+        return np.frombuffer(self._shared_stats).reshape(self.num_workers, len(VideoDecoderCache.STATS_KEYS))
+
+    def worker_init_fn(self, worker_id: int):
+        get_default_decoder_cache().share_stats(self._worker_stats()[worker_id])
+
+    def get_stats(self) -> dict[str, float]:
+        worker_stats = self._worker_stats() - self._stats_at_reset
+        stats = _decoder_cache_stats_dict(worker_stats.sum(axis=0))
+        for worker_id, counters in enumerate(worker_stats):
+            stats[f"worker_{worker_id}_hit_rate"] = _decoder_cache_stats_dict(counters)["hit_rate"]
+        return stats
+
+    def reset_stats(self):
+        self._stats_at_reset = self._worker_stats().copy()
+        # The number of decoders and bytes are the current sizes of the caches, not counters
+        self._stats_at_reset[:, VideoDecoderCache._NUM_DECODERS :] = 0
 
 
 def decode_video_frames_torchcodec(
@@ -223,6 +755,7 @@ def decode_video_frames_torchcodec(
     tolerance_s: float,
     log_loaded_timestamps: bool = False,
     decoder_cache: VideoDecoderCache | None = None,
+    return_uint8: bool = False,
 ) -> torch.Tensor:
     """Loads frames associated with the requested timestamps of a video using torchcodec.
 
@@ -232,6 +765,7 @@ def decode_video_frames_torchcodec(
         tolerance_s: Allowed deviation in seconds for frame retrieval.
         log_loaded_timestamps: Whether to log loaded timestamps.
         decoder_cache: Optional decoder cache instance. Uses default if None.
+        return_uint8: Return uint8 frames instead of float32 frames in [0, 1].
 
     Note: Setting device="cuda" outside the main process, e.g. in data loader workers, will lead to CUDA initialization errors.
 
@@ -244,19 +778,18 @@ def decode_video_frames_torchcodec(
     if decoder_cache is None:
         decoder_cache = _default_decoder_cache
 
-    # Use cached decoder instead of creating new one each time
-    decoder = decoder_cache.get_decoder(str(video_path))
-
     loaded_ts = []
     loaded_frames = []
 
-    # get metadata for frame information
-    metadata = decoder.metadata
-    average_fps = metadata.average_fps
-    # convert timestamps to frame indices
-    frame_indices = [round(ts * average_fps) for ts in timestamps]
-    # retrieve frames based on indices
-    frames_batch = decoder.get_frames_at(indices=frame_indices)
+    # Use cached decoder instead of creating new one each time
+    with decoder_cache.use_decoder(str(video_path)) as decoder:
+        # get metadata for frame information
+        metadata = decoder.metadata
+        average_fps = metadata.average_fps
+        # convert timestamps to frame indices
+        frame_indices = [round(ts * average_fps) for ts in timestamps]
+        # retrieve frames based on indices
+        frames_batch = decoder.get_frames_at(indices=frame_indices)
 
     for frame, pts in zip(frames_batch.data, frames_batch.pts_seconds, strict=True):
         loaded_frames.append(frame)
@@ -290,7 +823,8 @@ def decode_video_frames_torchcodec(
         logging.info(f"{closest_ts=}")
 
     # convert to float32 in [0,1] range
-    closest_frames = (closest_frames / 255.0).type(torch.float32)
+    if not return_uint8:
+        closest_frames = (closest_frames / 255.0).type(torch.float32)
 
     if not len(timestamps) == len(closest_frames):
         raise FrameTimestampError(
@@ -300,6 +834,46 @@ def decode_video_frames_torchcodec(
     return closest_frames
 
 
+def get_video_encoding_options(
+    vcodec: str,
+    pix_fmt: str = "yuv420p",
+    g: int | None = 2,
+    crf: int | None = 30,
+    fast_decode: int = 0,
+    preset: int | None = None,
+) -> tuple[dict[str, str], str]:
+    """Return the codec options and the pixel format used to encode videos with `vcodec`."""
+    # Check encoder availability
+    if vcodec not in ["h264", "hevc", "libsvtav1"]:
+        raise ValueError(f"Unsupported video codec: {vcodec}. Supported codecs are: h264, hevc, libsvtav1.")
+
+    # Encoders/pixel formats incompatibility check
+    if (vcodec == "libsvtav1" or vcodec == "hevc") and pix_fmt == "yuv444p":
+        logging.warning(
+            f"Incompatible pixel format 'yuv444p' for codec {vcodec}, auto-selecting format 'yuv420p'"
+        )
+        pix_fmt = "yuv420p"
+
+    # Define video codec options
+    video_options = {}
+
+    if g is not None:
+        video_options["g"] = str(g)
+
+    if crf is not None:
+        video_options["crf"] = str(crf)
+
+    if fast_decode:
+        key = "svtav1-params" if vcodec == "libsvtav1" else "tune"
+        value = f"fast-decode={fast_decode}" if vcodec == "libsvtav1" else "fastdecode"
+        video_options[key] = value
+
+    if vcodec == "libsvtav1":
+        video_options["preset"] = str(preset) if preset is not None else "12"
+
+    return video_options, pix_fmt
+
+
 def encode_video_frames(
     imgs_dir: Path | str,
     video_path: Path | str,
@@ -314,9 +888,7 @@ def encode_video_frames(
     preset: int | None = None,
 ) -> None:
     """More info on ffmpeg arguments tuning on `benchmark/video/README.md`"""
-    # Check encoder availability
-    if vcodec not in ["h264", "hevc", "libsvtav1"]:
-        raise ValueError(f"Unsupported video codec: {vcodec}. Supported codecs are: h264, hevc, libsvtav1.")
+    video_options, pix_fmt = get_video_encoding_options(vcodec, pix_fmt, g, crf, fast_decode, preset)
 
     video_path = Path(video_path)
     imgs_dir = Path(imgs_dir)
@@ -327,13 +899,6 @@ def encode_video_frames(
 
     video_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Encoders/pixel formats incompatibility check
-    if (vcodec == "libsvtav1" or vcodec == "hevc") and pix_fmt == "yuv444p":
-        logging.warning(
-            f"Incompatible pixel format 'yuv444p' for codec {vcodec}, auto-selecting format 'yuv420p'"
-        )
-        pix_fmt = "yuv420p"
-
     # Get input frames
     template = "frame-" + ("[0-9]" * 6) + ".png"
     input_list = sorted(
@@ -346,23 +911,6 @@ def encode_video_frames(
     with Image.open(input_list[0]) as dummy_image:
         width, height = dummy_image.size
 
-    # Define video codec options
-    video_options = {}
-
-    if g is not None:
-        video_options["g"] = str(g)
-
-    if crf is not None:
-        video_options["crf"] = str(crf)
-
-    if fast_decode:
-        key = "svtav1-params" if vcodec == "libsvtav1" else "tune"
-        value = f"fast-decode={fast_decode}" if vcodec == "libsvtav1" else "fastdecode"
-        video_options[key] = value
-
-    if vcodec == "libsvtav1":
-        video_options["preset"] = str(preset) if preset is not None else "12"
-
     # Set logging level
     if log_level is not None:
         # "While less efficient, it is generally preferable to modify logging with Python's logging"
@@ -397,6 +945,137 @@ def encode_video_frames(
         raise OSError(f"Video encoding did not work. File not found: {video_path}.")
 
 
+def image_array_to_rgb24(image: np.ndarray | Image.Image) -> np.ndarray:
+    """Convert a camera frame (channel first or last, uint8 or float in [0, 1]) to a (H, W, 3) uint8 array."""
+    if isinstance(image, Image.Image):
+        return np.asarray(image.convert("RGB"))
+    if image.ndim == 3 and image.shape[0] == 3 and image.shape[-1] != 3:
+        image = image.transpose(1, 2, 0)
+    if image.dtype != np.uint8:
+        image = (image * 255).round().clip(0, 255).astype(np.uint8)
+    return np.ascontiguousarray(image)
+
+
+class StreamingVideoEncoder:
+    """Encode the frames of one camera into a video file as they are recorded.
+
+    Frames are put in a bounded queue and encoded by a background thread with PyAV, so that the video of an
+    episode is ready as soon as its last frame is added, instead of writing the frames as PNG files and encoding
+    them when the episode is saved. When the queue is full, `add_frame` blocks until the encoder catches up.
+
+    A strided subset of the frames, downsampled like in `compute_episode_stats`, is kept as uint8 to compute the
+    statistics of the episode without reading the video back.
+
+    Args:
+        video_path: Path of the video file to write.
+        fps: Frame rate of the video.
+        vcodec: Video codec, see `encode_video_frames`.
+        queue_size: Maximum number of frames waiting to be encoded.
+        max_stats_frames: Maximum number of frames kept for the statistics.
+    """
+
+    def __init__(
+        self,
+        video_path: Path | str,
+        fps: int,
+        vcodec: str = "libsvtav1",
+        pix_fmt: str = "yuv420p",
+        g: int | None = 2,
+        crf: int | None = 30,
+        fast_decode: int = 0,
+        preset: int | None = None,
+        queue_size: int = 64,
+        max_stats_frames: int = 256,
+    ):
+        self.video_path = Path(video_path)
+        self.fps = fps
+        self.vcodec = vcodec
+        self.video_options, self.pix_fmt = get_video_encoding_options(
+            vcodec, pix_fmt, g, crf, fast_decode, preset
+        )
+        self.max_stats_frames = max_stats_frames
+        self.num_frames = 0
+        self._stats_frames: list[np.ndarray] = []
+        self._stats_stride = 1
+        self._error: BaseException | None = None
+        self._closed = False
+
+        self.video_path.parent.mkdir(parents=True, exist_ok=True)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = Thread(target=self._encode_loop, name=f"encoder-{self.video_path.stem}", daemon=True)
+        self._thread.start()
+
+    def add_frame(self, image: np.ndarray | Image.Image) -> None:
+        """Queue a frame to be encoded. Blocks while `queue_size` frames are already waiting."""
+        if self._closed:
+            raise RuntimeError(f"The encoder of {self.video_path} is already closed.")
+        self._raise_if_failed()
+        self._queue.put(image)
+
+    def finish(self) -> Path:
+        """Encode the remaining frames, close the video file and return its path."""
+        self._close()
+        self._raise_if_failed()
+        if self.num_frames == 0:
+            raise ValueError(f"No frames were added to {self.video_path}.")
+        return self.video_path
+
+    def cancel(self) -> None:
+        """Stop encoding and delete the video file."""
+        self._close()
+        self.video_path.unlink(missing_ok=True)
+
+    def get_stats_frames(self) -> np.ndarray:
+        """Return the frames kept for the statistics, as a (N, 3, H, W) uint8 array."""
+        return np.stack(self._stats_frames)
+
+    def _close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"Encoding {self.video_path} failed.") from self._error
+
+    def _keep_for_stats(self, frame: np.ndarray) -> None:
+        # Keep every `stride`-th frame, and halve the kept frames by doubling the stride when there are too many
+        if self.num_frames % self._stats_stride != 0:
+            return
+        self._stats_frames.append(auto_downsample_height_width(frame.transpose(2, 0, 1)).copy())
+        if len(self._stats_frames) > self.max_stats_frames:
+            self._stats_frames = self._stats_frames[::2]
+            self._stats_stride *= 2
+
+    def _encode_loop(self) -> None:
+        output = None
+        end_of_stream = False
+        try:
+            while (image := self._queue.get()) is not None:
+                frame = image_array_to_rgb24(image)
+                if output is None:
+                    output = av.open(str(self.video_path), "w")
+                    stream = output.add_stream(self.vcodec, self.fps, options=self.video_options)
+                    stream.pix_fmt = self.pix_fmt
+                    stream.height, stream.width = frame.shape[:2]
+                output.mux(stream.encode(av.VideoFrame.from_ndarray(frame, format="rgb24")))
+                self._keep_for_stats(frame)
+                self.num_frames += 1
+            end_of_stream = True
+            if output is not None:
+                # Flush the encoder
+                output.mux(stream.encode())
+        except Exception as e:
+            self._error = e
+            # Keep consuming the queue so that `add_frame` doesn't block until the end of stream is received
+            while not end_of_stream and self._queue.get() is not None:
+                pass
+        finally:
+            if output is not None:
+                output.close()
+
+
 def concatenate_video_files(
     input_video_paths: list[Path | str], output_video_path: Path, overwrite: bool = True
 ):
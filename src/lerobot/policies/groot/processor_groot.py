@@ -35,6 +35,7 @@ from lerobot.configs.types import (
     NormalizationMode,
     PolicyFeature,
 )
+from lerobot.datasets.compute_stats import strip_quantile_sketches
 from lerobot.policies.groot.configuration_groot import GrootConfig
 from lerobot.processor import (
     AddBatchDimensionProcessorStep,
@@ -106,7 +107,7 @@ def make_groot_pre_post_processors(
     max_action_dim = config.max_action_dim
 
     # Pass raw dataset_stats; normalization will occur inside pack step before padding
-    padded_stats = dataset_stats or {}
+    padded_stats = strip_quantile_sketches(dataset_stats or {})
 
     # Define feature specs for optional normalization steps
     _features: dict[str, PolicyFeature] = {
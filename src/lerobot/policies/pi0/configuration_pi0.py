@@ -53,6 +53,9 @@ class PI0Config(PreTrainedConfig):
     # Real-Time Chunking (RTC) configuration
     rtc_config: RTCConfig | None = None
 
+    # Reuse the prefix key/values across inference calls with the same prompt and images, see `PrefixCache`
+    use_prefix_cache: bool = False
+
     image_resolution: tuple[int, int] = (
         DEFAULT_IMAGE_SIZE,
         DEFAULT_IMAGE_SIZE,
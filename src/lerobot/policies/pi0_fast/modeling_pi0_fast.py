@@ -36,13 +36,14 @@ else:
     idct = None
 
 if TYPE_CHECKING or _transformers_available:
-    from transformers import AutoTokenizer
+    from transformers import AutoTokenizer, StaticCache
     from transformers.models.auto import CONFIG_MAPPING
     from transformers.models.paligemma.modeling_paligemma import PaliGemmaForConditionalGeneration
 else:
     CONFIG_MAPPING = None
     PaliGemmaForConditionalGeneration = None
     AutoTokenizer = None
+    StaticCache = None
 
 from lerobot.configs.policies import PreTrainedConfig
 from lerobot.policies.pi0_fast.configuration_pi0_fast import PI0FastConfig
@@ -254,6 +255,7 @@ class PI0FastPaliGemma(nn.Module):
         past_key_values: list[torch.FloatTensor] | None = None,
         inputs_embeds: list[torch.FloatTensor] | None = None,
         use_cache: bool | None = None,
+        cache_position: torch.LongTensor | None = None,
         adarms_cond: list[torch.Tensor] | None = None,
     ):
         if adarms_cond is None:
@@ -265,6 +267,7 @@ class PI0FastPaliGemma(nn.Module):
                 position_ids=position_ids,
                 past_key_values=past_key_values,
                 use_cache=use_cache,
+                cache_position=cache_position,
                 adarms_cond=adarms_cond[0] if adarms_cond is not None else None,
             )
             prefix_past_key_values = prefix_output.past_key_values
@@ -300,6 +303,10 @@ class PI0FastPytorch(nn.Module):  # see openpi `PI0Pytorch`
         # Initialize gradient checkpointing flag
         self.gradient_checkpointing_enabled = False
 
+        # Static KV cache reused across the calls to `sample_actions_fast`
+        self._decoding_cache = None
+        self._decoding_cache_key = None
+
         # Compile model if requested
         if config.compile_model:
             torch.set_float32_matmul_precision("high")
@@ -580,6 +587,56 @@ class PI0FastPytorch(nn.Module):  # see openpi `PI0Pytorch`
             "loss": fast_loss,
         }
 
+    def _embed_decoding_prefix(self, images, img_masks, tokens, masks):
+        """Embed the prefix [images, language prompt, BOS] the action tokens are decoded from."""
+        bsize = tokens.shape[0]
+        device = tokens.device
+
+        # add bos token after tokens
+        bos_token = torch.full(
+            (bsize, 1), self._paligemma_tokenizer.bos_token_id, dtype=torch.long, device=device
+        )
+        tokens = torch.cat([tokens, bos_token], dim=1)
+        masks = torch.cat([masks, torch.ones((bsize, 1), dtype=torch.bool, device=device)], dim=1)
+
+        prefix_embs, prefix_pad_masks, prefix_att_masks, _, _ = self.embed_prefix_fast(
+            images, img_masks, tokens, masks, fast_action_tokens=None, fast_action_masks=None
+        )
+
+        if (
+            self.paligemma_with_expert.paligemma.language_model.layers[0].self_attn.q_proj.weight.dtype
+            == torch.bfloat16
+        ):
+            prefix_embs = prefix_embs.to(dtype=torch.bfloat16)
+        return prefix_embs, prefix_pad_masks, prefix_att_masks
+
+    def _embed_action_token(self, token, dtype):
+        token_emb = self.paligemma_with_expert.embed_language_tokens(token)
+        return (token_emb * math.sqrt(token_emb.shape[-1])).to(dtype=dtype)
+
+    @staticmethod
+    def _sample_next_token(logits, temperature):
+        if temperature > 0:
+            probs = torch.softmax(logits / temperature, dim=-1)
+            return torch.multinomial(probs, num_samples=1)
+        return torch.argmax(logits, dim=-1, keepdim=True)
+
+    def _get_decoding_cache(self, bsize, max_cache_len, dtype, device) -> "StaticCache":
+        """Return the static KV cache used for decoding, only reallocated when its shape changes."""
+        cache_key = (bsize, max_cache_len, dtype, device)
+        if self._decoding_cache is None or self._decoding_cache_key != cache_key:
+            self._decoding_cache = StaticCache(
+                config=self.paligemma_with_expert.paligemma.config.text_config,
+                max_batch_size=bsize,
+                max_cache_len=max_cache_len,
+                device=device,
+                dtype=dtype,
+            )
+            self._decoding_cache_key = cache_key
+        else:
+            self._decoding_cache.reset()
+        return self._decoding_cache
+
     @torch.no_grad()
     def sample_actions_fast(
         self,
@@ -590,10 +647,17 @@ class PI0FastPytorch(nn.Module):  # see openpi `PI0Pytorch`
         max_decoding_steps=None,
         temperature=0.0,
     ) -> torch.Tensor:
-        """
-        Inefficient but safe autoregressive decoding for FAST tokens.
-        Matches the pattern of _generate_subtask_tokens.
-        TODO: jadechoghari, should we move this logic to PI0FastPolicy class?
+        """Autoregressive decoding of the FAST tokens with a static KV cache.
+
+        The prefix [images, language prompt, BOS] is run once to fill the cache, then each step only runs the
+        last generated token through the model. The cache, the attention mask and the output tokens are
+        preallocated for the full decoding length, so the decoding steps don't allocate or copy growing tensors.
+
+        A sequence is finished once it generated the EOS token, its following tokens are set to the pad token,
+        and decoding stops as soon as all the sequences of the batch are finished.
+
+        Returns:
+            The generated tokens [B, max_decoding_steps].
         """
         if max_decoding_steps is None:
             max_decoding_steps = self.config.max_action_tokens
@@ -601,83 +665,68 @@ class PI0FastPytorch(nn.Module):  # see openpi `PI0Pytorch`
         bsize = tokens.shape[0]
         device = tokens.device
         lm_head = self.paligemma_with_expert.paligemma.lm_head
+        eos_token_id = self._paligemma_tokenizer.eos_token_id
+        pad_token_id = self._paligemma_tokenizer.pad_token_id
 
-        # add bos token after tokens
-        bos_token = torch.full(
-            (bsize, 1), self._paligemma_tokenizer.bos_token_id, dtype=torch.long, device=device
+        prefix_embs, prefix_pad_masks, prefix_att_masks = self._embed_decoding_prefix(
+            images, img_masks, tokens, masks
         )
-        tokens = torch.cat([tokens, bos_token], dim=1)
-        masks = torch.cat([masks, torch.ones((bsize, 1), dtype=torch.bool, device=device)], dim=1)
-
-        # 1. Initial Embedding (matches training prefix)
-        # prefix_embs will include [Images, Language Prompt, BOS]
-        prefix_embs, prefix_pad_masks, prefix_att_masks, total_t_images, _ = self.embed_prefix_fast(
-            images, img_masks, tokens, masks, fast_action_tokens=None, fast_action_masks=None
+        prefix_len = prefix_embs.shape[1]
+        # The last generated token is never run through the model
+        max_cache_len = prefix_len + max_decoding_steps - 1
+        past_key_values = self._get_decoding_cache(bsize, max_cache_len, prefix_embs.dtype, device)
+
+        # 1. Prefill: the prefix attends to the prefix only, the rest of the cache is still empty
+        prefill_att_masks = torch.zeros((bsize, prefix_len, max_cache_len), dtype=torch.bool, device=device)
+        prefill_att_masks[:, :, :prefix_len] = prefix_att_masks
+        (prefix_out, _), _ = self.paligemma_with_expert.forward(
+            attention_mask=self._prepare_attention_masks_4d(prefill_att_masks, dtype=prefix_embs.dtype),
+            position_ids=torch.cumsum(prefix_pad_masks, dim=1) - 1,
+            past_key_values=past_key_values,
+            inputs_embeds=[prefix_embs, None],
+            use_cache=True,
+            cache_position=torch.arange(prefix_len, device=device),
+            adarms_cond=[None, None],
         )
+        next_token = self._sample_next_token(lm_head(prefix_out[:, -1]), temperature)
 
-        if (
-            self.paligemma_with_expert.paligemma.language_model.layers[0].self_attn.q_proj.weight.dtype
-            == torch.bfloat16
-        ):
-            prefix_embs = prefix_embs.to(dtype=torch.bfloat16)
+        generated_action_tokens = torch.full(
+            (bsize, max_decoding_steps), pad_token_id, dtype=torch.long, device=device
+        )
+        generated_action_tokens[:, 0] = next_token.squeeze(-1)
+        finished = next_token.squeeze(-1) == eos_token_id
 
-        generated_action_tokens = torch.zeros((bsize, max_decoding_steps), dtype=torch.long, device=device)
+        # 2. Decoding: the generated tokens attend to the valid prefix tokens and to the previous generated tokens
+        step_pad_masks = torch.zeros((bsize, 1, max_cache_len), dtype=torch.bool, device=device)
+        step_pad_masks[:, 0, :prefix_len] = prefix_pad_masks
+        step_att_mask = self._prepare_attention_masks_4d(step_pad_masks, dtype=prefix_embs.dtype)
+        num_valid_prefix_tokens = prefix_pad_masks.sum(dim=1, keepdim=True)
 
-        # 2. Decoding Loop (each step re-computes full sequence)
-        for t in range(max_decoding_steps):
-            # always re-calculate position IDs from the current pad mask
-            position_ids = torch.cumsum(prefix_pad_masks, dim=1) - 1
-            att_4d = self._prepare_attention_masks_4d(prefix_att_masks, dtype=prefix_embs.dtype)
+        for t in range(1, max_decoding_steps):
+            if finished.all():
+                break
+            cache_position = prefix_len + t - 1
+            step_att_mask[..., cache_position] = 0.0
 
-            # full forward pass (no kv cache)
-            (prefix_out, _), _ = self.paligemma_with_expert.forward(
-                attention_mask=att_4d,
-                position_ids=position_ids,
-                past_key_values=None,
-                inputs_embeds=[prefix_embs, None],
-                use_cache=False,
+            (step_out, _), _ = self.paligemma_with_expert.forward(
+                attention_mask=step_att_mask,
+                position_ids=num_valid_prefix_tokens + t - 1,
+                past_key_values=past_key_values,
+                inputs_embeds=[self._embed_action_token(next_token, prefix_embs.dtype), None],
+                use_cache=True,
+                cache_position=torch.tensor([cache_position], device=device),
                 adarms_cond=[None, None],
             )
-
-            # predict next token from the very last sequence position
-            last_logits = lm_head(prefix_out[:, -1:, :])  # (B, 1, vocab_size)
-
-            if temperature > 0:
-                probs = torch.softmax(last_logits[:, -1] / temperature, dim=-1)
-                next_token = torch.multinomial(probs, num_samples=1)
-            else:
-                next_token = torch.argmax(last_logits[:, -1], dim=-1, keepdim=True)
+            next_token = self._sample_next_token(lm_head(step_out[:, -1]), temperature)
+            next_token = torch.where(finished[:, None], pad_token_id, next_token)
 
             generated_action_tokens[:, t] = next_token.squeeze(-1)
+            finished |= next_token.squeeze(-1) == eos_token_id
 
-            # 3. Update sequence for next iteration (unless it's the last step)
-            if t < max_decoding_steps - 1:
-                # embed the newly generated token
-                next_token_emb = self.paligemma_with_expert.embed_language_tokens(next_token)
-                next_token_emb = next_token_emb * math.sqrt(next_token_emb.shape[-1])
-                if prefix_embs.dtype == torch.bfloat16:
-                    next_token_emb = next_token_emb.to(dtype=torch.bfloat16)
-
-                # append to embeddings
-                prefix_embs = torch.cat([prefix_embs, next_token_emb], dim=1)
-
-                # update padding mask (new token is always valid/1)
-                prefix_pad_masks = torch.cat(
-                    [prefix_pad_masks, torch.ones((bsize, 1), dtype=torch.bool, device=device)], dim=1
-                )
-
-                # update 2d attention mask: grow the matrix
-                old_len = prefix_att_masks.shape[1]
-                new_len = old_len + 1
-                new_att_masks = torch.zeros((bsize, new_len, new_len), dtype=torch.bool, device=device)
-                new_att_masks[:, :old_len, :old_len] = prefix_att_masks
-                # new token attends to all non-padding tokens in the updated sequence
-                new_att_masks[:, -1, :] = prefix_pad_masks
-                prefix_att_masks = new_att_masks
         return generated_action_tokens
 
     @torch.no_grad()
-    def sample_actions_fast_kv_cache(
+    def sample_actions_fast_no_cache(
         self,
         images,
         img_masks,
@@ -686,8 +735,10 @@ class PI0FastPytorch(nn.Module):  # see openpi `PI0Pytorch`
         max_decoding_steps=None,
         temperature=0.0,
     ) -> torch.Tensor:
-        """
-        Optimized autoregressive decoding for FAST tokens using KV Caching.
+        """Reference autoregressive decoding of the FAST tokens, without KV cache.
+
+        Each step re-computes the full sequence, which makes decoding quadratic in the number of generated tokens.
+        Generates the same tokens as `sample_actions_fast`, which should be preferred.
         """
         if max_decoding_steps is None:
             max_decoding_steps = self.config.max_action_tokens
@@ -695,110 +746,136 @@ class PI0FastPytorch(nn.Module):  # see openpi `PI0Pytorch`
         bsize = tokens.shape[0]
         device = tokens.device
         lm_head = self.paligemma_with_expert.paligemma.lm_head
+        eos_token_id = self._paligemma_tokenizer.eos_token_id
+        pad_token_id = self._paligemma_tokenizer.pad_token_id
 
-        # --- 1. PREFILL PHASE ---
-        # Process Images + Text Prompt + BOS token once to populate the KV cache.
-
-        # Add BOS token to the prompt
-        bos_token = torch.full(
-            (bsize, 1), self._paligemma_tokenizer.bos_token_id, dtype=torch.long, device=device
+        prefix_embs, prefix_pad_masks, prefix_att_masks = self._embed_decoding_prefix(
+            images, img_masks, tokens, masks
         )
-        tokens_in = torch.cat([tokens, bos_token], dim=1)
-        masks_in = torch.cat([masks, torch.ones((bsize, 1), dtype=torch.bool, device=device)], dim=1)
 
-        # Embed prefix [Images, Language, BOS]
-        # fast_action_tokens=None means we are just embedding the condition (images+text)
-        prefix_embs, prefix_pad_masks, prefix_att_masks, total_t_images, _ = self.embed_prefix_fast(
-            images, img_masks, tokens_in, masks_in, fast_action_tokens=None, fast_action_masks=None
+        generated_action_tokens = torch.full(
+            (bsize, max_decoding_steps), pad_token_id, dtype=torch.long, device=device
         )
+        finished = torch.zeros(bsize, dtype=torch.bool, device=device)
 
-        # Ensure correct precision (bfloat16/float32)
-        if (
-            self.paligemma_with_expert.paligemma.language_model.layers[0].self_attn.q_proj.weight.dtype
-            == torch.bfloat16
-        ):
-            prefix_embs = prefix_embs.to(dtype=torch.bfloat16)
+        for t in range(max_decoding_steps):
+            # full forward pass over [prefix, generated tokens]
+            (prefix_out, _), _ = self.paligemma_with_expert.forward(
+                attention_mask=self._prepare_attention_masks_4d(prefix_att_masks, dtype=prefix_embs.dtype),
+                position_ids=torch.cumsum(prefix_pad_masks, dim=1) - 1,
+                past_key_values=None,
+                inputs_embeds=[prefix_embs, None],
+                use_cache=False,
+                adarms_cond=[None, None],
+            )
+            next_token = self._sample_next_token(lm_head(prefix_out[:, -1]), temperature)
+            next_token = torch.where(finished[:, None], pad_token_id, next_token)
 
-        # Create position IDs (cumsum of mask - 1)
-        position_ids = torch.cumsum(prefix_pad_masks, dim=1) - 1
+            generated_action_tokens[:, t] = next_token.squeeze(-1)
+            finished |= next_token.squeeze(-1) == eos_token_id
+            if finished.all() or t == max_decoding_steps - 1:
+                break
 
-        # Create 4D mask for the prefix
-        att_4d = self._prepare_attention_masks_4d(prefix_att_masks, dtype=prefix_embs.dtype)
+            # append the generated token, which attends to all the non-padding tokens of the sequence
+            prefix_embs = torch.cat(
+                [prefix_embs, self._embed_action_token(next_token, prefix_embs.dtype)], dim=1
+            )
+            prefix_pad_masks = torch.cat(
+                [prefix_pad_masks, torch.ones((bsize, 1), dtype=torch.bool, device=device)], dim=1
+            )
+            old_len = prefix_att_masks.shape[1]
+            new_att_masks = torch.zeros((bsize, old_len + 1, old_len + 1), dtype=torch.bool, device=device)
+            new_att_masks[:, :old_len, :old_len] = prefix_att_masks
+            new_att_masks[:, -1, :] = prefix_pad_masks
+            prefix_att_masks = new_att_masks
 
-        # Forward pass (Prefill) with use_cache=True
-        # We only pass [prefix_embs, None] because we aren't using the suffix (expert) model yet
-        (prefix_out, _), past_key_values = self.paligemma_with_expert.forward(
-            attention_mask=att_4d,
-            position_ids=position_ids,
-            past_key_values=None,
-            inputs_embeds=[prefix_embs, None],
-            use_cache=True,  # Enable caching
-            adarms_cond=[None, None],
-        )
+        return generated_action_tokens
 
-        # Sample the first action token from the last logit of the prefix
-        last_logits = lm_head(prefix_out[:, -1:, :])  # (B, 1, V)
-        if temperature > 0:
-            probs = torch.softmax(last_logits[:, -1] / temperature, dim=-1)
-            next_token = torch.multinomial(probs, num_samples=1)
-        else:
-            next_token = torch.argmax(last_logits[:, -1], dim=-1, keepdim=True)
 
-        # Initialize storage for generated tokens
-        generated_action_tokens = torch.zeros((bsize, max_decoding_steps), dtype=torch.long, device=device)
-        generated_action_tokens[:, 0] = next_token.squeeze(-1)
+class FASTDetokenizer:
+    """Batched decoding of FAST action tokens to continuous actions.
 
-        # Track valid tokens mask (0 for pad, 1 for valid)
-        # We need this to tell the new token what it can attend to (images + text + past actions)
-        current_pad_mask = prefix_pad_masks
+    The FAST tokenizer decodes a sequence of tokens to a string, one character per quantized DCT coefficient. This
+    class builds once a lookup table from each token to its coefficients, and decodes a whole batch of token
+    sequences with array operations, followed by a single batched inverse DCT.
 
-        # --- 2. DECODING PHASE ---
-        # Generate remaining tokens one by one using the cache.
+    Args:
+        action_tokenizer: The FAST action tokenizer, with its `bpe_tokenizer`, `min_token` and `scale`.
+    """
 
-        for t in range(1, max_decoding_steps):
-            # Embed the single previous token
-            # We use embed_language_tokens directly to avoid overhead of full prefix embedding
-            next_token_emb = self.paligemma_with_expert.embed_language_tokens(next_token)
-            next_token_emb = next_token_emb * math.sqrt(next_token_emb.shape[-1])
-            if prefix_embs.dtype == torch.bfloat16:
-                next_token_emb = next_token_emb.to(dtype=torch.bfloat16)
-
-            # Update Pad Mask: append 1s for the new valid token
-            new_column = torch.ones((bsize, 1), dtype=torch.bool, device=device)
-            current_pad_mask = torch.cat([current_pad_mask, new_column], dim=1)
-
-            # Update Position IDs for the single new token
-            current_position_ids = (torch.sum(current_pad_mask, dim=1, keepdim=True) - 1).long()
-
-            # Create Attention Mask for the single new step
-            # The new token attends to all valid tokens in history (captured by current_pad_mask).
-            # Shape becomes (B, 1, 1, Total_Len) which works with HF's cache logic.
-            step_att_mask = self._prepare_attention_masks_4d(
-                current_pad_mask.unsqueeze(1), dtype=next_token_emb.dtype
-            )
+    def __init__(self, action_tokenizer):
+        self.scale = action_tokenizer.scale
+        bpe_tokenizer = action_tokenizer.bpe_tokenizer
+        self.vocab_size = len(bpe_tokenizer)
 
-            # Forward pass (Decoding step)
-            # input_embeds is just the new token (B, 1, D)
-            (step_out, _), past_key_values = self.paligemma_with_expert.forward(
-                attention_mask=step_att_mask,
-                position_ids=current_position_ids,
-                past_key_values=past_key_values,  # Pass updated cache
-                inputs_embeds=[next_token_emb, None],
-                use_cache=True,
-                adarms_cond=[None, None],
-            )
+        # The tokenizer can insert a separator between the decoded tokens (a space when it has no decoder)
+        single, pair = bpe_tokenizer.decode([0]), bpe_tokenizer.decode([0, 0])
+        separator = pair[len(single) : len(pair) - len(single)]
+        self.separator_len = len(separator)
 
-            # Sample next token
-            last_logits = lm_head(step_out[:, -1:, :])
-            if temperature > 0:
-                probs = torch.softmax(last_logits[:, -1] / temperature, dim=-1)
-                next_token = torch.multinomial(probs, num_samples=1)
-            else:
-                next_token = torch.argmax(last_logits[:, -1], dim=-1, keepdim=True)
+        pieces = [
+            [ord(char) + action_tokenizer.min_token for char in piece + separator]
+            for piece in bpe_tokenizer.batch_decode([[token] for token in range(self.vocab_size)])
+        ]
+        # Coefficients of each token followed by the separator [vocab_size, max_piece_len], and their count
+        self.piece_lengths = np.array([len(piece) for piece in pieces])
+        self.table = np.zeros((self.vocab_size, self.piece_lengths.max()), dtype=np.int64)
+        for token, piece in enumerate(pieces):
+            self.table[token, : len(piece)] = piece
 
-            generated_action_tokens[:, t] = next_token.squeeze(-1)
+    def __call__(
+        self,
+        token_ids: np.ndarray,
+        time_horizon: int,
+        action_dim: int,
+        token_mask: np.ndarray | None = None,
+        relaxed_decoding: bool = True,
+    ) -> np.ndarray:
+        """Decode action tokens to continuous actions.
 
-        return generated_action_tokens
+        Args:
+            token_ids: Action token IDs [B, L].
+            time_horizon: The number of timesteps for actions.
+            action_dim: The dimensionality of each action.
+            token_mask: Mask of the tokens to decode [B, L], all of them if None.
+            relaxed_decoding: Whether to truncate or zero-pad the decoded coefficients to the expected length,
+                instead of rejecting the sequences of a different length.
+
+        Returns:
+            The decoded actions [B, time_horizon, action_dim]. Sequences that can't be decoded give zero actions.
+        """
+        token_ids = np.asarray(token_ids, dtype=np.int64)
+        token_mask = np.ones(token_ids.shape, dtype=bool) if token_mask is None else np.asarray(token_mask)
+        bsize, seq_len = token_ids.shape
+        expected_len = time_horizon * action_dim
+
+        input_ids, input_mask = token_ids, token_mask
+        invalid = np.any(token_mask & (token_ids < 0), axis=1)
+        # Like the tokenizer, skip the IDs out of its vocabulary
+        token_mask = token_mask & (token_ids >= 0) & (token_ids < self.vocab_size)
+        token_ids = np.where(token_mask, token_ids, 0)
+
+        lengths = np.where(token_mask, self.piece_lengths[token_ids], 0)
+        # No separator after the last token
+        last_token = np.where(token_mask, np.arange(seq_len), -1).max(axis=1, initial=-1)
+        has_tokens = last_token >= 0
+        lengths[has_tokens, last_token[has_tokens]] -= self.separator_len
+        if not relaxed_decoding:
+            invalid |= lengths.sum(axis=1) != expected_len
+
+        # Scatter the coefficients of each token at its offset in the sequence, truncated to the expected length
+        positions = (np.cumsum(lengths, axis=1) - lengths)[..., None] + np.arange(self.table.shape[1])
+        keep = (np.arange(self.table.shape[1]) < lengths[..., None]) & (positions < expected_len)
+        keep &= ~invalid[:, None, None]
+        batch_idx = np.broadcast_to(np.arange(bsize)[:, None, None], positions.shape)
+        dct_coeff = np.zeros((bsize, expected_len))
+        dct_coeff[batch_idx[keep], positions[keep]] = self.table[token_ids][keep]
+
+        for idx in np.flatnonzero(invalid):
+            logging.warning(f"Error decoding tokens: {input_ids[idx][input_mask[idx]].tolist()}")
+
+        dct_coeff = dct_coeff.reshape(bsize, time_horizon, action_dim)
+        return idct(dct_coeff / self.scale, axis=1, norm="ortho")
 
 
 class PI0FastPolicy(PreTrainedPolicy):
@@ -840,6 +917,9 @@ class PI0FastPolicy(PreTrainedPolicy):
             logging.error("Tokenizer loading is required for proper policy initialization; aborting.")
             raise RuntimeError("Failed to load required tokenizers for PI0FastPolicy initialization") from e
 
+        # Built from the FAST tokenizer on the first decoding
+        self._fast_detokenizer = None
+
         # Initialize the core PI0Fast model
         self.init_rtc_processor()
         self.model = PI0FastPytorch(
@@ -1112,60 +1192,45 @@ class PI0FastPolicy(PreTrainedPolicy):
         return self._paligemma_tokenizer.vocab_size - 1 - self.config.fast_skip_tokens - tokens
 
     def decode_actions_with_fast(
-        self, token_ids: list[int], time_horizon: int, action_dim: int, relaxed_decoding: bool = True
+        self,
+        token_ids: np.ndarray | torch.Tensor | list,
+        time_horizon: int,
+        action_dim: int,
+        relaxed_decoding: bool = True,
+        token_mask: np.ndarray | torch.Tensor | None = None,
     ) -> np.ndarray:
         """
         Decodes action token IDs back to continuous action values using the FAST tokenizer.
 
         Args:
-            token_ids: List of token IDs to decode.
+            token_ids: Action token IDs [B, L], or a list of B sequences of token IDs.
             time_horizon: The number of timesteps for actions.
             action_dim: The dimensionality of each action.
             relaxed_decoding: Whether to use relaxed decoding (allows partial sequences).
+            token_mask: Mask of the tokens to decode [B, L], all of them if None.
 
         Returns:
             A numpy array representing the decoded actions.
         """
-        decoded_actions = []
-
-        for token in token_ids:
-            try:
-                decoded_tokens = self.action_tokenizer.bpe_tokenizer.decode(token)
-                decoded_dct_coeff = np.array(list(map(ord, decoded_tokens))) + self.action_tokenizer.min_token
-
-                if relaxed_decoding:
-                    # expected sequence length
-                    expected_seq_len = time_horizon * action_dim
-                    diff = expected_seq_len - decoded_dct_coeff.shape[0]
-
-                    # apply truncation if too long
-                    if diff < 0:
-                        decoded_dct_coeff = decoded_dct_coeff[:expected_seq_len]  # truncate on the right
-
-                    # apply padding if too short
-                    elif diff > 0:
-                        decoded_dct_coeff = np.pad(
-                            decoded_dct_coeff, (0, diff), mode="constant", constant_values=0
-                        )
-
-                decoded_dct_coeff = decoded_dct_coeff.reshape(-1, action_dim)
-                assert decoded_dct_coeff.shape == (
-                    time_horizon,
-                    action_dim,
-                ), (
-                    f"Decoded DCT coefficients have shape {decoded_dct_coeff.shape}, expected ({time_horizon}, {action_dim})"
-                )
-
-            except Exception as e:
-                logging.warning(f"Error decoding tokens: {e}")
-                logging.warning(f"Tokens: {token}")
-                decoded_dct_coeff = np.zeros((time_horizon, action_dim))
-
-            decoded_actions.append(
-                idct(decoded_dct_coeff / self.action_tokenizer.scale, axis=0, norm="ortho")
-            )
-
-        return np.stack(decoded_actions)
+        if self._fast_detokenizer is None:
+            self._fast_detokenizer = FASTDetokenizer(self.action_tokenizer)
+
+        if isinstance(token_ids, list):
+            # Pad the sequences of different lengths
+            sequences = [
+                np.asarray(torch.as_tensor(seq).cpu(), dtype=np.int64).reshape(-1) for seq in token_ids
+            ]
+            max_len = max((len(seq) for seq in sequences), default=0)
+            token_mask = np.arange(max_len) < np.array([len(seq) for seq in sequences])[:, None]
+            token_ids = np.stack([np.pad(seq, (0, max_len - len(seq))) for seq in sequences])
+        if isinstance(token_ids, torch.Tensor):
+            token_ids = token_ids.cpu().numpy()
+        if isinstance(token_mask, torch.Tensor):
+            token_mask = token_mask.cpu().numpy()
+
+        return self._fast_detokenizer(
+            token_ids, time_horizon, action_dim, token_mask=token_mask, relaxed_decoding=relaxed_decoding
+        )
 
     def detokenize_actions(self, tokens: torch.Tensor, action_horizon: int, action_dim: int) -> torch.Tensor:
         """
@@ -1193,57 +1258,35 @@ class PI0FastPolicy(PreTrainedPolicy):
         if single_sample:
             tokens = tokens.unsqueeze(0)
 
-        # Convert token IDs to token strings
-        decoded_tokens = [self._paligemma_tokenizer.convert_ids_to_tokens(seq.tolist()) for seq in tokens]
-        # Get the token sequence for "Action: " to remove it
-        action_prefix_ids = self._paligemma_tokenizer.encode("Action: ", add_special_tokens=False)
-        action_prefix_tokens = self._paligemma_tokenizer.convert_ids_to_tokens(action_prefix_ids)
-        action_prefix_len = len(action_prefix_tokens)
-
-        # Clean tokens by removing everything after the first "|" (end-of-action marker)
-        # and removing all occurrences of "Action: " token sequence
         # assert that beginning contain "Action: "
         if self.config.validate_action_token_prefix:
-            for token_seq in decoded_tokens:
+            for token_ids_seq in tokens[:, :2].tolist():
+                token_seq = self._paligemma_tokenizer.convert_ids_to_tokens(token_ids_seq)
                 assert len(token_seq) >= 2 and token_seq[0] == "Action" and token_seq[1] == ":", (
                     f"Token sequence does not start with ['Action', ':']: {token_seq}"
                 )
 
-        cleaned_tokens = []
-        for token_seq in decoded_tokens:
-            # Remove everything after "|"
-            if "|" in token_seq:
-                token_seq = token_seq[: token_seq.index("|")]
-
-            # Remove all occurrences of "Action: " token sequence
-            i = 0
-            while i <= len(token_seq) - action_prefix_len:
-                if token_seq[i : i + action_prefix_len] == action_prefix_tokens:
-                    # Found a match, remove it
-                    token_seq = token_seq[:i] + token_seq[i + action_prefix_len :]
-                else:
-                    i += 1
-
-            cleaned_tokens.append(token_seq)
-
-        # Convert token strings back to IDs
-        raw_action_tokens = [
-            torch.tensor(
-                self._paligemma_tokenizer.convert_tokens_to_ids(token_seq),
-                dtype=torch.long,
-                device=tokens.device,
-            )
-            for token_seq in cleaned_tokens
-        ]
-
-        # Convert PaliGemma tokens to action tokens
-        action_tokens = [
-            self._paligemma_tokens_to_act_tokens(raw_action_token) for raw_action_token in raw_action_tokens
-        ]
-
-        # Decode action tokens to continuous actions
+        token_ids = tokens.cpu().numpy()
+        # Keep the tokens before the first "|" (end-of-action marker)
+        end_token_id = self._paligemma_tokenizer.convert_tokens_to_ids("|")
+        token_mask = np.cumsum(token_ids == end_token_id, axis=1) == 0
+
+        # Remove all occurrences of the "Action: " token sequence
+        action_prefix_ids = np.array(self._paligemma_tokenizer.encode("Action: ", add_special_tokens=False))
+        prefix_len = len(action_prefix_ids)
+        if token_ids.shape[1] >= prefix_len:
+            windows = np.lib.stride_tricks.sliding_window_view(token_ids, prefix_len, axis=1)
+            window_masks = np.lib.stride_tricks.sliding_window_view(token_mask, prefix_len, axis=1)
+            is_prefix = np.all(windows == action_prefix_ids, axis=-1) & np.all(window_masks, axis=-1)
+            for offset in range(prefix_len):
+                token_mask[:, offset : offset + is_prefix.shape[1]] &= ~is_prefix
+
+        # Convert PaliGemma tokens to action tokens, and decode them to continuous actions
         actions = self.decode_actions_with_fast(
-            action_tokens, time_horizon=action_horizon, action_dim=action_dim
+            self._paligemma_tokens_to_act_tokens(token_ids),
+            time_horizon=action_horizon,
+            action_dim=action_dim,
+            token_mask=token_mask,
         )
 
         # Convert to tensor and return
@@ -1289,7 +1332,7 @@ class PI0FastPolicy(PreTrainedPolicy):
 
         # Sample action tokens autoregressively
         if self.config.use_kv_cache:
-            action_tokens = self.model.sample_actions_fast_kv_cache(
+            action_tokens = self.model.sample_actions_fast(
                 images,
                 img_masks,
                 tokens,
@@ -1298,7 +1341,7 @@ class PI0FastPolicy(PreTrainedPolicy):
                 temperature=temperature,
             )
         else:
-            action_tokens = self.model.sample_actions_fast(
+            action_tokens = self.model.sample_actions_fast_no_cache(
                 images,
                 img_masks,
                 tokens,
@@ -53,6 +53,13 @@ class ActorLearnerConfig:
     learner_port: int = 50051
     policy_parameters_push_frequency: int = 4
     queue_get_timeout: float = 2
+    # How the parameters are pushed to the actors, see `lerobot.rl.parameter_sync`: "full" sends all the tensors
+    # at every push, "trainable" and "delta" only send the trainable tensors (as is or as differences with the
+    # last keyframe) between keyframes sent every `policy_parameters_keyframe_interval` pushes.
+    policy_parameters_sync_mode: str = "full"
+    # Dtype of the tensors sent between keyframes: "float32", "float16" or "bfloat16"
+    policy_parameters_dtype: str = "float32"
+    policy_parameters_keyframe_interval: int = 10
 
 
 @dataclass
@@ -145,6 +152,16 @@ class SACConfig(PreTrainedConfig):
     offline_buffer_capacity: int = 100000
     # Whether to use asynchronous prefetching for the buffers
     async_prefetch: bool = False
+    # Whether to sample the online replay buffer proportionally to the TD errors of the transitions
+    use_prioritized_replay: bool = False
+    # Prioritization exponent of the prioritized replay buffer (0 is uniform sampling)
+    prioritized_replay_alpha: float = 0.6
+    # Importance sampling exponent of the prioritized replay buffer (1 fully corrects the sampling bias)
+    prioritized_replay_beta: float = 0.4
+    # Number of steps of the returns aggregated in the replay buffers
+    n_step: int = 1
+    # Whether to store the images of the replay buffers as uint8, which divides their memory by 4
+    store_images_as_uint8: bool = False
     # Number of steps before learning starts
     online_step_before_learning: int = 100
     # Frequency of policy updates
@@ -200,6 +217,8 @@ class SACConfig(PreTrainedConfig):
     def __post_init__(self):
         super().__post_init__()
         # Any validation specific to SAC configuration
+        if self.n_step < 1:
+            raise ValueError(f"n_step must be >= 1, got {self.n_step}.")
 
     def get_optimizer_preset(self) -> MultiAdamConfig:
         return MultiAdamConfig(
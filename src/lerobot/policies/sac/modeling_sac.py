@@ -152,6 +152,10 @@ class SACPolicy(
                 - done: Done mask tensor
                 - observation_feature: Optional pre-computed observation features
                 - next_observation_feature: Optional pre-computed next observation features
+                - discount: Optional per-transition bootstrap discount (e.g. of n-step returns), instead of
+                  `config.discount`
+                - weights: Optional per-transition importance sampling weights of the critic losses (e.g. of
+                  prioritized replay)
             model: Which model to compute the loss for ("actor", "critic", "discrete_critic", or "temperature")
 
         Returns:
@@ -169,7 +173,7 @@ class SACPolicy(
             done: Tensor = batch["done"]
             next_observation_features: Tensor = batch.get("next_observation_feature")
 
-            loss_critic = self.compute_loss_critic(
+            loss_critic, td_error = self.compute_loss_critic(
                 observations=observations,
                 actions=actions,
                 rewards=rewards,
@@ -177,9 +181,12 @@ class SACPolicy(
                 done=done,
                 observation_features=observation_features,
                 next_observation_features=next_observation_features,
+                discount=batch.get("discount"),
+                weights=batch.get("weights"),
+                return_td_errors=True,
             )
 
-            return {"loss_critic": loss_critic}
+            return {"loss_critic": loss_critic, "td_error": td_error}
 
         if model == "discrete_critic" and self.config.num_discrete_actions is not None:
             # Extract critic-specific components
@@ -197,6 +204,8 @@ class SACPolicy(
                 observation_features=observation_features,
                 next_observation_features=next_observation_features,
                 complementary_info=complementary_info,
+                discount=batch.get("discount"),
+                weights=batch.get("weights"),
             )
             return {"loss_discrete_critic": loss_discrete_critic}
         if model == "actor":
@@ -251,7 +260,19 @@ class SACPolicy(
         done,
         observation_features: Tensor | None = None,
         next_observation_features: Tensor | None = None,
-    ) -> Tensor:
+        discount: Tensor | None = None,
+        weights: Tensor | None = None,
+        return_td_errors: bool = False,
+    ) -> Tensor | tuple[Tensor, Tensor]:
+        """Compute the TD loss of the critic ensemble.
+
+        `discount` overrides `config.discount` per transition (e.g. `discount ** n` for n-step returns) and
+        `weights` weighs the loss of each transition (e.g. importance sampling weights of prioritized replay).
+        With `return_td_errors`, the absolute TD errors of each transition, averaged over the ensemble, are also
+        returned, to update the priorities of a prioritized replay buffer.
+        """
+        if discount is None:
+            discount = self.config.discount
         with torch.no_grad():
             next_action_preds, next_log_probs, _ = self.actor(next_observations, next_observation_features)
 
@@ -275,7 +296,7 @@ class SACPolicy(
             if self.config.use_backup_entropy:
                 min_q = min_q - (self.temperature * next_log_probs)
 
-            td_target = rewards + (1 - done) * self.config.discount * min_q
+            td_target = rewards + (1 - done) * discount * min_q
 
         # 3- compute predicted qs
         if self.config.num_discrete_actions is not None:
@@ -293,14 +314,18 @@ class SACPolicy(
         # 4- Calculate loss
         # Compute state-action value loss (TD loss) for all of the Q functions in the ensemble.
         td_target_duplicate = einops.repeat(td_target, "b -> e b", e=q_preds.shape[0])
+        td_losses = F.mse_loss(
+            input=q_preds,
+            target=td_target_duplicate,
+            reduction="none",
+        )
+        if weights is not None:
+            td_losses = td_losses * weights
         # You compute the mean loss of the batch for each critic and then to compute the final loss you sum them up
-        critics_loss = (
-            F.mse_loss(
-                input=q_preds,
-                target=td_target_duplicate,
-                reduction="none",
-            ).mean(dim=1)
-        ).sum()
+        critics_loss = td_losses.mean(dim=1).sum()
+        if return_td_errors:
+            td_errors = (q_preds.detach() - td_target_duplicate).abs().mean(dim=0)
+            return critics_loss, td_errors
         return critics_loss
 
     def compute_loss_discrete_critic(
@@ -313,7 +338,11 @@ class SACPolicy(
         observation_features=None,
         next_observation_features=None,
         complementary_info=None,
+        discount: Tensor | None = None,
+        weights: Tensor | None = None,
     ):
+        if discount is None:
+            discount = self.config.discount
         # NOTE: We only want to keep the discrete action part
         # In the buffer we have the full action space (continuous + discrete)
         # We need to split them before concatenating them in the critic forward
@@ -348,7 +377,7 @@ class SACPolicy(
             rewards_discrete = rewards
             if discrete_penalties is not None:
                 rewards_discrete = rewards + discrete_penalties
-            target_discrete_q = rewards_discrete + (1 - done) * self.config.discount * target_next_discrete_q
+            target_discrete_q = rewards_discrete + (1 - done) * discount * target_next_discrete_q
 
         # Get predicted Q-values for current observations
         predicted_discrete_qs = self.discrete_critic_forward(
@@ -359,7 +388,12 @@ class SACPolicy(
         predicted_discrete_q = torch.gather(predicted_discrete_qs, dim=1, index=actions_discrete).squeeze(-1)
 
         # Compute MSE loss between predicted and target Q-values
-        discrete_critic_loss = F.mse_loss(input=predicted_discrete_q, target=target_discrete_q)
+        if weights is None:
+            discrete_critic_loss = F.mse_loss(input=predicted_discrete_q, target=target_discrete_q)
+        else:
+            discrete_critic_loss = (
+                weights * F.mse_loss(input=predicted_discrete_q, target=target_discrete_q, reduction="none")
+            ).mean()
         return discrete_critic_loss
 
     def compute_loss_temperature(self, observations, observation_features: Tensor | None = None) -> Tensor:
@@ -67,6 +67,8 @@ class SmolVLAConfig(PreTrainedConfig):
 
     # Attention utils
     use_cache: bool = True
+    # Reuse the prefix key/values across inference calls with the same prompt, images and state, see `PrefixCache`
+    use_prefix_cache: bool = False
 
     # Finetuning settings
     freeze_vision_encoder: bool = True
@@ -119,6 +121,8 @@ class SmolVLAConfig(PreTrainedConfig):
             raise NotImplementedError(
                 "`use_delta_joint_actions_aloha` is used by smolvla for aloha real models. It is not ported yet in LeRobot."
             )
+        if self.use_prefix_cache and not self.use_cache:
+            raise ValueError("`use_prefix_cache` requires `use_cache`.")
 
     def validate_features(self) -> None:
         for i in range(self.empty_cameras):
@@ -15,7 +15,9 @@
 # limitations under the License.
 
 import logging
-from collections import deque
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from typing import Any
 
 import numpy as np
 import torch
@@ -48,6 +50,87 @@ def populate_queues(
     return queues
 
 
+class PrefixCache:
+    """Cache of the prefix of the flow matching VLA policies (PI0, PI05, SmolVLA) across inference calls.
+
+    Each inference call of these policies computes the key/values of the prefix (images and language tokens, and
+    the state for SmolVLA) once, then runs the denoising steps of the action expert on top of them. The prefix
+    tokens attend to each other bidirectionally, so the key/values of the language tokens depend on the images and
+    can't be kept when only the images change. The cache keeps, for each tokenized prompt, the prefix computed
+    for the last inputs seen with this prompt. The entries of the least recently used prompts are evicted first.
+
+    A hit needs the same prompt and the same images: it only pays off when the policy is queried several times
+    for one observation, e.g. to sample several action chunks, or again before the cameras deliver new frames.
+    With new frames at every call, as in most rollouts, every call is a miss, which costs a comparison of the
+    images with the cached ones on top of the prefix computation. The cached inputs are kept by reference, so
+    they must not be modified in place after the call.
+
+    The cached prefixes are only valid for the weights they were computed with: `clear` must be called after
+    updating the weights, which `clear_prefix_cache_on_load` does on `load_state_dict`.
+
+    Args:
+        max_prompts: Maximum number of prompts with a cached prefix.
+    """
+
+    def __init__(self, max_prompts: int = 8):
+        if max_prompts < 1:
+            raise ValueError(f"max_prompts must be >= 1, got {max_prompts}.")
+        self.max_prompts = max_prompts
+        self.num_hits = 0
+        self.num_misses = 0
+        # Prompt key -> (prefix inputs, prefix)
+        self._entries: OrderedDict[tuple, tuple[list[torch.Tensor], Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _same_inputs(cached_inputs: list[torch.Tensor], inputs: list[torch.Tensor]) -> bool:
+        return len(cached_inputs) == len(inputs) and all(
+            cached is tensor
+            or (
+                cached.shape == tensor.shape
+                and cached.dtype == tensor.dtype
+                and cached.device == tensor.device
+                and torch.equal(cached, tensor)
+            )
+            for cached, tensor in zip(cached_inputs, inputs, strict=True)
+        )
+
+    def get(
+        self, lang_tokens: torch.Tensor, inputs: list[torch.Tensor], compute_prefix: Callable[[], Any]
+    ) -> Any:
+        """Return the cached prefix of the prompt if it was computed with the same `inputs`, else `compute_prefix()`.
+
+        Args:
+            lang_tokens: Tokenized prompt [B, L].
+            inputs: The other tensors the prefix is computed from, e.g. the prompt mask, the images and their masks.
+            compute_prefix: Computes the prefix, called on a cache miss.
+        """
+        key = (tuple(lang_tokens.shape), lang_tokens.cpu().numpy().tobytes())
+        entry = self._entries.get(key)
+        if entry is not None and self._same_inputs(entry[0], inputs):
+            self._entries.move_to_end(key)
+            self.num_hits += 1
+            return entry[1]
+
+        self.num_misses += 1
+        prefix = compute_prefix()
+        self._entries[key] = (list(inputs), prefix)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_prompts:
+            self._entries.popitem(last=False)
+        return prefix
+
+    def clear(self):
+        self._entries.clear()
+
+
+def clear_prefix_cache_on_load(module: nn.Module, incompatible_keys) -> None:
+    """`load_state_dict` post hook of the models with a `prefix_cache`, whose prefixes used the previous weights."""
+    module.prefix_cache.clear()
+
+
 def get_device_from_parameters(module: nn.Module) -> torch.device:
     """Get a module's device by checking one of its parameters.
 
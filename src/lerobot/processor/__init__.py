@@ -49,10 +49,12 @@ from .hil_processor import (
     RewardClassifierProcessorStep,
     TimeLimitProcessorStep,
 )
+from .image_processor import ImageToFloatProcessorStep
 from .normalize_processor import NormalizerProcessorStep, UnnormalizerProcessorStep, hotswap_stats
 from .observation_processor import VanillaObservationProcessorStep
 from .pipeline import (
     ActionProcessorStep,
+    AffinePlan,
     ComplementaryDataProcessorStep,
     DataProcessorPipeline,
     DoneProcessorStep,
@@ -73,12 +75,14 @@ from .policy_robot_bridge import (
     PolicyActionToRobotActionProcessorStep,
     RobotActionToPolicyActionProcessorStep,
 )
+from .profiler import PipelineProfiler
 from .rename_processor import RenameObservationsProcessorStep
 from .tokenizer_processor import ActionTokenizerProcessorStep, TokenizerProcessorStep
 
 __all__ = [
     "ActionProcessorStep",
     "AddTeleopActionAsComplimentaryDataStep",
+    "AffinePlan",
     "AddTeleopEventsAsInfoStep",
     "ComplementaryDataProcessorStep",
     "batch_to_transition",
@@ -90,6 +94,7 @@ __all__ = [
     "GripperPenaltyProcessorStep",
     "hotswap_stats",
     "IdentityProcessorStep",
+    "ImageToFloatProcessorStep",
     "ImageCropResizeProcessorStep",
     "InfoProcessorStep",
     "InterventionActionProcessorStep",
@@ -102,6 +107,7 @@ __all__ = [
     "NormalizerProcessorStep",
     "Numpy2TorchActionProcessorStep",
     "ObservationProcessorStep",
+    "PipelineProfiler",
     "PolicyAction",
     "PolicyActionProcessorStep",
     "PolicyProcessorPipeline",
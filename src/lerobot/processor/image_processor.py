@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import dataclass
+from typing import Any
+
+import torch
+
+from lerobot.configs.types import PipelineFeatureType, PolicyFeature
+from lerobot.utils.constants import OBS_IMAGE, OBS_IMAGES
+
+from .device_processor import DeviceProcessorStep
+from .pipeline import ObservationProcessorStep, ProcessorStepRegistry
+
+
+@dataclass
+@ProcessorStepRegistry.register(name="image_to_float_processor")
+class ImageToFloatProcessorStep(ObservationProcessorStep):
+    """
+    Converts uint8 camera frames in [0, 255] to floating point frames in [0, 1].
+
+    It is meant to be placed right after `DeviceProcessorStep`, so that frames produced by
+    `LeRobotDataset(return_uint8_images=True)` go through the DataLoader and the host to device copy as uint8,
+    and are only converted on the device. Frames which are already floating point are left untouched, so the step
+    is a no-op on float inputs (e.g. at inference time).
+
+    Attributes:
+        float_dtype: The floating point dtype of the converted frames, as a string (e.g. "float32", "bfloat16").
+    """
+
+    float_dtype: str = "float32"
+
+    def __post_init__(self):
+        if self.float_dtype not in DeviceProcessorStep.DTYPE_MAPPING:
+            raise ValueError(
+                f"Invalid float_dtype '{self.float_dtype}'. Available options: {list(DeviceProcessorStep.DTYPE_MAPPING.keys())}"
+            )
+        self._target_float_dtype = DeviceProcessorStep.DTYPE_MAPPING[self.float_dtype]
+
+    def observation(self, observation):
+        processed_obs = dict(observation)
+        for key, value in observation.items():
+            is_image = key == OBS_IMAGE or key.startswith(f"{OBS_IMAGES}.")
+            if is_image and isinstance(value, torch.Tensor) and value.dtype == torch.uint8:
+                processed_obs[key] = value.to(dtype=self._target_float_dtype).div_(255)
+        return processed_obs
+
+    def get_config(self) -> dict[str, Any]:
+        return {"float_dtype": self.float_dtype}
+
+    def transform_features(
+        self, features: dict[PipelineFeatureType, dict[str, PolicyFeature]]
+    ) -> dict[PipelineFeatureType, dict[str, PolicyFeature]]:
+        return features
+
+
+def insert_image_to_float_step(steps: list) -> list:
+    """Insert an `ImageToFloatProcessorStep` right after the `DeviceProcessorStep` of `steps`, if not present.
+
+    Without a `DeviceProcessorStep`, the step is added first.
+    """
+    if any(isinstance(step, ImageToFloatProcessorStep) for step in steps):
+        return steps
+    device_step_idx = next(
+        (idx for idx, step in enumerate(steps) if isinstance(step, DeviceProcessorStep)),
+        -1,
+    )
+    steps = list(steps)
+    steps.insert(device_step_idx + 1, ImageToFloatProcessorStep())
+    return steps
@@ -25,12 +25,27 @@ import torch
 from torch import Tensor
 
 from lerobot.configs.types import FeatureType, NormalizationMode, PipelineFeatureType, PolicyFeature
+from lerobot.datasets.compute_stats import strip_quantile_sketches
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
 from lerobot.utils.constants import ACTION
 
 from .converters import from_tensor_to_numpy, to_tensor
 from .core import EnvTransition, PolicyAction, TransitionKey
-from .pipeline import PolicyProcessorPipeline, ProcessorStep, ProcessorStepRegistry, RobotObservation
+from .pipeline import (
+    AffineParams,
+    AffinePlan,
+    PolicyProcessorPipeline,
+    ProcessorStep,
+    ProcessorStepRegistry,
+    RobotObservation,
+)
+
+# Stats bounding the [-1, 1] range of the min/max-like normalization modes
+_RANGE_STATS = {
+    NormalizationMode.MIN_MAX: ("min", "max"),
+    NormalizationMode.QUANTILES: ("q01", "q99"),
+    NormalizationMode.QUANTILE10: ("q10", "q90"),
+}
 
 
 @dataclass
@@ -127,7 +142,8 @@ class _NormalizationMixin:
             self.norm_map = reconstructed
 
         # Convert stats to tensors and move to the target device once during initialization.
-        self.stats = self.stats or {}
+        # The quantile sketches of the dataset stats are only used to aggregate stats, not to normalize.
+        self.stats = strip_quantile_sketches(self.stats or {})
         if self.dtype is None:
             self.dtype = torch.float32
         self._tensor_stats = to_tensor(self.stats, device=self.device, dtype=self.dtype)
@@ -396,6 +412,72 @@ class _NormalizationMixin:
         # If necessary stats are missing, return input unchanged.
         return tensor
 
+    def _affine_params(self, key: str, feature_type: FeatureType, *, inverse: bool) -> AffineParams:
+        """
+        Expresses `_apply_transform` for a key as `tensor * scale + offset`.
+
+        Args:
+            key: The feature key.
+            feature_type: The `FeatureType` of the feature.
+            inverse: If `True`, returns the params of the unnormalization.
+
+        Returns:
+            The `(scale, offset)` tensors, or None if the key is left unchanged.
+
+        Raises:
+            ValueError: If an unsupported normalization mode is encountered, or stats are missing.
+        """
+        norm_mode = self.norm_map.get(feature_type, NormalizationMode.IDENTITY)
+        if norm_mode == NormalizationMode.IDENTITY or key not in self._tensor_stats:
+            return None
+
+        stats = self._tensor_stats[key]
+        if norm_mode == NormalizationMode.MEAN_STD:
+            if "mean" not in stats or "std" not in stats:
+                raise ValueError(
+                    "MEAN_STD normalization mode requires mean and std stats, please update the dataset with the correct stats"
+                )
+            mean, std = stats["mean"], stats["std"]
+            if inverse:
+                return std, mean
+            denom = std + self.eps
+            return 1 / denom, -mean / denom
+
+        if norm_mode not in _RANGE_STATS:
+            raise ValueError(f"Unsupported normalization mode: {norm_mode}")
+
+        low_name, high_name = _RANGE_STATS[norm_mode]
+        if low_name not in stats or high_name not in stats:
+            raise ValueError(
+                f"{norm_mode.name} normalization mode requires {low_name} and {high_name} stats, please update the dataset with the correct stats"
+            )
+        low, high = stats[low_name], stats[high_name]
+        denom = high - low
+        # Same substitution of a null denominator as in `_apply_transform`
+        denom = torch.where(denom == 0, torch.tensor(self.eps, device=denom.device, dtype=denom.dtype), denom)
+        if inverse:
+            return denom / 2, denom / 2 + low
+        return 2 / denom, -2 * low / denom - 1
+
+    def _build_affine_plan(self, inverse: bool) -> AffinePlan:
+        """
+        Expresses the (un)normalization of a transition as an `AffinePlan`, see `ProcessorStep.affine_plan`.
+
+        Args:
+            inverse: If `True`, returns the plan of the unnormalization.
+
+        Returns:
+            The plan covering the same observation keys as `_normalize_observation`, and the action.
+        """
+        plan = AffinePlan()
+        for key, feature in self.features.items():
+            if self.normalize_observation_keys is not None and key not in self.normalize_observation_keys:
+                continue
+            if feature.type != FeatureType.ACTION:
+                plan.observation[key] = self._affine_params(key, feature.type, inverse=inverse)
+        plan.action = self._affine_params(ACTION, FeatureType.ACTION, inverse=inverse)
+        return plan
+
 
 @dataclass
 @ProcessorStepRegistry.register(name="normalizer_processor")
@@ -465,6 +547,9 @@ class NormalizerProcessorStep(_NormalizationMixin, ProcessorStep):
 
         return new_transition
 
+    def affine_plan(self) -> AffinePlan:
+        return self._build_affine_plan(inverse=False)
+
     def transform_features(
         self, features: dict[PipelineFeatureType, dict[str, PolicyFeature]]
     ) -> dict[PipelineFeatureType, dict[str, PolicyFeature]]:
@@ -526,6 +611,9 @@ class UnnormalizerProcessorStep(_NormalizationMixin, ProcessorStep):
 
         return new_transition
 
+    def affine_plan(self) -> AffinePlan:
+        return self._build_affine_plan(inverse=True)
+
     def transform_features(
         self, features: dict[PipelineFeatureType, dict[str, PolicyFeature]]
     ) -> dict[PipelineFeatureType, dict[str, PolicyFeature]]:
@@ -552,9 +640,12 @@ def hotswap_stats(
         A new `PolicyProcessorPipeline` instance with the updated statistics.
     """
     rp = deepcopy(policy_processor)
+    stats = strip_quantile_sketches(stats)
     for step in rp.steps:
         if isinstance(step, _NormalizationMixin):
             step.stats = stats
             # Re-initialize tensor_stats on the correct device.
             step._tensor_stats = to_tensor(stats, device=step.device, dtype=step.dtype)  # type: ignore[assignment]
+    # A compiled pipeline rebuilds its fused plan with the new stats on the next call
+    rp._compiled_steps = None
     return rp
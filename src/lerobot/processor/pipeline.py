@@ -26,6 +26,8 @@ The core components are:
   pipelines, including their configuration and state.
 - Specialized abstract ProcessorStep subclasses (e.g., ObservationProcessorStep, ActionProcessorStep)
   to simplify the creation of steps that target specific parts of a data transition.
+- AffinePlan: The per-key `x * scale + offset` form of a step (e.g., normalization), used to fuse consecutive
+  steps when a pipeline is compiled with `DataProcessorPipeline.compile`.
 """
 
 from __future__ import annotations
@@ -50,11 +52,51 @@ from lerobot.utils.hub import HubMixin
 
 from .converters import batch_to_transition, create_transition, transition_to_batch
 from .core import EnvAction, EnvTransition, PolicyAction, RobotAction, RobotObservation, TransitionKey
+from .profiler import PipelineProfiler
 
 # Generic type variables for pipeline input and output.
 TInput = TypeVar("TInput")
 TOutput = TypeVar("TOutput")
 
+# (scale, offset) of an affine transform, or None for a value only converted to a tensor.
+AffineParams: TypeAlias = tuple[torch.Tensor, torch.Tensor] | None
+
+
+def _affine_transform(tensor: torch.Tensor, scale: torch.Tensor, offset: torch.Tensor) -> torch.Tensor:
+    # The in-place addition saves an allocation, the product has the broadcast shape of `tensor` and `scale`
+    return torch.mul(tensor, scale).add_(offset)
+
+
+def _compose_affine_params(first: AffineParams, second: AffineParams) -> AffineParams:
+    """Return the params of applying `first`, then `second`."""
+    if first is None:
+        return second
+    if second is None:
+        return first
+    scale, offset = (param.to(first[0]) for param in second)
+    return first[0] * scale, first[1] * scale + offset
+
+
+@dataclass
+class AffinePlan:
+    """Per-key affine transforms `x * scale + offset` describing a processor step, see `ProcessorStep.affine_plan`.
+
+    Attributes:
+        observation: The params of the transformed observation keys. Observation values of these keys are
+            converted to tensors, even when their params are None.
+        action: The params of the action transform, None if the action is left unchanged.
+    """
+
+    observation: dict[str, AffineParams] = field(default_factory=dict)
+    action: AffineParams = None
+
+    def then(self, other: AffinePlan) -> AffinePlan:
+        """Return the plan applying this plan, then `other`."""
+        observation = dict(self.observation)
+        for key, params in other.observation.items():
+            observation[key] = _compose_affine_params(observation.get(key), params)
+        return AffinePlan(observation=observation, action=_compose_affine_params(self.action, other.action))
+
 
 class ProcessorStepRegistry:
     """A registry for ProcessorStep classes to allow instantiation from a string name.
@@ -209,6 +251,18 @@ class ProcessorStep(ABC):
         """Resets the internal state of the processor step, if any."""
         return None
 
+    def affine_plan(self) -> AffinePlan | None:
+        """Returns the step as per-key affine transforms, if it can be expressed that way.
+
+        Compiled pipelines (see `DataProcessorPipeline.compile`) fuse consecutive steps returning a plan into a
+        single pass over the transition. The plan is requested after the step has processed a transition, so it
+        can use tensors already moved to the device and dtype of the data.
+
+        Returns:
+            An `AffinePlan` equivalent to `__call__`, or None (the default) if the step is not affine.
+        """
+        return None
+
     @abstractmethod
     def transform_features(
         self, features: dict[PipelineFeatureType, dict[str, PolicyFeature]]
@@ -227,6 +281,56 @@ class ProcessorStep(ABC):
         return features
 
 
+class _FusedAffineStep(ProcessorStep):
+    """Consecutive affine steps of a compiled pipeline, applied in a single pass over the transition.
+
+    The params are cast to the device and dtype of the data the first time they differ, and kept for the next
+    calls.
+    """
+
+    def __init__(self, steps: Sequence[ProcessorStep], plan: AffinePlan, use_torch_compile: bool = False):
+        self.steps = list(steps)
+        self.plan = plan
+        self._transform = (
+            torch.compile(_affine_transform, dynamic=True) if use_torch_compile else _affine_transform
+        )
+
+    def _apply(self, tensor: torch.Tensor, params: AffineParams) -> tuple[torch.Tensor, AffineParams]:
+        if params is None:
+            return tensor, params
+        scale, offset = params
+        if scale.device != tensor.device or scale.dtype != tensor.dtype:
+            params = scale, offset = scale.to(tensor), offset.to(tensor)
+        return self._transform(tensor, scale, offset), params
+
+    def __call__(self, transition: EnvTransition) -> EnvTransition:
+        new_transition = transition.copy()
+
+        observation = new_transition.get(TransitionKey.OBSERVATION)
+        if observation is not None and self.plan.observation:
+            new_observation = dict(observation)
+            for key, params in self.plan.observation.items():
+                if key in new_observation:
+                    tensor = torch.as_tensor(new_observation[key])
+                    new_observation[key], self.plan.observation[key] = self._apply(tensor, params)
+            new_transition[TransitionKey.OBSERVATION] = new_observation
+
+        action = new_transition.get(TransitionKey.ACTION)
+        if action is None:
+            return new_transition
+        if not isinstance(action, PolicyAction):
+            raise ValueError(f"Action should be a PolicyAction type got {type(action)}")
+        new_transition[TransitionKey.ACTION], self.plan.action = self._apply(action, self.plan.action)
+        return new_transition
+
+    def transform_features(
+        self, features: dict[PipelineFeatureType, dict[str, PolicyFeature]]
+    ) -> dict[PipelineFeatureType, dict[str, PolicyFeature]]:
+        for step in self.steps:
+            features = step.transform_features(features)
+        return features
+
+
 class ProcessorKwargs(TypedDict, total=False):
     """A TypedDict for optional keyword arguments used in pipeline construction."""
 
@@ -281,6 +385,14 @@ class DataProcessorPipeline(HubMixin, Generic[TInput, TOutput]):
     before_step_hooks: list[Callable[[int, EnvTransition], None]] = field(default_factory=list, repr=False)
     after_step_hooks: list[Callable[[int, EnvTransition], None]] = field(default_factory=list, repr=False)
 
+    # Set by `compile`: whether the fused plan is used, and the plan itself once built
+    _compile_enabled: bool = field(default=False, init=False, repr=False)
+    _use_torch_compile: bool = field(default=False, init=False, repr=False)
+    _compiled_steps: list[ProcessorStep] | None = field(default=None, init=False, repr=False)
+
+    # Set by `enable_profiling`
+    profiler: PipelineProfiler | None = field(default=None, init=False, repr=False)
+
     def __call__(self, data: TInput) -> TOutput:
         """Processes input data through the full pipeline.
 
@@ -303,6 +415,11 @@ class DataProcessorPipeline(HubMixin, Generic[TInput, TOutput]):
         Returns:
             The final `EnvTransition` after all steps have been applied.
         """
+        if self._compiled_steps is not None and not self.before_step_hooks and not self.after_step_hooks:
+            for processor_step in self._compiled_steps:
+                transition = processor_step(transition)
+            return transition
+
         for idx, processor_step in enumerate(self.steps):
             # Execute pre-hooks
             for hook in self.before_step_hooks:
@@ -313,8 +430,81 @@ class DataProcessorPipeline(HubMixin, Generic[TInput, TOutput]):
             # Execute post-hooks
             for hook in self.after_step_hooks:
                 hook(idx, transition)
+
+        if self._compile_enabled and self._compiled_steps is None:
+            # The plan is built after a first call, once the steps have seen the device and dtype of the data
+            self._compiled_steps = self._build_compiled_steps()
         return transition
 
+    def compile(self, enabled: bool = True, use_torch_compile: bool = False) -> DataProcessorPipeline:
+        """Opts in to running the pipeline with a fused plan, built after the next call.
+
+        Consecutive steps that can be expressed as per-key affine transforms (see `ProcessorStep.affine_plan`),
+        such as the normalization steps, are fused into a single step with precomputed scale and offset tensors
+        on the device of the data, applied in a single pass over the observation keys. The other steps are run
+        as is. The outputs match the ones of the uncompiled pipeline up to floating point rounding.
+
+        The plan is not used while step hooks are registered, since the fused steps don't match `steps`. Calling
+        `compile` again discards the current plan, e.g. after updating the statistics of a normalization step.
+
+        Args:
+            enabled: Whether to use the fused plan.
+            use_torch_compile: Whether to also `torch.compile` the fused tensor math.
+
+        Returns:
+            The pipeline itself, allowing for method chaining.
+        """
+        self._compile_enabled = enabled
+        self._use_torch_compile = use_torch_compile
+        self._compiled_steps = None
+        return self
+
+    def enable_profiling(self, window_size: int = 1000, synchronize: bool = False) -> PipelineProfiler:
+        """Starts recording per-step wall time, host to device bytes and tensor allocations.
+
+        The profiler is attached with the step hooks, so a compiled pipeline (see `compile`) runs its original
+        steps while profiling is enabled. Its statistics are available with `profiler.get_stats()`.
+
+        Args:
+            window_size: Number of calls over which the statistics are computed.
+            synchronize: Whether to synchronize CUDA around each step to time its kernels.
+
+        Returns:
+            The `PipelineProfiler` of the pipeline, also available as `profiler`.
+        """
+        self.disable_profiling()
+        self.profiler = PipelineProfiler(window_size=window_size, synchronize=synchronize)
+        self.profiler.attach(self)
+        return self.profiler
+
+    def disable_profiling(self):
+        """Stops recording per-step statistics, removing the profiler hooks."""
+        if self.profiler is not None:
+            self.profiler.detach(self)
+            self.profiler = None
+
+    def _build_compiled_steps(self) -> list[ProcessorStep]:
+        """Fuses the consecutive affine steps of the pipeline, see `compile`."""
+        compiled_steps: list[ProcessorStep] = []
+        fused_steps: list[ProcessorStep] = []
+        fused_plan: AffinePlan | None = None
+
+        def flush():
+            if fused_steps:
+                compiled_steps.append(_FusedAffineStep(fused_steps, fused_plan, self._use_torch_compile))
+
+        for processor_step in self.steps:
+            plan = processor_step.affine_plan()
+            if plan is None:
+                flush()
+                fused_steps, fused_plan = [], None
+                compiled_steps.append(processor_step)
+                continue
+            fused_steps.append(processor_step)
+            fused_plan = plan if fused_plan is None else fused_plan.then(plan)
+        flush()
+        return compiled_steps
+
     def step_through(self, data: TInput) -> Iterable[EnvTransition]:
         """Processes data step-by-step, yielding the transition at each stage.
 
@@ -1226,14 +1416,18 @@ class DataProcessorPipeline(HubMixin, Generic[TInput, TOutput]):
             containing the sliced steps.
         """
         if isinstance(idx, slice):
+            # The profiler hooks are specific to the steps of this pipeline, they are not copied.
+            profiler_hooks = (
+                [] if self.profiler is None else [self.profiler._before_step, self.profiler._after_step]
+            )
             # Return a new pipeline instance with the sliced steps.
             return DataProcessorPipeline(
                 steps=self.steps[idx],
                 name=self.name,
                 to_transition=self.to_transition,
                 to_output=self.to_output,
-                before_step_hooks=self.before_step_hooks.copy(),
-                after_step_hooks=self.after_step_hooks.copy(),
+                before_step_hooks=[hook for hook in self.before_step_hooks if hook not in profiler_hooks],
+                after_step_hooks=[hook for hook in self.after_step_hooks if hook not in profiler_hooks],
             )
         return self.steps[idx]
 
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Per-step profiling of processor pipelines.
+
+`PipelineProfiler` is attached to a `DataProcessorPipeline` with its step hooks, see
+`DataProcessorPipeline.enable_profiling`. It records, for every step and call:
+- the wall time of the step,
+- the bytes of the tensors moved from the host to an accelerator by the step,
+- the tensors allocated by the step (outputs that don't share the storage of an input tensor), and their bytes.
+
+The last `window_size` samples of each metric are kept, and summarized as rolling histograms (mean and
+percentiles). When profiling is disabled, no hook is registered, so the pipeline runs without any overhead.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import torch
+
+from .core import EnvTransition
+
+if TYPE_CHECKING:
+    from .pipeline import DataProcessorPipeline
+
+PROFILER_METRICS = ["wall_time_ms", "h2d_bytes", "num_allocations", "allocated_bytes"]
+PROFILER_PERCENTILES = [50, 90, 99]
+
+
+def _iter_tensors(value: Any, path: tuple = ()) -> Iterator[tuple[tuple, torch.Tensor]]:
+    """Yields the tensors nested in dicts, lists and tuples of `value`, with their path."""
+    if isinstance(value, torch.Tensor):
+        yield path, value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _iter_tensors(item, (*path, key))
+    elif isinstance(value, (list, tuple)):
+        for idx, item in enumerate(value):
+            yield from _iter_tensors(item, (*path, idx))
+
+
+def _storage_key(tensor: torch.Tensor) -> tuple[str, int]:
+    return str(tensor.device), tensor.untyped_storage().data_ptr()
+
+
+class PipelineProfiler:
+    """Records per-step metrics of a `DataProcessorPipeline`, see the module docstring.
+
+    Args:
+        window_size: Number of samples kept per step and metric.
+        synchronize: Whether to synchronize CUDA around each step, so that the wall time includes the
+            asynchronous kernels launched by the step.
+    """
+
+    def __init__(self, window_size: int = 1000, synchronize: bool = False):
+        if window_size < 1:
+            raise ValueError(f"window_size must be >= 1, got {window_size}.")
+        self.window_size = window_size
+        self.synchronize = synchronize and torch.cuda.is_available()
+        self.step_names: list[str] = []
+        self._samples: list[dict[str, deque]] = []
+        self._start_time = 0.0
+        self._input_devices: dict[tuple, str] = {}
+        self._input_storages: set[tuple[str, int]] = set()
+
+    def attach(self, pipeline: DataProcessorPipeline):
+        """Registers the hooks of the profiler on `pipeline`, and resets the recorded samples."""
+        # Steps are labeled by index, since a pipeline can contain several steps of the same class
+        self.step_names = [f"{idx}_{type(step).__name__}" for idx, step in enumerate(pipeline.steps)]
+        self.reset_stats()
+        pipeline.register_before_step_hook(self._before_step)
+        pipeline.register_after_step_hook(self._after_step)
+
+    def detach(self, pipeline: DataProcessorPipeline):
+        """Unregisters the hooks of the profiler from `pipeline`."""
+        pipeline.unregister_before_step_hook(self._before_step)
+        pipeline.unregister_after_step_hook(self._after_step)
+
+    def reset_stats(self):
+        self._samples = [
+            {metric: deque(maxlen=self.window_size) for metric in PROFILER_METRICS} for _ in self.step_names
+        ]
+
+    def _before_step(self, idx: int, transition: EnvTransition):
+        self._input_devices = {}
+        self._input_storages = set()
+        for path, tensor in _iter_tensors(transition):
+            self._input_devices[path] = tensor.device.type
+            self._input_storages.add(_storage_key(tensor))
+
+        if self.synchronize:
+            torch.cuda.synchronize()
+        # Started last, to leave the tensor accounting out of the measured time
+        self._start_time = time.perf_counter()
+
+    def _after_step(self, idx: int, transition: EnvTransition):
+        if self.synchronize:
+            torch.cuda.synchronize()
+        wall_time = time.perf_counter() - self._start_time
+
+        h2d_bytes = num_allocations = allocated_bytes = 0
+        seen_storages = set()
+        for path, tensor in _iter_tensors(transition):
+            storage = _storage_key(tensor)
+            if storage in self._input_storages or storage in seen_storages:
+                continue
+            seen_storages.add(storage)
+            num_bytes = tensor.numel() * tensor.element_size()
+            num_allocations += 1
+            allocated_bytes += num_bytes
+            if tensor.device.type != "cpu" and self._input_devices.get(path) == "cpu":
+                h2d_bytes += num_bytes
+
+        samples = self._samples[idx]
+        samples["wall_time_ms"].append(wall_time * 1e3)
+        samples["h2d_bytes"].append(h2d_bytes)
+        samples["num_allocations"].append(num_allocations)
+        samples["allocated_bytes"].append(allocated_bytes)
+
+    def get_stats(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Summarizes the recorded samples.
+
+        Returns:
+            A dictionary mapping each step (`"{index}_{class name}"`) and `"total"` (the sum over the steps of
+            each call) to its metrics, each summarized by its `count`, `mean`, `p50`, `p90`, `p99` and `max`
+            over the window. Steps that were not called are omitted.
+        """
+        stats = {}
+        totals = {}
+        for step_name, samples in zip(self.step_names, self._samples, strict=True):
+            if not samples["wall_time_ms"]:
+                continue
+            stats[step_name] = {}
+            for metric, values in samples.items():
+                values = np.asarray(values, dtype=np.float64)
+                stats[step_name][metric] = self._summarize(values)
+                # Steps can have different numbers of samples after a call interrupted by an error
+                total = totals.get(metric)
+                totals[metric] = values if total is None else total[-len(values) :] + values[-len(total) :]
+        if totals:
+            stats["total"] = {metric: self._summarize(values) for metric, values in totals.items()}
+        return stats
+
+    def get_log_dict(self, prefix: str = "") -> dict[str, float]:
+        """Flattens `get_stats` into `{prefix}{step}/{metric}_{stat}` keys, for the training and eval loggers."""
+        return {
+            f"{prefix}{step_name}/{metric}_{stat}": value
+            for step_name, step_stats in self.get_stats().items()
+            for metric, metric_stats in step_stats.items()
+            for stat, value in metric_stats.items()
+            if stat != "count"
+        }
+
+    @staticmethod
+    def _summarize(values: np.ndarray) -> dict[str, float]:
+        summary = {"count": float(len(values)), "mean": float(values.mean())}
+        for percentile, value in zip(
+            PROFILER_PERCENTILES, np.percentile(values, PROFILER_PERCENTILES), strict=True
+        ):
+            summary[f"p{percentile}"] = float(value)
+        summary["max"] = float(values.max())
+        return summary
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import functools
+import threading
 from collections.abc import Callable, Sequence
 from contextlib import suppress
 from typing import TypedDict
@@ -28,7 +29,7 @@ from lerobot.utils.constants import ACTION, DONE, OBS_IMAGE, REWARD
 from lerobot.utils.transition import Transition
 
 
-class BatchTransition(TypedDict):
+class _BatchTransitionBase(TypedDict):
     state: dict[str, torch.Tensor]
     action: torch.Tensor
     reward: torch.Tensor
@@ -38,6 +39,14 @@ class BatchTransition(TypedDict):
     complementary_info: dict[str, torch.Tensor | float | int] | None = None
 
 
+class BatchTransition(_BatchTransitionBase, total=False):
+    # Discount of the bootstrapped value of each transition, only returned by buffers with `n_step > 1`
+    discount: torch.Tensor
+    # Importance sampling weights and buffer indices of the transitions, only returned by `PrioritizedReplayBuffer`
+    weights: torch.Tensor
+    indices: torch.Tensor
+
+
 def random_crop_vectorized(images: torch.Tensor, output_size: tuple) -> torch.Tensor:
     """
     Perform a per-image random crop over a batch of images in a vectorized way.
@@ -87,6 +96,9 @@ class ReplayBuffer:
         use_drq: bool = True,
         storage_device: str = "cpu",
         optimize_memory: bool = False,
+        n_step: int = 1,
+        discount: float = 0.99,
+        store_images_as_uint8: bool = False,
     ):
         """
         Replay buffer for storing transitions.
@@ -104,9 +116,21 @@ class ReplayBuffer:
                 Using "cpu" can help save GPU memory.
             optimize_memory (bool): If True, optimizes memory by not storing duplicate next_states when
                 they can be derived from states. This is useful for large datasets where next_state[i] = state[i+1].
+                Only the next state of the last transition of each episode is stored, so that next states are
+                also correct across episode boundaries.
+            n_step (int): Number of steps of the returns. When greater than 1, the discounted rewards of the next
+                `n_step` transitions of the same episode are aggregated at insertion, and sampled transitions
+                bootstrap from the state `n_step` steps later (or at the end of the episode) with a `discount`
+                returned in the batch. Transitions are only sampled once their `n_step` rewards are known.
+            discount (float): Discount factor of the n-step returns. Unused when `n_step` is 1.
+            store_images_as_uint8 (bool): If True, images (keys starting with "observation.image") in [0, 1] are
+                stored as uint8, i.e. 4 times less memory than float32. They are sent to `device` as uint8 and
+                converted back to float32 in [0, 1] there when sampling.
         """
         if capacity <= 0:
             raise ValueError("Capacity must be greater than 0.")
+        if n_step < 1:
+            raise ValueError(f"n_step must be >= 1, got {n_step}.")
 
         self.capacity = capacity
         self.device = device
@@ -115,9 +139,19 @@ class ReplayBuffer:
         self.size = 0
         self.initialized = False
         self.optimize_memory = optimize_memory
+        self.n_step = n_step
+        self.discount = discount
+        self.store_images_as_uint8 = store_images_as_uint8
+
+        # Positions of the latest transitions, whose n-step returns are still being aggregated
+        self._open_windows: list[int] = []
+        # Positions of complete transitions whose next state is not stored yet (with `optimize_memory`)
+        self._awaiting_next_state: list[int] = []
 
         # Track episode boundaries for memory optimization
         self.episode_ends = torch.zeros(capacity, dtype=torch.bool, device=storage_device)
+        # Next state of the transitions ending an episode, by position (with `optimize_memory`)
+        self.final_next_states: dict[int, dict[str, torch.Tensor]] = {}
 
         # If no state_keys provided, default to an empty list
         self.state_keys = state_keys if state_keys is not None else []
@@ -140,9 +174,18 @@ class ReplayBuffer:
         state_shapes = {key: val.squeeze(0).shape for key, val in state.items()}
         action_shape = action.squeeze(0).shape
 
+        # Images are quantized to uint8 if requested, other states are stored as float32
+        self.uint8_state_keys = [
+            key for key in state_shapes if self.store_images_as_uint8 and key.startswith(OBS_IMAGE)
+        ]
+        state_dtypes = {
+            key: torch.uint8 if key in self.uint8_state_keys else torch.get_default_dtype()
+            for key in state_shapes
+        }
+
         # Pre-allocate tensors for storage
         self.states = {
-            key: torch.empty((self.capacity, *shape), device=self.storage_device)
+            key: torch.empty((self.capacity, *shape), dtype=state_dtypes[key], device=self.storage_device)
             for key, shape in state_shapes.items()
         }
         self.actions = torch.empty((self.capacity, *action_shape), device=self.storage_device)
@@ -151,7 +194,7 @@ class ReplayBuffer:
         if not self.optimize_memory:
             # Standard approach: store states and next_states separately
             self.next_states = {
-                key: torch.empty((self.capacity, *shape), device=self.storage_device)
+                key: torch.empty((self.capacity, *shape), dtype=state_dtypes[key], device=self.storage_device)
                 for key, shape in state_shapes.items()
             }
         else:
@@ -162,6 +205,11 @@ class ReplayBuffer:
         self.dones = torch.empty((self.capacity,), dtype=torch.bool, device=self.storage_device)
         self.truncateds = torch.empty((self.capacity,), dtype=torch.bool, device=self.storage_device)
 
+        if self.n_step > 1:
+            # Rewards are kept per step, n-step returns and their number of steps are stored alongside
+            self.returns = torch.empty((self.capacity,), device=self.storage_device)
+            self.n_steps = torch.ones((self.capacity,), dtype=torch.long, device=self.storage_device)
+
         # Initialize storage for complementary_info
         self.has_complementary_info = complementary_info is not None
         self.complementary_info_keys = []
@@ -204,11 +252,23 @@ class ReplayBuffer:
 
         # Store the transition in pre-allocated tensors
         for key in self.states:
-            self.states[key][self.position].copy_(state[key].squeeze(dim=0))
+            self.states[key][self.position].copy_(self._to_storage(key, state[key].squeeze(dim=0)))
 
             if not self.optimize_memory:
                 # Only store next_states if not optimizing memory
-                self.next_states[key][self.position].copy_(next_state[key].squeeze(dim=0))
+                self.next_states[key][self.position].copy_(
+                    self._to_storage(key, next_state[key].squeeze(dim=0))
+                )
+
+        episode_ended = bool(done) or bool(truncated)
+        self.episode_ends[self.position] = episode_ended
+        self.final_next_states.pop(self.position, None)
+        if self.optimize_memory and episode_ended and next_state is not None:
+            # The next state of the last transition of an episode isn't the state of the next transition
+            self.final_next_states[self.position] = {
+                key: self._to_storage(key, next_state[key].squeeze(dim=0)).to(self.storage_device, copy=True)
+                for key in self.states
+            }
 
         self.actions[self.position].copy_(action.squeeze(dim=0))
         self.rewards[self.position] = reward
@@ -226,19 +286,89 @@ class ReplayBuffer:
                     elif isinstance(value, (int | float)):
                         self.complementary_info[key][self.position] = value
 
+        ready = self._update_windows(float(reward), episode_ended)
+        self._on_transitions_ready(ready)
+
         self.position = (self.position + 1) % self.capacity
         self.size = min(self.size + 1, self.capacity)
 
+    def _update_windows(self, reward: float, episode_ended: bool) -> list[int]:
+        """Aggregate the reward of the transition at `self.position` into the n-step returns of the previous
+        transitions of its episode.
+
+        Returns:
+            The positions of the transitions which can now be sampled: their n-step returns are complete and their
+            next state is stored.
+        """
+        if self.n_step > 1:
+            self.returns[self.position] = reward
+            self.n_steps[self.position] = 1
+            if self._open_windows:
+                open_idx = torch.tensor(self._open_windows, device=self.storage_device)
+                self.returns[open_idx] += self.discount ** self.n_steps[open_idx] * reward
+                self.n_steps[open_idx] += 1
+
+        self._open_windows.append(self.position)
+        if episode_ended:
+            closed, self._open_windows = self._open_windows, []
+        else:
+            # Windows are opened in order, so the oldest one is the only one which can be complete
+            closed = self._open_windows[:1] if len(self._open_windows) == self.n_step else []
+            self._open_windows = self._open_windows[len(closed) :]
+
+        if not self.optimize_memory:
+            return closed
+        if episode_ended:
+            # The next state of the last transition of the episode is stored with it
+            ready, self._awaiting_next_state = self._awaiting_next_state + closed, []
+            return ready
+        # The next state of the closed transitions is the state of the next transition, not stored yet
+        ready, self._awaiting_next_state = self._awaiting_next_state, closed
+        return ready
+
+    def _to_storage(self, key: str, value: torch.Tensor) -> torch.Tensor:
+        """Quantize images in [0, 1] to uint8 if they are stored as uint8."""
+        if key in self.uint8_state_keys and value.dtype != torch.uint8:
+            return (value * 255).round_().clamp_(0, 255).to(torch.uint8)
+        return value
+
+    def _from_storage(self, key: str, value: torch.Tensor) -> torch.Tensor:
+        """Convert stored states back to float, e.g. once on the sampling device."""
+        if key in self.uint8_state_keys:
+            return value.to(torch.get_default_dtype()).div_(255)
+        return value
+
+    def _on_transitions_ready(self, positions: list[int]):
+        """Called when the transitions at `positions` can be sampled."""
+
+    def _num_unsampleable(self) -> int:
+        """Number of latest transitions that can't be sampled yet, see `_update_windows`."""
+        return len(self._open_windows) + len(self._awaiting_next_state)
+
     def sample(self, batch_size: int) -> BatchTransition:
         """Sample a random batch of transitions and collate them into batched tensors."""
         if not self.initialized:
             raise RuntimeError("Cannot sample from an empty buffer. Add transitions first.")
 
         batch_size = min(batch_size, self.size)
-        high = max(0, self.size - 1) if self.optimize_memory and self.size < self.capacity else self.size
+        high = max(0, self.size - self._num_unsampleable())
+        if high == 0:
+            raise RuntimeError("Cannot sample from the buffer: no transition is complete yet.")
 
-        # Random indices for sampling - create on the same device as storage
+        # Random indices for sampling - create on the same device as storage.
+        # Sampleable transitions are the `high` oldest ones of the buffer.
+        oldest = (self.position - self.size) % self.capacity
         idx = torch.randint(low=0, high=high, size=(batch_size,), device=self.storage_device)
+        if oldest > 0:
+            idx = (idx + oldest) % self.capacity
+
+        return self._get_batch(idx)
+
+    def _get_batch(self, idx: torch.Tensor) -> BatchTransition:
+        """Collate the transitions at `idx` into batched tensors on `self.device`."""
+        batch_size = len(idx)
+        # Last step of the n-step transitions
+        last_idx = idx if self.n_step == 1 else (idx + self.n_steps[idx] - 1) % self.capacity
 
         # Identify image keys that need augmentation
         image_keys = [k for k in self.states if k.startswith(OBS_IMAGE)] if self.use_drq else []
@@ -247,17 +377,29 @@ class ReplayBuffer:
         batch_state = {}
         batch_next_state = {}
 
+        # Rows whose next state is the stored final state of an episode (memory-optimized approach)
+        final_rows = []
+        if self.optimize_memory and self.final_next_states:
+            final_rows = [
+                (row, pos)
+                for row, pos in enumerate(last_idx.tolist())
+                if self.episode_ends[pos] and pos in self.final_next_states
+            ]
+
         # First pass: load all state tensors to target device
         for key in self.states:
-            batch_state[key] = self.states[key][idx].to(self.device)
+            batch_state[key] = self._from_storage(key, self.states[key][idx].to(self.device))
 
             if not self.optimize_memory:
                 # Standard approach - load next_states directly
-                batch_next_state[key] = self.next_states[key][idx].to(self.device)
+                next_state = self.next_states[key][last_idx]
             else:
                 # Memory-optimized approach - get next_state from the next index
-                next_idx = (idx + 1) % self.capacity
-                batch_next_state[key] = self.states[key][next_idx].to(self.device)
+                next_idx = (last_idx + 1) % self.capacity
+                next_state = self.states[key][next_idx]
+                for row, pos in final_rows:
+                    next_state[row] = self.final_next_states[pos][key]
+            batch_next_state[key] = self._from_storage(key, next_state.to(self.device))
 
         # Apply image augmentation in a batched way if needed
         if self.use_drq and image_keys:
@@ -282,9 +424,9 @@ class ReplayBuffer:
 
         # Sample other tensors
         batch_actions = self.actions[idx].to(self.device)
-        batch_rewards = self.rewards[idx].to(self.device)
-        batch_dones = self.dones[idx].to(self.device).float()
-        batch_truncateds = self.truncateds[idx].to(self.device).float()
+        batch_rewards = (self.rewards if self.n_step == 1 else self.returns)[idx].to(self.device)
+        batch_dones = self.dones[last_idx].to(self.device).float()
+        batch_truncateds = self.truncateds[last_idx].to(self.device).float()
 
         # Sample complementary_info if available
         batch_complementary_info = None
@@ -293,7 +435,7 @@ class ReplayBuffer:
             for key in self.complementary_info_keys:
                 batch_complementary_info[key] = self.complementary_info[key][idx].to(self.device)
 
-        return BatchTransition(
+        batch = BatchTransition(
             state=batch_state,
             action=batch_actions,
             reward=batch_rewards,
@@ -302,6 +444,9 @@ class ReplayBuffer:
             truncated=batch_truncateds,
             complementary_info=batch_complementary_info,
         )
+        if self.n_step > 1:
+            batch["discount"] = (self.discount ** self.n_steps[idx].to(self.device)).float()
+        return batch
 
     def get_iterator(
         self,
@@ -347,7 +492,6 @@ class ReplayBuffer:
             BatchTransition: A batch sampled from the replay buffer.
         """
         import queue
-        import threading
 
         data_queue: queue.Queue = queue.Queue(maxsize=queue_size)
         shutdown_event = threading.Event()
@@ -422,6 +566,7 @@ class ReplayBuffer:
         use_drq: bool = True,
         storage_device: str = "cpu",
         optimize_memory: bool = False,
+        **kwargs,
     ) -> "ReplayBuffer":
         """
         Convert a LeRobotDataset into a ReplayBuffer.
@@ -437,6 +582,8 @@ class ReplayBuffer:
             use_drq (bool): Whether to use DrQ image augmentation when sampling.
             storage_device (str): Device for storing tensor data. Using "cpu" saves GPU memory.
             optimize_memory (bool): If True, reduces memory usage by not duplicating state data.
+            **kwargs: Other arguments of the buffer class (e.g. `n_step`, or `alpha` of a
+                `PrioritizedReplayBuffer`).
 
         Returns:
             ReplayBuffer: The replay buffer with dataset transitions.
@@ -458,6 +605,7 @@ class ReplayBuffer:
             use_drq=use_drq,
             storage_device=storage_device,
             optimize_memory=optimize_memory,
+            **kwargs,
         )
 
         # Convert dataset to transitions
@@ -539,7 +687,7 @@ class ReplayBuffer:
 
         # Add state keys
         for key in self.states:
-            sample_val = self.states[key][0]
+            sample_val = self._from_storage(key, self.states[key][0])
             f_info = guess_feature_info(t=sample_val, name=key)
             features[key] = f_info
 
@@ -574,7 +722,7 @@ class ReplayBuffer:
 
             # Fill the data for state keys
             for key in self.states:
-                frame_dict[key] = self.states[key][actual_idx].cpu()
+                frame_dict[key] = self._from_storage(key, self.states[key][actual_idx].cpu())
 
             # Fill action, reward, done
             frame_dict[ACTION] = self.actions[actual_idx].cpu()
@@ -735,6 +883,158 @@ class ReplayBuffer:
         return transitions
 
 
+class SumTree:
+    """Binary tree whose leaves hold the priorities of the transitions and inner nodes the sum of their children.
+
+    Priorities are updated and sampled in batches: each operation is one vectorized tensor operation per level of the
+    tree, i.e. O(log(capacity)) kernels whatever the batch size.
+    """
+
+    def __init__(self, capacity: int, device: str = "cpu"):
+        self.capacity = capacity
+        self.num_leaves = 1 << max(0, (capacity - 1).bit_length())
+        self.depth = self.num_leaves.bit_length() - 1
+        # Node 1 is the root, the children of node i are 2 * i and 2 * i + 1 and leaves start at `num_leaves`
+        self.nodes = torch.zeros(2 * self.num_leaves, dtype=torch.float64, device=device)
+
+    def total(self) -> float:
+        return self.nodes[1].item()
+
+    def __getitem__(self, indices: torch.Tensor) -> torch.Tensor:
+        return self.nodes[indices + self.num_leaves]
+
+    def update(self, indices: torch.Tensor, priorities: torch.Tensor):
+        nodes = indices.to(self.nodes.device) + self.num_leaves
+        self.nodes[nodes] = priorities.to(self.nodes)
+        for _ in range(self.depth):
+            nodes = torch.unique(nodes // 2)
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+
+    def find(self, values: torch.Tensor) -> torch.Tensor:
+        """Indices of the leaves whose cumulative priority range contains each of `values` (in [0, total))."""
+        values = values.to(self.nodes)
+        nodes = torch.ones(len(values), dtype=torch.long, device=self.nodes.device)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            left_sums = self.nodes[left]
+            # Never descend into a zero priority subtree, which rounding errors could otherwise reach
+            go_right = (values >= left_sums) & (self.nodes[left + 1] > 0)
+            values = torch.where(go_right, values - left_sums, values)
+            nodes = left + go_right.long()
+        return nodes - self.num_leaves
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    def __init__(
+        self,
+        capacity: int,
+        device: str = "cuda:0",
+        state_keys: Sequence[str] | None = None,
+        image_augmentation_function: Callable | None = None,
+        use_drq: bool = True,
+        storage_device: str = "cpu",
+        optimize_memory: bool = False,
+        n_step: int = 1,
+        discount: float = 0.99,
+        store_images_as_uint8: bool = False,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        priority_epsilon: float = 1e-6,
+    ):
+        """
+        Replay buffer sampling transitions proportionally to their priority (Schaul et al., 2016).
+
+        New transitions get the highest priority seen so far, so that they are sampled at least once. The learner
+        then updates the priorities of the sampled transitions with their TD errors (see `update_priorities`).
+        Sampled batches hold the importance sampling `weights` correcting the bias of the prioritized sampling, and
+        the buffer `indices` of the transitions.
+
+        Args:
+            alpha (float): How much prioritization is used, from 0 (uniform sampling) to 1 (proportional to the
+                TD errors).
+            beta (float): Importance sampling correction, from 0 (none) to 1 (full). It can be annealed during
+                training by setting the attribute.
+            priority_epsilon (float): Added to the TD errors, so that every transition keeps a chance to be sampled.
+
+        See `ReplayBuffer` for the other arguments.
+        """
+        super().__init__(
+            capacity=capacity,
+            device=device,
+            state_keys=state_keys,
+            image_augmentation_function=image_augmentation_function,
+            use_drq=use_drq,
+            storage_device=storage_device,
+            optimize_memory=optimize_memory,
+            n_step=n_step,
+            discount=discount,
+            store_images_as_uint8=store_images_as_uint8,
+        )
+        self.alpha = alpha
+        self.beta = beta
+        self.priority_epsilon = priority_epsilon
+        self.max_priority = 1.0
+        self.tree = SumTree(capacity, device=storage_device)
+        # Priorities are updated by the learner while batches are prefetched by another thread
+        self._tree_lock = threading.Lock()
+
+    def add(self, *args, **kwargs):
+        with self._tree_lock:
+            # The transition being overwritten can't be sampled anymore, nor the new one until it's complete
+            self.tree.update(torch.tensor([self.position]), torch.zeros(1))
+        super().add(*args, **kwargs)
+
+    def _on_transitions_ready(self, positions: list[int]):
+        if not positions:
+            return
+        with self._tree_lock:
+            self.tree.update(torch.tensor(positions), torch.full((len(positions),), self.max_priority))
+
+    def sample(self, batch_size: int) -> BatchTransition:
+        """Sample a batch of transitions proportionally to their priority, see `PrioritizedReplayBuffer`."""
+        if not self.initialized:
+            raise RuntimeError("Cannot sample from an empty buffer. Add transitions first.")
+
+        num_sampleable = self.size - self._num_unsampleable()
+        if num_sampleable <= 0:
+            raise RuntimeError("Cannot sample from the buffer: no transition is complete yet.")
+        batch_size = min(batch_size, self.size)
+
+        with self._tree_lock:
+            total = self.tree.total()
+            # Stratified sampling: one value per segment of the cumulative priorities
+            segment = total / batch_size
+            values = (
+                torch.arange(batch_size, dtype=torch.float64) + torch.rand(batch_size, dtype=torch.float64)
+            ) * segment
+            idx = self.tree.find(values.to(self.storage_device))
+            priorities = self.tree[idx]
+
+        probabilities = priorities / total
+        weights = (num_sampleable * probabilities) ** (-self.beta)
+        weights = weights / weights.max()
+
+        batch = self._get_batch(idx)
+        batch["weights"] = weights.float().to(self.device)
+        batch["indices"] = idx
+        return batch
+
+    def update_priorities(self, indices: torch.Tensor, td_errors: torch.Tensor):
+        """Set the priorities of the transitions at `indices` (as returned in sampled batches) from their TD errors."""
+        indices = indices.to(self.storage_device)
+        priorities = (
+            td_errors.detach().abs().double().to(self.storage_device) + self.priority_epsilon
+        ) ** self.alpha
+        with self._tree_lock:
+            # Skip transitions overwritten since they were sampled
+            is_sampleable = self.tree[indices] > 0
+            indices, priorities = indices[is_sampleable], priorities[is_sampleable]
+            if len(indices) == 0:
+                return
+            self.tree.update(indices, priorities)
+            self.max_priority = max(self.max_priority, priorities.max().item())
+
+
 # Utility function to guess shapes/dtypes from a tensor
 def guess_feature_info(t, name: str):
     """
@@ -776,6 +1076,11 @@ def concatenate_batch_transitions(
     Returns:
         BatchTransition: The concatenated batch (same object as left_batch_transitions).
 
+    Note:
+        Importance sampling `weights` default to 1 for a batch which doesn't have any (i.e. sampled uniformly).
+        The `indices` of the left batch are kept, so that the priorities of the buffer it was sampled from can be
+        updated with the first `len(indices)` TD errors.
+
     Warning:
         This function modifies the left_batch_transitions object in place.
     """
@@ -831,4 +1136,20 @@ def concatenate_batch_transitions(
                 else:
                     left_info[key] = right_info[key]
 
+    if "discount" in left_batch_transitions or "discount" in right_batch_transition:
+        if "discount" not in left_batch_transitions or "discount" not in right_batch_transition:
+            raise ValueError("Can't concatenate batches sampled with and without n-step returns.")
+        left_batch_transitions["discount"] = torch.cat(
+            [left_batch_transitions["discount"], right_batch_transition["discount"]], dim=0
+        )
+
+    if "weights" in left_batch_transitions or "weights" in right_batch_transition:
+        left_weights = left_batch_transitions.get("weights")
+        right_weights = right_batch_transition.get("weights")
+        if left_weights is None:
+            left_weights = torch.ones_like(left_batch_transitions["reward"])
+        if right_weights is None:
+            right_weights = torch.ones_like(right_batch_transition["reward"])
+        left_batch_transitions["weights"] = torch.cat([left_weights, right_weights], dim=0)
+
     return left_batch_transitions
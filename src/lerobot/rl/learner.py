@@ -66,7 +66,8 @@ from lerobot.datasets.factory import make_dataset
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
 from lerobot.policies.factory import make_policy
 from lerobot.policies.sac.modeling_sac import SACPolicy
-from lerobot.rl.buffer import ReplayBuffer, concatenate_batch_transitions
+from lerobot.rl.buffer import PrioritizedReplayBuffer, ReplayBuffer, concatenate_batch_transitions
+from lerobot.rl.parameter_sync import ParameterSender, get_synced_modules
 from lerobot.rl.process import ProcessSignalHandler
 from lerobot.rl.wandb_utils import WandBLogger
 from lerobot.robots import so_follower  # noqa: F401
@@ -77,7 +78,6 @@ from lerobot.transport.utils import (
     MAX_MESSAGE_SIZE,
     bytes_to_python_object,
     bytes_to_transitions,
-    state_to_bytes,
 )
 from lerobot.utils.constants import (
     ACTION,
@@ -93,7 +93,7 @@ from lerobot.utils.train_utils import (
     save_checkpoint,
     update_last_checkpoint,
 )
-from lerobot.utils.transition import move_state_dict_to_device, move_transition_to_device
+from lerobot.utils.transition import move_transition_to_device
 from lerobot.utils.utils import (
     format_big_number,
     get_safe_torch_device,
@@ -315,7 +315,15 @@ def add_actor_information_and_train(
 
     policy.train()
 
-    push_actor_policy_to_queue(parameters_queue=parameters_queue, policy=policy)
+    actor_learner_config = cfg.policy.actor_learner_config
+    parameter_sender = ParameterSender(
+        mode=actor_learner_config.policy_parameters_sync_mode,
+        dtype=actor_learner_config.policy_parameters_dtype,
+        keyframe_interval=actor_learner_config.policy_parameters_keyframe_interval,
+    )
+    push_actor_policy_to_queue(
+        parameters_queue=parameters_queue, policy=policy, parameter_sender=parameter_sender
+    )
 
     last_time_policy_pushed = time.time()
 
@@ -422,6 +430,8 @@ def add_actor_information_and_train(
                 "observation_feature": observation_features,
                 "next_observation_feature": next_observation_features,
                 "complementary_info": batch["complementary_info"],
+                "discount": batch.get("discount"),
+                "weights": batch.get("weights"),
             }
 
             # Use the forward method for critic loss
@@ -435,6 +445,7 @@ def add_actor_information_and_train(
                 parameters=policy.critic_ensemble.parameters(), max_norm=clip_grad_norm_value
             )
             optimizers["critic"].step()
+            update_replay_buffer_priorities(replay_buffer, batch, critic_output)
 
             # Discrete critic optimization (if available)
             if policy.config.num_discrete_actions is not None:
@@ -480,6 +491,8 @@ def add_actor_information_and_train(
             "done": done,
             "observation_feature": observation_features,
             "next_observation_feature": next_observation_features,
+            "discount": batch.get("discount"),
+            "weights": batch.get("weights"),
         }
 
         critic_output = policy.forward(forward_batch, model="critic")
@@ -491,6 +504,7 @@ def add_actor_information_and_train(
             parameters=policy.critic_ensemble.parameters(), max_norm=clip_grad_norm_value
         ).item()
         optimizers["critic"].step()
+        update_replay_buffer_priorities(replay_buffer, batch, critic_output)
 
         # Initialize training info dictionary
         training_infos = {
@@ -550,7 +564,9 @@ def add_actor_information_and_train(
 
         # Push policy to actors if needed
         if time.time() - last_time_policy_pushed > policy_parameters_push_frequency:
-            push_actor_policy_to_queue(parameters_queue=parameters_queue, policy=policy)
+            push_actor_policy_to_queue(
+                parameters_queue=parameters_queue, policy=policy, parameter_sender=parameter_sender
+            )
             last_time_policy_pushed = time.time()
 
         # Update target networks (main and discrete)
@@ -946,13 +962,24 @@ def initialize_replay_buffer(
     Returns:
         ReplayBuffer: Initialized replay buffer
     """
+    buffer_cls = PrioritizedReplayBuffer if cfg.policy.use_prioritized_replay else ReplayBuffer
+    buffer_kwargs = {
+        "n_step": cfg.policy.n_step,
+        "discount": cfg.policy.discount,
+        "store_images_as_uint8": cfg.policy.store_images_as_uint8,
+    }
+    if cfg.policy.use_prioritized_replay:
+        buffer_kwargs["alpha"] = cfg.policy.prioritized_replay_alpha
+        buffer_kwargs["beta"] = cfg.policy.prioritized_replay_beta
+
     if not cfg.resume:
-        return ReplayBuffer(
+        return buffer_cls(
             capacity=cfg.policy.online_buffer_capacity,
             device=device,
             state_keys=cfg.policy.input_features.keys(),
             storage_device=storage_device,
             optimize_memory=True,
+            **buffer_kwargs,
         )
 
     logging.info("Resume training load the online dataset")
@@ -966,12 +993,13 @@ def initialize_replay_buffer(
         repo_id=repo_id,
         root=dataset_path,
     )
-    return ReplayBuffer.from_lerobot_dataset(
+    return buffer_cls.from_lerobot_dataset(
         lerobot_dataset=dataset,
         capacity=cfg.policy.online_buffer_capacity,
         device=device,
         state_keys=cfg.policy.input_features.keys(),
         optimize_memory=True,
+        **buffer_kwargs,
     )
 
 
@@ -1010,10 +1038,25 @@ def initialize_offline_replay_buffer(
         storage_device=storage_device,
         optimize_memory=True,
         capacity=cfg.policy.offline_buffer_capacity,
+        n_step=cfg.policy.n_step,
+        discount=cfg.policy.discount,
+        store_images_as_uint8=cfg.policy.store_images_as_uint8,
     )
     return offline_replay_buffer
 
 
+def update_replay_buffer_priorities(replay_buffer: ReplayBuffer, batch: dict, critic_output: dict) -> None:
+    """Update the priorities of the online transitions of `batch` with their TD errors, for prioritized replay.
+
+    The online transitions come first in batches concatenated with offline transitions, see
+    `concatenate_batch_transitions`.
+    """
+    if not isinstance(replay_buffer, PrioritizedReplayBuffer) or "indices" not in batch:
+        return
+    indices = batch["indices"]
+    replay_buffer.update_priorities(indices, critic_output["td_error"][: len(indices)])
+
+
 # Utilities/Helpers functions
 
 
@@ -1094,21 +1137,17 @@ def check_nan_in_transition(
     return nan_detected
 
 
-def push_actor_policy_to_queue(parameters_queue: Queue, policy: nn.Module):
-    logging.debug("[LEARNER] Pushing actor policy to the queue")
-
-    # Create a dictionary to hold all the state dicts
-    state_dicts = {"policy": move_state_dict_to_device(policy.actor.state_dict(), device="cpu")}
-
-    # Add discrete critic if it exists
-    if hasattr(policy, "discrete_critic") and policy.discrete_critic is not None:
-        state_dicts["discrete_critic"] = move_state_dict_to_device(
-            policy.discrete_critic.state_dict(), device="cpu"
-        )
-        logging.debug("[LEARNER] Including discrete critic in state dict push")
+def push_actor_policy_to_queue(
+    parameters_queue: Queue, policy: nn.Module, parameter_sender: ParameterSender | None = None
+):
+    """Push the parameters of the actor (and discrete critic) for the actors.
 
-    state_bytes = state_to_bytes(state_dicts)
-    parameters_queue.put(state_bytes)
+    Without `parameter_sender`, the complete state dicts are pushed, like with the "full" sync mode.
+    """
+    logging.debug("[LEARNER] Pushing actor policy to the queue")
+    if parameter_sender is None:
+        parameter_sender = ParameterSender(mode="full")
+    parameters_queue.put(parameter_sender.encode(get_synced_modules(policy)))
 
 
 def process_interaction_message(
@@ -19,7 +19,7 @@ import logging
 import time
 from multiprocessing import Event, Queue
 
-from lerobot.rl.queue import get_last_item_from_queue
+from lerobot.rl.parameter_sync import get_parameters_from_queue, is_keyframe
 from lerobot.transport import services_pb2, services_pb2_grpc
 from lerobot.transport.utils import receive_bytes_in_chunks, send_bytes_in_chunks
 
@@ -49,12 +49,15 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
         self.transition_queue = transition_queue
         self.interaction_message_queue = interaction_message_queue
         self.queue_get_timeout = queue_get_timeout
+        # Most recent parameters keyframe, sent to the actors which didn't receive it, see `parameter_sync`
+        self.last_keyframe = None
 
     def StreamParameters(self, request, context):  # noqa: N802
         # TODO: authorize the request
         logging.info("[LEARNER] Received request to stream parameters from the Actor")
 
         last_push_time = 0
+        sent_keyframe = None
 
         while not self.shutdown_event.is_set():
             time_since_last_push = time.time() - last_push_time
@@ -65,19 +68,27 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
                 continue
 
             logging.info("[LEARNER] Push parameters to the Actor")
-            buffer = get_last_item_from_queue(
+            buffers = get_parameters_from_queue(
                 self.parameters_queue, block=True, timeout=self.queue_get_timeout
             )
 
-            if buffer is None:
+            if not buffers:
                 continue
 
-            yield from send_bytes_in_chunks(
-                buffer,
-                services_pb2.Parameters,
-                log_prefix="[LEARNER] Sending parameters",
-                silent=True,
-            )
+            if is_keyframe(buffers[0]):
+                self.last_keyframe = buffers[0]
+            elif self.last_keyframe is not None and sent_keyframe is not self.last_keyframe:
+                # The keyframe was consumed by another stream, or before this actor connected
+                buffers.insert(0, self.last_keyframe)
+            sent_keyframe = self.last_keyframe
+
+            for buffer in buffers:
+                yield from send_bytes_in_chunks(
+                    buffer,
+                    services_pb2.Parameters,
+                    log_prefix="[LEARNER] Sending parameters",
+                    silent=True,
+                )
 
             last_push_time = time.time()
             logging.info("[LEARNER] Parameters sent")
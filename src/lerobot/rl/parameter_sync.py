@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Versioned synchronization of the policy parameters from the learner to the actors.
+
+With the "full" mode, the learner pushes the complete state dicts of the synchronized modules at every push. The
+other modes send a full precision keyframe with all the tensors every `keyframe_interval` pushes, and in between
+only the trainable tensors (frozen parameters, e.g. of a frozen vision encoder, are skipped):
+- "trainable": the tensors themselves, cast to `dtype`,
+- "delta": the difference with the last keyframe, cast to `dtype`. Since the differences are much smaller than the
+  parameters, casting them to float16 or bfloat16 loses much less precision than casting the parameters.
+
+Every message is self-contained given its keyframe, so the actors can skip messages (the queues of the learner
+and the actors only keep the most recent parameters), as long as they keep the keyframes, see
+`get_parameters_from_queue`.
+"""
+
+import logging
+import platform
+from contextlib import suppress
+from queue import Empty
+from typing import Any
+
+import torch
+from torch import nn
+from torch.multiprocessing import Queue
+
+from lerobot.transport.utils import bytes_to_tensors, is_tensor_format, tensors_to_bytes
+
+PARAMETER_SYNC_MODES = ["full", "trainable", "delta"]
+PARAMETER_SYNC_DTYPES = {"float32": torch.float32, "float16": torch.float16, "bfloat16": torch.bfloat16}
+
+
+def get_synced_modules(policy: nn.Module) -> dict[str, nn.Module]:
+    """Return the modules of `policy` used by the actors, by name."""
+    modules = {"policy": policy.actor}
+    if getattr(policy, "discrete_critic", None) is not None:
+        modules["discrete_critic"] = policy.discrete_critic
+    return modules
+
+
+def _is_frozen(value: torch.Tensor) -> bool:
+    return isinstance(value, nn.Parameter) and not value.requires_grad
+
+
+class ParameterSender:
+    """Encode the parameters pushed by the learner, see the module docstring.
+
+    Args:
+        mode: One of `PARAMETER_SYNC_MODES`.
+        dtype: Dtype of the floating point tensors sent between keyframes, one of `PARAMETER_SYNC_DTYPES`.
+        keyframe_interval: Number of pushes between two keyframes.
+    """
+
+    def __init__(self, mode: str = "delta", dtype: str = "float32", keyframe_interval: int = 10):
+        if mode not in PARAMETER_SYNC_MODES:
+            raise ValueError(f"Invalid mode '{mode}'. Available options: {PARAMETER_SYNC_MODES}")
+        if dtype not in PARAMETER_SYNC_DTYPES:
+            raise ValueError(f"Invalid dtype '{dtype}'. Available options: {list(PARAMETER_SYNC_DTYPES)}")
+        if mode == "full" and dtype != "float32":
+            raise ValueError(f"The 'full' mode sends float32 parameters, got dtype '{dtype}'.")
+        if keyframe_interval < 1:
+            raise ValueError(f"keyframe_interval must be >= 1, got {keyframe_interval}.")
+        self.mode = mode
+        self.dtype = PARAMETER_SYNC_DTYPES[dtype]
+        self.keyframe_interval = 1 if mode == "full" else keyframe_interval
+        self.version = 0
+        self.keyframe_version = 0
+        # Keyframe tensors of the trainable floating point tensors, on the device of the modules
+        self._keyframe: dict[str, dict[str, torch.Tensor]] = {}
+
+    @torch.no_grad()
+    def encode(self, modules: dict[str, nn.Module]) -> bytes:
+        keyframe = self.version % self.keyframe_interval == 0
+        if keyframe:
+            self.keyframe_version = self.version
+
+        state_dicts = {}
+        for name, module in modules.items():
+            state_dict = {}
+            module_keyframe = self._keyframe.setdefault(name, {})
+            for key, value in module.state_dict(keep_vars=True).items():
+                if not keyframe and _is_frozen(value):
+                    continue
+                value = value.detach()
+                if not value.is_floating_point():
+                    state_dict[key] = value.cpu()
+                elif keyframe:
+                    if self.mode == "delta" and not _is_frozen(value):
+                        if key in module_keyframe:
+                            module_keyframe[key].copy_(value)
+                        else:
+                            module_keyframe[key] = value.clone()
+                    state_dict[key] = value.cpu()
+                elif self.mode == "delta":
+                    state_dict[key] = (value - module_keyframe[key]).to(self.dtype).cpu()
+                else:
+                    state_dict[key] = value.to(self.dtype).cpu()
+            state_dicts[name] = state_dict
+
+        if self.mode == "full":
+            # Same payload as before versioned messages, readable by older actors
+            message = state_dicts
+        else:
+            message = {
+                "version": self.version,
+                "keyframe_version": self.keyframe_version,
+                "mode": self.mode,
+                "state_dicts": state_dicts,
+            }
+        self.version += 1
+        return tensors_to_bytes(message)
+
+
+class ParameterReceiver:
+    """Apply the parameters received by an actor in place, see the module docstring."""
+
+    def __init__(self):
+        self.version: int | None = None
+        self.keyframe_version: int | None = None
+        # Keyframe tensors kept for the "delta" mode, on the device of the modules
+        self._keyframe: dict[str, dict[str, torch.Tensor]] = {}
+
+    @torch.no_grad()
+    def apply(self, message: dict[str, Any], modules: dict[str, nn.Module]) -> bool:
+        """Copy the tensors of `message` into the parameters and buffers of `modules`.
+
+        Returns False if the message was skipped, because it is older than the current parameters or its keyframe
+        wasn't received.
+        """
+        if "version" not in message:
+            # Full state dicts, pushed with the "full" mode
+            for name, module in modules.items():
+                if name in message:
+                    self._copy(message[name], module.state_dict(keep_vars=True))
+            return True
+
+        version, keyframe_version = message["version"], message["keyframe_version"]
+        keyframe = version == keyframe_version
+        # Keyframes are always applied, e.g. after a restart of the learner
+        if not keyframe and self.version is not None and version <= self.version:
+            return False
+        if not keyframe and keyframe_version != self.keyframe_version:
+            logging.warning(
+                f"[ACTOR] Skipping parameters version {version}, its keyframe {keyframe_version} wasn't received."
+            )
+            return False
+
+        for name, state_dict in message["state_dicts"].items():
+            if name not in modules:
+                continue
+            targets = modules[name].state_dict(keep_vars=True)
+            if message["mode"] == "delta" and not keyframe:
+                module_keyframe = self._keyframe[name]
+                for key, value in state_dict.items():
+                    if key in module_keyframe:
+                        targets[key].copy_(module_keyframe[key]).add_(value.to(targets[key].device))
+                    else:
+                        targets[key].copy_(value)
+                continue
+
+            self._copy(state_dict, targets)
+            if message["mode"] == "delta":
+                module_keyframe = self._keyframe.setdefault(name, {})
+                for key in state_dict:
+                    target = targets[key]
+                    if not target.is_floating_point() or _is_frozen(target):
+                        continue
+                    if key in module_keyframe:
+                        module_keyframe[key].copy_(target)
+                    else:
+                        module_keyframe[key] = target.detach().clone()
+
+        self.version = version
+        if keyframe:
+            self.keyframe_version = version
+        return True
+
+    @staticmethod
+    def _copy(state_dict: dict[str, torch.Tensor], targets: dict[str, torch.Tensor]):
+        missing_keys = set(state_dict) - set(targets)
+        if missing_keys:
+            raise KeyError(f"Unexpected keys in the received parameters: {sorted(missing_keys)}")
+        for key, value in state_dict.items():
+            targets[key].copy_(value)
+
+
+def is_keyframe(buffer: bytes) -> bool:
+    """Whether the pushed parameters `buffer` can be applied without a previous keyframe."""
+    if not is_tensor_format(buffer):
+        return True
+    message = bytes_to_tensors(buffer, load_buffers=False)
+    return "version" not in message or message["version"] == message["keyframe_version"]
+
+
+def get_parameters_from_queue(queue: Queue, block: bool = True, timeout: float = 0.1) -> list[bytes]:
+    """Drain `queue` of the pushed parameters, keeping only the ones needed to get to the most recent version.
+
+    Returns an empty list if there is nothing in the queue, the most recent item if it is a keyframe, or the most
+    recent keyframe followed by the most recent item.
+    """
+    items = []
+    if block:
+        try:
+            items.append(queue.get(timeout=timeout))
+        except Empty:
+            return []
+
+    # Same draining as `get_last_item_from_queue`, see the comments there
+    if platform.system() == "Darwin":
+        with suppress(Empty):
+            while True:
+                items.append(queue.get_nowait())
+    else:
+        while queue.qsize() > 0:
+            with suppress(Empty):
+                items.append(queue.get_nowait())
+
+    if not items:
+        return []
+    last_keyframe_idx = max((i for i, item in enumerate(items) if is_keyframe(item)), default=None)
+    if last_keyframe_idx is None or last_keyframe_idx == len(items) - 1:
+        return [items[-1]]
+    return [items[last_keyframe_idx], items[-1]]
@@ -18,7 +18,8 @@
 Edit LeRobot datasets using various transformation tools.
 
 This script allows you to delete episodes, split datasets, merge datasets,
-remove features, and convert image datasets to video format.
+remove features, convert image datasets to video format, and recompute
+dataset statistics.
 When new_repo_id is specified, creates a new dataset.
 
 Usage Examples:
@@ -85,6 +86,19 @@ Convert image dataset to video format and push to hub:
         --operation.type convert_image_to_video \
         --push_to_hub true
 
+Recompute the statistics of a dataset in place, e.g. after editing its features:
+    python -m lerobot.scripts.lerobot_edit_dataset \
+        --repo_id lerobot/pusht \
+        --operation.type recompute_stats \
+        --operation.num_workers 8
+
+Recompute the statistics with custom quantiles, into a copy of the dataset:
+    python -m lerobot.scripts.lerobot_edit_dataset \
+        --repo_id lerobot/pusht \
+        --new_repo_id lerobot/pusht_new_quantiles \
+        --operation.type recompute_stats \
+        --operation.quantile_list "[0.02, 0.5, 0.98]"
+
 Using JSON config file:
     python -m lerobot.scripts.lerobot_edit_dataset \
         --config_path path/to/edit_config.json
@@ -100,6 +114,7 @@ from lerobot.datasets.dataset_tools import (
     convert_image_to_video_dataset,
     delete_episodes,
     merge_datasets,
+    recompute_stats,
     remove_feature,
     split_dataset,
 )
@@ -147,11 +162,25 @@ class ConvertImageToVideoConfig:
     max_frames_per_batch: int | None = None
 
 
+@dataclass
+class RecomputeStatsConfig:
+    type: str = "recompute_stats"
+    quantile_list: list[float] | None = None
+    num_workers: int = 4
+    batch_size: int = 1000
+    frames_per_task: int = 10_000
+
+
 @dataclass
 class EditDatasetConfig:
     repo_id: str
     operation: (
-        DeleteEpisodesConfig | SplitConfig | MergeConfig | RemoveFeatureConfig | ConvertImageToVideoConfig
+        DeleteEpisodesConfig
+        | SplitConfig
+        | MergeConfig
+        | RemoveFeatureConfig
+        | ConvertImageToVideoConfig
+        | RecomputeStatsConfig
     )
     root: str | None = None
     new_repo_id: str | None = None
@@ -359,6 +388,37 @@ def handle_convert_image_to_video(cfg: EditDatasetConfig) -> None:
         logging.info("Dataset saved locally (not pushed to hub)")
 
 
+def handle_recompute_stats(cfg: EditDatasetConfig) -> None:
+    # Note: Parser may create any config type with the right fields (e.g. ConvertImageToVideoConfig for
+    # num_workers), so we access fields directly instead of checking isinstance()
+    dataset = LeRobotDataset(cfg.repo_id, root=cfg.root)
+    num_workers = getattr(cfg.operation, "num_workers", 4)
+
+    if cfg.new_repo_id:
+        # Only the stats change, so the new dataset starts as a copy of the original one
+        output_repo_id, output_dir = get_output_path(
+            cfg.repo_id, cfg.new_repo_id, Path(cfg.root) if cfg.root else None
+        )
+        logging.info(f"Copying {cfg.repo_id} to {output_dir}")
+        shutil.copytree(dataset.root, output_dir)
+        dataset = LeRobotDataset(output_repo_id, root=output_dir)
+
+    logging.info(f"Recomputing the statistics of {dataset.repo_id} with {num_workers} workers")
+    recompute_stats(
+        dataset,
+        quantile_list=getattr(cfg.operation, "quantile_list", None),
+        num_workers=num_workers,
+        batch_size=getattr(cfg.operation, "batch_size", 1000),
+        frames_per_task=getattr(cfg.operation, "frames_per_task", 10_000),
+    )
+
+    logging.info(f"Statistics saved to {dataset.root}")
+
+    if cfg.push_to_hub:
+        logging.info(f"Pushing to hub as {dataset.repo_id}")
+        dataset.push_to_hub()
+
+
 @parser.wrap()
 def edit_dataset(cfg: EditDatasetConfig) -> None:
     operation_type = cfg.operation.type
@@ -373,10 +433,13 @@ def edit_dataset(cfg: EditDatasetConfig) -> None:
         handle_remove_feature(cfg)
     elif operation_type == "convert_image_to_video":
         handle_convert_image_to_video(cfg)
+    elif operation_type == "recompute_stats":
+        handle_recompute_stats(cfg)
     else:
         raise ValueError(
             f"Unknown operation type: {operation_type}\n"
-            f"Available operations: delete_episodes, split, merge, remove_feature, convert_to_video"
+            f"Available operations: delete_episodes, split, merge, remove_feature, convert_to_video, "
+            f"recompute_stats"
         )
 
 
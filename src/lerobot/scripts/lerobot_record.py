@@ -182,6 +182,10 @@ class DatasetRecordConfig:
     # Video codec for encoding videos. Options: 'h264', 'hevc', 'libsvtav1'.
     # Use 'h264' for faster encoding on systems where AV1 encoding is CPU-heavy.
     vcodec: str = "libsvtav1"
+    # Encode the camera frames into the episode's video while recording, in a background thread per camera,
+    # instead of writing them as PNG images encoded after each episode. Episodes are then saved without waiting
+    # for the encoding. Not compatible with `video_encoding_batch_size` > 1.
+    streaming_encoding: bool = False
     # Rename map for the observation to override the image and state keys
     rename_map: dict[str, str] = field(default_factory=dict)
 
@@ -402,6 +406,16 @@ def record_loop(
 
         timestamp = time.perf_counter() - start_episode_t
 
+    if dataset is not None and dataset.image_writer is not None:
+        writer_stats = dataset.image_writer.get_stats()
+        dataset.image_writer.reset_stats()
+        if writer_stats["num_blocked_frames"] > 0:
+            logging.warning(
+                f"{writer_stats['num_blocked_frames']} frames waited {writer_stats['blocked_time_s']:.2f}s in total "
+                f"for the image writer (queue depth: {writer_stats['queue_depth']}). Consider using more image "
+                "writer processes or threads."
+            )
+
 
 @parser.wrap()
 def record(cfg: RecordConfig) -> LeRobotDataset:
@@ -445,6 +459,7 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
                 root=cfg.dataset.root,
                 batch_encoding_size=cfg.dataset.video_encoding_batch_size,
                 vcodec=cfg.dataset.vcodec,
+                streaming_encoding=cfg.dataset.streaming_encoding,
             )
 
             if hasattr(robot, "cameras") and len(robot.cameras) > 0:
@@ -467,6 +482,7 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
                 image_writer_threads=cfg.dataset.num_image_writer_threads_per_camera * len(robot.cameras),
                 batch_encoding_size=cfg.dataset.video_encoding_batch_size,
                 vcodec=cfg.dataset.vcodec,
+                streaming_encoding=cfg.dataset.streaming_encoding,
             )
 
         # Load pretrained policy
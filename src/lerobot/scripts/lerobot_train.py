@@ -30,11 +30,13 @@ from lerobot.configs.train import TrainPipelineConfig
 from lerobot.datasets.factory import make_dataset
 from lerobot.datasets.sampler import EpisodeAwareSampler
 from lerobot.datasets.utils import cycle
+from lerobot.datasets.video_utils import DecoderCacheWorkerStats, get_default_decoder_cache
 from lerobot.envs.factory import make_env, make_env_pre_post_processors
 from lerobot.envs.utils import close_envs
 from lerobot.optim.factory import make_optimizer_and_scheduler
 from lerobot.policies.factory import make_policy, make_pre_post_processors
 from lerobot.policies.pretrained import PreTrainedPolicy
+from lerobot.processor.image_processor import insert_image_to_float_step
 from lerobot.rl.wandb_utils import WandBLogger
 from lerobot.scripts.lerobot_eval import eval_policy_all
 from lerobot.utils.import_utils import register_third_party_plugins
@@ -283,6 +285,12 @@ def train(cfg: TrainPipelineConfig, accelerator: Accelerator | None = None):
         **processor_kwargs,
         **postprocessor_kwargs,
     )
+    if cfg.dataset.return_uint8_images:
+        # Frames are loaded as uint8 and converted to float once on the device
+        preprocessor.steps = insert_image_to_float_step(preprocessor.steps)
+    if cfg.profile_processors:
+        preprocessor.enable_profiling()
+        postprocessor.enable_profiling()
 
     if is_main_process:
         logging.info("Creating optimizer and scheduler")
@@ -337,22 +345,27 @@ def train(cfg: TrainPipelineConfig, accelerator: Accelerator | None = None):
         logging.info(f"{num_total_params=} ({format_big_number(num_total_params)})")
 
     # create dataloader for offline training
-    if hasattr(cfg.policy, "drop_n_last_frames"):
+    if hasattr(cfg.policy, "drop_n_last_frames") or cfg.dataset.episode_group_size > 1:
         shuffle = False
         sampler = EpisodeAwareSampler(
             dataset.meta.episodes["dataset_from_index"],
             dataset.meta.episodes["dataset_to_index"],
             episode_indices_to_use=dataset.episodes,
-            drop_n_last_frames=cfg.policy.drop_n_last_frames,
+            drop_n_last_frames=getattr(cfg.policy, "drop_n_last_frames", 0),
             shuffle=True,
+            episode_group_size=cfg.dataset.episode_group_size,
         )
     else:
         shuffle = True
         sampler = None
 
+    # With dataloader workers, each worker has its own decoder cache in its own process, whose stats are shared
+    # with the main process
+    decoder_cache_worker_stats = DecoderCacheWorkerStats(cfg.num_workers) if cfg.num_workers > 0 else None
     dataloader = torch.utils.data.DataLoader(
         dataset,
         num_workers=cfg.num_workers,
+        worker_init_fn=decoder_cache_worker_stats.worker_init_fn if decoder_cache_worker_stats else None,
         batch_size=cfg.batch_size,
         shuffle=shuffle and not cfg.dataset.streaming,
         sampler=sampler,
@@ -435,6 +448,23 @@ def train(cfg: TrainPipelineConfig, accelerator: Accelerator | None = None):
                             "rabc_num_frames": rabc_stats["num_frames"],
                         }
                     )
+                if cfg.dataset.video_backend == "torchcodec":
+                    decoder_cache = decoder_cache_worker_stats or get_default_decoder_cache()
+                    wandb_log_dict.update(
+                        {f"decoder_cache_{key}": value for key, value in decoder_cache.get_stats().items()}
+                    )
+                    decoder_cache.reset_stats()
+                if cfg.num_workers == 0 and getattr(dataset, "frame_cache", None) is not None:
+                    wandb_log_dict.update(
+                        {
+                            f"frame_cache_{key}": value
+                            for key, value in dataset.frame_cache.get_stats().items()
+                        }
+                    )
+                    dataset.frame_cache.reset_stats()
+                if preprocessor.profiler is not None:
+                    wandb_log_dict.update(preprocessor.profiler.get_log_dict(prefix="preprocessor/"))
+                    preprocessor.profiler.reset_stats()
                 wandb_logger.log_dict(wandb_log_dict, step)
             train_tracker.reset_averages()
 
@@ -502,6 +532,9 @@ def train(cfg: TrainPipelineConfig, accelerator: Accelerator | None = None):
                 eval_tracker.pc_success = aggregated.pop("pc_success")
                 if wandb_logger:
                     wandb_log_dict = {**eval_tracker.to_dict(), **eval_info}
+                    if postprocessor.profiler is not None:
+                        wandb_log_dict.update(postprocessor.profiler.get_log_dict(prefix="postprocessor/"))
+                        postprocessor.profiler.reset_stats()
                     wandb_logger.log_dict(wandb_log_dict, step, mode="eval")
                     wandb_logger.log_video(eval_info["overall"]["video_paths"][0], step, mode="eval")
 
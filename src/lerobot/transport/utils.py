@@ -15,14 +15,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import dataclasses
 import io
 import json
 import logging
 import pickle  # nosec B403: Safe usage for internal serialization only
+import struct
+from collections.abc import Iterable
 from multiprocessing.synchronize import Event as MpEvent
 from queue import Queue
 from typing import Any
 
+import numpy as np
 import torch
 
 from lerobot.transport import services_pb2
@@ -34,6 +38,11 @@ TransferState = services_pb2.TransferState  # type: ignore[attr-defined]
 CHUNK_SIZE = 2 * 1024 * 1024  # 2 MB
 MAX_MESSAGE_SIZE = 4 * 1024 * 1024  # 4 MB
 
+# Tensor wire format: magic, header size, JSON header, then the raw buffers of the tensors and arrays
+TENSOR_FORMAT_MAGIC = b"LRT1"
+TENSOR_FORMAT_ALIGNMENT = 64
+_TENSOR_FORMAT_PREFIX = struct.Struct("<4sQ")
+
 
 def bytes_buffer_size(buffer: io.BytesIO) -> int:
     buffer.seek(0, io.SEEK_END)
@@ -42,9 +51,41 @@ def bytes_buffer_size(buffer: io.BytesIO) -> int:
     return result
 
 
-def send_bytes_in_chunks(buffer: bytes, message_class: Any, log_prefix: str = "", silent: bool = True):
-    bytes_buffer: io.BytesIO = io.BytesIO(buffer)
-    size_in_bytes = bytes_buffer_size(bytes_buffer)
+def _iter_chunks(buffers: list[memoryview], chunk_size: int):
+    """Yield chunks of `chunk_size` bytes of the concatenation of `buffers`, copying each byte once."""
+    pending, pending_size = [], 0
+    for buffer in buffers:
+        offset = 0
+        while offset < len(buffer):
+            view = buffer[offset : offset + chunk_size - pending_size]
+            offset += len(view)
+            if pending_size == 0 and len(view) == chunk_size:
+                yield view.tobytes()
+                continue
+            pending.append(view)
+            pending_size += len(view)
+            if pending_size == chunk_size:
+                yield b"".join(pending)
+                pending, pending_size = [], 0
+    if pending:
+        yield b"".join(pending)
+
+
+def send_bytes_in_chunks(
+    buffer: bytes | memoryview | list[bytes | memoryview],
+    message_class: Any,
+    log_prefix: str = "",
+    silent: bool = True,
+):
+    """Yield `message_class` messages holding consecutive chunks of `buffer`.
+
+    `buffer` can also be a list of buffers, e.g. returned by `tensors_to_buffers`, which are sent as if they were
+    concatenated. Chunks are sliced from memoryviews of the buffers, so that each byte is only copied once, into
+    its message.
+    """
+    buffers = buffer if isinstance(buffer, list) else [buffer]
+    buffers = [memoryview(b).cast("B") for b in buffers]
+    size_in_bytes = sum(len(b) for b in buffers)
 
     sent_bytes = 0
 
@@ -52,7 +93,7 @@ def send_bytes_in_chunks(buffer: bytes, message_class: Any, log_prefix: str = ""
 
     logging_method(f"{log_prefix} Buffer size {size_in_bytes / 1024 / 1024} MB with")
 
-    while sent_bytes < size_in_bytes:
+    for chunk in _iter_chunks(buffers, CHUNK_SIZE):
         transfer_state = TransferState.TRANSFER_MIDDLE
 
         if sent_bytes + CHUNK_SIZE >= size_in_bytes:
@@ -60,18 +101,20 @@ def send_bytes_in_chunks(buffer: bytes, message_class: Any, log_prefix: str = ""
         elif sent_bytes == 0:
             transfer_state = TransferState.TRANSFER_BEGIN
 
-        size_to_read = min(CHUNK_SIZE, size_in_bytes - sent_bytes)
-        chunk = bytes_buffer.read(size_to_read)
-
         yield message_class(transfer_state=transfer_state, data=chunk)
-        sent_bytes += size_to_read
+        sent_bytes += len(chunk)
         logging_method(f"{log_prefix} Sent {sent_bytes}/{size_in_bytes} bytes with state {transfer_state}")
 
     logging_method(f"{log_prefix} Published {sent_bytes / 1024 / 1024} MB")
 
 
 def receive_bytes_in_chunks(iterator, queue: Queue | None, shutdown_event: MpEvent, log_prefix: str = ""):
-    bytes_buffer = io.BytesIO()
+    """Reassemble the chunks sent by `send_bytes_in_chunks`.
+
+    Chunks are joined once per message, into a writable `bytearray` from which `bytes_to_tensors` can read tensors
+    without copying them.
+    """
+    chunks = []
     step = 0
 
     logging.info(f"{log_prefix} Starting receiver")
@@ -82,26 +125,24 @@ def receive_bytes_in_chunks(iterator, queue: Queue | None, shutdown_event: MpEve
             return
 
         if item.transfer_state == TransferState.TRANSFER_BEGIN:
-            bytes_buffer.seek(0)
-            bytes_buffer.truncate(0)
-            bytes_buffer.write(item.data)
+            chunks = [item.data]
             logging.debug(f"{log_prefix} Received data at step 0")
             step = 0
         elif item.transfer_state == TransferState.TRANSFER_MIDDLE:
-            bytes_buffer.write(item.data)
+            chunks.append(item.data)
             step += 1
             logging.debug(f"{log_prefix} Received data at step {step}")
         elif item.transfer_state == TransferState.TRANSFER_END:
-            bytes_buffer.write(item.data)
-            logging.debug(f"{log_prefix} Received data at step end size {bytes_buffer_size(bytes_buffer)}")
+            chunks.append(item.data)
+            data = bytearray().join(chunks)
+            logging.debug(f"{log_prefix} Received data at step end size {len(data)}")
 
             if queue is not None:
-                queue.put(bytes_buffer.getvalue())
+                queue.put(data)
             else:
-                return bytes_buffer.getvalue()
+                return data
 
-            bytes_buffer.seek(0)
-            bytes_buffer.truncate(0)
+            chunks = []
             step = 0
 
             logging.debug(f"{log_prefix} Queue updated")
@@ -110,16 +151,151 @@ def receive_bytes_in_chunks(iterator, queue: Queue | None, shutdown_event: MpEve
             raise ValueError(f"Received unknown transfer state {item.transfer_state}")
 
 
-def state_to_bytes(state_dict: dict[str, torch.Tensor]) -> bytes:
-    """Convert model state dict to flat array for transmission"""
-    bytes_buffer = io.BytesIO()
+def _encode_tree(obj: Any, buffers: list[memoryview], specs: list[dict], offset: int) -> tuple[Any, int]:
+    """Encode `obj` as JSON, appending the raw buffers of its tensors and arrays to `buffers`."""
+    if isinstance(obj, (torch.Tensor, np.ndarray)):
+        if isinstance(obj, torch.Tensor):
+            tensor = obj.detach().cpu().contiguous()
+            spec = {"kind": "tensor", "dtype": str(tensor.dtype).removeprefix("torch.")}
+            # Viewed as bytes, since numpy doesn't support all the torch dtypes (e.g. bfloat16)
+            raw = tensor.reshape(-1).view(torch.uint8).numpy()
+        else:
+            array = np.ascontiguousarray(obj)
+            if array.dtype.hasobject:
+                raise TypeError(f"Arrays of dtype {array.dtype} can't be serialized.")
+            spec = {"kind": "ndarray", "dtype": array.dtype.str}
+            raw = array.reshape(-1).view(np.uint8)
+        offset += -offset % TENSOR_FORMAT_ALIGNMENT
+        spec.update(shape=list(obj.shape), offset=offset, nbytes=raw.nbytes)
+        specs.append(spec)
+        buffers.append(memoryview(raw))
+        return {"__buffer__": len(specs) - 1}, offset + raw.nbytes
+    if isinstance(obj, dict):
+        items = []
+        for key, value in obj.items():
+            encoded, offset = _encode_tree(value, buffers, specs, offset)
+            items.append([key, encoded])
+        return {"__dict__": items}, offset
+    if isinstance(obj, (list, tuple)):
+        items = []
+        for value in obj:
+            encoded, offset = _encode_tree(value, buffers, specs, offset)
+            items.append(encoded)
+        return ({"__tuple__": items} if isinstance(obj, tuple) else items), offset
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        fields = {}
+        for field in dataclasses.fields(obj):
+            fields[field.name], offset = _encode_tree(getattr(obj, field.name), buffers, specs, offset)
+        return {"__dataclass__": type(obj).__qualname__, "fields": fields}, offset
+    if isinstance(obj, np.generic):
+        return obj.item(), offset
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj, offset
+    raise TypeError(f"Objects of type {type(obj)} can't be serialized with the tensor format.")
+
+
+def _decode_tree(
+    obj: Any, buffer: bytearray | memoryview | None, specs: list[dict], data_offset: int, classes: dict
+):
+    if isinstance(obj, list):
+        return [_decode_tree(value, buffer, specs, data_offset, classes) for value in obj]
+    if not isinstance(obj, dict):
+        return obj
+    if "__buffer__" in obj:
+        if buffer is None:
+            return None
+        spec = specs[obj["__buffer__"]]
+        offset = data_offset + spec["offset"]
+        if spec["kind"] == "tensor":
+            dtype = getattr(torch, spec["dtype"])
+            if spec["nbytes"] == 0:
+                return torch.empty(spec["shape"], dtype=dtype)
+            raw = torch.frombuffer(buffer, dtype=torch.uint8, count=spec["nbytes"], offset=offset)
+            return raw.view(dtype).view(spec["shape"])
+        dtype = np.dtype(spec["dtype"])
+        if spec["nbytes"] == 0:
+            return np.empty(spec["shape"], dtype=dtype)
+        raw = np.frombuffer(buffer, dtype=np.uint8, count=spec["nbytes"], offset=offset)
+        return raw.view(dtype).reshape(spec["shape"])
+    if "__dict__" in obj:
+        return {
+            key: _decode_tree(value, buffer, specs, data_offset, classes) for key, value in obj["__dict__"]
+        }
+    if "__tuple__" in obj:
+        return tuple(_decode_tree(value, buffer, specs, data_offset, classes) for value in obj["__tuple__"])
+    if "__dataclass__" in obj:
+        if obj["__dataclass__"] not in classes:
+            raise TypeError(f"Unexpected dataclass {obj['__dataclass__']}, allowed: {list(classes)}.")
+        fields = {k: _decode_tree(v, buffer, specs, data_offset, classes) for k, v in obj["fields"].items()}
+        return classes[obj["__dataclass__"]](**fields)
+    raise ValueError(f"Invalid node in the tensor format header: {obj}")
+
+
+def tensors_to_buffers(obj: Any) -> list[memoryview]:
+    """Serialize `obj` into a list of buffers without copying its tensors, to be sent with `send_bytes_in_chunks`.
+
+    `obj` is a tree of dicts, lists, tuples and dataclasses, whose leaves are tensors, numpy arrays, numbers,
+    strings or None (e.g. a state dict, a list of transitions or a `TimedObservation`). The first buffer holds a
+    JSON header describing the tree, and the dtypes, shapes and offsets of the tensors and arrays, followed by
+    their raw contiguous memory. Unlike `torch.save` or pickle, deserializing it can't execute code.
+    """
+    buffers, specs = [], []
+    tree, data_size = _encode_tree(obj, buffers, specs, offset=0)
+    header = json.dumps({"tree": tree, "buffers": specs}, separators=(",", ":")).encode()
+    # The raw data starts at an aligned offset, so that each tensor is aligned in the received buffer
+    padding = -(_TENSOR_FORMAT_PREFIX.size + len(header)) % TENSOR_FORMAT_ALIGNMENT
+    header += b" " * padding
+
+    frames = [memoryview(_TENSOR_FORMAT_PREFIX.pack(TENSOR_FORMAT_MAGIC, len(header)) + header)]
+    offset = 0
+    for spec, raw in zip(specs, buffers, strict=True):
+        if spec["offset"] > offset:
+            frames.append(memoryview(bytes(spec["offset"] - offset)))
+        frames.append(raw)
+        offset = spec["offset"] + spec["nbytes"]
+    return frames
+
+
+def tensors_to_bytes(obj: Any) -> bytes:
+    """Serialize `obj` with the tensor format of `tensors_to_buffers` into a single bytes object."""
+    return b"".join(tensors_to_buffers(obj))
+
+
+def is_tensor_format(buffer: bytes | bytearray | memoryview) -> bool:
+    return bytes(buffer[: len(TENSOR_FORMAT_MAGIC)]) == TENSOR_FORMAT_MAGIC
+
+
+def bytes_to_tensors(
+    buffer: bytes | bytearray | memoryview, dataclass_types: Iterable[type] = (), load_buffers: bool = True
+) -> Any:
+    """Deserialize a buffer written by `tensors_to_buffers`.
+
+    Tensors and arrays are views of `buffer` when it is writable (e.g. returned by `receive_bytes_in_chunks`),
+    otherwise `buffer` is copied once. Dataclasses are only rebuilt if their type is in `dataclass_types`. With
+    `load_buffers=False`, only the header is read and tensors and arrays are replaced by None.
+    """
+    if load_buffers and memoryview(buffer).readonly:
+        buffer = bytearray(buffer)
+    if not is_tensor_format(buffer):
+        raise ValueError("The buffer wasn't serialized with the tensor format.")
+    _, header_size = _TENSOR_FORMAT_PREFIX.unpack_from(buffer)
+    data_offset = _TENSOR_FORMAT_PREFIX.size + header_size
+    header = json.loads(bytes(buffer[_TENSOR_FORMAT_PREFIX.size : data_offset]))
+    classes = {cls.__qualname__: cls for cls in dataclass_types}
+    return _decode_tree(
+        header["tree"], buffer if load_buffers else None, header["buffers"], data_offset, classes
+    )
 
-    torch.save(state_dict, bytes_buffer)
 
-    return bytes_buffer.getvalue()
+def state_to_bytes(state_dict: dict[str, torch.Tensor]) -> bytes:
+    """Convert model state dict to flat array for transmission"""
+    return tensors_to_bytes(state_dict)
 
 
 def bytes_to_state_dict(buffer: bytes) -> dict[str, torch.Tensor]:
+    if is_tensor_format(buffer):
+        return bytes_to_tensors(buffer)
+    # Buffers sent by older versions with `torch.save`
     bytes_buffer = io.BytesIO(buffer)
     bytes_buffer.seek(0)
     return torch.load(bytes_buffer, weights_only=True)
@@ -138,6 +314,9 @@ def bytes_to_python_object(buffer: bytes) -> Any:
 
 
 def bytes_to_transitions(buffer: bytes) -> list[Transition]:
+    if is_tensor_format(buffer):
+        return bytes_to_tensors(buffer)
+    # Buffers sent by older versions with `torch.save`
     bytes_buffer = io.BytesIO(buffer)
     bytes_buffer.seek(0)
     transitions = torch.load(bytes_buffer, weights_only=True)
@@ -145,9 +324,7 @@ def bytes_to_transitions(buffer: bytes) -> list[Transition]:
 
 
 def transitions_to_bytes(transitions: list[Transition]) -> bytes:
-    bytes_buffer = io.BytesIO()
-    torch.save(transitions, bytes_buffer)
-    return bytes_buffer.getvalue()
+    return tensors_to_bytes(transitions)
 
 
 def grpc_channel_options(
@@ -43,8 +43,10 @@ pytest.importorskip("grpc")
 # -----------------------------------------------------------------------------
 
 
-def test_async_inference_e2e(monkeypatch):
+def test_async_inference_e2e(monkeypatch, tmp_path):
     """Tests the full asynchronous inference pipeline."""
+    # The server and client loggers write to `logs/` in the working directory when their modules are imported
+    monkeypatch.chdir(tmp_path)
     # Import grpc-dependent modules inside the test function
     import grpc
 
@@ -120,8 +122,9 @@ def test_async_inference_e2e(monkeypatch):
 
     monkeypatch.setattr(PolicyServer, "SendPolicyInstructions", _fake_send_policy_instructions, raising=True)
 
-    # Build gRPC server running a PolicyServer
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="policy_server"))
+    # Build gRPC server running a PolicyServer. The action stream holds a worker while the client is connected,
+    # so observations need another one.
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="policy_server"))
     services_pb2_grpc.add_AsyncInferenceServicer_to_server(policy_server, server)
 
     # Use the host/port specified in the fixture's config
@@ -173,7 +176,9 @@ def test_async_inference_e2e(monkeypatch):
     server.wait_for_termination(timeout=5)
 
     assert action_chunks_received["count"] > 0, "Client did not receive any action chunks"
-    assert len(policy_server._predicted_timesteps) > 0, "Server did not record any predicted timesteps"
+    assert any(client.predicted_timesteps for client in policy_server.clients.values()), (
+        "Server did not record any predicted timesteps"
+    )
 
     # ------------------------------------------------------------------
     # 4. Stop the system
@@ -142,51 +142,55 @@ def test_time_action_chunk(policy_server):
 
 def test_maybe_enqueue_observation_must_go(policy_server):
     """An observation with `must_go=True` is always enqueued."""
+    client = policy_server._get_client("client")
     obs = _make_obs(torch.zeros(6), must_go=True)
-    assert policy_server._enqueue_observation(obs) is True
-    assert policy_server.observation_queue.qsize() == 1
-    assert policy_server.observation_queue.get_nowait() is obs
+    assert policy_server._enqueue_observation(obs, client) is True
+    assert client.observation_queue.qsize() == 1
+    assert client.observation_queue.get_nowait() is obs
 
 
 def test_maybe_enqueue_observation_dissimilar(policy_server):
     """A dissimilar observation (not `must_go`) is enqueued."""
+    client = policy_server._get_client("client")
     # Set a last predicted observation.
-    policy_server.last_processed_obs = _make_obs(torch.zeros(6))
+    client.last_processed_obs = _make_obs(torch.zeros(6))
     # Create a new, dissimilar observation.
     new_obs = _make_obs(torch.ones(6) * 5)  # High norm difference
 
-    assert policy_server._enqueue_observation(new_obs) is True
-    assert policy_server.observation_queue.qsize() == 1
+    assert policy_server._enqueue_observation(new_obs, client) is True
+    assert client.observation_queue.qsize() == 1
 
 
 def test_maybe_enqueue_observation_is_skipped(policy_server):
     """A similar observation (not `must_go`) is skipped."""
+    client = policy_server._get_client("client")
     # Set a last predicted observation.
-    policy_server.last_processed_obs = _make_obs(torch.zeros(6))
+    client.last_processed_obs = _make_obs(torch.zeros(6))
     # Create a new, very similar observation.
     new_obs = _make_obs(torch.zeros(6) + 1e-4)
 
-    assert policy_server._enqueue_observation(new_obs) is False
-    assert policy_server.observation_queue.empty() is True
+    assert policy_server._enqueue_observation(new_obs, client) is False
+    assert client.observation_queue.empty() is True
 
 
 def test_obs_sanity_checks(policy_server):
     """Unit-test the private `_obs_sanity_checks` helper."""
+    client = policy_server._get_client("client")
     prev = _make_obs(torch.zeros(6), timestep=0)
 
     # Case 1 – timestep already predicted
-    policy_server._predicted_timesteps.add(1)
+    client.predicted_timesteps.add(1)
     obs_same_ts = _make_obs(torch.ones(6), timestep=1)
-    assert policy_server._obs_sanity_checks(obs_same_ts, prev) is False
+    assert policy_server._obs_sanity_checks(obs_same_ts, prev, client) is False
 
     # Case 2 – observation too similar
-    policy_server._predicted_timesteps.clear()
+    client.predicted_timesteps.clear()
     obs_similar = _make_obs(torch.zeros(6) + 1e-4, timestep=2)
-    assert policy_server._obs_sanity_checks(obs_similar, prev) is False
+    assert policy_server._obs_sanity_checks(obs_similar, prev, client) is False
 
     # Case 3 – genuinely new & dissimilar observation passes
     obs_ok = _make_obs(torch.ones(6) * 5, timestep=3)
-    assert policy_server._obs_sanity_checks(obs_ok, prev) is True
+    assert policy_server._obs_sanity_checks(obs_ok, prev, client) is True
 
 
 def test_predict_action_chunk(monkeypatch, policy_server):
@@ -217,3 +221,230 @@ def test_predict_action_chunk(monkeypatch, policy_server):
     for i, ta in enumerate(timed_actions):
         expected_ts = obs.get_timestamp() + i * policy_server.config.environment_dt
         assert abs(ta.get_timestamp() - expected_ts) < 1e-6
+
+
+def test_stack_observations():
+    from lerobot.async_inference.policy_server import stack_observations
+
+    observations = [
+        {OBS_STATE: torch.full((1, 6), float(i)), "task": [f"task {i}"], "robot_type": "dummy_robot"}
+        for i in range(3)
+    ]
+    batch = stack_observations(observations)
+    assert batch[OBS_STATE].shape == (3, 6)
+    assert batch[OBS_STATE][:, 0].tolist() == [0.0, 1.0, 2.0]
+    assert batch["task"] == ["task 0", "task 1", "task 2"]
+    assert batch["robot_type"] == "dummy_robot"
+
+    observations[1][OBS_STATE] = torch.zeros(1, 7)
+    with pytest.raises(ValueError, match="Can't stack"):
+        stack_observations(observations)
+
+
+def test_predict_action_chunks_batches_clients(monkeypatch, policy_server):
+    """Observations of several clients are run in a single forward pass and split back."""
+    from lerobot.async_inference.policy_server import PolicyServer
+
+    policy_server.preprocessor = lambda obs: obs
+    policy_server.postprocessor = lambda tensor: tensor
+    batch_sizes = []
+
+    def _fake_get_action_chunk(_self, observation):
+        batch_sizes.append(len(observation[OBS_STATE]))
+        # Each action is the first joint of its observation
+        return observation[OBS_STATE][:, :1].unsqueeze(1).expand(-1, policy_server.actions_per_chunk, 6)
+
+    monkeypatch.setattr(PolicyServer, "_get_action_chunk", _fake_get_action_chunk, raising=True)
+
+    observations = [_make_obs(torch.full((6,), float(i)), timestep=10 * i) for i in range(3)]
+    action_chunks = policy_server._predict_action_chunks(observations)
+
+    assert batch_sizes == [3]
+    assert len(action_chunks) == 3
+    for i, action_chunk in enumerate(action_chunks):
+        assert len(action_chunk) == policy_server.actions_per_chunk
+        assert action_chunk[0].get_timestep() == 10 * i
+        assert torch.equal(action_chunk[0].get_action(), torch.full((6,), float(i)))
+
+
+def test_batching_loop_groups_clients(monkeypatch):
+    from lerobot.async_inference.configs import PolicyServerConfig
+    from lerobot.async_inference.policy_server import PolicyServer
+
+    server = PolicyServer(
+        PolicyServerConfig(host="localhost", port=9999, max_batch_size=4, batch_timeout=0.5)
+    )
+    batches = []
+
+    def _fake_predict_action_chunks(_self, observations):
+        batches.append([obs.get_timestep() for obs in observations])
+        return [[obs.get_timestep()] for obs in observations]
+
+    monkeypatch.setattr(PolicyServer, "_predict_action_chunks", _fake_predict_action_chunks, raising=True)
+
+    for client_id in ["a", "b", "c"]:
+        server._get_client(client_id)
+    # The batch is closed as soon as every client has an observation, before the timeout
+    start = time.perf_counter()
+    results = [
+        server._submit_inference(client_id, _make_obs(torch.zeros(6), timestep=i))
+        for i, client_id in enumerate("abc")
+    ]
+    assert [future.result(timeout=5) for future in results] == [[0], [1], [2]]
+    assert time.perf_counter() - start < 0.5
+    assert batches == [[0, 1, 2]]
+
+    # A lone observation waits at most for the timeout
+    server.config.batch_timeout = 0.05
+    assert server._submit_inference("a", _make_obs(torch.zeros(6), timestep=3)).result(timeout=5) == [3]
+    assert batches[-1] == [3]
+
+    stats = server.get_batching_stats()
+    assert stats["num_batches"] == 2
+    assert stats["avg_batch_size"] == 2
+    assert stats["max_batch_size"] == 3
+    assert stats["max_queue_delay_ms"] >= 0
+
+    server.stop()
+    with pytest.raises(RuntimeError, match="stopped"):
+        server._submit_inference("a", _make_obs(torch.zeros(6), timestep=4))
+
+
+def test_batching_loop_ignores_disconnected_clients(monkeypatch):
+    """Clients whose last action stream closed, or which stopped calling the server, are not waited for."""
+    from lerobot.async_inference.configs import PolicyServerConfig
+    from lerobot.async_inference.constants import CLIENT_ID_METADATA_KEY
+    from lerobot.async_inference.policy_server import PolicyServer
+
+    server = PolicyServer(
+        PolicyServerConfig(
+            host="localhost", port=9999, obs_queue_timeout=0.05, batch_timeout=1.0, client_timeout=0.5
+        )
+    )
+    monkeypatch.setattr(
+        PolicyServer,
+        "_predict_action_chunks",
+        lambda _self, observations: [[obs.get_timestep()] for obs in observations],
+        raising=True,
+    )
+
+    class _Context:
+        def __init__(self, peer, client_id=None):
+            self._peer = peer
+            self._client_id = client_id
+
+        def peer(self):
+            return self._peer
+
+        def invocation_metadata(self):
+            return ((CLIENT_ID_METADATA_KEY, self._client_id),) if self._client_id else ()
+
+        def is_active(self):
+            return True
+
+    # A streaming client reconnects from a new port before its first stream is cancelled, it keeps its state
+    old_stream = server.StreamActions(None, _Context("ipv4:127.0.0.1:50001", client_id="streaming"))
+    new_stream = server.StreamActions(None, _Context("ipv4:127.0.0.1:50004", client_id="streaming"))
+    client = server._get_client("streaming")
+    for timestep, stream in enumerate([old_stream, new_stream]):
+        client.observation_queue.put(_make_obs(torch.zeros(6), timestep=timestep))
+        next(stream)
+    old_stream.close()
+    assert server.clients["streaming"] is client
+    assert client.predicted_timesteps == {0, 1}
+    new_stream.close()
+    assert "streaming" not in server.clients
+
+    # A polling client went silent
+    server._get_client("ipv4:127.0.0.1:50002").last_seen -= server.config.client_timeout
+    server._get_client("ipv4:127.0.0.1:50003")
+    assert server._num_active_clients() == 1
+
+    start = time.perf_counter()
+    assert server._submit_inference("ipv4:127.0.0.1:50003", _make_obs(torch.zeros(6), timestep=1)).result(
+        timeout=5
+    ) == [1]
+    assert time.perf_counter() - start < server.config.batch_timeout
+    server.stop()
+
+
+def test_stream_actions_pushes_action_chunks(monkeypatch):
+    """Each action chunk is pushed on the stream as soon as it is predicted, until the server stops."""
+    from lerobot.async_inference.configs import PolicyServerConfig
+    from lerobot.async_inference.helpers import TimedAction
+    from lerobot.async_inference.policy_server import PolicyServer
+    from lerobot.transport.utils import bytes_to_tensors
+
+    server = PolicyServer(PolicyServerConfig(host="localhost", port=9999, obs_queue_timeout=0.05))
+
+    def _fake_predict_action_chunks(_self, observations):
+        return [
+            [TimedAction(timestamp=obs.get_timestamp(), timestep=obs.get_timestep(), action=torch.zeros(6))]
+            for obs in observations
+        ]
+
+    monkeypatch.setattr(PolicyServer, "_predict_action_chunks", _fake_predict_action_chunks, raising=True)
+
+    class _Context:
+        def peer(self):
+            return "client"
+
+        def invocation_metadata(self):
+            return ()
+
+        def is_active(self):
+            return True
+
+    stream = server.StreamActions(None, _Context())
+    client = server._get_client("client")
+    for timestep in [3, 7]:
+        client.observation_queue.put(_make_obs(torch.zeros(6), timestep=timestep))
+        actions = next(stream)
+        (timed_action,) = bytes_to_tensors(actions.data, dataclass_types=[TimedAction])
+        assert timed_action.get_timestep() == timestep
+
+    assert client.predicted_timesteps == {3, 7}
+    assert client.last_processed_obs.get_timestep() == 7
+
+    server.stop()
+    with pytest.raises(StopIteration):
+        next(stream)
+    # The state of the client is dropped with its stream
+    assert "client" not in server.clients
+
+
+def test_postprocess_action_chunk_runs_pipeline_once(policy_server):
+    """The postprocessor runs once per chunk, with the same result as once per timestep."""
+    from lerobot.configs.types import FeatureType, NormalizationMode
+    from lerobot.processor import DeviceProcessorStep, PolicyProcessorPipeline, UnnormalizerProcessorStep
+    from lerobot.processor.converters import policy_action_to_transition, transition_to_policy_action
+    from lerobot.utils.constants import ACTION
+
+    postprocessor = PolicyProcessorPipeline(
+        steps=[
+            UnnormalizerProcessorStep(
+                features={ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(6,))},
+                norm_map={FeatureType.ACTION: NormalizationMode.MEAN_STD},
+                stats={ACTION: {"mean": torch.arange(6.0), "std": torch.full((6,), 2.0)}},
+            ),
+            DeviceProcessorStep(device="cpu"),
+        ],
+        to_transition=policy_action_to_transition,
+        to_output=transition_to_policy_action,
+    )
+    num_calls = 0
+
+    def counting_postprocessor(action):
+        nonlocal num_calls
+        num_calls += 1
+        return postprocessor(action)
+
+    policy_server.postprocessor = counting_postprocessor
+    action_chunk = torch.randn(2, 20, 6)
+
+    processed = policy_server._postprocess_action_chunk(action_chunk)
+
+    assert num_calls == 1
+    assert processed.shape == (2, 20, 6)
+    expected = torch.stack([postprocessor(action_chunk[:, i]) for i in range(20)], dim=1)
+    torch.testing.assert_close(processed, expected)
@@ -20,7 +20,7 @@ no real hardware is accessed. Only the queue-update mechanism is verified.
 from __future__ import annotations
 
 import time
-from queue import Queue
+from queue import Empty
 
 import pytest
 import torch
@@ -101,7 +101,7 @@ def test_update_action_queue_discards_stale(robot_client):
     robot_client._aggregate_action_queues(incoming)
 
     # Extract timesteps from queue
-    resulting_timesteps = [a.get_timestep() for a in robot_client.action_queue.queue]
+    resulting_timesteps = robot_client.action_queue.timesteps()
 
     assert resulting_timesteps == [5, 6, 7]
 
@@ -137,8 +137,7 @@ def test_aggregate_action_queues_combines_actions_in_overlap(
         for a in current_actions
     ]
 
-    for a in current_actions:
-        robot_client.action_queue.put(a)
+    robot_client.action_queue.merge(current_actions, latest_action=4, aggregate_fn=lambda x1, x2: x2)
 
     # Incoming chunk contains timesteps 3..7 -> expect 5,6,7 kept.
     incoming = _make_actions(start_ts=time.time(), start_t=3, count=5)  # 3,4,5,6,7
@@ -152,7 +151,8 @@ def test_aggregate_action_queues_combines_actions_in_overlap(
 
     queue_overlap_actions = []
     queue_non_overlap_actions = []
-    for a in robot_client.action_queue.queue:
+    while not robot_client.action_queue.empty():
+        a = robot_client.action_queue.get_nowait()
         if a.get_timestep() in overlap_timesteps:
             queue_overlap_actions.append(a)
         elif a.get_timestep() in nonoverlap_timesteps:
@@ -172,6 +172,96 @@ def test_aggregate_action_queues_combines_actions_in_overlap(
     assert torch.allclose(queue_non_overlap_actions[0].get_action(), incoming[-1].get_action())
 
 
+def test_timed_action_queue_ring_buffer():
+    """The queue wraps around its ring buffer and grows it for larger chunks, keeping queued actions."""
+    from lerobot.async_inference.helpers import TimedActionQueue
+
+    queue = TimedActionQueue(capacity=4)
+    queue.merge(_make_actions(start_ts=time.time(), start_t=0, count=4), -1, lambda x1, x2: x2)
+    assert [queue.get_nowait().get_timestep() for _ in range(3)] == [0, 1, 2]
+
+    # Timesteps 3..6 wrap around the 4 rows, the queued action #3 is aggregated with the incoming one
+    incoming = _make_actions(start_ts=time.time(), start_t=3, count=4)
+    queue.merge(incoming, 2, lambda x1, x2: x1 + x2)
+    assert queue.timesteps() == [3, 4, 5, 6]
+    action = queue.get_nowait()
+    assert action.get_timestamp() == incoming[0].get_timestamp()
+    assert torch.equal(action.get_action(), torch.full((6,), 6.0))
+
+    # A chunk larger than the buffer reallocates it
+    queue.merge(_make_actions(start_ts=time.time(), start_t=5, count=10), 3, lambda x1, x2: 0.5 * (x1 + x2))
+    assert queue.capacity == 10
+    actions = [queue.get_nowait() for _ in range(queue.qsize())]
+    assert [a.get_timestep() for a in actions] == list(range(5, 15))
+    assert all(torch.equal(a.get_action(), torch.full((6,), float(a.get_timestep()))) for a in actions)
+
+    with pytest.raises(Empty):
+        queue.get_nowait()
+    with pytest.raises(ValueError, match="consecutive"):
+        queue.merge(_make_actions(start_ts=time.time(), start_t=20, count=2)[::-1], 14, lambda x1, x2: x2)
+
+
+def test_process_action_chunk_drops_malformed_chunk(robot_client):
+    """A chunk with non-consecutive timesteps is dropped, and the queued actions are kept."""
+    from lerobot.transport import services_pb2
+    from lerobot.transport.utils import tensors_to_bytes
+
+    robot_client.latest_action = 4
+    robot_client._aggregate_action_queues(_make_actions(start_ts=time.time(), start_t=5, count=3))
+
+    malformed = _make_actions(start_ts=time.time(), start_t=6, count=3)[::-1]
+    robot_client._process_action_chunk(services_pb2.Actions(data=tensors_to_bytes(malformed)))
+    assert robot_client.action_queue.timesteps() == [5, 6, 7]
+
+    # The next chunks are still aggregated
+    incoming = _make_actions(start_ts=time.time(), start_t=6, count=3)
+    robot_client._process_action_chunk(services_pb2.Actions(data=tensors_to_bytes(incoming)))
+    assert robot_client.action_queue.timesteps() == [6, 7, 8]
+
+
+def test_receive_actions_backs_off_before_reconnecting(robot_client, monkeypatch):
+    """The action stream is reconnected after a delay doubled on each consecutive failure, up to a maximum."""
+    import threading
+
+    import grpc
+
+    from lerobot.async_inference.constants import CLIENT_ID_METADATA_KEY
+    from lerobot.transport import services_pb2
+    from lerobot.transport.utils import tensors_to_bytes
+
+    class _UnavailableError(grpc.RpcError):
+        def code(self):
+            return grpc.StatusCode.UNAVAILABLE
+
+    num_calls = 0
+
+    def _stream_actions(_request, metadata):
+        assert metadata == ((CLIENT_ID_METADATA_KEY, robot_client.client_id),)
+        nonlocal num_calls
+        num_calls += 1
+        if num_calls == 3:
+            # The stream is up again, then closed by the server
+            chunk = _make_actions(start_ts=time.time(), start_t=0, count=3)
+            return iter([services_pb2.Actions(data=tensors_to_bytes(chunk))])
+        raise _UnavailableError()
+
+    delays = []
+
+    def _wait(timeout):
+        delays.append(timeout)
+        if len(delays) == 9:
+            robot_client.shutdown_event.set()
+        return robot_client.shutdown_event.is_set()
+
+    monkeypatch.setattr(robot_client.stub, "StreamActions", _stream_actions)
+    monkeypatch.setattr(robot_client.shutdown_event, "wait", _wait)
+    robot_client.start_barrier = threading.Barrier(1)
+    robot_client.receive_actions()
+
+    assert robot_client.action_queue.timesteps() == [0, 1, 2]
+    assert delays == pytest.approx([0.1, 0.2, 0.1, 0.2, 0.4, 0.8, 1.6, 3.2, 5.0])
+
+
 @pytest.mark.parametrize(
     "chunk_size, queue_len, expected",
     [
@@ -183,15 +273,15 @@ def test_aggregate_action_queues_combines_actions_in_overlap(
 )
 def test_ready_to_send_observation(robot_client, chunk_size: int, queue_len: int, expected: bool):
     """Validate `_ready_to_send_observation` ratio logic for various sizes."""
+    from lerobot.async_inference.helpers import TimedActionQueue
 
     robot_client.action_chunk_size = chunk_size
 
     # Clear any existing actions then fill with `queue_len` dummy entries ----
-    robot_client.action_queue = Queue()
+    robot_client.action_queue = TimedActionQueue()
 
     dummy_actions = _make_actions(start_ts=time.time(), start_t=0, count=queue_len)
-    for act in dummy_actions:
-        robot_client.action_queue.put(act)
+    robot_client.action_queue.merge(dummy_actions, latest_action=-1, aggregate_fn=lambda x1, x2: x2)
 
     assert robot_client._ready_to_send_observation() is expected
 
@@ -216,6 +306,8 @@ def test_ready_to_send_observation(robot_client, chunk_size: int, queue_len: int
 )
 def test_ready_to_send_observation_with_varying_threshold(robot_client, g_threshold: float, expected: bool):
     """Validate `_ready_to_send_observation` with fixed sizes and varying `g`."""
+    from lerobot.async_inference.helpers import TimedActionQueue
+
     # Fixed sizes for this test: ratio = 6 / 10 = 0.6
     chunk_size = 10
     queue_len = 6
@@ -225,9 +317,8 @@ def test_ready_to_send_observation_with_varying_threshold(robot_client, g_thresh
     robot_client._chunk_size_threshold = g_threshold
 
     # Fill queue with dummy actions
-    robot_client.action_queue = Queue()
+    robot_client.action_queue = TimedActionQueue()
     dummy_actions = _make_actions(start_ts=time.time(), start_t=0, count=queue_len)
-    for act in dummy_actions:
-        robot_client.action_queue.put(act)
+    robot_client.action_queue.merge(dummy_actions, latest_action=-1, aggregate_fn=lambda x1, x2: x2)
 
     assert robot_client._ready_to_send_observation() is expected
@@ -19,6 +19,8 @@ import numpy as np
 import pytest
 
 from lerobot.datasets.compute_stats import (
+    QUANTILE_SKETCH_KEY,
+    QUANTILE_SKETCH_SIZE,
     RunningQuantileStats,
     _assert_type_and_shape,
     aggregate_feature_stats,
@@ -322,11 +324,11 @@ def test_running_quantile_stats_initialization():
     running_stats = RunningQuantileStats()
     assert running_stats._count == 0
     assert running_stats._mean is None
-    assert running_stats._num_quantile_bins == 5000
+    assert running_stats._sketch_size == QUANTILE_SKETCH_SIZE
 
-    # Test custom bin size
-    running_stats_custom = RunningQuantileStats(num_quantile_bins=1000)
-    assert running_stats_custom._num_quantile_bins == 1000
+    # Test custom sketch size
+    running_stats_custom = RunningQuantileStats(sketch_size=50)
+    assert running_stats_custom._sketch_size == 50
 
 
 def test_running_quantile_stats_single_batch_update():
@@ -339,8 +341,8 @@ def test_running_quantile_stats_single_batch_update():
 
     assert running_stats._count == 100
     assert running_stats._mean.shape == (3,)
-    assert len(running_stats._histograms) == 3
-    assert len(running_stats._bin_edges) == 3
+    assert running_stats._sketch_means.shape == (3, QUANTILE_SKETCH_SIZE)
+    assert running_stats._sketch_weights.sum(axis=1).tolist() == [100, 100, 100]
 
     # Verify basic statistics are reasonable
     np.testing.assert_allclose(running_stats._mean, np.mean(data, axis=0), atol=1e-10)
@@ -412,33 +414,27 @@ def test_running_quantile_stats_get_statistics_with_quantiles():
             assert np.all(stats[prev_q_key] <= stats[q_key])
 
 
-def test_running_quantile_stats_histogram_adjustment():
-    """Test that histograms adjust when min/max change."""
+def test_running_quantile_stats_range_expansion():
+    """Test that quantiles follow the data when min/max change."""
     running_stats = RunningQuantileStats()
 
     # Initial data with small range
     data1 = np.array([[0.0, 1.0], [0.1, 1.1], [0.2, 1.2]])
     running_stats.update(data1)
 
-    initial_edges_0 = running_stats._bin_edges[0].copy()
-    initial_edges_1 = running_stats._bin_edges[1].copy()
-
     # Add data with much larger range
     data2 = np.array([[10.0, -10.0], [11.0, -11.0]])
     running_stats.update(data2)
 
-    # Bin edges should have changed
-    assert not np.array_equal(initial_edges_0, running_stats._bin_edges[0])
-    assert not np.array_equal(initial_edges_1, running_stats._bin_edges[1])
-
-    # New edges should cover the expanded range
-    # First dimension: min should still be ~0.0, max should be ~11.0
-    assert running_stats._bin_edges[0][0] <= 0.0
-    assert running_stats._bin_edges[0][-1] >= 11.0
+    stats = running_stats.get_statistics()
+    np.testing.assert_allclose(stats["min"], [0.0, -11.0])
+    np.testing.assert_allclose(stats["max"], [11.0, 1.2])
 
-    # Second dimension: min should be ~-11.0, max should be ~1.2
-    assert running_stats._bin_edges[1][0] <= -11.0
-    assert running_stats._bin_edges[1][-1] >= 1.2
+    # First dimension: the upper quantiles are in the new range
+    assert stats["q99"][0] > 10.0
+    # Second dimension: the lower quantiles are in the new range
+    assert stats["q01"][1] < -10.0
+    np.testing.assert_allclose(stats[QUANTILE_SKETCH_KEY]["weights"].sum(axis=1), [5, 5])
 
 
 def test_running_quantile_stats_insufficient_data_error():
@@ -489,7 +485,7 @@ def test_get_feature_stats_quantiles_enabled_by_default():
     stats = get_feature_stats(data, axis=0, keepdims=False)
 
     expected_keys = {"min", "max", "mean", "std", "count", "q01", "q10", "q50", "q90", "q99"}
-    assert set(stats.keys()) == expected_keys
+    assert set(stats.keys()) == expected_keys | {QUANTILE_SKETCH_KEY}
 
 
 def test_get_feature_stats_quantiles_with_vector_data():
@@ -500,7 +496,7 @@ def test_get_feature_stats_quantiles_with_vector_data():
     stats = get_feature_stats(data, axis=0, keepdims=False)
 
     expected_keys = {"min", "max", "mean", "std", "count", "q01", "q10", "q50", "q90", "q99"}
-    assert set(stats.keys()) == expected_keys
+    assert set(stats.keys()) == expected_keys | {QUANTILE_SKETCH_KEY}
 
     # Verify shapes
     assert stats["q01"].shape == (5,)
@@ -518,7 +514,7 @@ def test_get_feature_stats_quantiles_with_image_data():
     stats = get_feature_stats(data, axis=(0, 2, 3), keepdims=True)
 
     expected_keys = {"min", "max", "mean", "std", "count", "q01", "q10", "q50", "q90", "q99"}
-    assert set(stats.keys()) == expected_keys
+    assert set(stats.keys()) == expected_keys | {QUANTILE_SKETCH_KEY}
 
     # Verify shapes for images (should be (1, channels, 1, 1))
     assert stats["q01"].shape == (1, 3, 1, 1)
@@ -563,7 +559,7 @@ def test_compute_episode_stats_backward_compatibility():
 
     for key in ["action", "observation.state"]:
         expected_keys = {"min", "max", "mean", "std", "count", "q01", "q10", "q50", "q90", "q99"}
-        assert set(stats[key].keys()) == expected_keys
+        assert set(stats[key].keys()) == expected_keys | {QUANTILE_SKETCH_KEY}
 
 
 def test_compute_episode_stats_with_custom_quantiles():
@@ -583,7 +579,7 @@ def test_compute_episode_stats_with_custom_quantiles():
     # Should have quantiles
     for key in ["action", "observation.state"]:
         expected_keys = {"min", "max", "mean", "std", "count", "q01", "q10", "q50", "q90", "q99"}
-        assert set(stats[key].keys()) == expected_keys
+        assert set(stats[key].keys()) == expected_keys | {QUANTILE_SKETCH_KEY}
 
         # Verify shapes
         assert stats[key]["q01"].shape == (features[key]["shape"][0],)
@@ -670,7 +666,7 @@ def test_aggregate_feature_stats_with_quantiles():
     assert "q01" in result
     assert "q99" in result
 
-    # Verify quantile aggregation (weighted average)
+    # Verify quantile aggregation (weighted average, without quantile sketches)
     expected_q01 = (1.5 * 100 + 2.5 * 150) / 250  # ≈ 2.1
     expected_q99 = (9.5 * 100 + 11.5 * 150) / 250  # ≈ 10.7
 
@@ -678,6 +674,52 @@ def test_aggregate_feature_stats_with_quantiles():
     np.testing.assert_allclose(result["q99"], np.array([expected_q99]), atol=1e-6)
 
 
+def test_aggregate_feature_stats_merges_quantile_sketches():
+    """Test that merged quantile sketches approximate the quantiles of the union of heterogeneous episodes."""
+    rng = np.random.default_rng(42)
+    episodes = [
+        rng.normal(rng.uniform(-5, 5), rng.uniform(0.1, 2), (rng.integers(50, 400), 4)) for _ in range(50)
+    ]
+    stats_ft_list = [get_feature_stats(data, axis=0, keepdims=False) for data in episodes]
+
+    # Merged at once, as in `aggregate_datasets`, and one episode at a time, as in `save_episode`
+    merged = aggregate_feature_stats(stats_ft_list)
+    running = stats_ft_list[0]
+    for stats in stats_ft_list[1:]:
+        running = aggregate_feature_stats([running, stats])
+
+    all_data = np.concatenate(episodes)
+    for result in [merged, running]:
+        assert result[QUANTILE_SKETCH_KEY]["means"].shape == (4, QUANTILE_SKETCH_SIZE)
+        np.testing.assert_allclose(result[QUANTILE_SKETCH_KEY]["weights"].sum(axis=-1), len(all_data))
+        for q_key in ["q01", "q10", "q50", "q90", "q99"]:
+            expected = np.quantile(all_data, int(q_key[1:]) / 100, axis=0)
+            np.testing.assert_allclose(result[q_key], expected, atol=0.1)
+
+
+def test_aggregate_stats_image_quantile_sketches():
+    """Test that image sketches keep the (3,1,1) shape of the image stats, with the centroids last."""
+    rng = np.random.default_rng(42)
+    episodes = [rng.integers(0, 256, (20, 3, 16, 16), dtype=np.uint8) for _ in range(3)]
+    features = {OBS_IMAGE: {"dtype": "image"}}
+    stats_list = [compute_episode_stats({OBS_IMAGE: images}, features) for images in episodes]
+
+    for stats in stats_list:
+        assert stats[OBS_IMAGE][QUANTILE_SKETCH_KEY]["means"].shape == (3, 1, 1, QUANTILE_SKETCH_SIZE)
+        # Sketches are weighted by frames, like the mean
+        np.testing.assert_allclose(stats[OBS_IMAGE][QUANTILE_SKETCH_KEY]["weights"].sum(axis=-1), 20)
+
+    result = aggregate_stats(stats_list)[OBS_IMAGE]
+    assert result["q50"].shape == (3, 1, 1)
+    assert result[QUANTILE_SKETCH_KEY]["means"].shape == (3, 1, 1, QUANTILE_SKETCH_SIZE)
+    np.testing.assert_allclose(result[QUANTILE_SKETCH_KEY]["weights"].sum(axis=-1), 60)
+
+    all_data = np.concatenate(episodes).transpose(1, 0, 2, 3).reshape(3, -1) / 255.0
+    for q_key in ["q01", "q50", "q99"]:
+        expected = np.quantile(all_data, int(q_key[1:]) / 100, axis=1)
+        np.testing.assert_allclose(result[q_key].ravel(), expected, atol=0.01)
+
+
 def test_aggregate_stats_mixed_quantiles():
     """Test aggregating stats where some have quantiles and some don't."""
     stats_with_quantiles = {
@@ -783,7 +825,7 @@ def test_quantile_integration_large_dataset_quantiles():
     np.random.seed(42)
     large_data = np.random.normal(0, 1, (10000, 5))
 
-    running_stats = RunningQuantileStats(num_quantile_bins=1000)  # Reduced bins for speed
+    running_stats = RunningQuantileStats(sketch_size=50)  # Reduced sketch size for speed
     running_stats.update(large_data)
 
     stats = running_stats.get_statistics()
@@ -18,6 +18,7 @@
 from unittest.mock import patch
 
 import numpy as np
+import pyarrow.parquet as pq
 import pytest
 import torch
 
@@ -26,10 +27,17 @@ from lerobot.datasets.dataset_tools import (
     delete_episodes,
     merge_datasets,
     modify_features,
+    recompute_stats,
     remove_feature,
     split_dataset,
 )
-from lerobot.scripts.lerobot_edit_dataset import convert_image_to_video_dataset
+from lerobot.datasets.utils import load_stats
+from lerobot.scripts.lerobot_edit_dataset import (
+    EditDatasetConfig,
+    RecomputeStatsConfig,
+    convert_image_to_video_dataset,
+    handle_recompute_stats,
+)
 
 
 @pytest.fixture
@@ -1152,3 +1160,66 @@ def test_convert_image_to_video_dataset_subset_episodes(tmp_path):
 
         if output_dir.exists():
             shutil.rmtree(output_dir)
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+@pytest.mark.parametrize("frames_per_task", [20, 10_000])
+def test_recompute_stats(sample_dataset, num_workers, frames_per_task):
+    """Test that recomputing the stats from the data files matches the stats computed while recording."""
+    recorded_stats = load_stats(sample_dataset.root)
+    episodes_path = next((sample_dataset.root / "meta/episodes").glob("*/*.parquet"))
+    recorded_episodes = pq.read_table(episodes_path)
+
+    # With 20 frames per task, the episodes of 10 frames are split in tasks reading 2 row groups of the data file
+    stats = recompute_stats(
+        sample_dataset, num_workers=num_workers, batch_size=7, frames_per_task=frames_per_task
+    )
+
+    assert stats.keys() == recorded_stats.keys()
+    for feature in ["action", "observation.state", "observation.images.top", "index"]:
+        for stat in ["min", "max", "mean", "std", "count"]:
+            np.testing.assert_allclose(stats[feature][stat], recorded_stats[feature][stat], rtol=1e-5)
+    assert stats["observation.images.top"]["q50"].shape == (3, 1, 1)
+
+    np.testing.assert_allclose(load_stats(sample_dataset.root)["action"]["mean"], stats["action"]["mean"])
+    assert sample_dataset.meta.stats is stats
+
+    episodes = pq.read_table(episodes_path)
+    for column in ["stats/action/mean", "stats/observation.state/max", "stats/observation.images.top/std"]:
+        np.testing.assert_allclose(
+            episodes.column(column).to_pylist(), recorded_episodes.column(column).to_pylist(), rtol=1e-5
+        )
+
+
+def test_recompute_stats_with_custom_quantiles(sample_dataset):
+    """Test that the stats of the dataset and of its episodes are recomputed with new quantiles."""
+    recompute_stats(sample_dataset, quantile_list=[0.02, 0.5, 0.98], num_workers=0)
+
+    action_stats = load_stats(sample_dataset.root)["action"]
+    assert {"q02", "q50", "q98"}.issubset(action_stats)
+    assert "q01" not in action_stats
+    assert np.all(action_stats["q02"] <= action_stats["q98"])
+
+    episodes_path = next((sample_dataset.root / "meta/episodes").glob("*/*.parquet"))
+    episodes = pq.read_table(episodes_path).to_pandas()
+    assert "stats/action/q02" in episodes.columns
+    assert "stats/action/q01" not in episodes.columns
+    np.testing.assert_allclose(episodes["stats/action/count"].apply(lambda count: count[0]), 10)
+
+
+def test_handle_recompute_stats_with_new_repo_id(sample_dataset):
+    """Test that the stats are recomputed in a copy of the dataset when a new repo id is given."""
+    from lerobot.datasets.lerobot_dataset import LeRobotDataset
+
+    cfg = EditDatasetConfig(
+        repo_id=sample_dataset.repo_id,
+        root=str(sample_dataset.root),
+        new_repo_id="test/new_stats",
+        operation=RecomputeStatsConfig(quantile_list=[0.02, 0.5, 0.98], num_workers=0),
+    )
+    handle_recompute_stats(cfg)
+
+    assert "q02" not in load_stats(sample_dataset.root)["action"]
+    new_dataset = LeRobotDataset("test/new_stats", root=sample_dataset.root / "test/new_stats")
+    assert "q02" in new_dataset.meta.stats["action"]
+    assert new_dataset.meta.total_frames == sample_dataset.meta.total_frames
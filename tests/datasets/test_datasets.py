@@ -1650,3 +1650,222 @@ def test_delta_timestamps_query_returns_correct_values(tmp_path, empty_lerobot_d
     # Previous frame is outside episode, so it's clamped to first frame and marked as padded
     assert state_values == [10.0, 10.0], f"Expected [10.0, 10.0], got {state_values}"
     assert is_pad == [True, False], f"Expected [True, False], got {is_pad}"
+
+
+def test_delta_timestamps_vectorized_query_matches_rows(tmp_path, empty_lerobot_dataset_factory):
+    """Test that delta windows gathered from the cached columns match a row-by-row lookup in hf_dataset."""
+    features = {
+        "observation.state": {"dtype": "float32", "shape": (2,), "names": ["x", "y"]},
+        "action": {"dtype": "float32", "shape": (3,), "names": ["vx", "vy", "vz"]},
+        "next.reward": {"dtype": "float32", "shape": (1,), "names": None},
+    }
+
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "test", features=features, use_videos=False, fps=10
+    )
+    episode_lengths = [4, 7, 5]
+    for ep_idx, length in enumerate(episode_lengths):
+        for _ in range(length):
+            dataset.add_frame(
+                {
+                    "observation.state": torch.randn(2),
+                    "action": torch.randn(3),
+                    "next.reward": np.random.rand(1).astype(np.float32),
+                    "task": f"task_{ep_idx}",
+                }
+            )
+        dataset.save_episode()
+    dataset.finalize()
+
+    delta_ts = {
+        "observation.state": [-0.1, 0.0],
+        "action": [i / 10 for i in range(6)],
+        "next.reward": [0.0, 0.1],
+    }
+    for episodes in [None, [0, 2]]:
+        loaded = LeRobotDataset(
+            dataset.repo_id, root=dataset.root, episodes=episodes, delta_timestamps=delta_ts, tolerance_s=0.04
+        )
+        rows = loaded.hf_dataset
+        abs_to_rel = {rows[i]["index"].item(): i for i in range(len(rows))}
+        for idx in range(len(loaded)):
+            item = loaded[idx]
+            abs_idx = item["index"].item()
+            ep = loaded.meta.episodes[item["episode_index"].item()]
+            for key, delta_idx in loaded.delta_indices.items():
+                query = [abs_idx + d for d in delta_idx]
+                clamped = [min(max(q, ep["dataset_from_index"]), ep["dataset_to_index"] - 1) for q in query]
+                expected = torch.stack([rows[abs_to_rel[q]][key] for q in clamped])
+                expected_pad = [not ep["dataset_from_index"] <= q < ep["dataset_to_index"] for q in query]
+
+                assert item[key].dtype == expected.dtype
+                torch.testing.assert_close(item[key], expected)
+                assert item[f"{key}_is_pad"].tolist() == expected_pad
+
+
+def test_getitems_batches_video_decoding(tmp_path, empty_lerobot_dataset_factory, monkeypatch):
+    """`__getitems__` returns the same samples as `__getitem__` while decoding each video file once."""
+    features = {
+        f"{OBS_IMAGES}.cam_1": {
+            "dtype": "video",
+            "shape": (16, 16, 3),
+            "names": ["height", "width", "channels"],
+        },
+        f"{OBS_IMAGES}.cam_2": {
+            "dtype": "video",
+            "shape": (16, 16, 3),
+            "names": ["height", "width", "channels"],
+        },
+        ACTION: {"dtype": "float32", "shape": (2,), "names": None},
+    }
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "test", features=features, use_videos=True, fps=10
+    )
+    for ep_idx, length in enumerate([5, 6]):
+        for _ in range(length):
+            dataset.add_frame(
+                {
+                    f"{OBS_IMAGES}.cam_1": np.zeros((16, 16, 3), dtype=np.uint8),
+                    f"{OBS_IMAGES}.cam_2": np.zeros((16, 16, 3), dtype=np.uint8),
+                    ACTION: torch.randn(2),
+                    "task": f"task_{ep_idx}",
+                }
+            )
+        dataset.save_episode()
+    dataset.finalize()
+
+    decoded_paths = []
+
+    def fake_decode_video_frames(video_path, timestamps, tolerance_s, backend=None, return_uint8=False):
+        # Each frame encodes its video file and timestamp, so that samples can be compared
+        decoded_paths.append(video_path)
+        cam_id = 1.0 if "cam_1" in str(video_path) else 2.0
+        frames = torch.tensor(timestamps, dtype=torch.float32) + cam_id * 100
+        return frames.view(-1, 1, 1, 1).expand(-1, 3, 2, 2).clone()
+
+    monkeypatch.setattr("lerobot.datasets.lerobot_dataset.decode_video_frames", fake_decode_video_frames)
+    monkeypatch.setattr("lerobot.datasets.video_utils.decode_video_frames", fake_decode_video_frames)
+
+    delta_ts = {f"{OBS_IMAGES}.cam_1": [-0.1, 0.0], ACTION: [0.0, 0.1]}
+    for delta_timestamps in [None, delta_ts]:
+        loaded = LeRobotDataset(
+            dataset.repo_id, root=dataset.root, delta_timestamps=delta_timestamps, video_backend="pyav"
+        )
+        indices = [7, 0, 4, 5, 10, 0]
+        expected = [loaded[idx] for idx in indices]
+
+        decoded_paths.clear()
+        items = loaded.__getitems__(indices)
+        # Both episodes share a single mp4 per camera, and close timestamps are decoded in a single call
+        assert sorted(str(p) for p in decoded_paths) == sorted(
+            str(loaded.root / loaded.meta.get_video_file_path(0, key)) for key in loaded.meta.video_keys
+        )
+
+        assert len(items) == len(expected)
+        for item, expected_item in zip(items, expected, strict=True):
+            assert list(item.keys()) == list(expected_item.keys())
+            for key, value in expected_item.items():
+                if isinstance(value, torch.Tensor):
+                    torch.testing.assert_close(item[key], value)
+                else:
+                    assert item[key] == value
+
+
+def test_return_uint8_images(tmp_path, empty_lerobot_dataset_factory, monkeypatch):
+    features = {
+        f"{OBS_IMAGES}.image": {
+            "dtype": "image",
+            "shape": (8, 8, 3),
+            "names": ["height", "width", "channels"],
+        },
+        f"{OBS_IMAGES}.video": {
+            "dtype": "video",
+            "shape": (8, 8, 3),
+            "names": ["height", "width", "channels"],
+        },
+        ACTION: {"dtype": "float32", "shape": (2,), "names": None},
+    }
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "test", features=features, use_videos=True, fps=10
+    )
+    for _ in range(3):
+        dataset.add_frame(
+            {
+                f"{OBS_IMAGES}.image": np.random.randint(0, 256, (8, 8, 3), dtype=np.uint8),
+                f"{OBS_IMAGES}.video": np.zeros((8, 8, 3), dtype=np.uint8),
+                ACTION: torch.randn(2),
+                "task": "task",
+            }
+        )
+    dataset.save_episode()
+    dataset.finalize()
+
+    def fake_decode_video_frames(video_path, timestamps, tolerance_s, backend=None, return_uint8=False):
+        frames = torch.tensor([round(ts * 10) for ts in timestamps], dtype=torch.uint8)
+        frames = frames.view(-1, 1, 1, 1).expand(-1, 3, 8, 8).clone()
+        return frames if return_uint8 else frames.to(torch.float32) / 255
+
+    monkeypatch.setattr("lerobot.datasets.lerobot_dataset.decode_video_frames", fake_decode_video_frames)
+    monkeypatch.setattr("lerobot.datasets.video_utils.decode_video_frames", fake_decode_video_frames)
+
+    float_dataset = LeRobotDataset(dataset.repo_id, root=dataset.root)
+    for kwargs in [{}, {"frame_cache_mb": 1}]:
+        uint8_dataset = LeRobotDataset(dataset.repo_id, root=dataset.root, return_uint8_images=True, **kwargs)
+        for idx in range(len(float_dataset)):
+            expected = float_dataset[idx]
+            item = uint8_dataset[idx]
+            for key in uint8_dataset.meta.camera_keys:
+                assert item[key].dtype == torch.uint8
+                assert item[key].shape == expected[key].shape
+                torch.testing.assert_close(item[key].to(torch.float32) / 255, expected[key])
+
+
+def test_streaming_encoding(tmp_path, empty_lerobot_dataset_factory):
+    """Videos encoded while recording hold the same frames as videos encoded from PNG files."""
+    key = f"{OBS_IMAGES}.cam"
+    features = {
+        key: {"dtype": "video", "shape": (32, 32, 3), "names": ["height", "width", "channels"]},
+        ACTION: {"dtype": "float32", "shape": (2,), "names": None},
+    }
+    datasets = {}
+    for streaming_encoding in [False, True]:
+        dataset = empty_lerobot_dataset_factory(
+            root=tmp_path / f"streaming_{streaming_encoding}",
+            features=features,
+            streaming_encoding=streaming_encoding,
+        )
+        for ep_idx, length in enumerate([6, 4, 5]):
+            for frame_idx in range(length):
+                dataset.add_frame(
+                    {
+                        key: np.full((32, 32, 3), 10 * frame_idx + 50 * ep_idx, dtype=np.uint8),
+                        ACTION: np.zeros(2, dtype=np.float32),
+                        "task": "Dummy task",
+                    }
+                )
+            if ep_idx == 1:
+                # Discarded episode, e.g. re-recorded
+                dataset.clear_episode_buffer()
+                continue
+            dataset.save_episode()
+            if streaming_encoding:
+                assert not dataset._get_image_file_dir(ep_idx, key).exists()
+        dataset.finalize()
+        datasets[streaming_encoding] = LeRobotDataset(
+            dataset.repo_id, root=dataset.root, video_backend="pyav"
+        )
+
+    # No PNG files nor temporary videos are left
+    assert sorted(p.name for p in datasets[True].root.iterdir()) == ["data", "meta", "videos"]
+    assert len(datasets[True]) == len(datasets[False]) == 11
+    for idx in range(len(datasets[False])):
+        torch.testing.assert_close(datasets[True][idx][key], datasets[False][idx][key], atol=2 / 255, rtol=0)
+    for stat in ["min", "max", "mean"]:
+        np.testing.assert_allclose(
+            datasets[True].meta.stats[key][stat], datasets[False].meta.stats[key][stat], atol=1e-6
+        )
+
+    with pytest.raises(ValueError, match="batch_encoding_size"):
+        empty_lerobot_dataset_factory(
+            root=tmp_path / "batched", features=features, streaming_encoding=True, batch_encoding_size=2
+        )
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pickle
+
+import numpy as np
+import pytest
+import torch
+
+from lerobot.datasets.frame_cache import DecodedFrameCache, get_frame_shard_path
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.utils.constants import ACTION, OBS_IMAGES
+
+FRAME_SHAPE = (3, 4, 4)
+
+
+def _frames(values: list[int]) -> torch.Tensor:
+    return torch.tensor(values, dtype=torch.uint8).view(-1, 1, 1, 1).expand(-1, *FRAME_SHAPE).clone()
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = tmp_path / "file-000.mp4"
+    path.write_bytes(b"0" * 100)
+    return path
+
+
+def test_memory_tier_is_lru(video_path):
+    frame_bytes = int(np.prod(FRAME_SHAPE))
+    cache = DecodedFrameCache(max_bytes=2 * frame_bytes)
+    assert cache.get(video_path, [0, 1]) == [None, None]
+
+    cache.put(video_path, [0, 1], _frames([10, 11]), num_frames=5)
+    cache.get(video_path, [0])  # frame 1 is now the least recently used
+    cache.put(video_path, [2], _frames([12]), num_frames=5)
+
+    frames = cache.get(video_path, [0, 1, 2])
+    assert frames[1] is None
+    assert torch.equal(frames[0], _frames([10])[0])
+    assert torch.equal(frames[2], _frames([12])[0])
+
+    stats = cache.get_stats()
+    assert stats["memory_hits"] == 3
+    assert stats["misses"] == 3
+    assert stats["hit_rate"] == pytest.approx(0.5)
+    assert stats["num_bytes_in_memory"] == 2 * frame_bytes
+
+
+def test_disk_tier_is_shared_and_persistent(tmp_path, video_path):
+    cache_dir = tmp_path / "frame_cache"
+    cache = DecodedFrameCache(cache_dir=cache_dir)
+    cache.put(video_path, [1, 3], _frames([11, 13]), num_frames=5)
+
+    # Another process (or a later run) reads the frames from the shard
+    other_cache = pickle.loads(pickle.dumps(DecodedFrameCache(max_bytes=2**20, cache_dir=cache_dir)))
+    frames = other_cache.get(video_path, [0, 1, 3])
+    assert frames[0] is None
+    assert torch.equal(frames[1], _frames([11])[0])
+    assert torch.equal(frames[2], _frames([13])[0])
+    assert other_cache.get_stats()["disk_hits"] == 2
+
+    # Then from its memory tier
+    other_cache.get(video_path, [1])
+    assert other_cache.get_stats()["memory_hits"] == 1
+
+    # Modifying the video file invalidates its shard
+    shard_path = get_frame_shard_path(cache_dir, video_path)
+    video_path.write_bytes(b"1" * 200)
+    assert get_frame_shard_path(cache_dir, video_path) != shard_path
+    assert DecodedFrameCache(cache_dir=cache_dir).get(video_path, [1]) == [None]
+
+
+def test_shard_path_is_computed_once(tmp_path, video_path, monkeypatch):
+    from lerobot.datasets import frame_cache
+
+    num_calls = 0
+
+    def _get_frame_shard_path(*args):
+        nonlocal num_calls
+        num_calls += 1
+        return get_frame_shard_path(*args)
+
+    monkeypatch.setattr(frame_cache, "get_frame_shard_path", _get_frame_shard_path)
+    cache = DecodedFrameCache(cache_dir=tmp_path / "frame_cache")
+    # Lookups before the shard exists don't stat the video file again
+    for _ in range(3):
+        assert cache.get(video_path, [1]) == [None]
+    cache.put(video_path, [1], _frames([11]), num_frames=5)
+    assert torch.equal(cache.get(video_path, [1])[0], _frames([11])[0])
+    assert num_calls == 1
+
+    # Each process computes it again
+    pickle.loads(pickle.dumps(cache)).get(video_path, [1])
+    assert num_calls == 2
+
+
+def test_dataset_frame_cache(tmp_path, empty_lerobot_dataset_factory, monkeypatch):
+    features = {
+        f"{OBS_IMAGES}.cam": {"dtype": "video", "shape": (4, 4, 3), "names": ["height", "width", "channels"]},
+        ACTION: {"dtype": "float32", "shape": (2,), "names": None},
+    }
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "test", features=features, use_videos=True, fps=10
+    )
+    for ep_idx, length in enumerate([5, 6]):
+        for _ in range(length):
+            dataset.add_frame(
+                {
+                    f"{OBS_IMAGES}.cam": np.zeros((4, 4, 3), dtype=np.uint8),
+                    ACTION: torch.randn(2),
+                    "task": f"task_{ep_idx}",
+                }
+            )
+        dataset.save_episode()
+    dataset.finalize()
+
+    num_decoded = 0
+
+    def fake_decode_video_frames(video_path, timestamps, tolerance_s, backend=None, return_uint8=False):
+        nonlocal num_decoded
+        num_decoded += len(timestamps)
+        frames = torch.tensor([round(ts * 10) for ts in timestamps], dtype=torch.uint8)
+        frames = frames.view(-1, 1, 1, 1).expand(-1, 3, 4, 4).clone()
+        return frames if return_uint8 else frames.to(torch.float32) / 255
+
+    monkeypatch.setattr("lerobot.datasets.lerobot_dataset.decode_video_frames", fake_decode_video_frames)
+    monkeypatch.setattr("lerobot.datasets.video_utils.decode_video_frames", fake_decode_video_frames)
+
+    delta_timestamps = {f"{OBS_IMAGES}.cam": [-0.1, 0.0]}
+    reference = LeRobotDataset(dataset.repo_id, root=dataset.root, delta_timestamps=delta_timestamps)
+    expected = [reference[idx][f"{OBS_IMAGES}.cam"] for idx in range(len(reference))]
+
+    cached = LeRobotDataset(
+        dataset.repo_id,
+        root=dataset.root,
+        delta_timestamps=delta_timestamps,
+        frame_cache_mb=1,
+        frame_cache_dir=tmp_path / "frame_cache",
+    )
+    for _epoch in range(2):
+        num_decoded = 0
+        items = cached.__getitems__(list(range(len(cached))))
+        for item, expected_frames in zip(items, expected, strict=True):
+            torch.testing.assert_close(item[f"{OBS_IMAGES}.cam"], expected_frames, rtol=0, atol=0)
+    # The second epoch is entirely served from the cache
+    assert num_decoded == 0
+    stats = cached.frame_cache.get_stats()
+    assert stats["misses"] == 22
+    assert stats["memory_hits"] == 22
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pickle
+
+import numpy as np
+import pyarrow as pa
+import pytest
+import torch
+
+from lerobot.datasets.frame_store import MEMMAP_DIR, MemmapFrameStore, arrow_to_numpy
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+
+FEATURES = {
+    "observation.state": {"dtype": "float32", "shape": (2,), "names": ["x", "y"]},
+    "action": {"dtype": "float32", "shape": (3,), "names": ["vx", "vy", "vz"]},
+    "next.done": {"dtype": "bool", "shape": (1,), "names": None},
+}
+
+
+def _record(dataset, episode_lengths):
+    for ep_idx, length in enumerate(episode_lengths):
+        for frame_idx in range(length):
+            dataset.add_frame(
+                {
+                    "observation.state": torch.randn(2),
+                    "action": torch.randn(3),
+                    "next.done": np.array([frame_idx == length - 1]),
+                    "task": f"task_{ep_idx}",
+                }
+            )
+        dataset.save_episode()
+    dataset.finalize()
+
+
+@pytest.fixture
+def recorded_dataset(tmp_path, empty_lerobot_dataset_factory):
+    dataset = empty_lerobot_dataset_factory(
+        root=tmp_path / "test", features=FEATURES, use_videos=False, fps=10
+    )
+    _record(dataset, [4, 6, 5])
+    return dataset
+
+
+def test_arrow_to_numpy():
+    scalars = pa.chunked_array([pa.array([1.0, 2.0], pa.float64()), pa.array([3.0], pa.float64())])
+    np.testing.assert_array_equal(arrow_to_numpy(scalars), np.array([1, 2, 3], dtype=np.float32))
+    assert arrow_to_numpy(scalars).dtype == np.float32
+
+    fixed = pa.array([[1, 2], [3, 4]], pa.list_(pa.int32(), 2))
+    assert arrow_to_numpy(fixed).dtype == np.int64
+    assert arrow_to_numpy(fixed).shape == (2, 2)
+
+    uniform = pa.array([[1.0, 2.0], [3.0, 4.0]], pa.list_(pa.float32()))
+    assert arrow_to_numpy(uniform).shape == (2, 2)
+
+    assert arrow_to_numpy(pa.array([[1.0], [2.0, 3.0]], pa.list_(pa.float32()))) is None
+    assert arrow_to_numpy(pa.array(["a", "b"])) is None
+    assert arrow_to_numpy(pa.array([1.0, None])) is None
+
+
+def test_invalid_data_backend(recorded_dataset):
+    with pytest.raises(ValueError, match="Invalid data_backend"):
+        LeRobotDataset(recorded_dataset.repo_id, root=recorded_dataset.root, data_backend="invalid")
+
+
+@pytest.mark.parametrize("episodes", [None, [0, 2]])
+def test_memmap_backend_matches_hf_backend(recorded_dataset, episodes):
+    delta_ts = {"observation.state": [-0.1, 0.0], "action": [i / 10 for i in range(4)]}
+    kwargs = {"episodes": episodes, "delta_timestamps": delta_ts, "tolerance_s": 0.04}
+    hf_dataset = LeRobotDataset(recorded_dataset.repo_id, root=recorded_dataset.root, **kwargs)
+    memmap_dataset = LeRobotDataset(
+        recorded_dataset.repo_id, root=recorded_dataset.root, data_backend="memmap", **kwargs
+    )
+
+    assert (recorded_dataset.root / MEMMAP_DIR / "action.npy").is_file()
+    assert len(memmap_dataset) == len(hf_dataset)
+    for idx in range(len(hf_dataset)):
+        expected = hf_dataset[idx]
+        item = memmap_dataset[idx]
+        assert item.keys() == expected.keys()
+        for key, value in expected.items():
+            if isinstance(value, torch.Tensor):
+                assert item[key].dtype == value.dtype, key
+                torch.testing.assert_close(item[key], value)
+            else:
+                assert item[key] == value
+
+
+def test_memmap_frame_store_is_rebuilt_when_stale(tmp_path, recorded_dataset):
+    store = MemmapFrameStore.load_or_build(recorded_dataset.root, recorded_dataset.features)
+    assert len(store) == 15
+    manifest_mtime = (store.directory / "manifest.json").stat().st_mtime_ns
+
+    # Loading again reuses the existing files
+    store = MemmapFrameStore.load_or_build(recorded_dataset.root, recorded_dataset.features)
+    assert (store.directory / "manifest.json").stat().st_mtime_ns == manifest_mtime
+
+    resumed = LeRobotDataset(recorded_dataset.repo_id, root=recorded_dataset.root)
+    _record(resumed, [3])
+
+    store = MemmapFrameStore.load_or_build(recorded_dataset.root, recorded_dataset.features)
+    assert len(store) == 18
+
+
+def test_memmap_frame_store_pickle_does_not_copy_columns(recorded_dataset):
+    store = MemmapFrameStore.load_or_build(recorded_dataset.root, recorded_dataset.features)
+    expected = np.array(store["action"])
+
+    state = store.__getstate__()
+    assert state["_columns"] is None
+
+    unpickled = pickle.loads(pickle.dumps(store))
+    assert isinstance(unpickled["action"], np.memmap)
+    np.testing.assert_array_equal(unpickled["action"], expected)
@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import queue
+import subprocess
+import sys
+import textwrap
 import time
-from multiprocessing import queues
+from multiprocessing import queues, shared_memory
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -22,6 +25,7 @@ from PIL import Image
 
 from lerobot.datasets.image_writer import (
     AsyncImageWriter,
+    SharedFrameRing,
     image_array_to_pil_image,
     safe_stop_image_writer,
     write_image,
@@ -324,6 +328,73 @@ def test_wait_until_done_multiprocessing(tmp_path, img_array_factory):
         writer.stop()
 
 
+def test_save_image_shared_memory_multiprocessing(tmp_path, img_array_factory):
+    writer = AsyncImageWriter(num_processes=1, num_threads=1, num_shared_slots=2)
+    try:
+        # Two cameras with different resolutions, each having its own ring of slots
+        image_arrays = [img_array_factory(height=40 + 20 * (i % 2), width=50) for i in range(20)]
+        fpaths = [tmp_path / f"frame_{i:06d}.png" for i in range(len(image_arrays))]
+        for image_array, fpath in zip(image_arrays, fpaths, strict=True):
+            writer.save_image(image_array, fpath)
+        writer.wait_until_done()
+        for image_array, fpath in zip(image_arrays, fpaths, strict=True):
+            assert np.array_equal(np.array(Image.open(fpath)), image_array)
+
+        assert len(writer.rings) == 2
+        stats = writer.get_stats()
+        assert stats["num_frames"] == stats["num_shared_frames"] == len(image_arrays)
+        # Frames are saved faster than the single worker writes them, so that the slots are all taken
+        assert stats["num_blocked_frames"] > 0
+        writer.reset_stats()
+        assert writer.get_stats()["num_frames"] == 0
+    finally:
+        shm_names = [ring.name for ring in writer.rings.values()]
+        writer.stop()
+    # The shared memory is released when the writer stops
+    for shm_name in shm_names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=shm_name)
+
+
+def test_writer_cycles_keep_shared_memory_multiprocessing(tmp_path):
+    # Run in a fresh interpreter, so that the workers of the first writer start before any resource tracker,
+    # and those of the next writers share the tracker started by the first ring
+    script = textwrap.dedent(
+        f"""
+        from pathlib import Path
+
+        import numpy as np
+
+        from lerobot.datasets.image_writer import AsyncImageWriter
+
+        root = Path({str(tmp_path)!r})
+        for cycle in range(3):
+            writer = AsyncImageWriter(num_processes=2, num_threads=1, num_shared_slots=2)
+            for i in range(8):
+                image = np.full((16, 16, 3), cycle * 10 + i, dtype=np.uint8)
+                writer.save_image(image, root / f"frame_{{cycle}}_{{i}}.png")
+            writer.wait_until_done()
+            writer.stop()
+        """
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=120)
+
+    assert result.returncode == 0, result.stderr
+    # Neither leaked nor unlinked by the resource trackers
+    assert "resource_tracker" not in result.stderr, result.stderr
+    assert "Traceback" not in result.stderr, result.stderr
+    for cycle in range(3):
+        for i in range(8):
+            saved_image = np.array(Image.open(tmp_path / f"frame_{cycle}_{i}.png"))
+            assert np.all(saved_image == cycle * 10 + i)
+
+
+def test_shared_frame_ring_close_after_unlink():
+    ring = SharedFrameRing((4, 4, 3), np.uint8, num_slots=2)
+    shared_memory.SharedMemory(name=ring.name).unlink()
+    ring.close()
+
+
 def test_exception_handling(tmp_path, img_array_factory):
     writer = AsyncImageWriter()
     try:
@@ -19,7 +19,9 @@
 import numpy as np
 import pytest
 
+from lerobot.datasets.compute_stats import QUANTILE_SKETCH_KEY
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import EPISODES_DIR, load_nested_dataset, load_stats
 
 
 def mock_load_image_as_numpy(path, dtype, channel_first):
@@ -145,7 +147,7 @@ def test_save_episode_with_fixed_quantiles(tmp_path, simple_features):
     for key in ["action", "observation.state"]:
         feature_stats = stats[key]
         expected_keys = {"min", "max", "mean", "std", "count", "q01", "q10", "q50", "q90", "q99"}
-        assert set(feature_stats.keys()) == expected_keys
+        assert set(feature_stats.keys()) == expected_keys | {QUANTILE_SKETCH_KEY}
 
 
 def test_quantile_aggregation_across_episodes(tmp_path, simple_features):
@@ -174,7 +176,7 @@ def test_quantile_aggregation_across_episodes(tmp_path, simple_features):
     for key in ["action", "observation.state"]:
         feature_stats = stats[key]
         expected_keys = {"min", "max", "mean", "std", "count", "q01", "q10", "q50", "q90", "q99"}
-        assert set(feature_stats.keys()) == expected_keys
+        assert set(feature_stats.keys()) == expected_keys | {QUANTILE_SKETCH_KEY}
         assert feature_stats["q01"].shape == (simple_features[key]["shape"][0],)
         assert feature_stats["q50"].shape == (simple_features[key]["shape"][0],)
         assert feature_stats["q99"].shape == (simple_features[key]["shape"][0],)
@@ -193,6 +195,7 @@ def test_save_multiple_episodes_with_quantiles(tmp_path, simple_features):
 
     # Save multiple episodes
     np.random.seed(42)
+    frames = {"action": [], "observation.state": []}
     for episode_idx in range(3):
         for _ in range(50):
             frame = {
@@ -201,6 +204,8 @@ def test_save_multiple_episodes_with_quantiles(tmp_path, simple_features):
                 "task": f"task_{episode_idx}",
             }
             dataset.add_frame(frame)
+            for key in frames:
+                frames[key].append(frame[key])
 
         dataset.save_episode()
 
@@ -210,3 +215,20 @@ def test_save_multiple_episodes_with_quantiles(tmp_path, simple_features):
         feature_stats = stats[key]
         assert "q01" in feature_stats and "q99" in feature_stats
         assert feature_stats["count"][0] == 150  # 3 episodes * 50 frames
+
+        # The quantiles are merged from the sketches of the episodes, not averaged. The extreme quantiles of
+        # 150 frames depend on a couple of samples, so only the inner ones are compared.
+        for q_key in ["q10", "q50", "q90"]:
+            expected = np.quantile(np.stack(frames[key]), int(q_key[1:]) / 100, axis=0)
+            np.testing.assert_allclose(feature_stats[q_key], expected, atol=0.2)
+
+    # The sketches are saved under their own key of the stats and of the episodes metadata, to be merged again
+    # when aggregating datasets
+    dataset.finalize()
+    loaded_stats = load_stats(dataset.root)
+    episodes = load_nested_dataset(dataset.root / EPISODES_DIR)
+    for key in ["action", "observation.state"]:
+        for sketch_key in ["means", "weights"]:
+            sketch = stats[key][QUANTILE_SKETCH_KEY][sketch_key]
+            np.testing.assert_allclose(loaded_stats[key][QUANTILE_SKETCH_KEY][sketch_key], sketch)
+            assert len(episodes[f"stats/{key}/{QUANTILE_SKETCH_KEY}/{sketch_key}"]) == 3
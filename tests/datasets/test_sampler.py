@@ -13,6 +13,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import pytest
 from datasets import Dataset
 
 from lerobot.datasets.push_dataset_to_hub.utils import calculate_episode_data_index
@@ -90,3 +91,25 @@ def test_shuffle():
     assert sampler.indices == [0, 1, 2, 3, 4, 5]
     assert len(sampler) == 6
     assert set(sampler) == {0, 1, 2, 3, 4, 5}
+
+
+def test_episode_group_size():
+    dataset_from_indices = [0, 10, 13]
+    dataset_to_indices = [10, 13, 20]
+    sampler = EpisodeAwareSampler(
+        dataset_from_indices, dataset_to_indices, shuffle=True, episode_group_size=4, drop_n_last_frames=1
+    )
+    assert len(sampler) == 17
+    indices = list(sampler)
+    assert sorted(indices) == sampler.indices
+
+    # Frames of an episode come in at most ceil(num_frames / episode_group_size) contiguous runs: episodes of 9,
+    # 2 and 6 frames are split into 3 + 1 + 2 groups, hence at most 6 runs overall.
+    episode_of = [0] * 10 + [1] * 3 + [2] * 7
+    num_runs = 1 + sum(episode_of[a] != episode_of[b] for a, b in zip(indices[:-1], indices[1:], strict=True))
+    assert num_runs <= 6
+
+
+def test_episode_group_size_invalid():
+    with pytest.raises(ValueError, match="episode_group_size"):
+        EpisodeAwareSampler([0], [10], episode_group_size=0)
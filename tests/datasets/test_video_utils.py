@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+from lerobot.datasets.video_utils import (
+    DecoderCacheWorkerStats,
+    FrameTimestampError,
+    StreamingVideoEncoder,
+    VideoDecoderCache,
+    VideoIndexCache,
+    build_video_index,
+    decode_video_frames,
+    decode_video_frames_batch,
+    decode_video_frames_pyav,
+    encode_video_frames,
+    get_default_decoder_cache,
+    get_pyav_decode_stats,
+    get_video_index_path,
+    plan_video_decode,
+    reset_pyav_decode_stats,
+)
+
+
+class FileDecoderCache(VideoDecoderCache):
+    """Cache whose "decoders" are the file handles themselves, to test the cache without decoding videos."""
+
+    def _open_decoder(self, file_handle):
+        return file_handle
+
+
+@pytest.fixture
+def video_files(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"file-{i:03d}.mp4"
+        path.write_bytes(b"0" * 100)
+        paths.append(path)
+    return paths
+
+
+def test_decoder_cache_hits_and_misses(video_files):
+    cache = FileDecoderCache()
+    decoder = cache.get_decoder(video_files[0])
+    assert cache.get_decoder(str(video_files[0])) is decoder
+    cache.get_decoder(video_files[1])
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+    assert stats["evictions"] == 0
+    assert stats["num_decoders"] == 2
+    assert stats["open_time_s"] >= 0
+
+    cache.reset_stats()
+    assert cache.get_stats()["misses"] == 0
+    assert cache.size() == 2
+
+    cache.clear()
+    assert cache.size() == 0
+    assert decoder.closed
+
+
+def test_decoder_cache_evicts_least_recently_used(video_files):
+    cache = FileDecoderCache(max_decoders=2)
+    first = cache.get_decoder(video_files[0])
+    second = cache.get_decoder(video_files[1])
+    cache.get_decoder(video_files[0])  # video_files[1] is now the least recently used
+    cache.get_decoder(video_files[2])
+
+    assert cache.size() == 2
+    assert second.closed
+    assert not first.closed
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get_decoder(video_files[0]) is first
+
+
+def test_decoder_cache_max_bytes(video_files):
+    cache = FileDecoderCache(max_bytes=250)
+    for path in video_files:
+        cache.get_decoder(path)
+
+    stats = cache.get_stats()
+    assert stats["num_decoders"] == 2
+    assert stats["num_bytes"] == 200
+    assert stats["evictions"] == 2
+
+    # A file larger than the limit is still cached on its own
+    cache = FileDecoderCache(max_bytes=50)
+    cache.get_decoder(video_files[0])
+    assert cache.size() == 1
+
+
+def test_decoder_cache_closes_evicted_decoders_once_unused(video_files):
+    cache = FileDecoderCache(max_decoders=1)
+    with cache.use_decoder(video_files[0]) as first:
+        # Evicted, e.g. by another thread, while in use
+        second = cache.get_decoder(video_files[1])
+        assert cache.get_stats()["evictions"] == 1
+        assert not first.closed
+    assert first.closed
+
+    with cache.use_decoder(video_files[1]) as decoder:
+        assert decoder is second
+        cache.clear()
+        assert not second.closed
+    assert second.closed
+
+
+class _DecoderCacheDataset(torch.utils.data.Dataset):
+    """Looks up the video of each item twice in the default decoder cache of the worker."""
+
+    def __init__(self, video_files):
+        self.video_files = video_files
+
+    def __len__(self):
+        return len(self.video_files)
+
+    def __getitem__(self, idx):
+        for _ in range(2):
+            with get_default_decoder_cache().use_decoder(self.video_files[idx]):
+                pass
+        return idx
+
+
+def test_decoder_cache_worker_stats(video_files, monkeypatch):
+    monkeypatch.setattr(VideoDecoderCache, "_open_decoder", FileDecoderCache._open_decoder)
+    worker_stats = DecoderCacheWorkerStats(num_workers=2)
+    dataloader = torch.utils.data.DataLoader(
+        _DecoderCacheDataset(video_files),
+        num_workers=2,
+        worker_init_fn=worker_stats.worker_init_fn,
+        multiprocessing_context="fork",
+    )
+
+    assert sorted(dataloader) == list(range(len(video_files)))
+    stats = worker_stats.get_stats()
+    assert stats["hits"] == 4
+    assert stats["misses"] == 4
+    assert stats["num_decoders"] == 4
+    assert stats["worker_0_hit_rate"] == stats["worker_1_hit_rate"] == 0.5
+
+    # The counters of the workers of the next epoch add up, the sizes of their caches don't
+    worker_stats.reset_stats()
+    assert worker_stats.get_stats()["hits"] == 0
+    list(dataloader)
+    stats = worker_stats.get_stats()
+    assert stats["hits"] == 4
+    assert stats["num_decoders"] == 4
+
+
+def test_decoder_cache_invalid_limits():
+    with pytest.raises(ValueError, match="max_decoders"):
+        VideoDecoderCache(max_decoders=0)
+    with pytest.raises(ValueError, match="max_bytes"):
+        VideoDecoderCache(max_bytes=0)
+
+
+NUM_FRAMES = 40
+FPS = 10
+GOP = 8
+
+
+@pytest.fixture(scope="module")
+def indexed_video(tmp_path_factory):
+    """Video laid out like in a LeRobotDataset, whose frame i is filled with the gray level 5 * i."""
+    root = tmp_path_factory.mktemp("dataset")
+    (root / "meta").mkdir()
+    imgs_dir = root / "images"
+    imgs_dir.mkdir()
+    for i in range(NUM_FRAMES):
+        Image.fromarray(np.full((32, 32, 3), 5 * i, dtype=np.uint8)).save(imgs_dir / f"frame-{i:06d}.png")
+    video_path = root / "videos" / "observation.images.cam" / "chunk-000" / "file-000.mp4"
+    encode_video_frames(imgs_dir, video_path, FPS, vcodec="libsvtav1", g=GOP, crf=0)
+    return video_path
+
+
+def _frame_indices(frames):
+    return (frames.float().mean(dim=(1, 2, 3)) / 5).round().long().tolist()
+
+
+def test_video_index(indexed_video):
+    index = build_video_index(indexed_video)
+    assert len(index.pts) == NUM_FRAMES
+    assert index.is_keyframe[0]
+    assert 1 < index.is_keyframe.sum() < NUM_FRAMES
+    np.testing.assert_allclose(index.timestamps, np.arange(NUM_FRAMES) / FPS, atol=1e-3)
+
+    index_path = get_video_index_path(indexed_video)
+    assert index_path == (
+        indexed_video.parents[3]
+        / "meta"
+        / "video_index"
+        / "observation.images.cam"
+        / "chunk-000"
+        / "file-000.npz"
+    )
+    cache = VideoIndexCache()
+    cached = cache.get_index(indexed_video)
+    assert index_path.is_file()
+    np.testing.assert_array_equal(cached.pts, index.pts)
+    assert cache.get_index(indexed_video) is cached
+
+    # A new cache loads the persisted index instead of demuxing the video again
+    reloaded = VideoIndexCache()._load(
+        index_path, (indexed_video.stat().st_size, indexed_video.stat().st_mtime_ns)
+    )
+    np.testing.assert_array_equal(reloaded.is_keyframe, index.is_keyframe)
+    assert reloaded.time_base == index.time_base
+    assert VideoIndexCache()._load(index_path, (0, 0)) is None
+
+
+def test_plan_video_decode(indexed_video):
+    index = build_video_index(indexed_video)
+    keyframes = np.flatnonzero(index.is_keyframe)
+    last_keyframe = int(keyframes[-1])
+
+    # Frames sharing a key frame are decoded in one segment, stopping at the last requested frame
+    segments, closest_pts = plan_video_decode(index, [(last_keyframe + 1) / FPS, last_keyframe / FPS], 0.04)
+    assert len(segments) == 1
+    assert segments[0].seek_pts == index.pts[last_keyframe]
+    assert segments[0].num_decoded == 2
+    assert closest_pts == [index.pts[last_keyframe + 1], index.pts[last_keyframe]]
+
+    # Far apart frames are decoded from their own key frames
+    segments, _ = plan_video_decode(index, [0.0, (NUM_FRAMES - 1) / FPS], 0.04)
+    assert [segment.seek_pts for segment in segments] == [index.pts[0], index.pts[last_keyframe]]
+    assert sum(segment.num_decoded for segment in segments) == 1 + NUM_FRAMES - last_keyframe
+
+    with pytest.raises(FrameTimestampError):
+        plan_video_decode(index, [NUM_FRAMES / FPS + 1.0], 0.04)
+
+
+def test_decode_video_frames_pyav(indexed_video):
+    frame_indices = [35, 2, 2, 20, 36]
+    timestamps = [i / FPS for i in frame_indices]
+    stats = {}
+    frames = decode_video_frames_pyav(indexed_video, timestamps, 0.04, return_uint8=True, stats=stats)
+    assert frames.dtype == torch.uint8
+    assert frames.shape == (len(frame_indices), 3, 32, 32)
+    assert _frame_indices(frames) == frame_indices
+
+    assert stats["returned_frames"] == len(frame_indices)
+    # Decoding sequentially from the first key frame would decode 37 frames
+    assert stats["decoded_frames"] < frame_indices[-1] + 1
+    assert stats["seeks"] == 3
+
+    reset_pyav_decode_stats()
+    decode_video_frames_pyav(indexed_video, timestamps, 0.04)
+    process_stats = get_pyav_decode_stats()
+    assert process_stats["decoded_frames"] == stats["decoded_frames"]
+    assert process_stats["decoded_frames_per_returned_frame"] == stats["decoded_frames"] / len(frame_indices)
+
+    float_frames = decode_video_frames(indexed_video, timestamps, 0.04, backend="pyav")
+    torch.testing.assert_close(float_frames, frames.float() / 255)
+    batch_frames = decode_video_frames_batch(
+        indexed_video, timestamps, 0.04, backend="pyav", return_uint8=True
+    )
+    torch.testing.assert_close(batch_frames, frames)
+
+
+def test_streaming_video_encoder(tmp_path):
+    video_path = tmp_path / "cam.mp4"
+    encoder = StreamingVideoEncoder(video_path, FPS, g=GOP, crf=0, queue_size=4, max_stats_frames=8)
+    for i in range(NUM_FRAMES):
+        # Frames are accepted channel first or last, as uint8 or float in [0, 1]
+        frame = np.full((32, 32, 3), 5 * i, dtype=np.uint8)
+        encoder.add_frame(frame if i % 2 == 0 else frame.transpose(2, 0, 1).astype(np.float32) / 255)
+    assert encoder.finish() == video_path
+    assert encoder.num_frames == NUM_FRAMES
+
+    frame_indices = list(range(NUM_FRAMES))
+    frames = decode_video_frames_pyav(video_path, [i / FPS for i in frame_indices], 0.04, return_uint8=True)
+    assert _frame_indices(frames) == frame_indices
+
+    # The frames kept for the statistics are evenly spread over the video
+    stats_frames = encoder.get_stats_frames()
+    assert stats_frames.dtype == np.uint8
+    assert 4 <= len(stats_frames) <= 8
+    stride = (stats_frames[1, 0, 0, 0] - stats_frames[0, 0, 0, 0]) // 5
+    np.testing.assert_array_equal(stats_frames[:, 0, 0, 0], 5 * stride * np.arange(len(stats_frames)))
+
+    with pytest.raises(RuntimeError, match="already closed"):
+        encoder.add_frame(np.zeros((32, 32, 3), dtype=np.uint8))
+
+
+def test_streaming_video_encoder_errors(tmp_path):
+    encoder = StreamingVideoEncoder(tmp_path / "cam.mp4", FPS, queue_size=1)
+    encoder.add_frame(np.zeros((32, 32, 3), dtype=np.uint8))
+    # The failure of the encoding thread is raised in the recording thread, which is never blocked by it
+    with pytest.raises(RuntimeError, match="failed"):
+        for _ in range(4):
+            encoder.add_frame(np.zeros((32, 32, 2), dtype=np.uint8))
+        encoder.finish()
+    encoder.cancel()
+
+    encoder = StreamingVideoEncoder(tmp_path / "cancelled.mp4", FPS)
+    encoder.add_frame(np.zeros((32, 32, 3), dtype=np.uint8))
+    encoder.cancel()
+    assert not (tmp_path / "cancelled.mp4").exists()
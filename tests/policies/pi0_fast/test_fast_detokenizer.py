@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ruff: noqa: E402
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("transformers")
+pytest.importorskip("scipy")
+
+from scipy.fftpack import idct
+from tokenizers import Tokenizer, models, trainers
+from transformers import PreTrainedTokenizerFast
+
+from lerobot.policies.pi0_fast.modeling_pi0_fast import FASTDetokenizer
+
+MIN_TOKEN = -20
+SCALE = 10.0
+TIME_HORIZON = 5
+ACTION_DIM = 3
+
+
+@pytest.fixture(scope="module")
+def action_tokenizer():
+    """A small BPE tokenizer trained like the FAST one, on sequences of quantized DCT coefficients."""
+    rng = np.random.default_rng(0)
+    coeffs = np.clip(rng.laplace(scale=2.0, size=(200, TIME_HORIZON * ACTION_DIM)), -19, 19).astype(int)
+    alphabet = [chr(i) for i in range(-MIN_TOKEN * 2)]
+    bpe = Tokenizer(models.BPE())
+    trainer = trainers.BpeTrainer(
+        vocab_size=120,
+        min_frequency=2,
+        show_progress=False,
+        initial_alphabet=alphabet,
+        max_token_length=10000,
+    )
+    bpe.train_from_iterator(["".join(map(chr, seq - MIN_TOKEN)) for seq in coeffs], trainer=trainer)
+    bpe_tokenizer = PreTrainedTokenizerFast(tokenizer_object=bpe, clean_up_tokenization_spaces=False)
+    return SimpleNamespace(bpe_tokenizer=bpe_tokenizer, min_token=MIN_TOKEN, scale=SCALE)
+
+
+def reference_decode(action_tokenizer, token_ids: list[int], relaxed_decoding: bool = True) -> np.ndarray:
+    """Per-sequence decoding, as done by the FAST tokenizer."""
+    expected_len = TIME_HORIZON * ACTION_DIM
+    try:
+        decoded_tokens = action_tokenizer.bpe_tokenizer.decode(token_ids)
+        dct_coeff = np.array(list(map(ord, decoded_tokens))) + action_tokenizer.min_token
+        if relaxed_decoding:
+            dct_coeff = np.pad(dct_coeff[:expected_len], (0, max(expected_len - len(dct_coeff), 0)))
+        dct_coeff = dct_coeff.reshape(-1, ACTION_DIM)
+        assert dct_coeff.shape == (TIME_HORIZON, ACTION_DIM)
+    except Exception:
+        dct_coeff = np.zeros((TIME_HORIZON, ACTION_DIM))
+    return idct(dct_coeff / action_tokenizer.scale, axis=0, norm="ortho")
+
+
+@pytest.mark.parametrize("relaxed_decoding", [True, False])
+def test_fast_detokenizer_matches_per_sequence_decoding(action_tokenizer, relaxed_decoding):
+    rng = np.random.default_rng(1)
+    sequences = []
+    for _ in range(16):
+        coeffs = np.clip(rng.laplace(scale=2.0, size=TIME_HORIZON * ACTION_DIM), -19, 19).astype(int)
+        sequences.append(action_tokenizer.bpe_tokenizer.encode("".join(map(chr, coeffs - MIN_TOKEN))))
+    # Truncated, too long, empty and invalid sequences
+    sequences += [sequences[0][:2], sequences[1] + sequences[2], [], [3, -1, 4]]
+
+    max_len = max(len(seq) for seq in sequences)
+    token_ids = np.array([seq + [0] * (max_len - len(seq)) for seq in sequences])
+    token_mask = np.arange(max_len) < np.array([len(seq) for seq in sequences])[:, None]
+
+    detokenizer = FASTDetokenizer(action_tokenizer)
+    actions = detokenizer(
+        token_ids, TIME_HORIZON, ACTION_DIM, token_mask=token_mask, relaxed_decoding=relaxed_decoding
+    )
+
+    assert actions.shape == (len(sequences), TIME_HORIZON, ACTION_DIM)
+    for seq, action in zip(sequences, actions, strict=True):
+        np.testing.assert_allclose(
+            action, reference_decode(action_tokenizer, seq, relaxed_decoding), atol=1e-12
+        )
+    np.testing.assert_array_equal(actions[-1], 0)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Checks the static KV cache decoding of PI0Fast against the decoding without cache, on a tiny random model."""
+# ruff: noqa: E402
+
+import importlib.util
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+pytest.importorskip("transformers")
+pytest.importorskip("scipy")
+
+from transformers.models.auto import CONFIG_MAPPING
+from transformers.models.paligemma.modeling_paligemma import PaliGemmaForConditionalGeneration
+
+from lerobot.policies.pi0_fast.configuration_pi0_fast import PI0FastConfig
+from lerobot.policies.pi0_fast.modeling_pi0_fast import PI0FastPytorch
+
+VOCAB_SIZE = 257152
+MAX_DECODING_STEPS = 12
+
+
+def make_tiny_paligemma():
+    config = CONFIG_MAPPING["paligemma"]()
+    config._vocab_size = VOCAB_SIZE  # noqa: SLF001
+    config.image_token_index = VOCAB_SIZE
+    config.text_config.vocab_size = VOCAB_SIZE
+    config.text_config.hidden_size = 64
+    config.text_config.intermediate_size = 128
+    config.text_config.num_hidden_layers = 2
+    config.text_config.num_attention_heads = 4
+    config.text_config.num_key_value_heads = 1
+    config.text_config.head_dim = 16
+    config.text_config.hidden_activation = "gelu_pytorch_tanh"
+    # Larger weights than the default init, so that the generated tokens depend on the positions and masks
+    config.text_config.initializer_range = 0.2
+    config.vision_config.hidden_size = 32
+    config.vision_config.intermediate_size = 64
+    config.vision_config.num_hidden_layers = 1
+    config.vision_config.num_attention_heads = 2
+    config.vision_config.projection_dim = 64
+    # With tied embeddings, a random model keeps generating its last input token
+    config.tie_word_embeddings = config.text_config.tie_word_embeddings = False
+    return PaliGemmaForConditionalGeneration(config=config)
+
+
+@pytest.fixture
+def model(monkeypatch):
+    if importlib.util.find_spec("transformers.models.siglip.check") is None:
+        # The decoding only runs the PaliGemma language model, which doesn't need the patched transformers the
+        # model checks for at init
+        check = types.ModuleType("transformers.models.siglip.check")
+        check.check_whether_transformers_replace_is_installed_correctly = lambda: True
+        monkeypatch.setitem(sys.modules, "transformers.models.siglip.check", check)
+
+    torch.manual_seed(0)
+    # Placeholder token ids, the EOS token is set by the tests
+    tokenizer = SimpleNamespace(bos_token_id=2, eos_token_id=-1, pad_token_id=0)
+    with torch.device("meta"):
+        model = PI0FastPytorch(PI0FastConfig(dtype="float32", device="cpu"), paligemma_tokenizer=tokenizer)
+    model.paligemma_with_expert.paligemma = make_tiny_paligemma()
+    return model.to("cpu").eval()
+
+
+def make_inputs(batch_size: int, prompt_lengths: list[int], seed: int):
+    generator = torch.Generator().manual_seed(seed)
+    images = [torch.rand(batch_size, 3, 224, 224, generator=generator) * 2 - 1 for _ in range(2)]
+    # The second camera is missing for the first sample
+    img_masks = [torch.ones(batch_size, dtype=torch.bool), torch.arange(batch_size) > 0]
+    max_length = max(prompt_lengths)
+    tokens = torch.randint(3, VOCAB_SIZE, (batch_size, max_length), generator=generator)
+    # Prompts are padded to the longest one
+    masks = torch.arange(max_length)[None] < torch.tensor(prompt_lengths)[:, None]
+    tokens[~masks] = 0
+    return images, img_masks, tokens, masks
+
+
+def test_kv_cache_decoding_matches_no_cache(model):
+    decoding_cache = None
+    for seed, prompt_lengths in [(0, [5, 9, 7]), (1, [9, 3, 6])]:
+        inputs = make_inputs(3, prompt_lengths, seed)
+        expected = model.sample_actions_fast_no_cache(*inputs, max_decoding_steps=MAX_DECODING_STEPS)
+        action_tokens = model.sample_actions_fast(*inputs, max_decoding_steps=MAX_DECODING_STEPS)
+        torch.testing.assert_close(action_tokens, expected, rtol=0, atol=0)
+
+        # The second call reuses the static cache of the first one
+        decoding_cache = decoding_cache or model._decoding_cache
+        assert model._decoding_cache is decoding_cache
+
+
+def test_kv_cache_decoding_stops_at_eos(model):
+    inputs = make_inputs(3, [5, 9, 7], seed=0)
+    tokens = model.sample_actions_fast_no_cache(*inputs, max_decoding_steps=MAX_DECODING_STEPS)
+
+    # Make the token generated mid-sequence by the first sample the EOS token
+    eos_step = next(t for t in range(3, MAX_DECODING_STEPS - 2) if tokens[0, t] not in tokens[0, :t])
+    eos_token_id = tokens[0, eos_step].item()
+    model._paligemma_tokenizer.eos_token_id = eos_token_id
+
+    expected = model.sample_actions_fast_no_cache(*inputs, max_decoding_steps=MAX_DECODING_STEPS)
+    action_tokens = model.sample_actions_fast(*inputs, max_decoding_steps=MAX_DECODING_STEPS)
+    torch.testing.assert_close(action_tokens, expected, rtol=0, atol=0)
+
+    # The tokens following the EOS token are padding, the other samples keep decoding
+    torch.testing.assert_close(action_tokens[0, : eos_step + 1], tokens[0, : eos_step + 1], rtol=0, atol=0)
+    assert (action_tokens[0, eos_step + 1 :] == 0).all()
+    for seq, reference in zip(action_tokens[1:], tokens[1:], strict=True):
+        if eos_token_id not in reference:
+            torch.testing.assert_close(seq, reference, rtol=0, atol=0)
+
+    # Decoding stops once all the samples generated the EOS token
+    images, img_masks, prompt_tokens, masks = inputs
+    first_sample = (
+        [image[:1] for image in images],
+        [mask[:1] for mask in img_masks],
+        prompt_tokens[:1],
+        masks[:1],
+    )
+    torch.testing.assert_close(
+        model.sample_actions_fast(*first_sample, max_decoding_steps=MAX_DECODING_STEPS),
+        action_tokens[:1],
+        rtol=0,
+        atol=0,
+    )
@@ -450,6 +450,40 @@ def test_pi0_fast_action_token_sampling(policy, preprocessor):
     print("\nAction token sampling test completed!")
 
 
+@require_cuda
+def test_pi0_fast_kv_cache_matches_no_cache(policy, preprocessor):
+    """Test that the KV cached decoding generates the same tokens as the decoding without cache."""
+    set_seed_all(42)
+    lerobot_observation = preprocessor(deepcopy(create_dummy_data()))
+
+    images, img_masks = policy._preprocess_images(lerobot_observation)
+    tokens = lerobot_observation[OBS_LANGUAGE_TOKENS]
+    masks = lerobot_observation[OBS_LANGUAGE_ATTENTION_MASK]
+
+    with torch.no_grad():
+        action_tokens = policy.model.sample_actions_fast(
+            images, img_masks, tokens, masks, max_decoding_steps=16, temperature=0.0
+        )
+        # The static cache is reused by the next calls
+        action_tokens_reused_cache = policy.model.sample_actions_fast(
+            images, img_masks, tokens, masks, max_decoding_steps=16, temperature=0.0
+        )
+        action_tokens_no_cache = policy.model.sample_actions_fast_no_cache(
+            images, img_masks, tokens, masks, max_decoding_steps=16, temperature=0.0
+        )
+
+    assert action_tokens.shape == (1, 16)
+    assert torch.equal(action_tokens, action_tokens_reused_cache)
+    assert torch.equal(action_tokens, action_tokens_no_cache)
+
+    # The tokens following the EOS token are padding
+    eos_positions = (action_tokens[0] == policy._paligemma_tokenizer.eos_token_id).nonzero()
+    if len(eos_positions) > 0:
+        assert torch.all(
+            action_tokens[0, eos_positions[0, 0] + 1 :] == policy._paligemma_tokenizer.pad_token_id
+        )
+
+
 @require_cuda
 def test_pi0_fast_detokenization(policy, preprocessor):
     """Test PI0Fast action detokenization (FAST decoding)."""
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import pytest
+import torch
+from torch import nn
+
+from lerobot.policies.utils import PrefixCache, clear_prefix_cache_on_load
+from tests.utils import require_package
+
+
+class PrefixCounter:
+    """Stands for the prefix computation, returns a new object on each call."""
+
+    def __init__(self):
+        self.num_calls = 0
+
+    def __call__(self):
+        self.num_calls += 1
+        return object()
+
+
+def make_prompt(seed: int):
+    generator = torch.Generator().manual_seed(seed)
+    tokens = torch.randint(0, 1000, (2, 8), generator=generator)
+    masks = torch.ones(2, 8, dtype=torch.bool)
+    return tokens, masks
+
+
+def test_prefix_cache_reuses_prefix_of_same_inputs():
+    cache = PrefixCache()
+    compute_prefix = PrefixCounter()
+    tokens, masks = make_prompt(0)
+    images = [torch.rand(2, 3, 16, 16), torch.rand(2, 3, 16, 16)]
+
+    prefix = cache.get(tokens, [masks, *images], compute_prefix)
+    assert cache.get(tokens, [masks, *images], compute_prefix) is prefix
+    # Equal tensors, not necessarily the same objects
+    assert (
+        cache.get(tokens.clone(), [masks.clone(), *[image.clone() for image in images]], compute_prefix)
+        is prefix
+    )
+    assert compute_prefix.num_calls == 1
+    assert (cache.num_hits, cache.num_misses) == (2, 1)
+
+    # New images with the same prompt replace the cached prefix
+    new_images = [images[0], images[1] + 1]
+    new_prefix = cache.get(tokens, [masks, *new_images], compute_prefix)
+    assert new_prefix is not prefix
+    assert cache.get(tokens, [masks, *new_images], compute_prefix) is new_prefix
+    assert cache.get(tokens, [masks, *images], compute_prefix) is not prefix
+    assert compute_prefix.num_calls == 3
+    assert len(cache) == 1
+
+    # Inputs with another dtype or shape, or another prompt mask, are not reused
+    cache.get(tokens, [masks, images[0].double(), images[1]], compute_prefix)
+    cache.get(tokens, [masks, images[0]], compute_prefix)
+    new_masks = masks.clone()
+    new_masks[:, -1] = False
+    cache.get(tokens, [new_masks, *images], compute_prefix)
+    assert compute_prefix.num_calls == 6
+    assert len(cache) == 1
+
+
+def test_prefix_cache_evicts_least_recently_used_prompt():
+    cache = PrefixCache(max_prompts=2)
+    compute_prefix = PrefixCounter()
+    images = [torch.rand(2, 3, 16, 16)]
+    prompts = [make_prompt(seed) for seed in range(3)]
+
+    prefixes = [cache.get(tokens, [masks, *images], compute_prefix) for tokens, masks in prompts[:2]]
+    # Prompt 0 becomes the most recently used, prompt 1 is evicted
+    assert cache.get(prompts[0][0], [prompts[0][1], *images], compute_prefix) is prefixes[0]
+    cache.get(prompts[2][0], [prompts[2][1], *images], compute_prefix)
+    assert len(cache) == 2
+    assert cache.get(prompts[0][0], [prompts[0][1], *images], compute_prefix) is prefixes[0]
+    assert cache.get(prompts[1][0], [prompts[1][1], *images], compute_prefix) is not prefixes[1]
+    assert compute_prefix.num_calls == 4
+
+    cache.clear()
+    assert len(cache) == 0
+    cache.get(prompts[0][0], [prompts[0][1], *images], compute_prefix)
+    assert compute_prefix.num_calls == 5
+
+    with pytest.raises(ValueError, match="max_prompts"):
+        PrefixCache(max_prompts=0)
+
+
+def test_prefix_cache_cleared_on_load_state_dict():
+    model = nn.Linear(4, 4)
+    model.prefix_cache = PrefixCache()
+    model.register_load_state_dict_post_hook(clear_prefix_cache_on_load)
+    compute_prefix = PrefixCounter()
+    tokens, masks = make_prompt(0)
+    inputs = [masks, torch.rand(2, 3, 16, 16)]
+
+    prefix = model.prefix_cache.get(tokens, inputs, compute_prefix)
+    assert model.prefix_cache.get(tokens, inputs, compute_prefix) is prefix
+
+    # Also when the state dict is loaded from a parent module
+    nn.Sequential(model).load_state_dict(nn.Sequential(nn.Linear(4, 4)).state_dict())
+    assert len(model.prefix_cache) == 0
+    prefix = model.prefix_cache.get(tokens, inputs, compute_prefix)
+    assert compute_prefix.num_calls == 2
+    assert model.prefix_cache.get(tokens, inputs, compute_prefix) is prefix
+
+
+def get_kv_tensors(past_key_values) -> list[torch.Tensor]:
+    if isinstance(past_key_values, dict):
+        # SmolVLA: layer index -> {"key_states": ..., "value_states": ...}
+        return [tensor for layer in past_key_values.values() for tensor in layer.values()]
+    return [tensor for layer in past_key_values for tensor in layer]
+
+
+def check_prefix_cache_matches_no_cache(model, images, img_masks, lang_tokens, lang_masks, state, **kwargs):
+    """Samples twice from the same observation with the prefix cache, and once without it."""
+    noise = torch.randn(len(state), model.config.chunk_size, model.config.max_action_dim)
+    prefix_cache = model.prefix_cache
+    model.prefix_cache = None
+    expected = model.sample_actions(images, img_masks, lang_tokens, lang_masks, state, noise=noise, **kwargs)
+    model.prefix_cache = prefix_cache
+
+    actions = model.sample_actions(images, img_masks, lang_tokens, lang_masks, state, noise=noise, **kwargs)
+    torch.testing.assert_close(actions, expected)
+    ((_, (_, past_key_values)),) = prefix_cache._entries.values()
+    kv_tensors = [tensor.clone() for tensor in get_kv_tensors(past_key_values)]
+
+    # Equal inputs, not the same objects
+    actions = model.sample_actions(
+        [image.clone() for image in images],
+        img_masks,
+        lang_tokens.clone(),
+        lang_masks,
+        state,
+        noise=noise,
+        **kwargs,
+    )
+    torch.testing.assert_close(actions, expected)
+    assert (prefix_cache.num_hits, prefix_cache.num_misses) == (1, 1)
+    # The denoising steps don't write to the cached key/values
+    for tensor, cached in zip(kv_tensors, get_kv_tensors(past_key_values), strict=True):
+        torch.testing.assert_close(cached, tensor, rtol=0, atol=0)
+
+    # New images, or new weights, give new actions
+    new_images = [image.flip(-1) for image in images]
+    actions = model.sample_actions(
+        new_images, img_masks, lang_tokens, lang_masks, state, noise=noise, **kwargs
+    )
+    assert not torch.allclose(actions, expected)
+    model.load_state_dict(model.state_dict())
+    model.sample_actions(new_images, img_masks, lang_tokens, lang_masks, state, noise=noise, **kwargs)
+    assert (prefix_cache.num_hits, prefix_cache.num_misses) == (1, 3)
+
+
+@require_package("transformers")
+def test_smolvla_prefix_cache_matches_no_cache(monkeypatch):
+    from transformers import SmolVLMConfig
+
+    from lerobot.policies.smolvla import smolvlm_with_expert
+    from lerobot.policies.smolvla.configuration_smolvla import SmolVLAConfig
+    from lerobot.policies.smolvla.modeling_smolvla import VLAFlowMatching
+
+    # A tiny SmolVLM, instead of the config and processor of the default VLM from the hub
+    vlm_config = SmolVLMConfig(
+        text_config={
+            "model_type": "llama",
+            "vocab_size": 128,
+            "hidden_size": 64,
+            "intermediate_size": 128,
+            "num_hidden_layers": 4,
+            "num_attention_heads": 4,
+            "num_key_value_heads": 2,
+            "head_dim": 16,
+        },
+        vision_config={
+            "hidden_size": 32,
+            "intermediate_size": 64,
+            "num_hidden_layers": 1,
+            "num_attention_heads": 2,
+            "image_size": 64,
+            "patch_size": 16,
+        },
+        scale_factor=2,
+    )
+    processor = SimpleNamespace(tokenizer=SimpleNamespace(fake_image_token_id=125, global_image_token_id=126))
+    monkeypatch.setattr(smolvlm_with_expert.AutoConfig, "from_pretrained", lambda model_id: vlm_config)
+    monkeypatch.setattr(smolvlm_with_expert.AutoProcessor, "from_pretrained", lambda model_id: processor)
+
+    torch.manual_seed(0)
+    config = SmolVLAConfig(
+        device="cpu", use_prefix_cache=True, num_vlm_layers=4, chunk_size=10, n_action_steps=10, num_steps=3
+    )
+    model = VLAFlowMatching(config).eval()
+
+    batch_size = 2
+    images = [torch.rand(batch_size, 3, 64, 64) * 2 - 1 for _ in range(2)]
+    img_masks = [torch.ones(batch_size, dtype=torch.bool), torch.tensor([True, False])]
+    lang_tokens = torch.randint(0, 120, (batch_size, 6))
+    lang_masks = torch.tensor([[True] * 6, [True] * 4 + [False] * 2])
+    state = torch.randn(batch_size, config.max_state_dim)
+    check_prefix_cache_matches_no_cache(model, images, img_masks, lang_tokens, lang_masks, state)
+
+
+@require_package("transformers")
+def test_pi0_prefix_cache_matches_no_cache():
+    # PI0 runs the action expert with the patched Gemma of the `pi` extra
+    pytest.importorskip("transformers.models.siglip.check")
+    from transformers.models.gemma.modeling_gemma import GemmaForCausalLM
+    from transformers.models.paligemma.modeling_paligemma import PaliGemmaForConditionalGeneration
+
+    from lerobot.policies.pi0.configuration_pi0 import PI0Config
+    from lerobot.policies.pi0.modeling_pi0 import GemmaConfig, PaliGemmaWithExpertModel, PI0Pytorch
+
+    torch.manual_seed(0)
+    config = PI0Config(
+        device="cpu", dtype="float32", use_prefix_cache=True, chunk_size=10, num_inference_steps=3
+    )
+    vlm_config, expert_config = (
+        GemmaConfig(width=width, depth=2, mlp_dim=2 * width, num_heads=4, num_kv_heads=1, head_dim=16)
+        for width in (64, 32)
+    )
+    with torch.device("meta"):
+        model = PI0Pytorch(config)
+        paligemma_with_expert = PaliGemmaWithExpertModel(
+            vlm_config, expert_config, precision="float32", image_size=config.image_resolution[0]
+        )
+    vlm_config_hf = paligemma_with_expert.paligemma.config
+    vlm_config_hf.vision_config.hidden_size = 32
+    vlm_config_hf.vision_config.intermediate_size = 64
+    vlm_config_hf.vision_config.num_hidden_layers = 1
+    vlm_config_hf.vision_config.num_attention_heads = 2
+    vlm_config_hf.vision_config.projection_dim = vlm_config.width
+    paligemma_with_expert.paligemma = PaliGemmaForConditionalGeneration(config=vlm_config_hf)
+    paligemma_with_expert.gemma_expert = GemmaForCausalLM(config=paligemma_with_expert.gemma_expert.config)
+    paligemma_with_expert.gemma_expert.model.embed_tokens = None
+    model.paligemma_with_expert = paligemma_with_expert
+    model.action_in_proj = nn.Linear(config.max_action_dim, expert_config.width)
+    model.action_out_proj = nn.Linear(expert_config.width, config.max_action_dim)
+    model.state_proj = nn.Linear(config.max_state_dim, expert_config.width)
+    model.action_time_mlp_in = nn.Linear(2 * expert_config.width, expert_config.width)
+    model.action_time_mlp_out = nn.Linear(expert_config.width, expert_config.width)
+    model = model.to("cpu").eval()
+
+    batch_size = 2
+    images = [torch.rand(batch_size, 3, 224, 224) * 2 - 1 for _ in range(2)]
+    img_masks = [torch.ones(batch_size, dtype=torch.bool), torch.tensor([True, False])]
+    lang_tokens = torch.randint(3, 257152, (batch_size, 6))
+    lang_masks = torch.tensor([[True] * 6, [True] * 4 + [False] * 2])
+    state = torch.randn(batch_size, config.max_state_dim)
+    check_prefix_cache_matches_no_cache(model, images, img_masks, lang_tokens, lang_masks, state)
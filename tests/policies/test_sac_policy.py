@@ -220,6 +220,31 @@ def create_config_with_visual_input(
     return config
 
 
+def test_sac_critic_loss_with_discount_and_weights():
+    batch = create_default_train_batch(batch_size=4, action_dim=6, state_dim=6)
+    config = create_default_config(state_dim=6, continuous_action_dim=6)
+    policy = SACPolicy(config=config)
+    policy.train()
+
+    with seeded_context(0):
+        output = policy.forward(batch, model="critic")
+    assert output["td_error"].shape == (4,)
+    assert (output["td_error"] >= 0).all()
+
+    # A per-transition discount equal to the configured one gives the same loss
+    with seeded_context(0):
+        same = policy.forward({**batch, "discount": torch.full((4,), config.discount)}, model="critic")
+    torch.testing.assert_close(same["loss_critic"], output["loss_critic"])
+
+    # Importance sampling weights scale the loss of each transition
+    with seeded_context(0):
+        weighted = policy.forward({**batch, "weights": torch.full((4,), 2.0)}, model="critic")
+    torch.testing.assert_close(weighted["loss_critic"], 2 * output["loss_critic"])
+    with seeded_context(0):
+        weighted = policy.forward({**batch, "weights": torch.zeros(4)}, model="critic")
+    assert weighted["loss_critic"].item() == 0
+
+
 @pytest.mark.parametrize("batch_size,state_dim,action_dim", [(2, 6, 6), (1, 10, 10)])
 def test_sac_policy_with_default_config(batch_size: int, state_dim: int, action_dim: int):
     batch = create_default_train_batch(batch_size=batch_size, action_dim=action_dim, state_dim=state_dim)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import tempfile
+
+import pytest
+import torch
+
+from lerobot.configs.types import FeatureType, PipelineFeatureType, PolicyFeature
+from lerobot.processor import (
+    DataProcessorPipeline,
+    DeviceProcessorStep,
+    ImageToFloatProcessorStep,
+    RenameObservationsProcessorStep,
+    TransitionKey,
+)
+from lerobot.processor.converters import create_transition, identity_transition
+from lerobot.processor.image_processor import insert_image_to_float_step
+from lerobot.utils.constants import OBS_IMAGE, OBS_IMAGES, OBS_STATE
+from tests.conftest import assert_contract_is_typed
+
+
+def test_converts_uint8_images_only():
+    processor = ImageToFloatProcessorStep()
+    image = torch.randint(0, 256, (2, 3, 8, 8), dtype=torch.uint8)
+    float_image = torch.rand(2, 3, 8, 8)
+    observation = {
+        f"{OBS_IMAGES}.top": image,
+        f"{OBS_IMAGES}.wrist": float_image,
+        OBS_IMAGE: image,
+        OBS_STATE: torch.tensor([[1, 2]], dtype=torch.uint8),
+    }
+
+    processed_obs = processor(create_transition(observation=observation))[TransitionKey.OBSERVATION]
+
+    expected = image.to(torch.float32) / 255
+    torch.testing.assert_close(processed_obs[f"{OBS_IMAGES}.top"], expected)
+    torch.testing.assert_close(processed_obs[OBS_IMAGE], expected)
+    assert processed_obs[f"{OBS_IMAGES}.wrist"] is float_image
+    assert processed_obs[OBS_STATE].dtype == torch.uint8
+    # The input observation is not modified
+    assert observation[f"{OBS_IMAGES}.top"].dtype == torch.uint8
+
+
+def test_float_dtype():
+    processor = ImageToFloatProcessorStep(float_dtype="bfloat16")
+    image = torch.full((3, 2, 2), 255, dtype=torch.uint8)
+    processed_obs = processor(create_transition(observation={OBS_IMAGE: image}))[TransitionKey.OBSERVATION]
+    assert processed_obs[OBS_IMAGE].dtype == torch.bfloat16
+    assert (processed_obs[OBS_IMAGE] == 1).all()
+
+    with pytest.raises(ValueError, match="Invalid float_dtype"):
+        ImageToFloatProcessorStep(float_dtype="int8")
+
+
+def test_save_and_load_pretrained():
+    pipeline = DataProcessorPipeline([ImageToFloatProcessorStep(float_dtype="float16")], name="ImageToFloat")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pipeline.save_pretrained(tmp_dir)
+        loaded_pipeline = DataProcessorPipeline.from_pretrained(
+            tmp_dir,
+            config_filename="imagetofloat.json",
+            to_transition=identity_transition,
+            to_output=identity_transition,
+        )
+    assert isinstance(loaded_pipeline.steps[0], ImageToFloatProcessorStep)
+    assert loaded_pipeline.steps[0].float_dtype == "float16"
+
+
+def test_insert_image_to_float_step():
+    rename_step = RenameObservationsProcessorStep()
+    device_step = DeviceProcessorStep(device="cpu")
+    steps = insert_image_to_float_step([rename_step, device_step, rename_step])
+    assert isinstance(steps[2], ImageToFloatProcessorStep)
+    assert steps[:2] == [rename_step, device_step]
+
+    # Not inserted twice
+    assert len(insert_image_to_float_step(steps)) == 4
+    # Inserted first without device step
+    assert isinstance(insert_image_to_float_step([rename_step])[0], ImageToFloatProcessorStep)
+
+
+def test_features_are_unchanged():
+    features = {
+        PipelineFeatureType.OBSERVATION: {OBS_IMAGE: PolicyFeature(type=FeatureType.VISUAL, shape=(3, 8, 8))}
+    }
+    out = ImageToFloatProcessorStep().transform_features(features)
+    assert out == features
+    assert_contract_is_typed(out)
@@ -20,6 +20,7 @@ import pytest
 import torch
 
 from lerobot.configs.types import FeatureType, NormalizationMode, PolicyFeature
+from lerobot.datasets.compute_stats import QUANTILE_SKETCH_KEY
 from lerobot.processor import (
     DataProcessorPipeline,
     IdentityProcessorStep,
@@ -1235,6 +1236,30 @@ def test_hotswap_stats_basic_functionality():
             )
 
 
+def test_hotswap_stats_strips_quantile_sketches():
+    """Test that hotswap_stats drops the quantile sketches of dataset stats, which aren't normalization stats."""
+    stats = {ACTION: {"mean": np.array([0.0, 0.0]), "std": np.array([1.0, 1.0])}}
+    new_stats = {
+        ACTION: {
+            "mean": np.array([0.1, 0.1]),
+            "std": np.array([0.5, 0.5]),
+            QUANTILE_SKETCH_KEY: {"means": np.zeros((2, 100)), "weights": np.ones((2, 100))},
+        }
+    }
+    features = {ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(2,))}
+    norm_map = {FeatureType.ACTION: NormalizationMode.MEAN_STD}
+    processor = DataProcessorPipeline(
+        steps=[NormalizerProcessorStep(features=features, norm_map=norm_map, stats=stats)]
+    )
+
+    new_processor = hotswap_stats(processor, new_stats)
+
+    assert set(new_processor.steps[0].stats[ACTION]) == {"mean", "std"}
+    assert set(new_processor.steps[0]._tensor_stats[ACTION]) == {"mean", "std"}
+    # The stats passed in are left untouched
+    assert QUANTILE_SKETCH_KEY in new_stats[ACTION]
+
+
 def test_hotswap_stats_deep_copy():
     """Test that hotswap_stats creates a deep copy and doesn't modify the original processor."""
     initial_stats = {
@@ -2128,3 +2153,120 @@ def test_stats_reconstruction_after_load_state_dict():
         new_result[TransitionKey.OBSERVATION][OBS_STATE],
     )
     torch.testing.assert_close(original_result[TransitionKey.ACTION], new_result[TransitionKey.ACTION])
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+def test_compiled_pipeline_matches_uncompiled(inverse):
+    """The fused plan of a compiled pipeline gives the same outputs, for every normalization mode."""
+    features = {
+        OBS_IMAGE: PolicyFeature(FeatureType.VISUAL, (3, 4, 4)),
+        OBS_STATE: PolicyFeature(FeatureType.STATE, (3,)),
+        "observation.environment_state": PolicyFeature(FeatureType.ENV, (2,)),
+        ACTION: PolicyFeature(FeatureType.ACTION, (2,)),
+    }
+    norm_map = {
+        FeatureType.VISUAL: NormalizationMode.MEAN_STD,
+        FeatureType.STATE: NormalizationMode.MIN_MAX,
+        FeatureType.ENV: NormalizationMode.QUANTILES,
+        FeatureType.ACTION: NormalizationMode.QUANTILE10,
+    }
+    stats = {
+        OBS_IMAGE: {"mean": [[[0.5]], [[0.4]], [[0.3]]], "std": [[[0.2]], [[0.1]], [[0.3]]]},
+        # A null range, where the denominator is replaced by eps
+        OBS_STATE: {"min": [0.0, -1.0, 2.0], "max": [1.0, 1.0, 2.0]},
+        "observation.environment_state": {"q01": [0.1, -0.8], "q99": [0.9, 0.8]},
+        ACTION: {"q10": [0.2, -0.6], "q90": [0.8, 0.6]},
+    }
+    step_cls = UnnormalizerProcessorStep if inverse else NormalizerProcessorStep
+    pipeline = DataProcessorPipeline(
+        [step_cls(features=features, norm_map=norm_map, stats=stats), IdentityProcessorStep()],
+        to_transition=identity_transition,
+        to_output=identity_transition,
+    )
+    compiled_pipeline = DataProcessorPipeline(
+        [step_cls(features=features, norm_map=norm_map, stats=stats), IdentityProcessorStep()],
+        to_transition=identity_transition,
+        to_output=identity_transition,
+    ).compile()
+
+    for _ in range(3):
+        transition = create_transition(
+            observation={
+                OBS_IMAGE: torch.rand(2, 3, 4, 4),
+                OBS_STATE: torch.rand(2, 3),
+                # Non-tensor values are converted, like with the normalizer
+                "observation.environment_state": np.random.rand(2, 2).astype(np.float32),
+                "observation.other": "untouched",
+            },
+            action=torch.rand(2, 2),
+        )
+        expected = pipeline(transition)
+        result = compiled_pipeline(transition)
+        for key, value in expected[TransitionKey.OBSERVATION].items():
+            if isinstance(value, torch.Tensor):
+                torch.testing.assert_close(result[TransitionKey.OBSERVATION][key], value)
+            else:
+                assert result[TransitionKey.OBSERVATION][key] == value
+        torch.testing.assert_close(result[TransitionKey.ACTION], expected[TransitionKey.ACTION])
+
+    # The normalizer is fused, the identity step is run as is
+    compiled_steps = compiled_pipeline._compiled_steps
+    assert len(compiled_steps) == 2
+    assert compiled_steps[0].steps == [compiled_pipeline.steps[0]]
+    assert compiled_steps[1] is compiled_pipeline.steps[1]
+
+
+def test_compiled_pipeline_fuses_steps_and_tracks_stats():
+    features = {
+        OBS_STATE: PolicyFeature(FeatureType.STATE, (2,)),
+        ACTION: PolicyFeature(FeatureType.ACTION, (2,)),
+    }
+    norm_map = {FeatureType.STATE: NormalizationMode.MEAN_STD, FeatureType.ACTION: NormalizationMode.MIN_MAX}
+    stats = {
+        OBS_STATE: {"mean": [1.0, -1.0], "std": [2.0, 0.5]},
+        ACTION: {"min": [0.0, -2.0], "max": [1.0, 2.0]},
+    }
+    pipeline = DataProcessorPipeline(
+        [
+            NormalizerProcessorStep(features=features, norm_map=norm_map, stats=stats),
+            UnnormalizerProcessorStep(features=features, norm_map=norm_map, stats=stats),
+        ],
+        to_transition=identity_transition,
+        to_output=identity_transition,
+    ).compile()
+    transition = create_transition(observation={OBS_STATE: torch.randn(4, 2)}, action=torch.rand(4, 2))
+
+    for _ in range(2):
+        result = pipeline(transition)
+        # Normalizing, then unnormalizing is the identity
+        torch.testing.assert_close(
+            result[TransitionKey.OBSERVATION][OBS_STATE], transition[TransitionKey.OBSERVATION][OBS_STATE]
+        )
+        torch.testing.assert_close(result[TransitionKey.ACTION], transition[TransitionKey.ACTION])
+    assert len(pipeline._compiled_steps) == 1
+
+    # The plan is not used while hooks are registered
+    calls = []
+    pipeline.register_after_step_hook(lambda idx, _: calls.append(idx))
+    pipeline(transition)
+    assert calls == [0, 1]
+
+    # Swapping the stats discards the plan
+    new_stats = {
+        OBS_STATE: {"mean": [0.0, 0.0], "std": [1.0, 1.0]},
+        ACTION: {"min": [0.0, 0.0], "max": [2.0, 2.0]},
+    }
+    normalizer_pipeline = DataProcessorPipeline(
+        [NormalizerProcessorStep(features=features, norm_map=norm_map, stats=stats)],
+        to_transition=identity_transition,
+        to_output=identity_transition,
+    ).compile()
+    normalizer_pipeline(transition)
+    assert normalizer_pipeline._compiled_steps is not None
+    swapped = hotswap_stats(normalizer_pipeline, new_stats)
+    for _ in range(2):
+        result = swapped(transition)
+        torch.testing.assert_close(result[TransitionKey.ACTION], transition[TransitionKey.ACTION] - 1)
+
+    with pytest.raises(ValueError, match="PolicyAction"):
+        swapped(create_transition(observation={OBS_STATE: torch.randn(4, 2)}, action=[1.0, 2.0]))
@@ -364,6 +364,72 @@ def test_hooks():
     assert after_calls == [0]
 
 
+@dataclass
+class MockMoveStep(ProcessorStep):
+    """Mock step moving the state to a device and adding a new tensor to the observation."""
+
+    device: str = "meta"
+
+    def __call__(self, transition: EnvTransition) -> EnvTransition:
+        observation = dict(transition[TransitionKey.OBSERVATION])
+        observation[OBS_STATE] = observation[OBS_STATE].to(self.device)
+        observation["observation.extra"] = torch.zeros(4, dtype=torch.float64)
+        new_transition = transition.copy()
+        new_transition[TransitionKey.OBSERVATION] = observation
+        return new_transition
+
+    def transform_features(
+        self, features: dict[PipelineFeatureType, dict[str, PolicyFeature]]
+    ) -> dict[PipelineFeatureType, dict[str, PolicyFeature]]:
+        return features
+
+
+def test_pipeline_profiling():
+    """The profiler records per-step metrics through hooks, and leaves no hook when disabled."""
+    pipeline = DataProcessorPipeline(
+        [MockStep("test_step"), MockMoveStep()],
+        to_transition=identity_transition,
+        to_output=identity_transition,
+    )
+    user_hook_calls = []
+    pipeline.register_after_step_hook(lambda idx, _: user_hook_calls.append(idx))
+    profiler = pipeline.enable_profiling(window_size=3)
+
+    for _ in range(5):
+        pipeline(create_transition(observation={OBS_STATE: torch.zeros(2, 8)}))
+    assert user_hook_calls == [0, 1] * 5
+
+    stats = profiler.get_stats()
+    assert set(stats) == {"0_MockStep", "1_MockMoveStep", "total"}
+    for step_stats in stats.values():
+        assert set(step_stats) == {"wall_time_ms", "h2d_bytes", "num_allocations", "allocated_bytes"}
+        # Only the last `window_size` calls are kept
+        assert step_stats["wall_time_ms"]["count"] == 3
+        assert 0 <= step_stats["wall_time_ms"]["p50"] <= step_stats["wall_time_ms"]["max"]
+
+    assert stats["0_MockStep"]["num_allocations"]["max"] == 0
+    # The state moved from the host (64 bytes) and the new float64 tensor (32 bytes)
+    assert stats["1_MockMoveStep"]["h2d_bytes"]["mean"] == 64
+    assert stats["1_MockMoveStep"]["num_allocations"]["mean"] == 2
+    assert stats["1_MockMoveStep"]["allocated_bytes"]["mean"] == 96
+    assert stats["total"]["allocated_bytes"]["mean"] == 96
+
+    log_dict = profiler.get_log_dict(prefix="preprocessor/")
+    assert log_dict["preprocessor/1_MockMoveStep/h2d_bytes_p99"] == 64
+    assert "preprocessor/total/wall_time_ms_mean" in log_dict
+
+    # Sliced pipelines don't record in the profiler of the original one
+    assert len(pipeline[:1].after_step_hooks) == 1
+
+    profiler.reset_stats()
+    assert profiler.get_stats() == {}
+
+    pipeline.disable_profiling()
+    assert pipeline.profiler is None
+    assert pipeline.before_step_hooks == []
+    assert len(pipeline.after_step_hooks) == 1
+
+
 def test_unregister_hooks():
     """Test unregistering hooks from the pipeline."""
     step = MockStep("test_step")
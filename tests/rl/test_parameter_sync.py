@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+import torch
+from torch import nn
+from torch.multiprocessing import Queue
+
+from tests.utils import require_package
+
+
+class DummyPolicy(nn.Module):
+    def __init__(self, with_discrete_critic: bool = False):
+        super().__init__()
+        self.actor = nn.Sequential(nn.Linear(4, 8), nn.BatchNorm1d(8), nn.Linear(8, 2))
+        # Frozen "encoder"
+        self.actor[0].requires_grad_(False)
+        self.discrete_critic = nn.Linear(4, 3) if with_discrete_critic else None
+
+
+def perturb(policy: DummyPolicy):
+    with torch.no_grad():
+        for param in policy.parameters():
+            if param.requires_grad:
+                param.add_(0.01 * torch.randn_like(param))
+        policy.actor[1].num_batches_tracked += 1
+
+
+def assert_synced(learner_policy: DummyPolicy, actor_policy: DummyPolicy, atol: float = 0.0):
+    actor_state_dict = actor_policy.state_dict()
+    for key, value in learner_policy.state_dict().items():
+        torch.testing.assert_close(actor_state_dict[key], value, atol=atol, rtol=0)
+
+
+@require_package("grpcio", "grpc")
+@pytest.mark.parametrize("mode,dtype,atol", [("trainable", "float32", 0), ("delta", "bfloat16", 1e-4)])
+def test_parameter_sync_modes(mode, dtype, atol):
+    from lerobot.rl.parameter_sync import ParameterReceiver, ParameterSender, get_synced_modules
+    from lerobot.transport.utils import bytes_to_state_dict
+
+    learner_policy, actor_policy = DummyPolicy(with_discrete_critic=True), DummyPolicy(True)
+    sender = ParameterSender(mode=mode, dtype=dtype, keyframe_interval=3)
+    receiver = ParameterReceiver()
+    data_ptrs = {key: value.data_ptr() for key, value in actor_policy.state_dict().items()}
+
+    for version in range(5):
+        buffer = sender.encode(get_synced_modules(learner_policy))
+        message = bytes_to_state_dict(buffer)
+        assert message["version"] == version
+        assert message["keyframe_version"] == (0 if version < 3 else 3)
+        # Frozen parameters are only sent with the keyframes
+        assert ("0.weight" in message["state_dicts"]["policy"]) == (version in [0, 3])
+
+        assert receiver.apply(message, get_synced_modules(actor_policy))
+        assert_synced(learner_policy, actor_policy, atol=atol)
+        perturb(learner_policy)
+
+    # The parameters are updated in place
+    assert data_ptrs == {key: value.data_ptr() for key, value in actor_policy.state_dict().items()}
+
+
+@require_package("grpcio", "grpc")
+def test_delta_sync_skips_messages_without_keyframe():
+    from lerobot.rl.parameter_sync import ParameterReceiver, ParameterSender, get_synced_modules
+    from lerobot.transport.utils import bytes_to_state_dict
+
+    learner_policy, actor_policy = DummyPolicy(), DummyPolicy()
+    sender = ParameterSender(mode="delta", keyframe_interval=2)
+    receiver = ParameterReceiver()
+    messages = []
+    for _ in range(4):
+        messages.append(bytes_to_state_dict(sender.encode(get_synced_modules(learner_policy))))
+        perturb(learner_policy)
+
+    # Messages 0 and 2 are keyframes
+    assert not receiver.apply(messages[1], get_synced_modules(actor_policy))
+    assert receiver.apply(messages[2], get_synced_modules(actor_policy))
+    assert not receiver.apply(messages[1], get_synced_modules(actor_policy))
+    assert receiver.apply(messages[3], get_synced_modules(actor_policy))
+    assert receiver.version == 3
+
+    perturb(learner_policy)
+    # A restarted learner starts again from a keyframe
+    sender = ParameterSender(mode="delta", keyframe_interval=2)
+    assert receiver.apply(
+        bytes_to_state_dict(sender.encode(get_synced_modules(learner_policy))),
+        get_synced_modules(actor_policy),
+    )
+    assert_synced(learner_policy, actor_policy)
+
+
+@require_package("grpcio", "grpc")
+def test_full_sync_mode_pushes_state_dicts():
+    from lerobot.rl.learner import push_actor_policy_to_queue
+    from lerobot.transport.utils import bytes_to_state_dict
+
+    policy = DummyPolicy(with_discrete_critic=True)
+    queue = Queue()
+    push_actor_policy_to_queue(queue, policy)
+    state_dicts = bytes_to_state_dict(queue.get(timeout=1))
+
+    assert state_dicts.keys() == {"policy", "discrete_critic"}
+    assert state_dicts["policy"].keys() == policy.actor.state_dict().keys()
+    torch.testing.assert_close(state_dicts["policy"]["0.weight"], policy.actor[0].weight)
+
+
+@require_package("grpcio", "grpc")
+def test_get_parameters_from_queue_keeps_keyframe():
+    from lerobot.rl.parameter_sync import ParameterSender, get_parameters_from_queue, get_synced_modules
+
+    policy = DummyPolicy()
+    sender = ParameterSender(mode="delta", keyframe_interval=3)
+    buffers = [sender.encode(get_synced_modules(policy)) for _ in range(5)]
+
+    queue = Queue()
+    assert get_parameters_from_queue(queue, block=False) == []
+    for buffer in buffers:
+        queue.put(buffer)
+    time.sleep(0.1)
+    # The keyframe (version 3) is kept before the most recent parameters
+    assert get_parameters_from_queue(queue, block=False) == [buffers[3], buffers[4]]
+
+    for buffer in buffers[:4]:
+        queue.put(buffer)
+    time.sleep(0.1)
+    assert get_parameters_from_queue(queue, block=False) == [buffers[3]]
+
+
+@require_package("grpcio", "grpc")
+def test_parameter_sender_invalid_config():
+    from lerobot.rl.parameter_sync import ParameterSender
+
+    with pytest.raises(ValueError, match="Invalid mode"):
+        ParameterSender(mode="sparse")
+    with pytest.raises(ValueError, match="Invalid dtype"):
+        ParameterSender(dtype="int8")
+    with pytest.raises(ValueError, match="'full' mode"):
+        ParameterSender(mode="full", dtype="float16")
+    with pytest.raises(ValueError, match="keyframe_interval"):
+        ParameterSender(keyframe_interval=0)
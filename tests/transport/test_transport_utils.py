@@ -15,9 +15,11 @@
 # limitations under the License.
 
 import io
+import pickle
 from multiprocessing import Event, Queue
 from pickle import UnpicklingError
 
+import numpy as np
 import pytest
 import torch
 
@@ -570,3 +572,116 @@ def test_receive_bytes_in_chunks_unknown_state():
 
     with pytest.raises(ValueError, match="Received unknown transfer state"):
         receive_bytes_in_chunks(bad_iterator, output_queue, shutdown_event)
+
+
+@require_package("grpcio", "grpc")
+def test_tensors_to_buffers_round_trip():
+    from lerobot.async_inference.helpers import TimedAction
+    from lerobot.transport.utils import bytes_to_tensors, tensors_to_buffers
+
+    obj = {
+        "float32": torch.randn(3, 4),
+        "bfloat16": torch.randn(5, dtype=torch.bfloat16),
+        "bool": torch.tensor([True, False]),
+        "empty": torch.empty(0, 3),
+        "non_contiguous": torch.arange(12).reshape(3, 4).t(),
+        "frame": np.random.randint(0, 256, (4, 5, 3), dtype=np.uint8),
+        "scalar": np.float64(0.5),
+        "nested": (1, [2.0, "task", None], {"x": torch.ones(2)}),
+        "actions": [TimedAction(timestamp=0.1, timestep=3, action=torch.randn(6))],
+    }
+    frames = tensors_to_buffers(obj)
+    decoded = bytes_to_tensors(bytearray().join(frames), dataclass_types=[TimedAction])
+
+    assert decoded.keys() == obj.keys()
+    for key in ["float32", "bfloat16", "bool", "empty", "non_contiguous"]:
+        assert decoded[key].dtype == obj[key].dtype
+        assert torch.equal(decoded[key], obj[key])
+    np.testing.assert_array_equal(decoded["frame"], obj["frame"])
+    assert decoded["scalar"] == 0.5
+    assert decoded["nested"][:2] == (1, [2.0, "task", None])
+    assert torch.equal(decoded["nested"][2]["x"], torch.ones(2))
+    assert isinstance(decoded["actions"][0], TimedAction)
+    assert decoded["actions"][0].get_timestep() == 3
+    assert torch.equal(decoded["actions"][0].get_action(), obj["actions"][0].action)
+
+
+@require_package("grpcio", "grpc")
+def test_bytes_to_tensors_is_zero_copy():
+    from lerobot.transport.utils import TENSOR_FORMAT_ALIGNMENT, bytes_to_tensors, tensors_to_buffers
+
+    tensor = torch.randn(100)
+    frames = tensors_to_buffers({"a": torch.ones(3, dtype=torch.uint8), "b": tensor})
+    # The tensor isn't copied when serializing
+    assert frames[-1].obj is not None and np.shares_memory(frames[-1], tensor.numpy())
+
+    buffer = bytearray().join(frames)
+    decoded = bytes_to_tensors(buffer)
+    assert torch.equal(decoded["b"], tensor)
+    buffer_start = np.frombuffer(buffer, dtype=np.uint8).ctypes.data
+    assert buffer_start <= decoded["b"].data_ptr() < buffer_start + len(buffer)
+    assert (decoded["b"].data_ptr() - buffer_start) % TENSOR_FORMAT_ALIGNMENT == 0
+
+
+@require_package("grpcio", "grpc")
+def test_bytes_to_tensors_rejects_unknown_dataclass():
+    from lerobot.async_inference.helpers import TimedAction, TimedObservation
+    from lerobot.transport.utils import bytes_to_tensors, tensors_to_bytes
+
+    data = tensors_to_bytes(TimedAction(timestamp=0.1, timestep=3, action=torch.randn(6)))
+    with pytest.raises(TypeError, match="Unexpected dataclass TimedAction"):
+        bytes_to_tensors(data)
+    with pytest.raises(TypeError, match="Unexpected dataclass TimedAction"):
+        bytes_to_tensors(data, dataclass_types=[TimedObservation])
+
+    with pytest.raises(ValueError, match="tensor format"):
+        bytes_to_tensors(pickle.dumps({"a": 1}))
+
+
+@require_package("grpcio", "grpc")
+def test_tensors_to_buffers_rejects_objects():
+    from lerobot.transport.utils import tensors_to_buffers
+
+    with pytest.raises(TypeError, match="can't be serialized"):
+        tensors_to_buffers({"a": object()})
+    with pytest.raises(TypeError, match="can't be serialized"):
+        tensors_to_buffers(np.array([object()]))
+
+
+@require_package("grpcio", "grpc")
+def test_send_buffers_in_chunks_round_trip(monkeypatch):
+    from lerobot.transport import utils
+    from lerobot.transport.utils import (
+        bytes_to_tensors,
+        receive_bytes_in_chunks,
+        send_bytes_in_chunks,
+        services_pb2,
+        tensors_to_buffers,
+    )
+
+    obj = {f"layer_{i}": torch.randn(1000 + i) for i in range(5)}
+    frames = tensors_to_buffers(obj)
+    monkeypatch.setattr(utils, "CHUNK_SIZE", 1024)
+    messages = list(send_bytes_in_chunks(frames, services_pb2.InteractionMessage))
+    assert len(messages) > 1 and all(len(message.data) <= 1024 for message in messages)
+
+    queue = Queue()
+    receive_bytes_in_chunks(iter(messages), queue, Event())
+    decoded = bytes_to_tensors(queue.get(timeout=1))
+    for key, value in obj.items():
+        assert torch.equal(decoded[key], value)
+
+
+@require_package("grpcio", "grpc")
+def test_bytes_to_state_dict_reads_torch_save_buffers():
+    from lerobot.transport.utils import bytes_to_state_dict, bytes_to_transitions
+
+    state_dict = {"weight": torch.randn(3, 3)}
+    buffer = io.BytesIO()
+    torch.save(state_dict, buffer)
+    assert torch.equal(bytes_to_state_dict(buffer.getvalue())["weight"], state_dict["weight"])
+
+    transitions = [{"action": torch.randn(2)}]
+    buffer = io.BytesIO()
+    torch.save(transitions, buffer)
+    assert torch.equal(bytes_to_transitions(buffer.getvalue())[0]["action"], transitions[0]["action"])
@@ -21,7 +21,14 @@ import pytest
 import torch
 
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
-from lerobot.rl.buffer import BatchTransition, ReplayBuffer, random_crop_vectorized
+from lerobot.rl.buffer import (
+    BatchTransition,
+    PrioritizedReplayBuffer,
+    ReplayBuffer,
+    SumTree,
+    concatenate_batch_transitions,
+    random_crop_vectorized,
+)
 from lerobot.utils.constants import ACTION, DONE, OBS_IMAGE, OBS_STATE, OBS_STR, REWARD
 from tests.fixtures.constants import DUMMY_REPO_ID
 
@@ -679,3 +686,186 @@ def test_async_iterator_multiple_iterations():
 
     # Ensure iterator can be disposed without blocking
     del iterator
+
+
+def _add_episode(buffer: ReplayBuffer, rewards: list[float], start: int = 0, done: bool = True):
+    """Add an episode whose state and action of step i are `start + i`, so that transitions can be identified."""
+    for i, reward in enumerate(rewards):
+        step = float(start + i)
+        buffer.add(
+            state={OBS_STATE: torch.tensor([[step]])},
+            action=torch.tensor([[step]]),
+            reward=reward,
+            next_state={OBS_STATE: torch.tensor([[step + 1]])},
+            done=done and i == len(rewards) - 1,
+            truncated=False,
+        )
+
+
+def _sample_many(buffer: ReplayBuffer, num_batches: int = 50) -> BatchTransition:
+    # Batches are at most as large as the buffer
+    batch = buffer.sample(len(buffer))
+    for _ in range(num_batches - 1):
+        batch = concatenate_batch_transitions(batch, buffer.sample(len(buffer)))
+    return batch
+
+
+@pytest.mark.parametrize("optimize_memory", [False, True])
+def test_n_step_returns(optimize_memory):
+    buffer = ReplayBuffer(
+        10, "cpu", [OBS_STATE], use_drq=False, optimize_memory=optimize_memory, n_step=3, discount=0.5
+    )
+    _add_episode(buffer, [1.0, 2.0, 4.0, 8.0, 16.0])
+    # Start another episode, so that the next state of the last transitions is stored with `optimize_memory`
+    _add_episode(buffer, [0.0], start=10, done=False)
+
+    batch = _sample_many(buffer)
+    steps = batch[ACTION][:, 0].long()
+    assert set(steps.tolist()) == {0, 1, 2, 3, 4}
+
+    expected_returns = torch.tensor([1 + 1 + 1.0, 2 + 2 + 2.0, 4 + 4 + 4.0, 8 + 8.0, 16.0])
+    expected_n_steps = torch.tensor([3, 3, 3, 2, 1])
+    torch.testing.assert_close(batch["reward"], expected_returns[steps])
+    torch.testing.assert_close(batch["discount"], 0.5 ** expected_n_steps[steps].float())
+    assert torch.equal(batch["done"], (steps + expected_n_steps[steps] == 5).float())
+    if optimize_memory:
+        # Transitions ending the episode bootstrap from the next stored state, which is masked by `done`
+        not_done = batch["done"] == 0
+        assert torch.equal(batch["next_state"][OBS_STATE][not_done, 0], (steps + 3)[not_done].float())
+    else:
+        assert torch.equal(batch["next_state"][OBS_STATE][:, 0], (steps + expected_n_steps[steps]).float())
+
+
+def test_n_step_incomplete_returns_are_not_sampled():
+    buffer = ReplayBuffer(10, "cpu", [OBS_STATE], use_drq=False, n_step=3)
+    _add_episode(buffer, [1.0, 1.0], done=False)
+    with pytest.raises(RuntimeError, match="no transition is complete"):
+        buffer.sample(1)
+
+    _add_episode(buffer, [1.0, 1.0], start=2, done=False)
+    batch = _sample_many(buffer)
+    assert set(batch[ACTION][:, 0].tolist()) == {0.0, 1.0}
+
+
+def test_sum_tree():
+    tree = SumTree(5)
+    priorities = torch.tensor([1.0, 0.0, 2.0, 3.0, 4.0])
+    tree.update(torch.arange(5), priorities)
+    assert tree.total() == 10.0
+    torch.testing.assert_close(tree[torch.arange(5)], priorities.double())
+
+    values = torch.tensor([0.0, 0.99, 1.0, 2.5, 3.0, 5.99, 6.0, 9.99])
+    assert tree.find(values).tolist() == [0, 0, 2, 2, 3, 3, 4, 4]
+
+    tree.update(torch.tensor([4, 0]), torch.tensor([0.0, 1.5]))
+    assert tree.total() == 6.5
+    assert tree.find(torch.tensor([6.49])).tolist() == [3]
+
+
+def test_prioritized_replay_buffer():
+    buffer = PrioritizedReplayBuffer(10, "cpu", [OBS_STATE], use_drq=False, alpha=1.0, beta=1.0)
+    _add_episode(buffer, [0.0] * 4)
+
+    # New transitions get the same, maximal, priority
+    batch = buffer.sample(4)
+    torch.testing.assert_close(batch["weights"], torch.ones(4))
+    assert torch.equal(batch["indices"], batch[ACTION][:, 0].long())
+
+    buffer.update_priorities(torch.tensor([0, 1, 2, 3]), torch.tensor([0.0, 0.0, 0.0, 9.0]))
+    assert buffer.max_priority == pytest.approx(9.0)
+    batch = buffer.sample(4)
+    # Stratified sampling over the cumulative priorities, which are all on the last transition
+    assert batch["indices"].tolist() == [3, 3, 3, 3]
+    torch.testing.assert_close(batch["weights"], torch.ones(4))
+
+    buffer.update_priorities(torch.tensor([0, 1, 2, 3]), torch.tensor([1.0, 1.0, 1.0, 17.0]))
+    batch = buffer.sample(4)
+    assert batch["indices"][1:].tolist() == [3, 3, 3]
+    # Importance sampling weights are inversely proportional to the sampling probabilities
+    probabilities = torch.tensor([1.0, 1.0, 1.0, 17.0])[batch["indices"]] / 20
+    torch.testing.assert_close(batch["weights"], probabilities.min() / probabilities, rtol=1e-4, atol=1e-6)
+
+    # Transitions added later get the maximal priority
+    _add_episode(buffer, [0.0], start=4)
+    assert buffer.tree[torch.tensor([4])].item() == pytest.approx(17.0)
+
+
+def test_prioritized_replay_buffer_skips_overwritten_transitions():
+    buffer = PrioritizedReplayBuffer(3, "cpu", [OBS_STATE], use_drq=False, n_step=2)
+    _add_episode(buffer, [0.0] * 3, done=False)
+    # The latest transition is not complete yet
+    assert buffer.tree[torch.tensor([2])].item() == 0
+
+    batch = _sample_many(buffer)
+    assert set(batch["indices"].tolist()) == {0, 1}
+
+    # Slot 0 is overwritten by a new transition, which is not complete either
+    _add_episode(buffer, [0.0], start=3, done=False)
+    buffer.update_priorities(torch.tensor([0, 1]), torch.tensor([5.0, 5.0]))
+    assert buffer.tree[torch.tensor([0])].item() == 0
+    assert buffer.tree[torch.tensor([1])].item() > 0
+
+
+def test_concatenate_prioritized_and_uniform_batches():
+    prioritized = PrioritizedReplayBuffer(10, "cpu", [OBS_STATE], use_drq=False)
+    uniform = ReplayBuffer(10, "cpu", [OBS_STATE], use_drq=False)
+    _add_episode(prioritized, [0.0] * 4)
+    _add_episode(uniform, [0.0] * 4)
+
+    batch = concatenate_batch_transitions(prioritized.sample(3), uniform.sample(2))
+    assert batch["weights"].shape == (5,)
+    torch.testing.assert_close(batch["weights"][3:], torch.ones(2))
+    assert batch["indices"].shape == (3,)
+
+
+def test_store_images_as_uint8():
+    buffer = ReplayBuffer(10, "cpu", state_dims(), use_drq=False, store_images_as_uint8=True)
+    states = [create_dummy_state() for _ in range(4)]
+    for i in range(3):
+        buffer.add(states[i], create_dummy_action(), 1.0, states[i + 1], False, False)
+
+    assert buffer.states[OBS_IMAGE].dtype == torch.uint8
+    assert buffer.states[OBS_STATE].dtype == torch.float32
+
+    batch = buffer.sample(3)
+    assert batch["state"][OBS_IMAGE].dtype == torch.float32
+    assert batch["next_state"][OBS_IMAGE].dtype == torch.float32
+    for image, state in zip(batch["state"][OBS_IMAGE], batch["state"][OBS_STATE], strict=True):
+        idx = next(i for i in range(3) if torch.equal(states[i][OBS_STATE], state))
+        torch.testing.assert_close(image, states[idx][OBS_IMAGE], atol=0.5 / 255, rtol=0)
+
+
+def test_store_images_as_uint8_uses_less_memory():
+    float_buffer = ReplayBuffer(10, "cpu", state_dims(), use_drq=False, optimize_memory=True)
+    uint8_buffer = ReplayBuffer(
+        10, "cpu", state_dims(), use_drq=False, optimize_memory=True, store_images_as_uint8=True
+    )
+    for buffer in [float_buffer, uint8_buffer]:
+        state = create_dummy_state()
+        buffer.add(state, create_dummy_action(), 1.0, state, False, False)
+
+    image_bytes = 10 * 3 * 84 * 84
+    assert get_object_memory(float_buffer) - get_object_memory(uint8_buffer) >= 3 * image_bytes
+
+
+@pytest.mark.parametrize("truncated", [False, True])
+def test_memory_optimization_next_state_across_episodes(truncated):
+    buffer = ReplayBuffer(10, "cpu", [OBS_STATE], use_drq=False, optimize_memory=True)
+    for step in range(3):
+        buffer.add(
+            state={OBS_STATE: torch.tensor([[float(step)]])},
+            action=torch.tensor([[float(step)]]),
+            reward=0.0,
+            next_state={OBS_STATE: torch.tensor([[step + 1.0]])},
+            done=not truncated and step == 2,
+            truncated=truncated and step == 2,
+        )
+    # The last transition of the episode can be sampled before the next episode starts
+    assert len(buffer) - buffer._num_unsampleable() == 3
+    _add_episode(buffer, [0.0] * 2, start=10, done=False)
+
+    batch = _sample_many(buffer)
+    steps = batch[ACTION][:, 0]
+    assert set(steps.tolist()) == {0.0, 1.0, 2.0, 10.0}
+    # The next state of the last transition of the first episode is not the first state of the second one
+    torch.testing.assert_close(batch["next_state"][OBS_STATE][:, 0], steps + 1)